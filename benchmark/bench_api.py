@@ -0,0 +1,178 @@
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from urllib.parse import urlsplit
+
+from synthetic import DASHBOARD_DIR, make_dataset
+
+import api
+import data_loader
+import queries
+
+# Campuran request untuk skenario cache: state default setiap view dan beberapa variasi
+URLS = [
+    '/api/kpis',
+    '/api/weekday', '/api/weekday?agg=Median&y=casual', '/api/weekday?agg=Sum&y=registered',
+    '/api/hourly', '/api/hourly?workingday=1', '/api/hourly?workingday=0&season=2,3',
+    '/api/hourly_heatmap', '/api/hourly_heatmap?y=casual',
+    '/api/weather_correlation', '/api/weather_correlation?x=hum_percent&weather=1,2',
+    '/api/weather_stats', '/api/weather_stats?y=casual&weather=1,2,3',
+    '/api/periods', '/api/periods?freq=Bulanan&y=cnt,casual', '/api/periods?dataset=hour&freq=Per%20Jam&start=2012-06-01&end=2012-06-30',
+    '/api/users', '/api/users?by=weather', '/api/users?dataset=hour&by=temperature',
+    '/api/users?by=period&freq=Mingguan',
+]
+
+
+# Klien HTTP/1.1 keep-alive minimal: (status, header, body) untuk satu GET
+async def fetch(reader, writer, url, headers=None):
+    lines = [f'GET {url} HTTP/1.1', 'Host: bench'] + [f'{k}: {v}' for k, v in (headers or {}).items()]
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode())
+    await writer.drain()
+    head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+    response_headers = dict(line.split(': ', 1) for line in head[1:] if ': ' in line)
+    body = await reader.readexactly(int(response_headers.get('Content-Length', 0)))
+    return int(head[0].split()[1]), response_headers, body
+
+
+# Satu koneksi yang terus mengirim request sampai deadline; latensi dan status dicatat
+async def client(port, next_request, deadline, latencies, statuses):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        while time.perf_counter() < deadline:
+            url, headers = next_request()
+            start = time.perf_counter()
+            status, _, _ = await fetch(reader, writer, url, headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def load_test(port, next_request, connections, duration):
+    latencies, statuses = [], {}
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*[client(port, next_request, deadline, latencies, statuses) for _ in range(connections)])
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'rps': len(latencies) / elapsed,
+        'p50': latencies[len(latencies) // 2],
+        'p99': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        'statuses': statuses,
+    }
+
+
+# Request bersyarat dengan ETag yang sudah diketahui klien (respons 304 tanpa body)
+def etag_request(etags):
+    def next_request():
+        url = random.choice(URLS)
+        return url, {'If-None-Match': etags[url]}
+    return next_request
+
+
+# Rentang tanggal acak: hampir setiap request punya parameter unik sehingga tidak ada
+# respons yang bisa diambil dari cache
+def uncached_request(bounds):
+    first, last = bounds
+    span = (last - first).days
+
+    def next_request():
+        start = first + datetime.timedelta(days=random.randrange(span))
+        end = start + datetime.timedelta(days=random.randrange(1, 120))
+        freq = random.choice(['Harian', 'Mingguan', 'Bulanan'])
+        endpoint = random.choice(['periods?dataset=hour&y=cnt,casual', 'users?dataset=hour&by=period'])
+        return f'/api/{endpoint}&freq={freq}&start={start}&end={end}', None
+    return next_request
+
+
+# Setiap respons API harus sama dengan hasil lapisan query yang dipanggil in-process
+async def verify(port, frames):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    etags = {}
+    try:
+        for url in URLS:
+            status, headers, body = await fetch(reader, writer, url)
+            assert status == 200, (url, status, body[:200])
+            parts = urlsplit(url)
+            name = parts.path[len('/api/'):]
+            params = api.parse_params(api.ENDPOINTS[name][1], parts.query)
+            _, expected = api.build_response(name, params, frames)
+            assert json.loads(body) == json.loads(expected), url
+            etags[url] = headers['ETag']
+
+            status, _, body = await fetch(reader, writer, url, {'If-None-Match': headers['ETag']})
+            assert status == 304 and body == b'', (url, status)
+    finally:
+        writer.close()
+    print(f"{len(URLS)} query: respons API identik dengan lapisan query in-process, If-None-Match -> 304")
+    return etags
+
+
+def wait_ready(port, process, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("server API berhenti sebelum siap")
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/api', timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError("server API tidak siap")
+
+
+def run_scale(scale, args, tmp):
+    data_dir = os.path.join(tmp, f'scale-{scale}')
+    make_dataset(data_dir, scale)
+    command = [sys.executable, os.path.join(DASHBOARD_DIR, 'api.py'), '--port', str(args.port)]
+    process = subprocess.Popen(command, cwd=data_dir, stdout=subprocess.DEVNULL)
+    cwd = os.getcwd()
+    try:
+        wait_ready(args.port, process)
+        os.chdir(data_dir)
+        data_loader.invalidate_cache()
+        frames = queries.load()
+        etags = asyncio.run(verify(args.port, frames))
+
+        rows = len(frames[1])
+        scenarios = [
+            ('cache (200)', lambda: (random.choice(URLS), None)),
+            ('etag (304)', etag_request(etags)),
+            ('tanpa cache', uncached_request(queries.date_bounds(frames[0]))),
+        ]
+        print(f"\nSkala {scale}x ({rows:,} baris per jam, {args.connections} koneksi, {args.duration:.0f} detik per skenario)")
+        print(f"{'skenario':<14}{'req/detik':>11}{'p50 (ms)':>10}{'p99 (ms)':>10}  status")
+        for name, next_request in scenarios:
+            result = asyncio.run(load_test(args.port, next_request, args.connections, args.duration))
+            statuses = ', '.join(f'{k}: {v}' for k, v in sorted(result['statuses'].items()))
+            print(f"{name:<14}{result['rps']:>11.0f}{result['p50']:>10.2f}{result['p99']:>10.2f}  {statuses}")
+    finally:
+        os.chdir(cwd)
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test lokal API agregasi (req/detik)')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--connections', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=5.0, help='lama setiap skenario (detik)')
+    parser.add_argument('--port', type=int, default=8599)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            run_scale(scale, args, tmp)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from synthetic import make_dataset, split_csv
+
+import cube
+import data_loader
+import regression
+import selection
+import sql_backend
+import weather_stats
+
+
+def append_lines(path, lines):
+    with open(path, 'ab') as f:
+        f.write(b''.join(lines))
+
+
+# Membandingkan frame dan cube dari cache inkremental dengan pemuatan penuh tanpa cache
+def assert_same_as_full_load(day_path, hour_path):
+    day_df, hour_df = data_loader.load_frames(day_path, hour_path)
+    full_day, full_hour = data_loader.read_frames(day_path, hour_path, use_snapshot=False)
+    pd.testing.assert_frame_equal(day_df, full_day)
+    pd.testing.assert_frame_equal(hour_df, full_hour)
+
+    pd.testing.assert_frame_equal(cube.get_cube(hour_df), cube.build_cube(full_hour))
+
+    positions = selection.get_positions(hour_df, 'weathersit')
+    expected_positions = selection.build_positions(full_hour['weathersit'].to_numpy())
+    assert positions.keys() == expected_positions.keys()
+    for value, part in expected_positions.items():
+        assert (positions[value] == part).all()
+
+    summary = weather_stats.get_summary(hour_df)
+    expected_summary = weather_stats.build_summary(full_hour)
+    assert summary.keys() == expected_summary.keys()
+    for key, stats in expected_summary.items():
+        assert summary[key]['count'] == stats['count'] and summary[key]['sum'] == stats['sum'], key
+        np.testing.assert_allclose(summary[key]['m2'], stats['m2'], rtol=1e-12)
+        np.testing.assert_array_equal(summary[key]['quantiles'], stats['quantiles'])
+
+    # Database SQLite diperbarui lewat hook append (lihat verify), hasil query sama dengan
+    # data penuh
+    moments = sql_backend.regression_moments(hour_df, 'temp_celsius', 'cnt')
+    expected_moments = regression.build_moments(full_hour)[('temp_celsius', 'cnt')]
+    assert moments.keys() == expected_moments.keys()
+    for group, stats in expected_moments.items():
+        for stat, value in stats.items():
+            np.testing.assert_allclose(moments[group][stat], value, rtol=1e-9, err_msg=f'{group} {stat}')
+    np.testing.assert_allclose(sql_backend.hourly_profile(cube.get_cube(hour_df), 'cnt').to_numpy(),
+                               cube.rollup(cube.build_cube(full_hour), 'hr', 'cnt')['mean'].to_numpy(), rtol=1e-12)
+
+
+# Skenario append pada data asli: beberapa batch, baris yang belum selesai ditulis,
+# dan perubahan isi lama yang harus memicu pemuatan ulang penuh
+def verify(tmp):
+    day_path, hour_path = make_dataset(tmp, 1)
+    day_head, day_rest = split_csv(day_path, 500)
+    hour_head, hour_rest = split_csv(hour_path, 12000)
+    with open(day_path, 'wb') as f:
+        f.write(day_head)
+    with open(hour_path, 'wb') as f:
+        f.write(hour_head)
+
+    sql_backend.BACKEND = 'sqlite'
+    data_loader.invalidate_cache()
+    assert_same_as_full_load(day_path, hour_path)
+    database = sql_backend.get_database(data_loader.load_frames(day_path, hour_path)[1])
+
+    # Append dalam beberapa batch; batch hour terakhir berakhir di tengah baris
+    batches = [(day_rest[:100], hour_rest[:24]), (day_rest[100:], hour_rest[24:3000]), ([], hour_rest[3000:])]
+    for day_lines, hour_lines in batches:
+        append_lines(day_path, day_lines)
+        append_lines(hour_path, hour_lines[:-1])
+        with open(hour_path, 'ab') as f:
+            f.write(hour_lines[-1][:10])
+        before = data_loader.cache_info()
+        day_df, hour_df = data_loader.load_frames(day_path, hour_path)
+        after = data_loader.cache_info()
+        assert after['appends'] == before['appends'] + 1 and after['misses'] == before['misses']
+        with open(hour_path, 'rb') as f:
+            assert len(hour_df) == f.read().count(b'\n') - 1
+        with open(hour_path, 'ab') as f:
+            f.write(hour_lines[-1][10:])
+        assert_same_as_full_load(day_path, hour_path)
+        assert sql_backend.get_database(data_loader.load_frames(day_path, hour_path)[1]) is database
+
+    # Range version: rentang sebelum baris baru tetap, rentang yang terdampak berubah
+    day_df, _ = data_loader.load_frames(day_path, hour_path)
+    old_range = data_loader.range_version(day_df, '2011-01-01', '2011-03-31')
+    new_range = data_loader.range_version(day_df, '2012-12-01', '2012-12-31')
+    assert old_range == new_range[:-1] + ((),) and new_range[-1]
+
+    # Mengubah baris lama harus memicu pemuatan ulang penuh
+    with open(hour_path, 'r+b') as f:
+        f.seek(len(hour_head) - 20)
+        f.write(b'9')
+    before = data_loader.cache_info()
+    data_loader.load_frames(day_path, hour_path)
+    assert data_loader.cache_info()['misses'] == before['misses'] + 1
+    sql_backend.BACKEND = 'pandas'
+    print("append inkremental identik dengan pemuatan penuh")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verifikasi dan benchmark ingest inkremental (append)')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--rows', type=int, default=24, help='jumlah baris per jam yang ditambahkan')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        verify(tmp)
+
+    print(f"{'skala':<8}{'baris':>10}{'reload penuh (s)':>18}{'append (s)':>12}")
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            day_path, hour_path = make_dataset(tmp, scale)
+            head, rest = split_csv(hour_path, sum(1 for _ in open(hour_path)) - 1 - args.rows)
+            with open(hour_path, 'wb') as f:
+                f.write(head)
+
+            data_loader.invalidate_cache()
+            _, hour_df = data_loader.load_frames(day_path, hour_path)
+            cube.get_cube(hour_df)
+            append_lines(hour_path, rest)
+
+            start = time.perf_counter()
+            _, hour_df = data_loader.load_frames(day_path, hour_path)
+            cube.get_cube(hour_df)
+            append_seconds = time.perf_counter() - start
+            assert data_loader.cache_info()['appends'] >= 1
+
+            start = time.perf_counter()
+            _, full_hour = data_loader.read_frames(day_path, hour_path, use_snapshot=False)
+            cube.build_cube(full_hour)
+            full_seconds = time.perf_counter() - start
+            print(f"{scale:<8}{len(full_hour):>10}{full_seconds:>18.3f}{append_seconds:>12.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import tempfile
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from synthetic import make_dataset
+
+import cube
+import data_loader
+
+# Kombinasi filter yang sama dengan widget di tampilan Distribusi Jam
+FILTER_CASES = [
+    ('Semua Hari', None, [1, 2, 3, 4]),
+    ('Hari Kerja', [1], [1, 2, 3, 4]),
+    ('Akhir Pekan', [0], [2, 3]),
+]
+
+
+# Cara lama: filter baris lalu groupby/pivot_table di atas data per jam
+def pandas_views(hour_df, workingday, seasons, y_var):
+    filtered_df = hour_df.copy()
+    if workingday is not None:
+        filtered_df = filtered_df[filtered_df['workingday'].isin(workingday)]
+    filtered_df = filtered_df[filtered_df['season'].isin(seasons)]
+    hourly = filtered_df.groupby('hr')[y_var].mean()
+    pivot = filtered_df.pivot_table(index='hr', columns='weekday', values=y_var, aggfunc='mean')
+    weather = filtered_df.groupby('weathersit')[y_var].agg(['mean', 'std', 'count'])
+    return hourly, pivot, weather
+
+
+# Cara baru: roll-up dari cube
+def cube_views(hour_cube, workingday, seasons, y_var):
+    filters = {'workingday': workingday, 'season': seasons}
+    hourly = cube.rollup(hour_cube, 'hr', y_var, filters)['mean']
+    pivot = cube.rollup(hour_cube, ['hr', 'weekday'], y_var, filters)['mean'].unstack('weekday')
+    weather = cube.rollup(hour_cube, 'weathersit', y_var, filters)[['mean', 'std', 'count']]
+    return hourly, pivot, weather
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cube vs groupby pandas untuk tampilan per jam')
+    parser.add_argument('--scale', type=int, default=1)
+    parser.add_argument('--number', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        day_path, hour_path = make_dataset(tmp, args.scale)
+        hour_df = data_loader.read_frame(hour_path, use_snapshot=False)
+
+    start = timeit.default_timer()
+    hour_cube = cube.build_cube(hour_df)
+    build_seconds = timeit.default_timer() - start
+    print(f'{len(hour_df)} baris -> {len(hour_cube)} sel cube (dibangun dalam {build_seconds:.3f}s)')
+
+    for label, workingday, seasons in FILTER_CASES:
+        for y_var in cube.CUBE_MEASURES:
+            expected = pandas_views(hour_df, workingday, seasons, y_var)
+            actual = cube_views(hour_cube, workingday, seasons, y_var)
+            # Mean dan count harus identik; std cukup sama sampai toleransi floating-point
+            assert expected[0].to_numpy().tolist() == actual[0].to_numpy().tolist()
+            assert np.array_equal(expected[1].to_numpy(), actual[1].to_numpy(), equal_nan=True)
+            pd.testing.assert_frame_equal(expected[2], actual[2], check_exact=False, rtol=1e-12, check_names=False)
+
+        pandas_time = timeit.timeit(lambda: pandas_views(hour_df, workingday, seasons, 'cnt'), number=args.number)
+        cube_time = timeit.timeit(lambda: cube_views(hour_cube, workingday, seasons, 'cnt'), number=args.number)
+        print(f'{label:<12} pandas {pandas_time / args.number * 1000:8.2f} ms   '
+              f'cube {cube_time / args.number * 1000:8.2f} ms')
+    # Std dari M2 tidak kehilangan presisi walaupun nilainya besar dan variansnya kecil:
+    # menggeser ukuran sebesar konstanta tidak boleh mengubah std
+    shifted = hour_df.assign(cnt=hour_df['cnt'] + 10 ** 8)
+    for by in ['weathersit', 'hr', ['hr', 'weekday']]:
+        expected = cube.rollup(hour_cube, by, 'cnt')['std']
+        actual = cube.rollup(cube.build_cube(shifted), by, 'cnt')['std']
+        np.testing.assert_allclose(actual, expected, rtol=1e-8)
+    print('Hasil cube identik dengan pandas.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import os
+import tempfile
+import timeit
+import tracemalloc
+
+import pandas as pd
+
+from synthetic import make_dataset, split_csv
+
+import data_loader
+import time_index
+
+
+# Data harian turunan harus sama dengan day.csv yang diproses (kolom cuaca sebatas
+# pembulatan 6 desimal di day.csv; kolom satuan seperti temp_celsius mengikuti) dan lolos
+# pemeriksaan konsistensi
+def verify(day_path, hour_path):
+    hour_df = data_loader.read_frame(hour_path, use_snapshot=False)
+    daily = data_loader.derive_daily(hour_df)
+    expected = data_loader.read_frame(day_path, use_snapshot=False)
+    assert list(daily.columns) == list(expected.columns) and (daily.dtypes == expected.dtypes).all()
+    columns = data_loader.DAY_COLUMNS + ['weekday_name', 'season_name', 'weather_name']
+    pd.testing.assert_frame_equal(daily[columns], expected[columns],
+                                  check_exact=False, atol=data_loader.DAY_WEATHER_TOLERANCE, rtol=0)
+    report = data_loader.check_daily(daily, day_path)
+    assert report['consistent'], report
+
+
+# Append per jam: batch yang melengkapi hari terakhir maupun yang membuka hari baru harus
+# menghasilkan data harian (dan artefak turunannya) yang sama dengan penurunan penuh
+def verify_append(tmp):
+    day_path, hour_path = make_dataset(tmp, 1)
+    head, rest = split_csv(hour_path, 12000)
+    with open(hour_path, 'wb') as f:
+        f.write(head)
+
+    data_loader.invalidate_cache()
+    data_loader.load_frames(day_path, hour_path)
+    for batch in [rest[:5], rest[5:30], rest[30:1000], rest[1000:]]:
+        with open(hour_path, 'ab') as f:
+            f.write(b''.join(batch))
+        day_df, hour_df = data_loader.load_frames(day_path, hour_path)
+        expected = data_loader.derive_daily(data_loader.read_frame(hour_path, use_snapshot=False))
+        pd.testing.assert_frame_equal(day_df, expected)
+        index = time_index.get_index(day_df)
+        pd.testing.assert_frame_equal(
+            time_index.rollup(index, '2011-01-01', '2012-12-31', 'Bulanan', ['cnt']),
+            time_index.rollup(time_index.build_time_index(expected), '2011-01-01', '2012-12-31', 'Bulanan', ['cnt']))
+    assert data_loader.cache_info()['appends'] == 4
+
+
+# Waktu terbaik dan memori puncak (tracemalloc) memuat data tanpa cache
+def measure(load, repeat):
+    seconds = min(timeit.repeat(load, number=1, repeat=repeat))
+    tracemalloc.start()
+    frames = load()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    resident = sum(data_loader.memory_report({'day': frames[0], 'hour': frames[1]}).values())
+    return seconds, peak, resident
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Data harian dari day.csv vs diturunkan dari data per jam')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    # Salinan sintetis bergeser 2 tahun sehingga 29 Februari bertabrakan dengan 28 Februari;
+    # day.csv hanya konsisten dengan hour.csv pada data asli (skala 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        verify(*make_dataset(os.path.join(tmp, 'verify'), 1))
+        data_loader.DAY_SOURCE = 'hour'
+        verify_append(os.path.join(tmp, 'append'))
+        data_loader.DAY_SOURCE = 'csv'
+    print("Data asli: data harian turunan sama dengan day.csv dan lolos pemeriksaan konsistensi")
+    print("Append per jam: data harian turunan identik dengan penurunan penuh")
+
+    print(f"\n{'skala':<7}{'sumber':<8}{'CSV dibaca (MB)':>17}{'muat (s)':>10}{'puncak (MB)':>13}{'frame (MB)':>12}")
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            day_path, hour_path = make_dataset(tmp, scale)
+            for source in data_loader.DAY_SOURCES:
+                data_loader.DAY_SOURCE = source
+                read_bytes = os.path.getsize(hour_path) + (os.path.getsize(day_path) if source == 'csv' else 0)
+                seconds, peak, resident = measure(
+                    lambda: data_loader.read_frames(day_path, hour_path, use_snapshot=False), args.repeat)
+                print(f"{scale:<7}{source:<8}{read_bytes / 1024 ** 2:>17.1f}{seconds:>10.3f}"
+                      f"{peak / 1024 ** 2:>13.1f}{resident / 1024 ** 2:>12.1f}")
+            data_loader.DAY_SOURCE = 'csv'
+
+
+if __name__ == '__main__':
+    main()
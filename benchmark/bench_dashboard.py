@@ -0,0 +1,356 @@
+import argparse
+import datetime
+import itertools
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic import DASHBOARD_DIR, REPO_DIR, make_dataset
+
+APP_PATH = os.path.join(DASHBOARD_DIR, 'dashboard.py')
+RESULTS_DIR = os.path.join(REPO_DIR, 'benchmark', 'results')
+BASELINE_PATH = os.path.join(RESULTS_DIR, 'baseline.json')
+
+RENDER_MODES = [[('radio', 'Mode Render Grafik:', 'Server (Matplotlib)')],
+                [('radio', 'Mode Render Grafik:', 'Browser (Vega-Lite)')]]
+
+
+# Satu sumbu kombinasi: setiap nilai menjadi satu pengaturan widget
+def axis(kind, label, values):
+    return [[(kind, label, value)] for value in values]
+
+
+# Rentang tanggal: seluruh data, atau 90 hari terakhir dari rentang default widget
+def full_range(value):
+    return value
+
+
+def last_quarter(value):
+    start, end = value
+    return (max(start, end - datetime.timedelta(days=90)), end)
+
+
+# Interaksi per view: daftar sumbu, dan setiap kombinasi (produk kartesius) dijalankan
+# sebagai rangkaian rerun. Sebuah pengaturan bisa berisi beberapa widget yang saling
+# bergantung (misalnya slider yang baru muncul setelah checkbox dicentang).
+VIEWS = {
+    'Dashboard Utama': [],
+    'Tren Harian': [
+        axis('selectbox', 'Pilih Jenis Visualisasi:', ['Bar Chart', 'Line Chart', 'Box Plot']),
+        axis('selectbox', 'Pilih Metode Agregasi:', ['Mean', 'Median', 'Sum', 'Min', 'Max']),
+        axis('selectbox', 'Pilih Variabel untuk Divisualisasi:', ['cnt', 'casual', 'registered']),
+    ],
+    'Distribusi Jam': [
+        axis('selectbox', 'Pilih Variabel untuk Analisis:', ['cnt', 'casual', 'registered']),
+        axis('radio', 'Filter Berdasarkan Hari:', ['Semua Hari', 'Hari Kerja', 'Akhir Pekan']),
+        axis('multiselect', 'Filter Berdasarkan Musim:', [[1, 2, 3, 4], [1], [2, 3], []]),
+    ],
+    'Korelasi Cuaca': [
+        RENDER_MODES,
+        axis('selectbox', 'Pilih Faktor Cuaca:', ['temp_celsius', 'hum_percent', 'windspeed_kph']),
+        axis('selectbox', 'Pilih Tipe Peminjaman:', ['cnt', 'casual', 'registered']),
+        axis('multiselect', 'Filter Berdasarkan Kondisi Cuaca:', [[1, 2, 3, 4], [1], [2, 3]]),
+    ],
+    'Tren Waktu': [
+        axis('date_input', 'Pilih Rentang Waktu:', [full_range, last_quarter]),
+        axis('selectbox', 'Pilih Frekuensi Agregasi:', ['Harian', 'Mingguan', 'Bulanan', 'Per Jam']),
+        axis('multiselect', 'Pilih Variabel untuk Divisualisasi:', [['cnt'], ['casual', 'registered']]),
+        [
+            [('checkbox', 'Tampilkan Rolling Average', False)],
+            [('checkbox', 'Tampilkan Rolling Average', True), ('slider', 'Window Size Rolling Average:', 7)],
+            [('checkbox', 'Tampilkan Rolling Average', True), ('slider', 'Window Size Rolling Average:', 30)],
+        ],
+    ],
+    'Pengguna Casual vs Terdaftar': [
+        axis('radio', 'Pilih Dataset:', ['Data Harian', 'Data Per Jam']),
+        axis('selectbox', 'Pilih Tipe Perbandingan:', ['Proporsi Harian', 'Berdasarkan Cuaca', 'Berdasarkan Suhu']) + [
+            [('selectbox', 'Pilih Tipe Perbandingan:', 'Tren Waktu'),
+             ('date_input', 'Pilih Rentang Waktu:', date_range),
+             ('selectbox', 'Pilih Frekuensi Agregasi:', freq)]
+            for date_range in [full_range, last_quarter] for freq in ['Harian', 'Mingguan', 'Bulanan']
+        ],
+    ],
+    'Kondisi Cuaca': [
+        RENDER_MODES,
+        axis('multiselect', 'Pilih Kondisi Cuaca:', [[1, 2], [1, 2, 3, 4], [3]]),
+        axis('selectbox', 'Pilih Variabel untuk Analisis:', ['cnt', 'casual', 'registered']),
+        axis('radio', 'Pilih Tipe Visualisasi:', ['Box Plot', 'Violin Plot', 'Strip Plot']),
+    ],
+}
+
+
+# Semua kombinasi untuk sebuah view; max_combos > 0 mengambil sampel merata
+def combinations(view, max_combos=0):
+    axes = VIEWS[view]
+    combos = [sum(settings, []) for settings in itertools.product(*axes)] if axes else [[]]
+    if max_combos and len(combos) > max_combos:
+        step = len(combos) / max_combos
+        combos = [combos[int(i * step)] for i in range(max_combos)]
+    return combos
+
+
+# Peak RSS proses. Di Linux, VmHWM bisa di-reset lewat /proc/self/clear_refs sehingga
+# peak bisa diukur per view; jika tidak tersedia, dipakai ru_maxrss (peak sejak proses mulai).
+def reset_peak_rss():
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def peak_rss_mb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# Persentil nearest-rank
+def percentile(values, q):
+    values = sorted(values)
+    rank = max(1, -(-len(values) * q // 100))
+    return values[int(rank) - 1]
+
+
+def find_widget(at, kind, label):
+    for widget in getattr(at, kind):
+        if widget.label == label:
+            return widget
+    return None
+
+
+def check(at, context):
+    if at.exception:
+        raise RuntimeError(f'{context}: {[e.value for e in at.exception]}')
+
+
+# Satu rerun AppTest; waktu (ms) dan rincian fase dari profiling ditambahkan ke samples
+def timed_run(at, samples, context):
+    import profiling
+
+    start = time.perf_counter()
+    at.run()
+    elapsed = (time.perf_counter() - start) * 1000
+    check(at, context)
+    records = profiling.history(1)
+    samples.append({'ms': elapsed, 'phases': records[0]['phases'] if records else {}})
+
+
+# Menerapkan satu kombinasi pengaturan. Widget yang belum muncul (bergantung pada widget
+# sebelumnya) diterapkan setelah rerun; setiap rerun dicatat sebagai sampel.
+def apply_combo(at, combo, samples):
+    pending = False
+    for kind, label, value in combo:
+        widget = find_widget(at, kind, label)
+        if widget is None and pending:
+            timed_run(at, samples, combo)
+            pending = False
+            widget = find_widget(at, kind, label)
+        if widget is None:
+            continue
+        if callable(value):
+            value = value(tuple(widget.value))
+        if kind == 'checkbox':
+            widget.check() if value else widget.uncheck()
+        else:
+            widget.set_value(value)
+        pending = True
+    if pending or not combo:
+        timed_run(at, samples, combo)
+
+
+# Menjalankan semua kombinasi untuk satu view pada AppTest baru
+def bench_view(view, max_combos, repeat, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    reset_peak_rss()
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.run()
+    check(at, 'init')
+    find_widget(at, 'radio', 'Pilih Analisis:').set_value(view)
+    at.run()
+    check(at, view)
+
+    passes = []
+    for _ in range(repeat):
+        samples = []
+        for combo in combinations(view, max_combos):
+            apply_combo(at, combo, samples)
+        passes.append(samples)
+
+    first = [s['ms'] for s in passes[0]]
+    phases = {}
+    for sample in passes[0]:
+        for name, stats in sample['phases'].items():
+            phases[name] = phases.get(name, 0.0) + stats['ms']
+    result = {
+        'reruns': len(first),
+        'p50_ms': percentile(first, 50),
+        'p95_ms': percentile(first, 95),
+        'max_ms': max(first),
+        'peak_rss_mb': peak_rss_mb(),
+        'phase_mean_ms': {name: total / len(first) for name, total in sorted(phases.items())},
+    }
+    if repeat > 1:
+        warm = [s['ms'] for samples in passes[1:] for s in samples]
+        result['warm_p50_ms'] = percentile(warm, 50)
+        result['warm_p95_ms'] = percentile(warm, 95)
+    return result
+
+
+# Dijalankan di proses terpisah per skala agar cache dan peak memori tidak tercampur
+def child_main(args):
+    sys.path.insert(0, DASHBOARD_DIR)
+    os.chdir(args.data_dir)
+    import data_loader
+
+    with open(os.path.join(args.data_dir, 'hour.csv'), 'rb') as f:
+        rows = sum(1 for _ in f) - 1
+
+    start = time.perf_counter()
+    data_loader.load_frames()
+    startup_ms = (time.perf_counter() - start) * 1000
+    data_loader.invalidate_cache()
+
+    views = {}
+    for view in args.views or list(VIEWS):
+        views[view] = bench_view(view, args.max_combos, args.repeat, args.timeout)
+        print(f"  {view}: p50 {views[view]['p50_ms']:.0f} ms, p95 {views[view]['p95_ms']:.0f} ms",
+              file=sys.stderr)
+    print(json.dumps({'rows': rows, 'startup_ms': startup_ms, 'views': views}))
+
+
+# Folder dataset untuk sebuah skala; dibuat sekali jika --data-cache diberikan
+def dataset_dir(scale, data_cache, tmp):
+    root = data_cache or tmp
+    path = os.path.join(root, f'scale-{scale}')
+    if not os.path.exists(os.path.join(path, 'hour.csv')):
+        make_dataset(path, scale)
+    return path
+
+
+def run_scale(scale, args, tmp):
+    data_dir = dataset_dir(scale, args.data_cache, tmp)
+    command = [sys.executable, os.path.abspath(__file__), '--child', '--data-dir', data_dir,
+               '--max-combos', str(args.max_combos), '--repeat', str(args.repeat), '--timeout', str(args.timeout)]
+    if args.views:
+        command += ['--views'] + args.views
+    # Precompute latar belakang dimatikan secara default agar rerun pertama tetap mengukur
+    # biaya cold dan tidak bersaing dengan thread precompute (lihat bench_precompute.py)
+    env = dict(os.environ, DASHBOARD_PRECOMPUTE='1' if args.precompute else '0')
+    out = subprocess.run(command, check=True, stdout=subprocess.PIPE, text=True, env=env)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def print_results(results):
+    for scale, result in results['scales'].items():
+        print(f"\nSkala {scale}x ({result['rows']} baris per jam, startup {result['startup_ms']:.0f} ms)")
+        print(f"{'view':<30}{'rerun':>7}{'p50 (ms)':>11}{'p95 (ms)':>11}{'peak RSS (MB)':>15}  fase terlama")
+        for view, r in result['views'].items():
+            top = max(r['phase_mean_ms'].items(), key=lambda item: item[1] if item[0] != 'view' else -1,
+                      default=('-', 0))
+            print(f"{view:<30}{r['reruns']:>7}{r['p50_ms']:>11.0f}{r['p95_ms']:>11.0f}{r['peak_rss_mb']:>15.0f}"
+                  f"  {top[0]} ({top[1]:.0f} ms)")
+
+
+# Membandingkan hasil dengan baseline; mengembalikan daftar regresi
+def compare(results, baseline, tolerance):
+    regressions = []
+    print(f"\nPerbandingan dengan baseline ({baseline['meta']['created']}), toleransi {tolerance:.0%}")
+    for key in ['max_combos', 'repeat', 'machine', 'cpus']:
+        if baseline['meta'].get(key) != results['meta'].get(key):
+            print(f"Peringatan: {key} berbeda dari baseline ({baseline['meta'].get(key)} vs "
+                  f"{results['meta'].get(key)}), hasil tidak sebanding")
+    for scale, result in results['scales'].items():
+        base_scale = baseline['scales'].get(scale)
+        if base_scale is None:
+            continue
+        for view, r in result['views'].items():
+            base = base_scale['views'].get(view)
+            if base is None:
+                continue
+            for metric in ['p50_ms', 'p95_ms', 'peak_rss_mb']:
+                ratio = r[metric] / base[metric] if base[metric] else 1.0
+                flag = ''
+                if ratio > 1 + tolerance:
+                    flag = '  REGRESI'
+                    regressions.append((scale, view, metric, ratio))
+                print(f"{scale + 'x':<6}{view:<30}{metric:<13}{base[metric]:>10.0f}{r[metric]:>10.0f}"
+                      f"{ratio:>8.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark rerun dashboard (AppTest) pada dataset berskala')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100, 1000])
+    parser.add_argument('--views', nargs='+', choices=list(VIEWS), help='default: semua view')
+    parser.add_argument('--max-combos', type=int, default=0, help='batas kombinasi per view (0 = semua)')
+    parser.add_argument('--repeat', type=int, default=1, help='jumlah putaran; putaran 2+ dilaporkan sebagai warm')
+    parser.add_argument('--timeout', type=float, default=900, help='batas waktu per rerun (detik)')
+    parser.add_argument('--data-cache', help='folder untuk menyimpan dan memakai ulang dataset sintetis')
+    parser.add_argument('--output', help='file hasil JSON (default: benchmark/results/dashboard-<waktu>.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='simpan hasil sebagai baseline')
+    parser.add_argument('--compare', nargs='?', const=BASELINE_PATH, help='bandingkan dengan baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--precompute', action='store_true', help='aktifkan precompute latar belakang')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--data-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child_main(args)
+        return
+
+    import pandas
+    import streamlit
+
+    results = {
+        'meta': {
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pandas.__version__,
+            'streamlit': streamlit.__version__,
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'max_combos': args.max_combos,
+            'repeat': args.repeat,
+            'precompute': args.precompute,
+        },
+        'scales': {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            print(f"Skala {scale}x...", file=sys.stderr)
+            results['scales'][str(scale)] = run_scale(scale, args, tmp)
+
+    print_results(results)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(RESULTS_DIR, f"dashboard-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nHasil disimpan di {output}")
+    if args.save_baseline:
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline disimpan di {BASELINE_PATH}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from synthetic import make_dataset
+
+import data_loader
+import queries
+
+# Query lapisan query yang hasilnya berupa tabel (di-cache sebagai Parquet)
+QUERIES = {
+    'weekday': lambda day, hour, hour_cube: queries.weekday_aggregate(day, 'Median', 'cnt'),
+    'hourly': lambda day, hour, hour_cube: queries.hourly_profile(hour_cube, 'casual', 1, [2, 3]),
+    'hourly heatmap': lambda day, hour, hour_cube: queries.hourly_heatmap(hour_cube, 'cnt'),
+    'ringkasan cuaca': lambda day, hour, hour_cube: queries.weather_summary(hour, 'cnt', [1, 2, 3]),
+    'describe cuaca': lambda day, hour, hour_cube: queries.weather_describe(hour, 'cnt', [1, 2]),
+    'periode harian': lambda day, hour, hour_cube: queries.period_rollup(day, 'Harian', ['cnt']),
+    'periode per jam': lambda day, hour, hour_cube: queries.period_rollup(hour, 'Per Jam', ['cnt']),
+    'pengguna per hari (harian)': lambda day, hour, hour_cube: queries.user_table(day, 'weekday'),
+    'pengguna per hari (per jam)': lambda day, hour, hour_cube: queries.user_table(hour, 'weekday'),
+    'pengguna mingguan': lambda day, hour, hour_cube: queries.user_periods(hour, 'Mingguan'),
+}
+
+
+# Proses anak: seperti server yang baru di-restart, memuat data lalu menghitung semua query
+# tabel dan merender grafik Dashboard Utama serta state default Tren Harian. Mencetak
+# waktu, statistik cache disk, dan hash hasilnya sebagai JSON.
+def child(day_path, hour_path):
+    import cube
+    import dashboard
+    import disk_cache
+    import lazy
+
+    lazy.module('seaborn')
+    start = time.perf_counter()
+    day_df, hour_df = data_loader.load_frames(day_path, hour_path)
+    hour_cube = cube.get_cube(hour_df)
+    load_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = {name: fn(day_df, hour_df, hour_cube) for name, fn in QUERIES.items()}
+    pngs = [png() for png in dashboard.overview_pngs(day_df, hour_cube)]
+    pngs.append(dashboard.render_cache.get_png(*_daily_default(dashboard, day_df)))
+    work_s = time.perf_counter() - start
+
+    digests = {name: hashlib.sha256(pd.util.hash_pandas_object(value.to_frame() if isinstance(value, pd.Series)
+                                                               else value).to_numpy().tobytes()).hexdigest()
+               for name, value in results.items()}
+    print(json.dumps({
+        'load_s': load_s, 'work_s': work_s, 'tables': digests,
+        'pngs': [hashlib.sha256(png).hexdigest() for png in pngs],
+        'disk': disk_cache.cache_info(),
+    }))
+
+
+# Kunci, fungsi gambar, dan fungsi agregasi state default Tren Harian
+def _daily_default(dashboard, day_df):
+    view, params, df, draw_fn, aggregate_fn = dashboard.daily_trends_figure(
+        day_df, queries.weekday_aggregate(day_df, 'Mean', 'cnt'), 'Bar Chart', 'Mean', 'cnt')
+    return dashboard.figure_key(view, params, df), draw_fn, aggregate_fn
+
+
+def run_child(day_path, hour_path, cache_dir):
+    env = dict(os.environ, DASHBOARD_PRECOMPUTE='0', DASHBOARD_SNAPSHOT='1')
+    env.pop('DASHBOARD_DISK_CACHE', None)
+    env.pop('DASHBOARD_DISK_CACHE_MB', None)
+    if cache_dir:
+        env['DASHBOARD_DISK_CACHE'] = cache_dir
+    output = subprocess.run([sys.executable, __file__, '--child', day_path, hour_path],
+                            env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+# Isi entri uji yang deterministik per nomor kunci, sehingga pembaca bisa memeriksa bahwa
+# yang terbaca bukan file setengah jadi atau milik kunci lain
+def _payload(n, size):
+    block = hashlib.sha256(str(n).encode()).digest()
+    return block * (size // len(block))
+
+
+# Proses uji akses bersamaan: membaca kunci acak, menulis jika belum ada
+def _stress_worker(seed, keys, size, rounds):
+    import random
+    import disk_cache
+    rng = random.Random(seed)
+    checked = 0
+    for _ in range(rounds):
+        n = rng.randrange(keys)
+        data = disk_cache.read('png', ('stress', n))
+        if data is None:
+            disk_cache.write('png', ('stress', n), _payload(n, size))
+        else:
+            assert data == _payload(n, size), f'entri {n} rusak'
+            checked += 1
+    return checked, disk_cache.cache_info()['png']['hit_rate']
+
+
+# Beberapa proses membaca, menulis, dan menghapus (LRU) di folder yang sama sekaligus;
+# batas ukuran dibuat kecil agar penghapusan sering terjadi
+def stress(cache_dir, workers, keys=200, size=32 * 1024, rounds=400):
+    saved = dict(os.environ)
+    os.environ.update(DASHBOARD_DISK_CACHE=cache_dir, DASHBOARD_DISK_CACHE_MB='2')
+    try:
+        with multiprocessing.get_context('spawn').Pool(workers) as pool:
+            results = pool.starmap(_stress_worker, [(seed, keys, size, rounds) for seed in range(workers)])
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+    import disk_cache
+    disk_cache.DIR, disk_cache.ENABLED, disk_cache.MAX_BYTES = cache_dir, True, 2 * 1024 ** 2
+    disk_cache.evict()
+    used = disk_cache.cache_info()['bytes']
+    assert used <= disk_cache.MAX_BYTES, used
+    leftovers = [name for _, _, names in os.walk(cache_dir) for name in names if name.endswith('.tmp')]
+    assert not leftovers, leftovers
+    return sum(checked for checked, _ in results), [rate for _, rate in results], used
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cache disk: restart server dengan dan tanpa cache')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--workers', type=int, default=4, help='jumlah proses uji akses bersamaan')
+    parser.add_argument('--child', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        checked, rates, used = stress(os.path.join(tmp, 'stress'), args.workers)
+        print(f"{args.workers} proses bersamaan: {checked} entri terbaca utuh, hit rate per proses "
+              f"{', '.join(f'{rate:.0%}' for rate in rates)}, ukuran akhir {used / 1024 ** 2:.2f} MB (batas 2 MB)")
+
+    print(f"\n{'skala':<7}{'restart':<22}{'muat (s)':>10}{'query+grafik (s)':>18}{'hit gambar':>12}{'hit tabel':>11}")
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            day_path, hour_path = make_dataset(tmp, scale)
+            cache_dir = os.path.join(tmp, 'cache')
+            # Snapshot data dibuat lebih dulu agar semua restart memuat data dengan cara yang sama
+            data_loader.load_frames(day_path, hour_path)
+            runs = [
+                ('tanpa cache disk', run_child(day_path, hour_path, None)),
+                ('cache disk kosong', run_child(day_path, hour_path, cache_dir)),
+                ('cache disk terisi', run_child(day_path, hour_path, cache_dir)),
+            ]
+            baseline = runs[0][1]
+            for name, run in runs[1:]:
+                assert run['tables'] == baseline['tables'], f'tabel dari cache disk berbeda ({name})'
+                assert run['pngs'] == baseline['pngs'], f'gambar dari cache disk berbeda ({name})'
+            warm = runs[2][1]['disk']
+            assert warm['png']['misses'] == 0 and warm['table']['misses'] == 0, warm
+            for name, run in runs:
+                disk = run['disk']
+                rates = [disk[kind]['hit_rate'] for kind in ('png', 'table')]
+                print(f"{scale:<7}{name:<22}{run['load_s']:>10.2f}{run['work_s']:>18.2f}"
+                      + ''.join(f"{'-' if rate is None else f'{rate:.0%}':>{width}}" for rate, width in zip(rates, (12, 11))))
+    print("\nHasil dari cache disk identik dengan perhitungan ulang setelah restart")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+import argparse
+import tempfile
+import timeit
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from synthetic import make_dataset
+
+import data_loader
+import figures
+import regression
+import render_cache
+import selection
+
+# Kondisi cuaca terpilih per interaksi (default widget dan pilihan sebagian)
+SELECTED = [1, 2]
+ALL_WEATHER = list(data_loader.WEATHER_LABELS)
+
+
+# Cara lama: salinan frame lalu mask boolean (filter_weather sebelum selection)
+def old_filter(df, selected_weather):
+    filtered_df = df.copy()
+    if selected_weather:
+        filtered_df = filtered_df[filtered_df['weathersit'].isin(selected_weather)]
+    return filtered_df
+
+
+# Cara lama bootstrap regresi: mask boolean dan konversi float64 kolom penuh
+def old_bootstrap_values(df, x_var, y_var, groups):
+    rows = df[df['weathersit'].isin(list(groups))] if groups else df
+    return rows[x_var].to_numpy(dtype='float64'), rows[y_var].to_numpy(dtype='float64')
+
+
+def new_bootstrap_values(df, x_var, y_var, groups):
+    rows = selection.rows(df, {'weathersit': list(groups)})
+    return selection.values(df, rows, x_var, 'float64'), selection.values(df, rows, y_var, 'float64')
+
+
+# Interaksi per tampilan: (lama, baru). Untuk scatter dan box plot ringkasan, grafik diambil
+# dari render cache atau ringkasan sketch, jadi yang tersisa per interaksi hanya filternya.
+def interactions(df):
+    return {
+        'scatter (cache hit)': (
+            lambda: old_filter(df, SELECTED),
+            lambda: selection.rows(df, {'weathersit': SELECTED}),
+        ),
+        'scatter semua cuaca': (
+            lambda: old_filter(df, ALL_WEATHER),
+            lambda: selection.rows(df, {'weathersit': ALL_WEATHER}),
+        ),
+        'box plot ringkasan': (
+            lambda: df[df['weathersit'].isin(SELECTED)],
+            lambda: selection.rows(df, {'weathersit': SELECTED}),
+        ),
+        'strip / eksak': (
+            lambda: df[df['weathersit'].isin(SELECTED)][['weather_name', 'cnt']],
+            lambda: selection.take(df, selection.rows(df, {'weathersit': SELECTED}), ['weather_name', 'cnt']),
+        ),
+        'scatter (render)': (
+            lambda: old_filter(df, SELECTED)[['temp_celsius', 'cnt', 'weathersit']],
+            lambda: selection.take(df, selection.rows(df, {'weathersit': SELECTED}),
+                                   ['temp_celsius', 'cnt', 'weathersit']),
+        ),
+        'bootstrap regresi': (
+            lambda: old_bootstrap_values(df, 'temp_celsius', 'cnt', SELECTED),
+            lambda: new_bootstrap_values(df, 'temp_celsius', 'cnt', SELECTED),
+        ),
+    }
+
+
+# Waktu terbaik (ms) dan memori puncak (tracemalloc, byte) satu interaksi
+def measure(fn, repeat):
+    fn()
+    ms = min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return ms, peak
+
+
+# Hasil cara baru sama dengan kolom hasil filter lama, dan grafiknya identik byte per byte
+def verify(df):
+    for selected in (SELECTED, [3], ALL_WEATHER, []):
+        expected = old_filter(df, selected)
+        rows = selection.rows(df, {'weathersit': selected})
+        assert selection.count(df, rows) == len(expected)
+        for columns in (['weather_name', 'cnt'], ['temp_celsius', 'cnt', 'weathersit']):
+            pd.testing.assert_frame_equal(selection.take(df, rows, columns), expected[columns])
+        for old, new in zip(old_bootstrap_values(df, 'temp_celsius', 'cnt', selected),
+                            new_bootstrap_values(df, 'temp_celsius', 'cnt', selected)):
+            np.testing.assert_array_equal(old, new)
+
+    rows = selection.rows(df, {'weathersit': SELECTED})
+    expected = old_filter(df, SELECTED)
+    order = [data_loader.WEATHER_LABELS[w] for w in SELECTED]
+    line = regression.regression_line(df, 'temp_celsius', 'cnt', SELECTED)
+    pairs = [
+        (lambda: figures.weather_scatter(expected, 'temp_celsius', 'cnt', line),
+         lambda: figures.weather_scatter(selection.take(df, rows, ['temp_celsius', 'cnt', 'weathersit']),
+                                         'temp_celsius', 'cnt', line)),
+        (lambda: figures.weather_distribution(expected, 'cnt', 'Strip Plot', order),
+         lambda: figures.weather_distribution(selection.take(df, rows, ['weather_name', 'cnt']),
+                                              'cnt', 'Strip Plot', order)),
+    ]
+    for old, new in pairs:
+        # Jitter strip plot memakai generator acak global numpy
+        np.random.seed(0)
+        old_png = render_cache.render_png(old)
+        np.random.seed(0)
+        assert render_cache.render_png(new) == old_png, 'grafik berbeda'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Memori dan waktu filter kondisi cuaca: salinan frame vs posisi baris')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    # Verifikasi (termasuk render grafik) cukup sekali pada data skala 1
+    with tempfile.TemporaryDirectory() as tmp:
+        day_path, hour_path = make_dataset(tmp, 1)
+        _, hour_df = data_loader.load_frames(day_path, hour_path)
+        verify(hour_df)
+    print("Kolom, nilai bootstrap, dan grafik identik dengan filter salinan frame\n")
+
+    print(f"{'skala':<7}{'baris':>9}  {'interaksi':<22}{'lama (ms)':>11}{'baru (ms)':>11}"
+          f"{'lama (MB)':>11}{'baru (MB)':>11}")
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            day_path, hour_path = make_dataset(tmp, scale)
+            data_loader.invalidate_cache()
+            _, hour_df = data_loader.load_frames(day_path, hour_path)
+            # Posisi baris dibangun sekali per versi data (precompute "Data Per Jam")
+            selection.get_positions(hour_df, 'weathersit')
+            for name, (old, new) in interactions(hour_df).items():
+                old_ms, old_peak = measure(old, args.repeat)
+                new_ms, new_peak = measure(new, args.repeat)
+                print(f"{scale:<7}{len(hour_df):>9}  {name:<22}{old_ms:>11.2f}{new_ms:>11.2f}"
+                      f"{old_peak / 1024 ** 2:>11.2f}{new_peak / 1024 ** 2:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic import DASHBOARD_DIR, make_dataset
+
+APP_PATH = os.path.join(DASHBOARD_DIR, 'dashboard.py')
+
+# Modul yang tidak boleh ikut terimpor saat modul dashboard dimuat
+LAZY_MODULES = ['matplotlib', 'seaborn', 'scipy']
+
+# Modul yang diimpor di awal pada mode --eager, meniru import top-level sebelumnya
+EAGER_MODULES = ['matplotlib.pyplot', 'seaborn', 'scipy.stats']
+
+
+# Laporan `python -X importtime -c "import dashboard"`: daftar (self us, kumulatif us,
+# kedalaman, nama modul) sesuai urutan output
+def import_times():
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import dashboard'],
+                         cwd=DASHBOARD_DIR, check=True, capture_output=True, text=True)
+    entries = []
+    for line in out.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return entries
+
+
+def report_imports(entries, top):
+    total = next(cumulative for _, cumulative, _, name in entries if name == 'dashboard')
+    # Import langsung oleh dashboard.py berada satu tingkat di bawahnya
+    direct = sorted((e for e in entries if e[2] == 1), key=lambda e: -e[1])
+    print(f"import dashboard: {total / 1000:.0f} ms")
+    print(f"{'modul':<28}{'kumulatif (ms)':>16}")
+    for _, cumulative, _, name in direct[:top]:
+        print(f"{name:<28}{cumulative / 1000:>16.1f}")
+
+    loaded = {name.split('.')[0] for _, _, _, name in entries}
+    eager = [name for name in LAZY_MODULES if name in loaded]
+    assert not eager, f"modul berat ikut terimpor saat startup: {eager}"
+    print(f"tidak terimpor saat startup: {', '.join(LAZY_MODULES)}")
+
+
+# Dijalankan di proses baru: satu rerun AppTest pada Dashboard Utama. Waktu KPI pertama
+# diambil dari penanda profiling 'kpi' (relatif terhadap awal rerun).
+def child_main(args):
+    sys.path.insert(0, DASHBOARD_DIR)
+    os.chdir(args.data_dir)
+    if args.eager:
+        for name in EAGER_MODULES:
+            __import__(name)
+
+    from streamlit.testing.v1 import AppTest
+    import profiling
+
+    at = AppTest.from_file(APP_PATH, default_timeout=args.timeout)
+    at.run()
+    assert not at.exception, at.exception
+    record = profiling.history(1)[0]
+    print(json.dumps({
+        'kpi_at': record['ts'] + record['marks']['kpi'] / 1000,
+        'kpi_ms': record['marks']['kpi'],
+        'rerun_ms': record['total_ms'],
+        'imports_ms': sum(stats['ms'] for name, stats in record['phases'].items() if 'import:' in name),
+    }))
+
+
+# Waktu dari proses dimulai sampai KPI pertama tampil, termasuk startup interpreter,
+# import Streamlit/AppTest, import modul dashboard, dan pemuatan data
+def time_to_kpi(data_dir, eager, timeout):
+    command = [sys.executable, os.path.abspath(__file__), '--child', '--data-dir', data_dir,
+               '--timeout', str(timeout)]
+    if eager:
+        command.append('--eager')
+    start = time.time()
+    out = subprocess.run(command, capture_output=True, text=True)
+    if out.returncode != 0:
+        sys.stderr.write(out.stderr)
+        out.check_returncode()
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    result['to_kpi_ms'] = (result['kpi_at'] - start) * 1000
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Waktu import saat startup dan waktu sampai KPI pertama')
+    parser.add_argument('--scale', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--top', type=int, default=12, help='jumlah modul yang ditampilkan')
+    parser.add_argument('--budget-ms', type=float, default=1500,
+                        help='batas waktu dari proses dimulai sampai KPI pertama (mode lazy)')
+    parser.add_argument('--timeout', type=float, default=120)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--eager', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--data-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child_main(args)
+        return
+
+    report_imports(import_times(), args.top)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_dataset(tmp, args.scale)
+        # Rerun pertama membuat snapshot, sehingga run berikutnya mengukur startup biasa
+        time_to_kpi(tmp, False, args.timeout)
+
+        print(f"\nSkala {args.scale}x, proses baru sampai KPI pertama (min dari {args.repeat} run)")
+        print(f"{'mode':<8}{'sampai KPI (ms)':>17}{'KPI dlm rerun (ms)':>20}{'rerun (ms)':>12}{'import view (ms)':>18}")
+        results = {}
+        for mode, eager in [('eager', True), ('lazy', False)]:
+            runs = [time_to_kpi(tmp, eager, args.timeout) for _ in range(args.repeat)]
+            best = min(runs, key=lambda r: r['to_kpi_ms'])
+            results[mode] = best
+            print(f"{mode:<8}{best['to_kpi_ms']:>17.0f}{best['kpi_ms']:>20.0f}{best['rerun_ms']:>12.0f}"
+                  f"{best['imports_ms']:>18.0f}")
+
+    lazy_ms = results['lazy']['to_kpi_ms']
+    if lazy_ms > args.budget_ms:
+        print(f"MELEBIHI BUDGET: {lazy_ms:.0f} ms > {args.budget_ms:.0f} ms")
+        sys.exit(1)
+    print(f"dalam budget: {lazy_ms:.0f} ms <= {args.budget_ms:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
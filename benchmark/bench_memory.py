@@ -0,0 +1,47 @@
+import argparse
+import tempfile
+
+import pandas as pd
+
+from synthetic import make_dataset
+
+import data_loader
+
+
+# Cara memuat data sebelum skema tipe data diterapkan (tipe default pandas)
+def load_default_dtypes(path):
+    df = pd.read_csv(path)
+    df['dteday'] = pd.to_datetime(df['dteday'])
+    df['weekday_name'] = df['weekday'].map(data_loader.DAY_NAMES)
+    df['temp_celsius'] = df['temp'] * 41
+    df['hum_percent'] = df['hum'] * 100
+    df['windspeed_kph'] = df['windspeed'] * 67
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Laporan memori per frame: tipe default vs skema ringkas')
+    parser.add_argument('--scale', type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        day_path, hour_path = make_dataset(tmp, args.scale)
+        before = data_loader.memory_report({
+            'day_df': load_default_dtypes(day_path),
+            'hour_df': load_default_dtypes(hour_path),
+        })
+        day_df, hour_df = data_loader.read_frames(day_path, hour_path, use_snapshot=False)
+        after = data_loader.memory_report({'day_df': day_df, 'hour_df': hour_df})
+
+    print(f"{'frame':<10}{'sebelum (MB)':>14}{'sesudah (MB)':>14}{'hemat':>8}")
+    for name in before:
+        saving = 1 - after[name] / before[name]
+        print(f"{name:<10}{before[name] / 1024 ** 2:>14.2f}{after[name] / 1024 ** 2:>14.2f}{saving:>8.0%}")
+
+    print()
+    print('Rincian hour_df (byte per kolom, sesudah):')
+    print(hour_df.memory_usage(deep=True, index=False).to_string())
+
+
+if __name__ == '__main__':
+    main()
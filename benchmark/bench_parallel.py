@@ -0,0 +1,75 @@
+import argparse
+import os
+import tempfile
+import timeit
+
+from synthetic import make_dataset
+
+import cube
+import dashboard
+import data_loader
+import lazy
+import parallel
+import render_cache
+
+
+# Mengganti mode paralel saat proses berjalan (DASHBOARD_PARALLEL_WORKERS hanya dibaca saat import)
+def use_workers(workers):
+    parallel.shutdown()
+    parallel.WORKERS = workers
+    parallel.ENABLED = workers > 0
+    if workers:
+        parallel.warm()
+
+
+# Memuat ulang data tanpa cache sehingga agregasi (indeks waktu, cube, statistik regresi)
+# dan render Dashboard Utama ikut diukur
+def fresh_frames(day_path, hour_path):
+    data_loader.invalidate_cache()
+    render_cache.clear()
+    day_df, hour_df = data_loader.load_frames(day_path, hour_path)
+    return day_df, cube.get_cube(hour_df)
+
+
+# Waktu sampai keempat grafik Dashboard Utama tersedia (urutan layout)
+def overview_ms(day_path, hour_path, repeat):
+    frames = {}
+    def setup():
+        frames['value'] = fresh_frames(day_path, hour_path)
+    def run():
+        return [png() for png in dashboard.overview_pngs(*frames['value'])]
+    return min(timeit.repeat(run, setup=setup, number=1, repeat=repeat)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Dashboard Utama: agregasi dan render serial vs paralel')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    # Import pustaka plotting tidak ikut dihitung (proses render mengimpornya saat dijalankan)
+    lazy.module('matplotlib.pyplot')
+    lazy.module('seaborn')
+    print(f"CPU tersedia: {len(os.sched_getaffinity(0))}")
+    print(f"\n{'skala':<7}{'proses':<8}{'total (ms)':>12}{'percepatan':>12}")
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            day_path, hour_path = make_dataset(tmp, scale)
+
+            use_workers(0)
+            expected = [png() for png in dashboard.overview_pngs(*fresh_frames(day_path, hour_path))]
+            serial_ms = overview_ms(day_path, hour_path, args.repeat)
+            print(f"{scale:<7}{'serial':<8}{serial_ms:>12.0f}{1:>11.2f}x")
+            for workers in args.workers:
+                use_workers(workers)
+                pngs = [png() for png in dashboard.overview_pngs(*fresh_frames(day_path, hour_path))]
+                assert pngs == expected, f'PNG paralel ({workers} proses) berbeda dengan serial'
+                parallel_ms = overview_ms(day_path, hour_path, args.repeat)
+                print(f"{scale:<7}{workers:<8}{parallel_ms:>12.0f}{serial_ms / parallel_ms:>11.2f}x")
+            use_workers(0)
+    print("\nPNG paralel identik byte per byte dengan render serial")
+
+
+if __name__ == '__main__':
+    main()
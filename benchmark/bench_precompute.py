@@ -0,0 +1,134 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from synthetic import DASHBOARD_DIR, make_dataset
+
+APP_PATH = os.path.join(DASHBOARD_DIR, 'dashboard.py')
+
+VIEWS = ['Dashboard Utama', 'Tren Harian', 'Distribusi Jam', 'Korelasi Cuaca',
+         'Tren Waktu', 'Pengguna Casual vs Terdaftar', 'Kondisi Cuaca']
+
+
+# Dijalankan di proses baru: data dimuat, precompute ditunggu sampai selesai (mode warm),
+# lalu setiap view dibuka sekali dengan state default. Per view dicatat lama rerun dan
+# jumlah gambar yang harus dirender (miss render cache).
+def child_main(args):
+    sys.path.insert(0, DASHBOARD_DIR)
+    os.chdir(args.data_dir)
+    from streamlit.testing.v1 import AppTest
+    import dashboard
+    import data_loader
+    import precompute
+    import profiling
+    import render_cache
+
+    day_df, hour_df, hour_cube = dashboard.load_data()
+    precompute_ms = 0.0
+    if precompute.ENABLED:
+        start = time.perf_counter()
+        precompute.start(
+            (data_loader.frame_version(day_df), data_loader.frame_version(hour_cube)),
+            lambda: dashboard.precompute_tasks(day_df, hour_df, hour_cube)
+        )
+        assert precompute.wait(args.timeout), 'precompute tidak selesai'
+        precompute_ms = (time.perf_counter() - start) * 1000
+        status = precompute.status()
+        assert status['failed'] == 0, status
+
+    at = AppTest.from_file(APP_PATH, default_timeout=args.timeout)
+    views = {}
+    for view in VIEWS:
+        misses = render_cache.cache_info()['misses']
+        if view == VIEWS[0]:
+            at.run()
+        else:
+            next(w for w in at.sidebar.radio if w.label == 'Pilih Analisis:').set_value(view)
+            at.run()
+        assert not at.exception, (view, at.exception)
+        record = profiling.history(1)[0]
+        views[view] = {'ms': record['total_ms'], 'renders': render_cache.cache_info()['misses'] - misses}
+    print(json.dumps({'precompute_ms': precompute_ms, 'views': views}))
+
+
+def first_visits(data_dir, warm, timeout):
+    env = dict(os.environ, DASHBOARD_PRECOMPUTE='1' if warm else '0')
+    command = [sys.executable, os.path.abspath(__file__), '--child', '--data-dir', data_dir,
+               '--timeout', str(timeout)]
+    out = subprocess.run(command, env=env, capture_output=True, text=True)
+    if out.returncode != 0:
+        sys.stderr.write(out.stderr)
+        out.check_returncode()
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+# Pembatalan: putaran yang sedang berjalan berhenti di antara task setelah cache
+# di-invalidate, dan putaran yang digantikan versi baru tidak menimpa progres putaran baru
+def verify_cancel():
+    import data_loader
+    import precompute
+
+    step = threading.Event()
+    tasks = [(f'task {i}', lambda: step.wait(0.02)) for i in range(100)]
+    precompute.start('v1', lambda: tasks)
+    time.sleep(0.1)
+    with precompute._lock:
+        thread = precompute._state['thread']
+    data_loader.invalidate_cache()
+    thread.join(1.0)
+    assert not thread.is_alive(), 'precompute tidak berhenti setelah invalidate'
+    assert not precompute.status()['active']
+
+    precompute.start('v2', lambda: tasks)
+    time.sleep(0.1)
+    precompute.start('v3', lambda: tasks[:3])
+    assert precompute.wait(5.0)
+    status = precompute.status()
+    assert (status['total'], status['done']) == (3, 3), status
+    print(f"pembatalan precompute OK ({status['cancelled']} putaran dibatalkan)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Kunjungan pertama setiap view: tanpa vs dengan precompute')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--repeat', type=int, default=2)
+    parser.add_argument('--timeout', type=float, default=300)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--data-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child_main(args)
+        return
+
+    verify_cancel()
+
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            make_dataset(tmp, scale)
+            # Proses pertama membuat snapshot data
+            first_visits(tmp, False, args.timeout)
+            runs = {mode: [first_visits(tmp, mode == 'warm', args.timeout) for _ in range(args.repeat)]
+                    for mode in ('cold', 'warm')}
+
+        precompute_ms = min(run['precompute_ms'] for run in runs['warm'])
+        print(f"\nSkala {scale}x, kunjungan pertama per view (min dari {args.repeat} proses; "
+              f"precompute {precompute_ms:.0f} ms)")
+        print(f"{'view':<30}{'cold (ms)':>11}{'render':>8}{'warm (ms)':>11}{'render':>8}{'speedup':>9}")
+        for view in VIEWS:
+            cold = min(run['views'][view]['ms'] for run in runs['cold'])
+            warm = min(run['views'][view]['ms'] for run in runs['warm'])
+            cold_renders = runs['cold'][0]['views'][view]['renders']
+            warm_renders = max(run['views'][view]['renders'] for run in runs['warm'])
+            # State default setiap view harus sudah ada di render cache setelah precompute
+            assert warm_renders == 0, f"{view}: {warm_renders} gambar dirender ulang setelah precompute"
+            print(f"{view:<30}{cold:>11.0f}{cold_renders:>8}{warm:>11.0f}{warm_renders:>8}{cold / warm:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+import argparse
+import itertools
+import tempfile
+
+import numpy as np
+
+from synthetic import best_ms, make_dataset
+
+import data_loader
+import figures
+import lazy
+import regression
+import render_cache
+
+
+# Implementasi lama Korelasi Cuaca: korelasi dari seluruh frame terfilter dan garis
+# regresi sns.regplot (interval kepercayaan bootstrap dari semua baris di setiap render)
+def legacy_scatter(filtered_df, x_var, y_var):
+    plt, sns = lazy.module('matplotlib.pyplot'), lazy.module('seaborn')
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.scatterplot(x=x_var, y=y_var, data=filtered_df, hue='weathersit', palette='viridis', alpha=0.6, ax=ax)
+    sns.regplot(x=x_var, y=y_var, data=filtered_df, scatter=False, color='red', ax=ax)
+    correlation = filtered_df[[x_var, y_var]].corr().iloc[0, 1]
+    ax.annotate(f'Korelasi: {correlation:.2f}', xy=(0.05, 0.95), xycoords='axes fraction')
+    return fig
+
+
+def legacy_stats(filtered_df, x_var, y_var):
+    correlation = filtered_df[[x_var, y_var]].corr().iloc[0, 1]
+    slope, intercept = np.polyfit(filtered_df[x_var], filtered_df[y_var], 1)
+    return correlation, slope, intercept
+
+
+# Semua kombinasi kondisi cuaca (termasuk pilihan kosong = semua kondisi)
+def weather_subsets(df):
+    groups = sorted(df['weathersit'].unique().tolist())
+    return [list(c) for k in range(len(groups) + 1) for c in itertools.combinations(groups, k)]
+
+
+# Koefisien dari statistik cukup yang digabung harus sama dengan hitungan langsung pada
+# baris terfilter, dan statistik yang disambung lewat hook append sama dengan yang dibangun ulang
+def verify(frames):
+    for name, df in frames.items():
+        table = regression.get_moments(df)
+        for x_var, y_var in itertools.product(regression.X_VARS, regression.Y_VARS):
+            for groups in weather_subsets(df):
+                rows = df[df['weathersit'].isin(groups)] if groups else df
+                correlation, slope, intercept = legacy_stats(rows, x_var, y_var)
+                coefficients = regression.fit(regression.combine(table[(x_var, y_var)], groups))
+                np.testing.assert_allclose(
+                    [coefficients['r'], coefficients['slope'], coefficients['intercept']],
+                    [correlation, slope, intercept], rtol=1e-9, atol=1e-9, err_msg=f'{name} {x_var} {y_var} {groups}')
+
+        head, tail = df.iloc[:len(df) // 3], df.iloc[len(df) // 3:]
+        appended, _ = regression.append_moments(regression.build_moments(head), df, tail)
+        for pair, group_moments in regression.build_moments(df).items():
+            for group, moments in group_moments.items():
+                for stat, value in moments.items():
+                    np.testing.assert_allclose(appended[pair][group][stat], value, rtol=1e-9, err_msg=f'{pair} {stat}')
+
+    # Interval analitik sebanding dengan interval bootstrap dari semua baris
+    day_df = frames['harian']
+    line = regression.regression_line(day_df, 'temp_celsius', 'cnt')
+    lo, hi = regression.bootstrap_band(day_df['temp_celsius'].to_numpy(dtype='float64'),
+                                       day_df['cnt'].to_numpy(dtype='float64'), line['x'], max_rows=len(day_df))
+    ratio = (line['hi'] - line['lo']) / (hi - lo)
+    assert 0.8 < np.median(ratio) < 1.25, np.median(ratio)
+    print(f"statistik cukup identik dengan corr/polyfit; lebar interval analitik / bootstrap: {np.median(ratio):.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Regresi dan korelasi dari statistik cukup vs sns.regplot')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            day_path, hour_path = make_dataset(tmp, scale)
+            data_loader.invalidate_cache()
+            day_df, hour_df = data_loader.load_frames(day_path, hour_path)
+        if scale == 1:
+            verify({'harian': day_df, 'per jam': hour_df})
+
+        x_var, y_var, groups = 'temp_celsius', 'cnt', [1, 2]
+        filtered_df = hour_df[hour_df['weathersit'].isin(groups)]
+        build_ms = best_ms(lambda: regression.build_moments(hour_df), args.repeat)
+        regression.get_moments(hour_df)
+
+        print(f"\nSkala {scale}x ({len(hour_df):,} baris per jam, statistik cukup dibangun sekali: {build_ms:.0f} ms)")
+        print(f"{'langkah':<34}{'lama (ms)':>11}{'baru (ms)':>11}{'speedup':>9}")
+        timings = [
+            ('korelasi + koefisien',
+             lambda: legacy_stats(filtered_df, x_var, y_var),
+             lambda: regression.fit(regression.combine(regression.get_moments(hour_df)[(x_var, y_var)], groups))),
+            ('garis + interval (analitik)',
+             None,
+             lambda: regression.regression_line(hour_df, x_var, y_var, groups)),
+            ('garis + interval (bootstrap)',
+             None,
+             lambda: regression.regression_line(hour_df, x_var, y_var, groups, bootstrap=True)),
+            ('render scatter (regplot vs analitik)',
+             lambda: render_cache.render_png(lambda: legacy_scatter(filtered_df, x_var, y_var)),
+             lambda: render_cache.render_png(lambda: figures.weather_scatter(
+                 filtered_df, x_var, y_var, regression.regression_line(hour_df, x_var, y_var, groups)))),
+        ]
+        for name, legacy_fn, new_fn in timings:
+            new_ms = best_ms(new_fn, args.repeat)
+            if legacy_fn is None:
+                print(f"{name:<34}{'-':>11}{new_ms:>11.2f}{'-':>9}")
+                continue
+            legacy_ms = best_ms(legacy_fn, 1 if 'render' in name else args.repeat)
+            print(f"{name:<34}{legacy_ms:>11.2f}{new_ms:>11.2f}{legacy_ms / new_ms:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
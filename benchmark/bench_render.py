@@ -0,0 +1,74 @@
+import argparse
+import io
+import tempfile
+import time
+
+import pyarrow as pa
+
+from synthetic import make_dataset
+
+import client_charts
+import data_loader
+import figures
+import regression
+import render_cache
+
+
+# Serialisasi payload ke Arrow IPC, seperti yang dikirim Streamlit ke browser
+def arrow_bytes(df):
+    sink = io.BytesIO()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+# Waktu server (detik) dan ukuran respons (byte) untuk satu interaksi
+def measure(fn, repeat):
+    best = None
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Waktu server per interaksi: matplotlib vs Vega-Lite')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'skala':>6}{'baris':>10}  {'grafik':<16}{'mode':<10}{'server (ms)':>12}{'payload (KB)':>14}")
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            day_path, hour_path = make_dataset(tmp, scale)
+            hour_df = data_loader.read_frame(hour_path, use_snapshot=False)
+
+        weather_order = list(data_loader.WEATHER_LABELS.values())
+        cases = {
+            'scatter': (
+                lambda: len(render_cache.render_png(lambda: figures.weather_scatter(
+                    hour_df, 'temp_celsius', 'cnt', regression.regression_line(hour_df, 'temp_celsius', 'cnt')))),
+                lambda: client_charts.weather_scatter(
+                    hour_df, 'temp_celsius', 'cnt', line=regression.regression_line(hour_df, 'temp_celsius', 'cnt')),
+            ),
+            'strip': (
+                lambda: len(render_cache.render_png(
+                    lambda: figures.weather_distribution(hour_df, 'cnt', 'Strip Plot', weather_order))),
+                lambda: client_charts.weather_strip(hour_df, 'cnt', weather_order),
+            ),
+        }
+        for chart, (server_fn, client_fn) in cases.items():
+            seconds, size = measure(server_fn, args.repeat)
+            print(f"{scale:>6}{len(hour_df):>10}  {chart:<16}{'server':<10}{seconds * 1000:>12.1f}{size / 1024:>14.1f}")
+
+            mode = 'browser' if len(hour_df) <= client_charts.POINT_THRESHOLD else 'density'
+            seconds, size = measure(lambda: len(arrow_bytes(client_fn()[0])), args.repeat)
+            print(f"{scale:>6}{len(hour_df):>10}  {chart:<16}{mode:<10}{seconds * 1000:>12.1f}{size / 1024:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic import make_dataset
+
+import comparison
+import cube
+import data_loader
+import serve
+import time_index
+
+# Mode pemuatan data yang dibandingkan, beserta environment worker:
+# csv      - setiap worker mem-parsing CSV sendiri (salinan penuh per proses)
+# snapshot - setiap worker memory-map snapshot Feather di disk (page cache bersama)
+# shared   - satu loader mempublikasikan data ke /dev/shm, worker hanya attach
+MODES = ['csv', 'snapshot', 'shared']
+
+
+def mode_env(mode, shared_dir):
+    env = dict(os.environ, DASHBOARD_INGEST='memory')
+    env.pop('DASHBOARD_SHARED_DIR', None)
+    if mode == 'csv':
+        env['DASHBOARD_SNAPSHOT'] = '0'
+    elif mode == 'snapshot':
+        env['DASHBOARD_SNAPSHOT'] = '1'
+    else:
+        env['DASHBOARD_SHARED_DIR'] = shared_dir
+    return env
+
+
+# Dijalankan di proses worker: memuat data seperti dashboard, membangun artefak turunan
+# yang dipakai view, dan menyentuh setiap kolom agar semua halaman data termuat
+def child_main(args):
+    start = time.perf_counter()
+    day_path = os.path.join(args.data_dir, 'day.csv')
+    hour_path = os.path.join(args.data_dir, 'hour.csv')
+    day_df, hour_df = data_loader.load_frames(day_path, hour_path)
+    cube.get_cube(hour_df)
+    comparison.static_tables(hour_df)
+    for df in (day_df, hour_df):
+        time_index.get_index(df)
+        for column in df.select_dtypes('number').columns:
+            df[column].sum()
+    print(f"ready {(time.perf_counter() - start) * 1000:.1f}", flush=True)
+    sys.stdin.readline()
+
+
+# Memeriksa bahwa artefak turunan di folder shared hanya di-attach jika penanda
+# sumbernya cocok dengan frame: cube dengan penanda lain harus dibangun ulang worker
+def verify_markers(shared_dir):
+    build_cube = cube.build_cube
+    builds = []
+    cube.build_cube = lambda df: builds.append(len(df)) or build_cube(df)
+    cube_path = os.path.join(shared_dir, 'hour.cube.arrow')
+    try:
+        data_loader.invalidate_cache()
+        _, hour_df = data_loader.load_shared(shared_dir)
+        attached = cube.get_cube(hour_df)
+        assert not builds, 'cube yang cocok harus di-attach, bukan dibangun ulang'
+
+        data_loader.write_arrow(attached, cube_path, b'publikasi-lain')
+        data_loader.invalidate_cache()
+        _, hour_df = data_loader.load_shared(shared_dir)
+        rebuilt = cube.get_cube(hour_df)
+        assert builds == [len(hour_df)], 'cube dengan penanda lain harus dibangun ulang'
+        assert rebuilt.equals(attached)
+    finally:
+        cube.build_cube = build_cube
+        data_loader.invalidate_cache()
+
+
+# Menjalankan N worker sekaligus, lalu mengukur memori masing-masing saat semuanya aktif
+def measure(mode, workers, data_dir, shared_dir):
+    env = mode_env(mode, shared_dir)
+    command = [sys.executable, os.path.abspath(__file__), '--child', '--data-dir', data_dir]
+    processes = [subprocess.Popen(command, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+                 for _ in range(workers)]
+    try:
+        ready_ms = [float(process.stdout.readline().split()[1]) for process in processes]
+        memory = [serve.process_memory(process.pid) for process in processes]
+    finally:
+        for process in processes:
+            process.stdin.close()
+            process.wait()
+    return ready_ms, memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Memori per worker: salinan per proses vs shared memory')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--modes', nargs='+', default=MODES, choices=MODES)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--data-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child_main(args)
+        return
+
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else None
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp, tempfile.TemporaryDirectory(dir=base) as shared_dir:
+            day_path, hour_path = make_dataset(tmp, scale)
+
+            # Snapshot dan file shared dibuat lebih dulu agar waktu worker tidak
+            # termasuk pembuatan snapshot oleh worker pertama
+            data_loader.read_frames(day_path, hour_path, use_snapshot=True)
+            start = time.perf_counter()
+            data_loader.publish_frames(shared_dir, day_path, hour_path, serve.SHARED_DERIVED)
+            publish_ms = (time.perf_counter() - start) * 1000
+            verify_markers(shared_dir)
+            data_loader.publish_frames(shared_dir, day_path, hour_path, serve.SHARED_DERIVED)
+            shared_mb = sum(os.path.getsize(os.path.join(shared_dir, name)) for name in os.listdir(shared_dir)) / 1024 ** 2
+
+            print(f"Skala {scale}x, {args.workers} worker (data Arrow {shared_mb:.1f} MB, "
+                  f"publikasi {publish_ms:.0f} ms)")
+            print(f"{'mode':<10}{'siap (ms)':>11}{'rss/worker':>12}{'pss/worker':>12}"
+                  f"{'privat/worker':>15}{'total pss':>11}")
+            for mode in args.modes:
+                ready_ms, memory = measure(mode, args.workers, tmp, shared_dir)
+                rss = [m['Rss'] / 1024 for m in memory]
+                pss = [m['Pss'] / 1024 for m in memory]
+                private = [(m['Private_Clean'] + m['Private_Dirty']) / 1024 for m in memory]
+                print(f"{mode:<10}{max(ready_ms):>11.0f}{sum(rss) / len(rss):>11.1f}M{sum(pss) / len(pss):>11.1f}M"
+                      f"{sum(private) / len(private):>14.1f}M{sum(pss):>10.1f}M")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+import argparse
+import tempfile
+
+import numpy as np
+
+from synthetic import best_ms, make_dataset
+
+import data_loader
+import figures
+import lazy
+import render_cache
+import sketch
+
+PROBES = np.linspace(0.01, 0.99, 99)
+
+
+# Galat rank maksimum sketch: selisih rank nilai perkiraan dengan rank yang diminta
+# (relatif terhadap n). Untuk nilai kembar, rank mana pun di antara batas bawah dan
+# atas nilai tersebut dianggap benar.
+def rank_error(sketch_state, values):
+    ordered = np.sort(values)
+    estimates = sketch.kll_quantiles(sketch_state, PROBES)
+    low = np.searchsorted(ordered, estimates, 'left') / len(ordered)
+    high = np.searchsorted(ordered, estimates, 'right') / len(ordered)
+    return float(np.max(np.maximum(low - PROBES, 0) + np.maximum(PROBES - high, 0)))
+
+
+def verify(hour_df, day_df, tolerance):
+    # Sketch besar: galat rank tetap terbatas, ukuran tetap kecil, dan gabungan dua
+    # sketch sama akuratnya dengan sketch dari data gabungan
+    rng = np.random.default_rng(1)
+    values = rng.gamma(2.0, 100.0, 2_000_000).round()
+    whole = sketch.kll_update(sketch.kll_sketch(), values)
+    left = sketch.kll_update(sketch.kll_sketch(seed=1), values[:700_000])
+    right = sketch.kll_update(sketch.kll_sketch(seed=2), values[700_000:])
+    # Penggabungan tidak mengubah sketch asal, termasuk generator acaknya
+    states = [side['rng'].bit_generator.state for side in (left, right)]
+    merged = sketch.kll_merge(left, right)
+    assert states == [side['rng'].bit_generator.state for side in (left, right)]
+    stored = sum(len(level) for level in whole['levels'])
+    for name, state in [('utuh', whole), ('gabungan', merged)]:
+        error = rank_error(state, values)
+        assert error <= tolerance, (name, error)
+        print(f"sketch {name}: {len(values):,} nilai, {stored} tersimpan, galat rank maks {error:.4f}")
+
+    # Ringkasan per kategori pada data dashboard
+    worst = 0.0
+    for df, by in [(hour_df, 'weathersit'), (day_df, 'weekday_name')]:
+        distributions = sketch.get_distributions(df, by)
+        for (category, measure), summary in distributions['groups'].items():
+            raw = df.loc[df[by] == category, measure].to_numpy(dtype='float64')
+            assert summary['n'] == len(raw) and summary['min'] == raw.min() and summary['max'] == raw.max()
+            np.testing.assert_allclose(summary['m2'], ((raw - raw.mean()) ** 2).sum(), rtol=1e-9)
+            worst = max(worst, rank_error(summary['sketch'], raw))
+        # Hook append: n, jumlah, dan histogram sama persis dengan ringkasan yang dibangun ulang
+        head, tail = df.iloc[:len(df) // 2], df.iloc[len(df) // 2:]
+        appended, _ = sketch.append_distributions(sketch.build_distributions(head, by), df, tail)
+        rebuilt = sketch.build_distributions(df, by)
+        for key, summary in rebuilt['groups'].items():
+            for stat in ['n', 'min', 'max']:
+                assert appended['groups'][key][stat] == summary[stat], (key, stat)
+            np.testing.assert_allclose(appended['groups'][key]['sum'], summary['sum'])
+            np.testing.assert_allclose(appended['groups'][key]['m2'], summary['m2'], rtol=1e-9)
+            if np.array_equal(appended['edges'][key[1]], rebuilt['edges'][key[1]]):
+                np.testing.assert_array_equal(appended['groups'][key]['hist'], summary['hist'])
+    assert worst <= tolerance, worst
+    print(f"ringkasan per kategori: galat rank maks {worst:.4f} (batas {tolerance})")
+
+    # Violin: KDE dari histogram dibandingkan dengan gaussian_kde pada data mentah
+    gaussian_kde = lazy.module('scipy.stats').gaussian_kde
+    distributions = sketch.get_distributions(hour_df, 'weathersit')
+    for category in [1, 2]:
+        summary = distributions['groups'][(category, 'cnt')]
+        stats = sketch.violin_stats(summary, distributions['edges']['cnt'])
+        raw = hour_df.loc[hour_df['weathersit'] == category, 'cnt'].to_numpy(dtype='float64')
+        exact = gaussian_kde(raw, bw_method='scott')(stats['coords'])
+        difference = np.max(np.abs(stats['vals'] - exact)) / exact.max()
+        assert difference < 0.1, (category, difference)
+        print(f"violin kondisi {category}: selisih KDE maks {difference:.3f} dari puncak")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Box/violin plot dari sketch kuantil vs data mentah')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--repeat', type=int, default=2)
+    parser.add_argument('--tolerance', type=float, default=0.02, help='batas galat rank yang diterima')
+    args = parser.parse_args()
+
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            day_path, hour_path = make_dataset(tmp, scale)
+            data_loader.invalidate_cache()
+            day_df, hour_df = data_loader.load_frames(day_path, hour_path)
+        if scale == 1:
+            verify(hour_df, day_df, args.tolerance)
+
+        build_ms = best_ms(lambda: sketch.build_distributions(hour_df, 'weathersit'), 1)
+        distributions = sketch.get_distributions(hour_df, 'weathersit')
+        groups = [1, 2, 3, 4]
+        order = [data_loader.WEATHER_LABELS[g] for g in groups if (g, 'cnt') in distributions['groups']]
+
+        print(f"\nSkala {scale}x ({len(hour_df):,} baris per jam, ringkasan dibangun sekali: {build_ms:.0f} ms)")
+        print(f"{'grafik':<14}{'mentah (ms)':>13}{'sketch (ms)':>13}{'speedup':>9}")
+        for viz_type in ['Box Plot', 'Violin Plot']:
+            exact_ms = best_ms(lambda: render_cache.render_png(
+                lambda: figures.weather_distribution(hour_df, 'cnt', viz_type, order)), args.repeat)
+            summary_ms = best_ms(lambda: render_cache.render_png(
+                lambda: figures.weather_distribution(hour_df, 'cnt', viz_type, order, sketch.plot_stats(
+                    distributions, 'cnt', groups, data_loader.WEATHER_LABELS))), args.repeat)
+            print(f"{viz_type:<14}{exact_ms:>13.0f}{summary_ms:>13.0f}{exact_ms / summary_ms:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
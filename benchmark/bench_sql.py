@@ -0,0 +1,108 @@
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from synthetic import best_ms, make_dataset
+
+import cube
+import data_loader
+import lazy
+import queries
+import sql_backend
+
+# Query lapisan query yang dibandingkan: nama -> fungsi(day_df, hour_df, hour_cube)
+QUERIES = {
+    'kpis': lambda day, hour, hour_cube: queries.kpis(day),
+    'weekday median': lambda day, hour, hour_cube: queries.weekday_aggregate(day, 'Median', 'cnt'),
+    'weekday mean': lambda day, hour, hour_cube: queries.weekday_aggregate(day, 'Mean', 'casual'),
+    'hourly': lambda day, hour, hour_cube: queries.hourly_profile(hour_cube, 'cnt', 1, [2, 3]),
+    'hourly heatmap': lambda day, hour, hour_cube: queries.hourly_heatmap(hour_cube, 'registered'),
+    'regresi cuaca': lambda day, hour, hour_cube: queries.weather_regression(hour, 'temp_celsius', 'cnt', [1, 2]),
+    'ringkasan cuaca': lambda day, hour, hour_cube: queries.weather_summary(hour, 'cnt', [1, 2, 3]),
+    'describe cuaca': lambda day, hour, hour_cube: queries.weather_describe(hour, 'casual', [1, 2, 3, 4]),
+    'anova cuaca': lambda day, hour, hour_cube: queries.weather_anova(hour, 'cnt', [1, 2]),
+    'periode bulanan': lambda day, hour, hour_cube: queries.period_rollup(hour, 'Bulanan', ['cnt', 'casual']),
+    'periode mingguan': lambda day, hour, hour_cube: queries.period_rollup(
+        hour, 'Mingguan', ['cnt'], *queries.date_bounds(day)),
+    'periode per jam': lambda day, hour, hour_cube: queries.period_rollup(
+        hour, 'Per Jam', ['registered'], pd.Timestamp('2012-06-01').date(), pd.Timestamp('2012-06-30').date()),
+    'pengguna per suhu': lambda day, hour, hour_cube: queries.user_table(hour, 'temperature'),
+    'pengguna per hari': lambda day, hour, hour_cube: queries.user_table(day, 'weekday'),
+    'pengguna mingguan': lambda day, hour, hour_cube: queries.user_periods(hour, 'Mingguan'),
+}
+
+
+# Mengganti backend saat proses berjalan (DASHBOARD_BACKEND hanya dibaca saat import)
+def use_backend(name):
+    sql_backend.BACKEND = name
+    sql_backend.ENABLED = name != 'pandas'
+
+
+# Hasil backend SQL harus sama dengan pandas (nilai; tipe data kolom boleh berbeda)
+def assert_same(result, expected, label):
+    if isinstance(expected, pd.DataFrame):
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_index_type=False,
+                                      check_column_type=False, check_exact=False, rtol=1e-9, obj=label)
+    elif isinstance(expected, pd.Series):
+        pd.testing.assert_series_equal(result, expected, check_dtype=False, check_index_type=False,
+                                       check_exact=False, rtol=1e-9, obj=label)
+    elif isinstance(expected, dict):
+        assert result.keys() == expected.keys(), label
+        for key in expected:
+            assert_same(result[key], expected[key], f'{label}[{key}]')
+    elif expected is None:
+        assert result is None, label
+    else:
+        np.testing.assert_allclose(np.asarray(result, dtype='float64'), np.asarray(expected, dtype='float64'),
+                                   rtol=1e-9, err_msg=label)
+
+
+def run_scale(scale, backends, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        day_path, hour_path = make_dataset(tmp, scale)
+        data_loader.invalidate_cache()
+        day_df, hour_df = data_loader.load_frames(day_path, hour_path)
+    hour_cube = cube.get_cube(hour_df)
+    frames = (day_df, hour_df, hour_cube)
+
+    # Pandas: artefak turunan (indeks waktu, cube, ringkasan, statistik) dibangun pada query
+    # pertama; import scipy tidak ikut dihitung
+    lazy.module('scipy.stats')
+    use_backend('pandas')
+    expected = {}
+    setup = {'pandas': best_ms(lambda: expected.update((name, fn(*frames)) for name, fn in QUERIES.items()), 1)}
+    timings = {'pandas': {name: best_ms(lambda: fn(*frames), repeat) for name, fn in QUERIES.items()}}
+
+    for backend in backends:
+        use_backend(backend)
+        setup[backend] = best_ms(lambda: [sql_backend.build_database(frame) for frame in
+                                          (day_df, hour_df, hour_cube)], 1)
+        queries.register(*frames)
+        for name, fn in QUERIES.items():
+            assert_same(fn(*frames), expected[name], f'{backend} {name}')
+        timings[backend] = {name: best_ms(lambda: fn(*frames), repeat) for name, fn in QUERIES.items()}
+    use_backend('pandas')
+
+    print(f"\nSkala {scale}x ({len(hour_df):,} baris per jam): hasil {', '.join(backends)} identik dengan pandas")
+    names = ['pandas'] + list(backends)
+    print("Persiapan (artefak pandas / pendaftaran ke engine): " + ", ".join(f"{b} {setup[b]:.0f} ms" for b in names))
+    print(f"{'query':<20}" + ''.join(f"{name + ' (ms)':>15}" for name in names))
+    for query in QUERIES:
+        print(f"{query:<20}" + ''.join(f"{timings[name][query]:>15.2f}" for name in names))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Latensi lapisan query: pandas vs SQLite vs DuckDB')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 100, 1000])
+    parser.add_argument('--backends', nargs='+', default=['sqlite', 'duckdb'], choices=sql_backend.BACKENDS[1:])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for scale in args.scales:
+        run_scale(scale, args.backends, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+
+from synthetic import DASHBOARD_DIR, make_dataset
+
+# Kode yang dijalankan di proses terpisah agar waktu dan peak RSS terukur bersih
+CHILD_CODE = '''
+import json, resource, sys, time
+sys.path.insert(0, {dashboard_dir!r})
+import pandas
+import data_loader
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+day_df, hour_df = data_loader.read_frames({day_path!r}, {hour_path!r}, use_snapshot={use_snapshot!r})
+elapsed = time.perf_counter() - start
+rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{'seconds': elapsed, 'peak_rss_mb': rss_after / 1024,
+                  'load_rss_mb': (rss_after - rss_before) / 1024, 'rows': len(hour_df)}}))
+'''
+
+
+def run_child(day_path, hour_path, use_snapshot):
+    code = CHILD_CODE.format(dashboard_dir=DASHBOARD_DIR, day_path=day_path,
+                             hour_path=hour_path, use_snapshot=use_snapshot)
+    out = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark waktu startup: CSV vs snapshot Feather')
+    parser.add_argument('--scale', type=int, default=1, help='faktor pengganda dataset sintetis')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        day_path, hour_path = make_dataset(tmp, args.scale)
+
+        # Startup pertama membuat snapshot
+        run_child(day_path, hour_path, True)
+
+        results = {}
+        for mode, use_snapshot in [('csv', False), ('snapshot', True)]:
+            runs = [run_child(day_path, hour_path, use_snapshot) for _ in range(args.repeat)]
+            results[mode] = {
+                'rows': runs[0]['rows'],
+                'seconds': min(r['seconds'] for r in runs),
+                'peak_rss_mb': min(r['peak_rss_mb'] for r in runs),
+                'load_rss_mb': min(r['load_rss_mb'] for r in runs),
+            }
+
+    print(f"Skala {args.scale}x ({results['csv']['rows']} baris per jam)")
+    print(f"{'mode':<10}{'waktu (s)':>12}{'peak RSS (MB)':>16}{'RSS load (MB)':>16}")
+    for mode, r in results.items():
+        print(f"{mode:<10}{r['seconds']:>12.3f}{r['peak_rss_mb']:>16.1f}{r['load_rss_mb']:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
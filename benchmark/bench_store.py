@@ -0,0 +1,110 @@
+import argparse
+import os
+import tempfile
+import timeit
+
+import pandas as pd
+
+from synthetic import make_dataset
+
+import data_loader
+import store
+
+
+# Membuat penyimpanan terpartisi berisi beberapa kota dari dataset sintetis yang sama
+def make_store(root, source_dir, cities):
+    day_path, hour_path = os.path.join(source_dir, 'day.csv'), os.path.join(source_dir, 'hour.csv')
+    for i in range(cities):
+        catalog = store.split(day_path, hour_path, root, f'kota{i:02d}')
+    return catalog, day_path, hour_path
+
+
+# Frame cakupan harus sama dengan frame monolitik yang difilter, dan hanya file partisi
+# yang beririsan dengan cakupan yang dibaca
+def verify(root, catalog, full_frames, city, start, end, seasons):
+    frames = store.load(city, start, end, seasons, root=root)
+    for frame, full in zip(frames, full_frames):
+        expected = store.scope_filter(start, end, seasons)(full)
+        pd.testing.assert_frame_equal(frame, expected, check_dtype=False)
+    _, signature = data_loader.frame_version(frames[0])
+    read_paths = {path for path, _, _ in signature}
+    expected_paths = {os.path.abspath(store.partition_path(root, partition, name))
+                      for partition in store.prune(catalog, city, start, end, seasons)
+                      for name in store.loaded_files()}
+    assert read_paths == expected_paths, (city, start, end, seasons)
+
+
+# Waktu terbaik memuat tanpa cache data; katalog dipindai di luar waktu yang diukur
+def load_ms(fn, repeat, root=None):
+    def reset():
+        data_loader.invalidate_cache()
+        if root is not None:
+            store.get_catalog(root)
+    return min(timeit.repeat(fn, setup=reset, number=1, repeat=repeat)) * 1000
+
+
+# Waktu muat dari snapshot per file dan dari CSV (snapshot dimatikan)
+def load_times(fn, repeat, root=None):
+    fn()
+    snapshot_ms = load_ms(fn, repeat, root)
+    data_loader.USE_SNAPSHOT = False
+    try:
+        csv_ms = load_ms(fn, repeat, root)
+    finally:
+        data_loader.USE_SNAPSHOT = True
+    return snapshot_ms, csv_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Penyimpanan terpartisi: katalog dan pemangkasan partisi')
+    parser.add_argument('--scale', type=int, default=4, help='skala data per kota (2 tahun per skala)')
+    parser.add_argument('--cities', type=int, default=12)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source_dir = os.path.join(tmp, 'source')
+        root = os.path.join(tmp, 'store')
+        make_dataset(source_dir, args.scale)
+        catalog, day_path, hour_path = make_store(root, source_dir, args.cities)
+
+        full_frames = data_loader.read_frames(day_path, hour_path, use_snapshot=False)
+        city = store.cities(catalog)[-1]
+        first, last = store.city_bounds(catalog, city)
+        scopes = [
+            ('satu bulan', (city, '2012-06-01', '2012-06-30', None)),
+            ('rentang di tengah bulan', (city, '2011-03-15', '2011-05-10', None)),
+            ('satu tahun, musim panas', (city, '2012-01-01', '2012-12-31', (2,))),
+            ('satu kota penuh', (city, None, None, None)),
+        ]
+        for _, scope in scopes:
+            verify(root, catalog, full_frames, *scope)
+        print(f"{len(scopes)} cakupan: frame identik dengan data monolitik yang difilter, "
+              f"hanya file partisi yang lolos katalog yang dibaca")
+
+        partitions = catalog['partitions']
+        total_bytes = store.partition_bytes(partitions)
+        store.clear_catalogs()
+        os.remove(os.path.join(root, store.CATALOG_NAME))
+        scan_ms = min(timeit.repeat(lambda: store.refresh_catalog(root), number=1, repeat=1)) * 1000
+        refresh_ms = min(timeit.repeat(lambda: store.refresh_catalog(root), number=1, repeat=args.repeat)) * 1000
+        print(f"\n{args.cities} kota x {first.year}-{last.year}: {len(partitions)} partisi, "
+              f"{total_bytes / 1024 ** 2:.1f} MB")
+        print(f"Katalog: pindai penuh {scan_ms:.0f} ms, pindai ulang tanpa perubahan {refresh_ms:.0f} ms")
+
+        # Data monolitik satu kota (day.csv/hour.csv penuh) sebagai pembanding
+        monolithic_bytes = os.path.getsize(day_path) + os.path.getsize(hour_path)
+        rows = [('file tunggal (tanpa store)', '-', monolithic_bytes,
+                 load_times(lambda: data_loader.load_frames(day_path, hour_path), args.repeat))]
+        for name, scope in scopes:
+            selected = store.prune(catalog, *scope)
+            rows.append((name, len(selected), store.partition_bytes(selected),
+                         load_times(lambda: store.load(*scope, root=root), args.repeat, root)))
+
+        print(f"\n{'cakupan':<28}{'partisi':>9}{'dibaca (MB)':>13}{'snapshot (ms)':>15}{'CSV (ms)':>10}")
+        for name, count, size, (snapshot_ms, csv_ms) in rows:
+            print(f"{name:<28}{count:>9}{size / 1024 ** 2:>13.2f}{snapshot_ms:>15.1f}{csv_ms:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
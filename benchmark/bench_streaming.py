@@ -0,0 +1,51 @@
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+
+from synthetic import DASHBOARD_DIR, make_dataset
+
+import data_loader
+
+# Kode yang dijalankan di proses terpisah agar peak RSS tiap mode terukur bersih. Kedua mode
+# membangun ringkasan yang sama (lihat streaming): per chunk, atau sekaligus dari frame penuh.
+CHILD_CODE = '''
+import json, resource, sys, time
+sys.path.insert(0, {dashboard_dir!r})
+import data_loader
+import streaming
+start = time.perf_counter()
+if {mode!r} == 'stream':
+    result = streaming.stream_summaries({hour_path!r}, chunksize={chunksize!r})
+else:
+    result = streaming.summarize(data_loader.read_frame({hour_path!r}, use_snapshot=False))
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{'seconds': elapsed, 'peak_rss_mb': peak / 1024, 'rows': int(result['cube']['n'].sum())}}))
+'''
+
+
+def run_child(mode, hour_path, chunksize):
+    code = CHILD_CODE.format(dashboard_dir=DASHBOARD_DIR, mode=mode, hour_path=hour_path, chunksize=chunksize)
+    out = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ingest streaming data per jam')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--chunksize', type=int, default=data_loader.STREAM_CHUNKSIZE)
+    args = parser.parse_args()
+
+    print(f"{'skala':<8}{'baris':>10}{'mode':>9}{'waktu (s)':>12}{'peak RSS (MB)':>16}")
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            _, hour_path = make_dataset(tmp, scale)
+            for mode in ['memory', 'stream']:
+                r = run_child(mode, hour_path, args.chunksize)
+                print(f"{scale:<8}{r['rows']:>10}{mode:>9}{r['seconds']:>12.3f}{r['peak_rss_mb']:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
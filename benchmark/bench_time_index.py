@@ -0,0 +1,130 @@
+import argparse
+import tempfile
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from synthetic import make_dataset
+
+import comparison
+import data_loader
+import time_index
+
+
+# Implementasi lama dari interactive_time_series: filter .dt.date per baris, lalu
+# kolom period ditambahkan dan dijumlahkan dengan groupby
+def legacy_rollup(df, start_date, end_date, freq, y_vars):
+    filtered_df = df[(df['dteday'].dt.date >= start_date) &
+                     (df['dteday'].dt.date <= end_date)]
+    if freq == "Per Jam":
+        filtered_df['period'] = filtered_df['dteday'] + pd.to_timedelta(filtered_df['hr'], unit='h')
+    elif freq == "Harian":
+        filtered_df['period'] = filtered_df['dteday']
+    elif freq == "Mingguan":
+        filtered_df['period'] = filtered_df['dteday'].dt.to_period('W').dt.start_time
+    else:
+        filtered_df['period'] = filtered_df['dteday'].dt.to_period('M').dt.start_time
+    return filtered_df.groupby('period')[y_vars].sum().reset_index()
+
+
+# Rentang tanggal uji: seluruh data, kuartal terakhir, satu minggu di tengah bulan,
+# rentang satu hari, rentang di luar data, dan beberapa rentang acak
+def test_ranges(df, count, seed=0):
+    first, last = df['dteday'].min().date(), df['dteday'].max().date()
+    middle = first + (last - first) / 2
+    ranges = [
+        (first, last),
+        (last - pd.Timedelta(days=91), last),
+        (middle, middle + pd.Timedelta(days=6)),
+        (middle, middle),
+        (last + pd.Timedelta(days=1), last + pd.Timedelta(days=30)),
+    ]
+    rng = np.random.default_rng(seed)
+    days = (last - first).days
+    for _ in range(count):
+        a, b = sorted(rng.integers(0, days + 1, size=2))
+        ranges.append((first + pd.Timedelta(days=int(a)), first + pd.Timedelta(days=int(b))))
+    return ranges
+
+
+def frequencies(df):
+    return ['Harian', 'Mingguan', 'Bulanan'] + (['Per Jam'] if 'hr' in df.columns else [])
+
+
+# Hasil indeks waktu harus identik dengan filter+groupby lama, termasuk periode
+# di tepi rentang yang hanya terpotong sebagian
+def verify(frames, ranges_per_frame):
+    for frame_name, df in frames.items():
+        index = time_index.get_index(df)
+        for start, end in test_ranges(df, ranges_per_frame):
+            for freq in frequencies(df):
+                expected = legacy_rollup(df, start, end, freq, time_index.MEASURES)
+                result = time_index.rollup(index, start, end, freq, time_index.MEASURES)
+                pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+                assert str(result['period'].dtype) == str(expected['period'].dtype), (frame_name, freq)
+
+        # Baris yang tidak terurut menurut waktu tetap menghasilkan jumlah yang sama
+        shuffled = df.sample(frac=1, random_state=0)
+        start, end = test_ranges(df, 1)[-1]
+        for freq in frequencies(df):
+            pd.testing.assert_frame_equal(
+                time_index.rollup(time_index.build_time_index(shuffled), start, end, freq, ['cnt']),
+                legacy_rollup(df, start, end, freq, ['cnt']), check_dtype=False)
+
+        # Indeks yang disambung lewat hook append sama dengan indeks yang dibangun ulang
+        for split in [1, len(df) // 3, len(df) - 1]:
+            head, tail = df.iloc[:split], df.iloc[split:]
+            appended, _ = time_index.append_time_index(time_index.build_time_index(head), df, tail)
+            rebuilt = time_index.build_time_index(df)
+            np.testing.assert_array_equal(appended['stamps'], rebuilt['stamps'])
+            for measure in time_index.MEASURES:
+                np.testing.assert_array_equal(appended['prefix'][measure], rebuilt['prefix'][measure])
+            for label, (starts, keys) in rebuilt['resolutions'].items():
+                np.testing.assert_array_equal(appended['resolutions'][label][0], starts)
+                np.testing.assert_array_equal(appended['resolutions'][label][1], keys)
+
+        # Tabel tren pengguna sama dengan jumlah casual/registered per periode versi lama
+        start, end = test_ranges(df, 1)[-1]
+        expected = legacy_rollup(df, start, end, 'Bulanan', comparison.USER_COLUMNS)
+        table = comparison.period_table(df, 'Bulanan', start, end)
+        pd.testing.assert_frame_equal(table[['period'] + comparison.USER_COLUMNS], expected, check_dtype=False)
+    print("indeks waktu identik dengan filter + groupby lama")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmark indeks waktu untuk filter rentang tanggal')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--ranges', type=int, default=20, help='jumlah rentang acak per frame saat verifikasi')
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            day_path, hour_path = make_dataset(tmp, scale)
+            data_loader.invalidate_cache()
+            day_df, hour_df = data_loader.load_frames(day_path, hour_path)
+        frames = {'harian': day_df, 'per jam': hour_df}
+        if scale == 1:
+            verify(frames, args.ranges)
+
+        print(f"Skala {scale}x")
+        print(f"{'data':<10}{'rentang':<10}{'frekuensi':<11}{'lama (ms)':>11}{'indeks (ms)':>13}{'speedup':>9}")
+        for frame_name, df in frames.items():
+            build_ms = min(timeit.repeat(lambda: time_index.build_time_index(df), number=1, repeat=3)) * 1000
+            index = time_index.get_index(df)
+            first, last = time_index.date_bounds(index)
+            ranges = {'penuh': (first, last), 'kuartal': (last - pd.Timedelta(days=91), last)}
+            for range_name, (start, end) in ranges.items():
+                for freq in frequencies(df):
+                    legacy_ms = min(timeit.repeat(lambda: legacy_rollup(df, start, end, freq, ['cnt']),
+                                                  number=1, repeat=args.repeat)) * 1000
+                    index_ms = min(timeit.repeat(lambda: time_index.rollup(index, start, end, freq, ['cnt']),
+                                                 number=1, repeat=args.repeat)) * 1000
+                    print(f"{frame_name:<10}{range_name:<10}{freq:<11}{legacy_ms:>11.2f}{index_ms:>13.3f}"
+                          f"{legacy_ms / index_ms:>8.1f}x")
+            print(f"{frame_name:<10}membangun indeks sekali: {build_ms:.1f} ms untuk {len(df):,} baris")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+import argparse
+import tempfile
+import timeit
+
+import pandas as pd
+
+from synthetic import make_dataset
+
+import comparison
+import data_loader
+
+
+# Implementasi lama dari interactive_user_comparison, disalin apa adanya
+# (dua groupby per cabang, list comprehension, dan pd.cut yang mengubah frame)
+def legacy_weekday(df):
+    daily_casual = df.groupby('weekday_name', observed=True)['casual'].sum()
+    daily_registered = df.groupby('weekday_name', observed=True)['registered'].sum()
+    day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+    comp_df = pd.DataFrame({
+        'weekday': day_order,
+        'casual': [daily_casual.get(day, 0) for day in day_order],
+        'registered': [daily_registered.get(day, 0) for day in day_order]
+    })
+    comp_df['total'] = comp_df['casual'] + comp_df['registered']
+    comp_df['casual_pct'] = (comp_df['casual'] / comp_df['total'] * 100).round(1)
+    comp_df['registered_pct'] = (comp_df['registered'] / comp_df['total'] * 100).round(1)
+    return comp_df
+
+
+def legacy_period(df, freq):
+    filtered_df = df.copy()
+    if freq == "Harian":
+        filtered_df['period'] = filtered_df['dteday']
+    elif freq == "Mingguan":
+        filtered_df['period'] = filtered_df['dteday'].dt.to_period('W').dt.start_time
+    else:
+        filtered_df['period'] = filtered_df['dteday'].dt.to_period('M').dt.start_time
+    agg_casual = filtered_df.groupby('period')['casual'].sum()
+    agg_registered = filtered_df.groupby('period')['registered'].sum()
+    trend_df = pd.DataFrame({
+        'period': agg_casual.index,
+        'casual': agg_casual.values,
+        'registered': agg_registered.values
+    })
+    trend_df['total'] = trend_df['casual'] + trend_df['registered']
+    trend_df['casual_pct'] = (trend_df['casual'] / trend_df['total'] * 100).round(1)
+    trend_df['registered_pct'] = (trend_df['registered'] / trend_df['total'] * 100).round(1)
+    return trend_df
+
+
+def legacy_weather(df):
+    weather_options = {1: 'Cerah', 2: 'Berawan', 3: 'Hujan Ringan/Salju Ringan', 4: 'Hujan Lebat/Salju Lebat'}
+    weather_casual = df.groupby('weathersit')['casual'].sum()
+    weather_registered = df.groupby('weathersit')['registered'].sum()
+    weather_df = pd.DataFrame({
+        'weathersit': list(weather_options.keys()),
+        'weather_name': list(weather_options.values()),
+        'casual': [weather_casual.get(w, 0) for w in weather_options.keys()],
+        'registered': [weather_registered.get(w, 0) for w in weather_options.keys()]
+    })
+    weather_df['total'] = weather_df['casual'] + weather_df['registered']
+    weather_df['casual_pct'] = (weather_df['casual'] / weather_df['total'] * 100).round(1)
+    weather_df['registered_pct'] = (weather_df['registered'] / weather_df['total'] * 100).round(1)
+    return weather_df
+
+
+def legacy_temperature(df):
+    df['temp_bins'] = pd.cut(df['temp_celsius'],
+                             bins=[0, 10, 15, 20, 25, 30, 35, 45],
+                             labels=['0-10°C', '10-15°C', '15-20°C', '20-25°C', '25-30°C', '30-35°C', '35-45°C'])
+    temp_casual = df.groupby('temp_bins')['casual'].sum()
+    temp_registered = df.groupby('temp_bins')['registered'].sum()
+    temp_df = pd.DataFrame({
+        'temp_range': temp_casual.index,
+        'casual': temp_casual.values,
+        'registered': temp_registered.values
+    })
+    temp_df['total'] = temp_df['casual'] + temp_df['registered']
+    temp_df['casual_pct'] = (temp_df['casual'] / temp_df['total'] * 100).round(1)
+    temp_df['registered_pct'] = (temp_df['registered'] / temp_df['total'] * 100).round(1)
+    return temp_df
+
+
+# Pasangan (nama, implementasi lama, implementasi baru)
+CASES = [
+    ('hari', legacy_weekday, lambda df: comparison.weekday_table(comparison.user_counts(df))),
+    ('cuaca', legacy_weather, lambda df: comparison.weather_table(comparison.user_counts(df))),
+    ('suhu', legacy_temperature, lambda df: comparison.temperature_table(comparison.user_counts(df))),
+    ('periode harian', lambda df: legacy_period(df, 'Harian'), lambda df: comparison.period_table(df, 'Harian')),
+    ('periode mingguan', lambda df: legacy_period(df, 'Mingguan'), lambda df: comparison.period_table(df, 'Mingguan')),
+    ('periode bulanan', lambda df: legacy_period(df, 'Bulanan'), lambda df: comparison.period_table(df, 'Bulanan')),
+]
+
+
+# Ketiga tabel statis sekaligus: tiga cabang lama vs satu lintasan user_counts
+ALL_STATIC = (
+    'hari+cuaca+suhu',
+    lambda df: (legacy_weekday(df), legacy_weather(df), legacy_temperature(df)),
+    lambda df: [table(counts) for counts in [comparison.user_counts(df)]
+                for table in (comparison.weekday_table, comparison.weather_table, comparison.temperature_table)],
+)
+
+
+def verify(frames):
+    for frame_name, df in frames.items():
+        columns = list(df.columns)
+        for name, legacy, engine in CASES:
+            result = engine(df)
+            assert list(df.columns) == columns, 'engine tidak boleh mengubah frame sumber'
+            expected = legacy(df.copy())
+            pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_categorical=False)
+            assert (result.dtypes.astype(str) == expected.dtypes.astype(str)).all(), (frame_name, name)
+    print("tabel engine identik dengan implementasi lama")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmark tabel perbandingan pengguna')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            day_path, hour_path = make_dataset(tmp, scale)
+            day_df, hour_df = data_loader.read_frames(day_path, hour_path, use_snapshot=False)
+        frames = {'harian': day_df, 'per jam': hour_df}
+        if scale == 1:
+            verify(frames)
+
+        print(f"Skala {scale}x")
+        print(f"{'data':<10}{'tabel':<18}{'lama (ms)':>12}{'engine (ms)':>13}{'speedup':>9}")
+        for frame_name, df in frames.items():
+            for name, legacy, engine in CASES + [ALL_STATIC]:
+                # Versi lama menambah kolom ke frame, jadi dijalankan pada salinan
+                legacy_df = df.copy()
+                legacy_ms = min(timeit.repeat(lambda: legacy(legacy_df), number=1, repeat=args.repeat)) * 1000
+                engine_ms = min(timeit.repeat(lambda: engine(df), number=1, repeat=args.repeat)) * 1000
+                print(f"{frame_name:<10}{name:<18}{legacy_ms:>12.2f}{engine_ms:>13.2f}{legacy_ms / engine_ms:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
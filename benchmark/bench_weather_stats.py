@@ -0,0 +1,86 @@
+import argparse
+import itertools
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from synthetic import best_ms, make_dataset
+
+import cube
+import data_loader
+import lazy
+import weather_stats
+
+
+# Implementasi lama Kondisi Cuaca: describe per kelompok dari frame terfilter dan ANOVA
+# dari satu array per kondisi cuaca hasil boolean masking
+def legacy_describe(df, y_var, groups):
+    filtered_df = df[df['weathersit'].isin(groups)]
+    return filtered_df.groupby('weather_name', observed=True)[y_var].describe().reset_index()
+
+
+def legacy_anova(df, y_var, groups):
+    filtered_df = df[df['weathersit'].isin(groups)]
+    weather_groups = []
+    for weather in groups:
+        group_data = filtered_df[filtered_df['weathersit'] == weather][y_var].values
+        if len(group_data) > 0:
+            weather_groups.append(group_data)
+    if len(weather_groups) < 2:
+        return None
+    return lazy.module('scipy.stats').f_oneway(*weather_groups)
+
+
+def weather_subsets(df):
+    groups = sorted(df['weathersit'].unique().tolist())
+    return [list(c) for k in range(1, len(groups) + 1) for c in itertools.combinations(groups, k)]
+
+
+# Tabel describe dan ANOVA dari ringkasan harus sama dengan pandas/scipy untuk setiap
+# subset kondisi cuaca dan setiap variabel
+def verify(df):
+    for y_var in cube.CUBE_MEASURES:
+        for groups in weather_subsets(df):
+            pd.testing.assert_frame_equal(weather_stats.describe_table(df, y_var, groups),
+                                          legacy_describe(df, y_var, groups), check_exact=False, rtol=1e-9)
+            expected = legacy_anova(df, y_var, groups)
+            result = weather_stats.anova(df, y_var, groups)
+            if expected is None:
+                assert result is None, (y_var, groups)
+            else:
+                np.testing.assert_allclose(result, tuple(expected), rtol=1e-9, err_msg=f'{y_var} {groups}')
+    print("describe dan ANOVA dari ringkasan identik dengan pandas/scipy")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Describe dan ANOVA Kondisi Cuaca dari momen per kelompok')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            day_path, hour_path = make_dataset(tmp, scale)
+            data_loader.invalidate_cache()
+            _, hour_df = data_loader.load_frames(day_path, hour_path)
+        if scale == 1:
+            verify(hour_df)
+
+        summary_ms = best_ms(lambda: weather_stats.build_summary(hour_df), 3)
+        weather_stats.get_summary(hour_df)
+
+        print(f"\nSkala {scale}x ({len(hour_df):,} baris per jam, ringkasan dibangun sekali: {summary_ms:.0f} ms)")
+        print(f"{'langkah':<12}{'kondisi':<14}{'lama (ms)':>11}{'baru (ms)':>11}{'speedup':>9}")
+        for groups in [[1, 2], [1, 2, 3, 4]]:
+            for name, legacy_fn, new_fn in [
+                ('describe', legacy_describe, weather_stats.describe_table),
+                ('anova', legacy_anova, weather_stats.anova),
+            ]:
+                legacy_ms = best_ms(lambda: legacy_fn(hour_df, 'cnt', groups), args.repeat)
+                new_ms = best_ms(lambda: new_fn(hour_df, 'cnt', groups), args.repeat)
+                print(f"{name:<12}{str(groups):<14}{legacy_ms:>11.2f}{new_ms:>11.2f}{legacy_ms / new_ms:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import os
+import sys
+import timeit
+
+import pandas as pd
+
+# Folder data asli relatif terhadap folder benchmark
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(REPO_DIR, 'data')
+DASHBOARD_DIR = os.path.join(REPO_DIR, 'dashboard')
+
+# Supaya modul dashboard (data_loader, dst.) bisa diimpor dari skrip benchmark
+if DASHBOARD_DIR not in sys.path:
+    sys.path.insert(0, DASHBOARD_DIR)
+
+
+# Menggandakan sebuah file CSV sebanyak `scale` kali dengan skema yang sama.
+# Setiap salinan digeser 2 tahun ke depan agar tanggal tidak bertabrakan.
+def scale_csv(src_path, dst_path, scale):
+    df = pd.read_csv(src_path)
+    dates = pd.to_datetime(df['dteday'])
+    span = pd.DateOffset(years=2)
+
+    with open(dst_path, 'w', newline='') as f:
+        for i in range(scale):
+            part = df.copy()
+            part['instant'] = df['instant'] + i * len(df)
+            part['dteday'] = (dates + span * i).dt.strftime('%Y-%m-%d')
+            part['yr'] = df['yr'] + 2 * i
+            part.to_csv(f, index=False, header=(i == 0))
+
+
+# Membuat dataset sintetis (day.csv dan hour.csv) di folder tujuan
+def make_dataset(out_dir, scale):
+    os.makedirs(out_dir, exist_ok=True)
+    day_path = os.path.join(out_dir, 'day.csv')
+    hour_path = os.path.join(out_dir, 'hour.csv')
+    if scale == 1:
+        src_day = os.path.join(DATA_DIR, 'day.csv')
+        src_hour = os.path.join(DATA_DIR, 'hour.csv')
+        for src, dst in [(src_day, day_path), (src_hour, hour_path)]:
+            with open(src, 'rb') as fin, open(dst, 'wb') as fout:
+                fout.write(fin.read())
+    else:
+        scale_csv(os.path.join(DATA_DIR, 'day.csv'), day_path, scale)
+        scale_csv(os.path.join(DATA_DIR, 'hour.csv'), hour_path, scale)
+    return day_path, hour_path
+
+
+
+# Memisahkan file CSV menjadi bagian awal (header + `keep` baris) dan sisa baris
+def split_csv(path, keep):
+    with open(path, 'rb') as f:
+        lines = f.readlines()
+    return b''.join(lines[:keep + 1]), lines[keep + 1:]
+
+
+# Waktu terbaik (ms) dari beberapa kali pemanggilan fn
+def best_ms(fn, repeat):
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Membuat dataset sintetis berskala')
+    parser.add_argument('out_dir')
+    parser.add_argument('--scale', type=int, default=10)
+    args = parser.parse_args()
+    print(make_dataset(args.out_dir, args.scale))
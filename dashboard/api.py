@@ -0,0 +1,412 @@
+import argparse
+import asyncio
+import datetime
+import hashlib
+import json
+import math
+import os
+import signal
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+import queries
+import regression
+import streaming
+
+# API HTTP/JSON untuk lapisan query (lihat queries.py), terpisah dari UI Streamlit:
+#
+#   python dashboard/api.py --port 8502
+#   curl 'http://127.0.0.1:8502/api/weekday?agg=Median&y=casual'
+#
+# GET /api menampilkan daftar query beserta parameter dan nilai default-nya. Respons
+# di-cache per (query, parameter, versi data) dan diberi ETag, sehingga klien yang
+# mengirim If-None-Match dengan ETag yang sama menerima 304 tanpa body. Data dimuat
+# lewat data_loader seperti dashboard (snapshot, append inkremental, shared memory,
+# dan mode streaming berlaku sama) dan diperiksa ulang setiap --watch-interval detik.
+
+# Jumlah maksimum respons yang disimpan (LRU)
+MAX_ENTRIES = int(os.environ.get('DASHBOARD_API_CACHE_SIZE', '1024'))
+HEAD_LIMIT = 64 * 1024
+
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 500: 'Internal Server Error', 501: 'Not Implemented',
+           503: 'Service Unavailable'}
+
+# Data yang sedang disajikan: (frame harian, frame per jam, cube per jam) dan versinya
+_state = {'frames': None, 'version': None}
+
+# Cache respons: (query, parameter, versi data) -> (ETag, body JSON). Request untuk kunci
+# yang sedang dihitung menunggu hasil yang sama (_pending) agar tidak dihitung dua kali.
+_cache = OrderedDict()
+_pending = {}
+_stats = {'requests': 0, 'hits': 0, 'misses': 0, 'not_modified': 0, 'evictions': 0}
+
+
+# Parser parameter query string. Setiap parser menerima string dan mengembalikan nilai
+# yang bisa di-hash (bagian dari kunci cache), atau melempar ValueError.
+def choice(options):
+    def parse(value):
+        if value not in options:
+            raise ValueError(f"harus salah satu dari {', '.join(map(str, options))}")
+        return value
+    return parse
+
+
+def choices(options):
+    def parse(value):
+        values = tuple(v for v in value.split(',') if v)
+        for v in values:
+            choice(options)(v)
+        if not values:
+            raise ValueError("minimal satu nilai")
+        return values
+    return parse
+
+
+def int_set(options):
+    def parse(value):
+        values = tuple(sorted({int(v) for v in value.split(',') if v}))
+        for v in values:
+            choice(options)(v)
+        return values
+    return parse
+
+
+def integer(options):
+    def parse(value):
+        return choice(options)(int(value))
+    return parse
+
+
+def date(value):
+    return datetime.date.fromisoformat(value)
+
+
+def flag(value):
+    return value.lower() in ('1', 'true', 'yes')
+
+
+MEASURE = choice(queries.MEASURES)
+DATASET = choice(['day', 'hour'])
+WEATHER = int_set(list(data_loader.WEATHER_LABELS))
+SEASON = int_set(list(data_loader.SEASON_LABELS))
+WORKINGDAY = integer([0, 1])
+
+
+# Frame sumber untuk parameter dataset
+def dataset_frame(frames, dataset):
+    return frames[0] if dataset == 'day' else frames[1]
+
+
+def weather_stats_result(frames, p):
+    anova = queries.weather_anova(frames[1], p['y'], p['weather'])
+    return {
+        'describe': queries.weather_describe(frames[1], p['y'], p['weather']),
+        'anova': None if anova is None else {'f': anova[0], 'p': anova[1]},
+    }
+
+
+def weather_correlation_result(frames, p):
+    return {
+        'line': queries.weather_regression(frames[1], p['x'], p['y'], p['weather'], p['bootstrap']),
+        'summary': queries.weather_summary(frames[1], p['y'], p['weather'] or tuple(data_loader.WEATHER_LABELS)),
+    }
+
+
+def users_result(frames, p):
+    df = dataset_frame(frames, p['dataset'])
+    if p['by'] == 'period':
+        return queries.user_periods(df, p['freq'], p['start'], p['end'])
+    return queries.user_table(df, p['by'])
+
+
+# Apakah parameter meminta resolusi per jam pada data per jam
+def hourly_resolution(p):
+    return p['dataset'] == 'hour' and p['freq'] == 'Per Jam'
+
+
+# Daftar query: nama -> (fungsi(frames, parameter), {parameter: (parser, default)},
+# fungsi(parameter) yang bernilai True jika query butuh baris data per jam mentah, yang
+# tidak ada pada mode streaming; None jika tidak pernah). Default None berarti parameter opsional.
+ENDPOINTS = {
+    'kpis': (lambda frames, p: queries.kpis(frames[0]), {}, None),
+    'weekday': (
+        lambda frames, p: queries.weekday_aggregate(frames[0], p['agg'], p['y']),
+        {'agg': (choice(list(queries.AGG_METHODS)), 'Mean'), 'y': (MEASURE, 'cnt')},
+        None,
+    ),
+    'hourly': (
+        lambda frames, p: queries.hourly_profile(frames[2], p['y'], p['workingday'], p['season']),
+        {'y': (MEASURE, 'cnt'), 'workingday': (WORKINGDAY, None), 'season': (SEASON, ())},
+        None,
+    ),
+    'hourly_heatmap': (
+        lambda frames, p: queries.hourly_heatmap(frames[2], p['y'], p['workingday'], p['season']),
+        {'y': (MEASURE, 'cnt'), 'workingday': (WORKINGDAY, None), 'season': (SEASON, ())},
+        None,
+    ),
+    'weather_correlation': (
+        weather_correlation_result,
+        {'x': (choice(regression.X_VARS), 'temp_celsius'), 'y': (MEASURE, 'cnt'),
+         'weather': (WEATHER, ()), 'bootstrap': (flag, False)},
+        lambda p: p['bootstrap'],
+    ),
+    'weather_stats': (
+        weather_stats_result,
+        {'y': (MEASURE, 'cnt'), 'weather': (WEATHER, (1, 2))},
+        None,
+    ),
+    'periods': (
+        lambda frames, p: queries.period_rollup(dataset_frame(frames, p['dataset']), p['freq'], p['y'], p['start'], p['end']),
+        {'dataset': (DATASET, 'day'), 'freq': (choice(queries.FREQUENCIES), 'Harian'),
+         'y': (choices(queries.MEASURES), ('cnt',)), 'start': (date, None), 'end': (date, None)},
+        hourly_resolution,
+    ),
+    'users': (
+        users_result,
+        {'dataset': (DATASET, 'day'), 'by': (choice(queries.USER_TABLES + ['period']), 'weekday'),
+         'freq': (choice(queries.FREQUENCIES), 'Bulanan'), 'start': (date, None), 'end': (date, None)},
+        lambda p: p['by'] == 'period' and hourly_resolution(p),
+    ),
+}
+
+
+# Parameter request dari query string: nilai terakhir untuk setiap nama, default untuk
+# yang tidak diberikan. Parameter yang tidak dikenal ditolak agar tidak diam-diam diabaikan.
+def parse_params(spec, query):
+    raw = parse_qs(query, keep_blank_values=True)
+    unknown = set(raw) - set(spec)
+    if unknown:
+        raise ValueError(f"parameter tidak dikenal: {', '.join(sorted(unknown))}")
+    params = {}
+    for name, (parse, default) in spec.items():
+        if name not in raw:
+            params[name] = default
+            continue
+        try:
+            params[name] = parse(raw[name][-1])
+        except ValueError as e:
+            raise ValueError(f"parameter {name}: {e}")
+    if params.get('dataset') == 'day' and params.get('freq') == 'Per Jam':
+        raise ValueError("frekuensi Per Jam hanya untuk dataset hour")
+    return params
+
+
+# Mengubah hasil query menjadi nilai JSON: DataFrame/Series menjadi daftar record
+# (indeks bernama ikut menjadi kolom), tanggal menjadi string ISO, NaN menjadi null
+def to_plain(value):
+    if isinstance(value, pd.Series):
+        value = value.to_frame()
+    if isinstance(value, pd.DataFrame):
+        if value.index.name is not None or not isinstance(value.index, pd.RangeIndex):
+            value = value.reset_index()
+        return [{str(k): to_plain(v) for k, v in record.items()} for record in value.to_dict('records')]
+    if isinstance(value, dict):
+        return {str(k): to_plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [to_plain(v) for v in value]
+    if isinstance(value, (pd.Timestamp, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+# Body JSON dan ETag untuk satu query (dijalankan di thread executor)
+def build_response(name, params, frames):
+    result = ENDPOINTS[name][0](frames, params)
+    body = json.dumps({'query': name, 'params': to_plain(params), 'result': to_plain(result)},
+                      ensure_ascii=False, separators=(',', ':'), allow_nan=False).encode()
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"', body
+
+
+# Mengambil respons dari cache, atau menghitungnya di executor jika belum ada
+async def cached_response(key, name, params, frames):
+    entry = _cache.get(key)
+    if entry is not None:
+        _cache.move_to_end(key)
+        _stats['hits'] += 1
+        return entry, True
+
+    pending = _pending.get(key)
+    if pending is not None:
+        _stats['hits'] += 1
+        return await asyncio.shield(pending), True
+
+    _stats['misses'] += 1
+    future = asyncio.get_running_loop().run_in_executor(None, build_response, name, params, frames)
+    _pending[key] = future
+    try:
+        entry = await future
+    finally:
+        _pending.pop(key, None)
+    _cache[key] = entry
+    while len(_cache) > MAX_ENTRIES:
+        _cache.popitem(last=False)
+        _stats['evictions'] += 1
+    return entry, False
+
+
+# Apakah ETag cocok dengan header If-None-Match (daftar ETag atau *)
+def etag_matches(etag, if_none_match):
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or etag in tags or f'W/{etag}' in tags
+
+
+def json_response(status, payload, headers=None):
+    body = json.dumps(payload, ensure_ascii=False).encode()
+    return status, dict(headers or {}, **{'Content-Type': 'application/json; charset=utf-8'}), body
+
+
+# Daftar query beserta parameter dan default-nya, ditambah statistik cache
+def index_payload():
+    return {
+        'queries': {
+            name: {param: to_plain(default) for param, (_, default) in spec.items()}
+            for name, (_, spec, _) in ENDPOINTS.items()
+        },
+        'cache': dict(_stats, entries=len(_cache)),
+    }
+
+
+# Menangani satu request: (status, header, body)
+async def respond(method, target, headers):
+    _stats['requests'] += 1
+    url = urlsplit(target)
+    path = url.path.rstrip('/')
+    if method not in ('GET', 'HEAD'):
+        return json_response(405, {'error': 'hanya GET dan HEAD'}, {'Allow': 'GET, HEAD'})
+    if path == '/api':
+        return json_response(200, index_payload(), {'Cache-Control': 'no-store'})
+    name = path[len('/api/'):] if path.startswith('/api/') else None
+    if name not in ENDPOINTS:
+        return json_response(404, {'error': f'query tidak ditemukan: {url.path}'})
+
+    _, spec, needs_hour_rows = ENDPOINTS[name]
+    try:
+        params = parse_params(spec, url.query)
+    except ValueError as e:
+        return json_response(400, {'error': str(e)})
+
+    frames, version = _state['frames'], _state['version']
+    if frames is None:
+        return json_response(503, {'error': 'data belum dimuat'})
+    if needs_hour_rows is not None and needs_hour_rows(params) and streaming.is_streamed(frames[1]):
+        return json_response(501, {'error': 'query ini membutuhkan data per jam lengkap dan tidak '
+                                            'tersedia pada mode streaming (DASHBOARD_INGEST=stream)'})
+
+    key = (name, tuple(params.items()), version)
+    try:
+        (etag, body), hit = await cached_response(key, name, params, frames)
+    except Exception as e:
+        return json_response(500, {'error': f'{type(e).__name__}: {e}'})
+
+    response_headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'X-Cache': 'hit' if hit else 'miss'}
+    if etag_matches(etag, headers.get('if-none-match')):
+        _stats['not_modified'] += 1
+        return 304, response_headers, b''
+    response_headers['Content-Type'] = 'application/json; charset=utf-8'
+    return 200, response_headers, body
+
+
+# Baris request dan header (nama header huruf kecil)
+def parse_head(head):
+    lines = head.decode('latin-1').split('\r\n')
+    method, target, version = lines[0].split(' ', 2)
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+    return method, target, version, headers
+
+
+# Koneksi keep-alive: request dilayani berurutan sampai klien menutup koneksi atau
+# meminta Connection: close
+async def handle_client(reader, writer):
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+                method, target, version, headers = parse_head(head)
+                length = int(headers.get('content-length', 0))
+                if length:
+                    await reader.readexactly(length)
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+                break
+
+            status, response_headers, body = await respond(method, target, headers)
+            connection = headers.get('connection', '').lower()
+            keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+            response_headers['Content-Length'] = str(len(body))
+            response_headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+            lines = [f'HTTP/1.1 {status} {REASONS[status]}'] + [f'{k}: {v}' for k, v in response_headers.items()]
+            writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+            if method != 'HEAD':
+                writer.write(body)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+# Memuat data lewat lapisan query; versi data menjadi bagian dari kunci cache respons
+def load_state():
+    frames = queries.load()
+    version = (data_loader.frame_version(frames[0]), data_loader.frame_version(frames[2]))
+    return frames, version
+
+
+# Memeriksa perubahan file data secara berkala. Baris baru ditambahkan lewat append
+# inkremental data_loader; respons untuk versi lama tersingkir dari cache LRU.
+async def watch_data(interval):
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            frames, version = await loop.run_in_executor(None, load_state)
+            if version != _state['version']:
+                _state['frames'], _state['version'] = frames, version
+                print("Data berubah, versi baru disajikan", flush=True)
+        except Exception as e:
+            print(f"Gagal memuat ulang data: {e}", flush=True)
+
+
+async def serve(args):
+    _state['frames'], _state['version'] = load_state()
+    server = await asyncio.start_server(handle_client, args.host, args.port, limit=HEAD_LIMIT)
+    print(f"API di http://{args.host}:{args.port}/api", flush=True)
+
+    watcher = asyncio.create_task(watch_data(args.watch_interval))
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    async with server:
+        await stop.wait()
+    watcher.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='API HTTP/JSON untuk query agregasi dashboard')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('--watch-interval', type=float, default=5.0,
+                        help='interval (detik) pengecekan perubahan file data')
+    args = parser.parse_args()
+    asyncio.run(serve(args))
+
+
+if __name__ == '__main__':
+    main()
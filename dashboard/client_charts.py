@@ -0,0 +1,161 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from figures import VAR_LABELS, X_LABELS
+
+# Grafik di modul ini dirender di browser dengan Vega-Lite: server hanya mengirim
+# data kolumnar yang ringkas beserta spesifikasi grafik, tanpa menggambar piksel.
+# Di atas ambang jumlah titik, data dibinning 2D di server dan dikirim sebagai heatmap.
+POINT_THRESHOLD = int(os.environ.get('DASHBOARD_POINT_THRESHOLD', '50000'))
+DENSITY_BINS = 60
+
+WEATHER_FIELD = 'Kondisi Cuaca'
+
+
+# Kolom yang dikirim ke browser: float32 untuk nilai dan kategorikal untuk label
+def _point_payload(df, columns):
+    payload = pd.DataFrame({column: df[column].to_numpy(dtype='float32') for column in columns})
+    payload[WEATHER_FIELD] = df['weather_name'].cat.remove_unused_categories().array
+    return payload
+
+
+# Garis regresi linear dihitung di server. Jika hasil regression.regression_line
+# diberikan, garis beserta batas interval kepercayaannya diambil dari sana; jika tidak,
+# garis (dua titik ujung) dihitung dari data lengkap.
+def _regression_values(x, y, x_var, y_var, line=None):
+    if line is not None:
+        return [
+            {x_var: float(px), y_var: float(py), 'lo': float(lo), 'hi': float(hi)}
+            for px, py, lo, hi in zip(line['x'], line['y'], line['lo'], line['hi'])
+        ]
+    if len(x) < 2 or np.ptp(x) == 0:
+        return []
+    slope, intercept = np.polyfit(x, y, 1)
+    x_min, x_max = float(x.min()), float(x.max())
+    return [
+        {x_var: x_min, y_var: float(intercept + slope * x_min)},
+        {x_var: x_max, y_var: float(intercept + slope * x_max)},
+    ]
+
+
+# Histogram 2D sebagai tabel sel (batas x, batas y, jumlah) untuk heatmap kepadatan
+def density_table(x, y, bins=DENSITY_BINS):
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+    x_idx, y_idx = np.nonzero(counts)
+    return pd.DataFrame({
+        'x_start': x_edges[x_idx].astype('float32'),
+        'x_end': x_edges[x_idx + 1].astype('float32'),
+        'y_start': y_edges[y_idx].astype('float32'),
+        'y_end': y_edges[y_idx + 1].astype('float32'),
+        'count': counts[x_idx, y_idx].astype('int32'),
+    })
+
+
+# Scatter plot faktor cuaca vs peminjaman; (data, spec) untuk st.vega_lite_chart
+def weather_scatter(filtered_df, x_var, y_var, threshold=None, line=None):
+    if threshold is None:
+        threshold = POINT_THRESHOLD
+    x_title = X_LABELS.get(x_var, x_var)
+    y_title = VAR_LABELS.get(y_var, y_var)
+    x = filtered_df[x_var].to_numpy(dtype='float64')
+    y = filtered_df[y_var].to_numpy(dtype='float64')
+
+    regression_values = _regression_values(x, y, x_var, y_var, line)
+    regression_layer = {
+        'data': {'values': regression_values},
+        'mark': {'type': 'line', 'color': 'red'},
+        'encoding': {
+            'x': {'field': x_var, 'type': 'quantitative'},
+            'y': {'field': y_var, 'type': 'quantitative'},
+        },
+    }
+
+    if len(filtered_df) <= threshold:
+        data = _point_payload(filtered_df, [x_var, y_var])
+        point_layer = {
+            'mark': {'type': 'circle', 'opacity': 0.6},
+            'encoding': {
+                'x': {'field': x_var, 'type': 'quantitative', 'title': x_title},
+                'y': {'field': y_var, 'type': 'quantitative', 'title': y_title},
+                'color': {'field': WEATHER_FIELD, 'type': 'nominal', 'scale': {'scheme': 'viridis'}},
+            },
+        }
+    else:
+        data = density_table(x, y)
+        point_layer = {
+            'mark': 'rect',
+            'encoding': {
+                'x': {'field': 'x_start', 'type': 'quantitative', 'title': x_title},
+                'x2': {'field': 'x_end'},
+                'y': {'field': 'y_start', 'type': 'quantitative', 'title': y_title},
+                'y2': {'field': 'y_end'},
+                'color': {'field': 'count', 'type': 'quantitative', 'title': 'Jumlah Data',
+                          'scale': {'scheme': 'viridis', 'type': 'log'}},
+            },
+        }
+
+    spec = {
+        'title': f'Korelasi antara {x_title} dan {y_title}',
+        'height': 400,
+        'layer': [point_layer, regression_layer],
+    }
+    if line is not None:
+        spec['layer'].insert(1, {
+            'data': {'values': regression_values},
+            'mark': {'type': 'area', 'color': 'red', 'opacity': 0.15},
+            'encoding': {
+                'x': {'field': x_var, 'type': 'quantitative'},
+                'y': {'field': 'lo', 'type': 'quantitative'},
+                'y2': {'field': 'hi'},
+            },
+        })
+    return data, spec
+
+
+# Strip plot per kondisi cuaca; di atas ambang menjadi heatmap kepadatan per kategori
+def weather_strip(filtered_df, y_var, weather_order, threshold=None):
+    if threshold is None:
+        threshold = POINT_THRESHOLD
+    y_title = VAR_LABELS.get(y_var, y_var)
+    x_encoding = {'field': WEATHER_FIELD, 'type': 'nominal', 'sort': weather_order, 'title': 'Kondisi Cuaca'}
+
+    if len(filtered_df) <= threshold:
+        data = _point_payload(filtered_df, [y_var])
+        chart = {
+            'transform': [{'calculate': 'random()', 'as': 'jitter'}],
+            'mark': {'type': 'circle', 'opacity': 0.5, 'size': 12},
+            'encoding': {
+                'x': x_encoding,
+                'xOffset': {'field': 'jitter', 'type': 'quantitative'},
+                'y': {'field': y_var, 'type': 'quantitative', 'title': y_title},
+                'color': {'field': WEATHER_FIELD, 'type': 'nominal', 'legend': None},
+            },
+        }
+    else:
+        y = filtered_df[y_var].to_numpy(dtype='float64')
+        edges = np.histogram_bin_edges(y, bins=DENSITY_BINS)
+        codes = np.clip(np.searchsorted(edges, y, side='right') - 1, 0, len(edges) - 2)
+        counts = pd.DataFrame({WEATHER_FIELD: filtered_df['weather_name'].cat.remove_unused_categories().array, 'bin': codes})
+        counts = counts.groupby([WEATHER_FIELD, 'bin'], observed=True).size().rename('count').reset_index()
+        data = pd.DataFrame({
+            WEATHER_FIELD: counts[WEATHER_FIELD],
+            'y_start': edges[counts['bin']].astype('float32'),
+            'y_end': edges[counts['bin'] + 1].astype('float32'),
+            'count': counts['count'].astype('int32'),
+        })
+        chart = {
+            'mark': 'rect',
+            'encoding': {
+                'x': x_encoding,
+                'y': {'field': 'y_start', 'type': 'quantitative', 'title': y_title},
+                'y2': {'field': 'y_end'},
+                'color': {'field': 'count', 'type': 'quantitative', 'title': 'Jumlah Data',
+                          'scale': {'scheme': 'viridis', 'type': 'log'}},
+            },
+        }
+
+    spec = dict(chart, title=f'Distribusi {y_title} Berdasarkan Kondisi Cuaca', height=400)
+    return data, spec
+
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+import cube
+import data_loader
+import time_index
+
+# Kolom pengguna yang dibandingkan
+USER_COLUMNS = ['casual', 'registered']
+
+# Ukuran tiap dimensi pada kubus pengguna; slot terakhir (hari/cuaca) atau slot 0 (suhu)
+# menampung nilai di luar label yang dikenal agar baris tersebut tetap terhitung di
+# dimensi lainnya
+WEEKDAY_SLOTS = len(data_loader.DAY_ORDER) + 1
+WEATHER_SLOTS = len(data_loader.WEATHER_LABELS) + 1
+TEMP_SLOTS = len(cube.TEMP_LABELS) + 1
+
+
+# Tabel perbandingan: casual, registered, total, dan persentase per kunci
+def user_table(key_name, keys, casual, registered):
+    casual = np.asarray(casual, dtype='int64')
+    registered = np.asarray(registered, dtype='int64')
+    total = casual + registered
+    with np.errstate(divide='ignore', invalid='ignore'):
+        casual_pct = np.round(casual / total * 100, 1)
+        registered_pct = np.round(registered / total * 100, 1)
+    return pd.DataFrame({
+        key_name: keys,
+        'casual': casual,
+        'registered': registered,
+        'total': total,
+        'casual_pct': casual_pct,
+        'registered_pct': registered_pct,
+    })
+
+
+# Jumlah baris, casual, dan registered per (hari, kondisi cuaca, rentang suhu) dalam satu
+# lintasan data: setiap baris dipetakan ke satu sel lalu dijumlahkan dengan np.bincount
+def user_counts(df):
+    weekday = df['weekday_name'].cat.codes.to_numpy()
+    weekday = np.where(weekday >= 0, weekday, WEEKDAY_SLOTS - 1)
+    weather = df['weathersit'].to_numpy().astype('int64') - 1
+    weather = np.where((weather >= 0) & (weather < WEATHER_SLOTS - 1), weather, WEATHER_SLOTS - 1)
+    temp = cube.temp_bin_codes(df['temp_celsius']).to_numpy().astype('int64') + 1
+
+    cells = (weekday * WEATHER_SLOTS + weather) * TEMP_SLOTS + temp
+    shape = (WEEKDAY_SLOTS, WEATHER_SLOTS, TEMP_SLOTS)
+    size = WEEKDAY_SLOTS * WEATHER_SLOTS * TEMP_SLOTS
+    counts = {'rows': np.bincount(cells, minlength=size).reshape(shape)}
+    for column in USER_COLUMNS:
+        counts[column] = np.bincount(cells, weights=df[column].to_numpy(), minlength=size).reshape(shape)
+    return counts
+
+
+# Perbandingan per hari, berurutan Senin..Minggu; hari tanpa data bernilai 0
+def weekday_table(counts):
+    sums = {column: counts[column].sum(axis=(1, 2))[:-1] for column in USER_COLUMNS}
+    return user_table('weekday', data_loader.DAY_ORDER, sums['casual'], sums['registered'])
+
+
+# Perbandingan per kondisi cuaca; keempat kondisi selalu ditampilkan
+def weather_table(counts):
+    sums = {column: counts[column].sum(axis=(0, 2))[:-1] for column in USER_COLUMNS}
+    table = user_table('weathersit', list(data_loader.WEATHER_LABELS), sums['casual'], sums['registered'])
+    table.insert(1, 'weather_name', list(data_loader.WEATHER_LABELS.values()))
+    return table
+
+
+# Perbandingan per rentang suhu; hanya rentang yang berisi data, suhu di luar rentang diabaikan
+def temperature_table(counts):
+    present = counts['rows'].sum(axis=(0, 1))[1:] > 0
+    sums = {column: counts[column].sum(axis=(0, 1))[1:][present] for column in USER_COLUMNS}
+    labels = pd.Categorical(np.array(cube.TEMP_LABELS)[present], categories=cube.TEMP_LABELS, ordered=True)
+    return user_table('temp_range', labels, sums['casual'], sums['registered'])
+
+
+# Perbandingan per periode waktu untuk rentang tanggal [start, end] (default seluruh data),
+# dijumlahkan dari prefix sum pada indeks waktu tanpa memfilter frame
+def period_table(df, freq, start=None, end=None):
+    index = time_index.get_index(df)
+    if start is None or end is None:
+        start, end = time_index.date_bounds(index)
+    sums = time_index.rollup(index, start, end, freq, USER_COLUMNS)
+    return user_table('period', sums['period'].to_numpy(), sums['casual'], sums['registered'])
+
+
+# Tabel per hari, cuaca, dan suhu tidak bergantung pada widget, sehingga dihitung
+# bersama dari satu kubus pengguna, sekali per versi data
+def static_tables(df):
+    def build(frame):
+        counts = user_counts(frame)
+        return {
+            'weekday': weekday_table(counts),
+            'weather': weather_table(counts),
+            'temperature': temperature_table(counts),
+        }
+    return data_loader.derived(df, 'user_comparison', build)
@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+
+import data_loader
+
+# Dimensi dan ukuran cube agregasi data per jam. Tanggal bukan dimensi: setiap
+# (tanggal, jam) hanya berisi satu baris, jadi cube bertanggal sebesar datanya sendiri.
+# Tampilan yang memfilter tanggal memakai indeks waktu (lihat time_index).
+CUBE_DIMENSIONS = ['hr', 'weekday', 'workingday', 'season', 'weathersit', 'temp_bin']
+CUBE_MEASURES = ['cnt', 'casual', 'registered']
+
+# Rentang suhu yang dipakai di seluruh dashboard
+TEMP_BINS = [0, 10, 15, 20, 25, 30, 35, 45]
+TEMP_LABELS = ['0-10°C', '10-15°C', '15-20°C', '20-25°C', '25-30°C', '30-35°C', '35-45°C']
+
+
+# Kode rentang suhu (0..6) untuk setiap baris; -1 untuk suhu di luar rentang
+def temp_bin_codes(temp_celsius):
+    codes = pd.cut(temp_celsius, bins=TEMP_BINS, labels=False)
+    return codes.fillna(-1).astype('int8').rename('temp_bin')
+
+
+# Kode kelompok untuk kombinasi kunci (dimensi bernilai bilangan bulat kecil):
+# (kode kelompok per baris, indeks kelompok terurut)
+def _group_codes(keys, names):
+    codes = np.zeros(len(keys[0]), dtype='int64')
+    levels = []
+    for key in keys:
+        key_codes, uniques = pd.factorize(np.asarray(key), sort=True)
+        codes = codes * len(uniques) + key_codes
+        levels.append(uniques)
+    groups, inverse = np.unique(codes, return_inverse=True)
+    level_codes = []
+    for uniques in reversed(levels):
+        level_codes.insert(0, groups % len(uniques))
+        groups = groups // len(uniques)
+    if len(levels) == 1:
+        return inverse, pd.Index(levels[0][level_codes[0]], name=names[0])
+    return inverse, pd.MultiIndex(levels=levels, codes=level_codes, names=names)
+
+
+# Menggabungkan sel per kombinasi kunci `by` (nama kolom atau Series): jumlah baris (n),
+# jumlah ({ukuran}_sum), dan M2 ({ukuran}_m2, jumlah kuadrat simpangan dari rata-rata
+# sel) setiap ukuran. M2 digabung dengan rumus varians paralel,
+# M2 = sum(M2_i) + sum(n_i * (mean_i - mean)^2), sehingga tidak kehilangan presisi
+# seperti selisih jumlah kuadrat dan kuadrat jumlah.
+def combine_cells(cells, by, measures=CUBE_MEASURES):
+    keys = by if isinstance(by, list) else [by]
+    columns = ['n'] + [f'{measure}_{part}' for measure in measures for part in ('sum', 'm2')]
+    if not len(cells):
+        return cells[columns].groupby(keys, sort=True).sum()
+    names = [key if isinstance(key, str) else key.name for key in keys]
+    inverse, index = _group_codes([cells[key] if isinstance(key, str) else key for key in keys], names)
+
+    # Sel diurutkan per kelompok lalu dijumlahkan per segmen (bilangan bulat tetap eksak)
+    order = np.argsort(inverse, kind='stable')
+    starts = np.searchsorted(inverse[order], np.arange(len(index)))
+    n = cells['n'].to_numpy()[order]
+    counts = np.add.reduceat(n, starts)
+    totals = {'n': counts}
+    for measure in measures:
+        sums = cells[f'{measure}_sum'].to_numpy()[order]
+        totals[f'{measure}_sum'] = np.add.reduceat(sums, starts)
+        deviation = sums / n - np.repeat(totals[f'{measure}_sum'] / counts, np.diff(np.r_[starts, len(n)]))
+        m2 = cells[f'{measure}_m2'].to_numpy()[order] + n * deviation * deviation
+        totals[f'{measure}_m2'] = np.add.reduceat(m2, starts)
+    return pd.DataFrame(totals, index=index)
+
+
+# Membangun cube: banyak baris, jumlah, dan M2 per sel dimensi. Setiap baris adalah sel
+# berisi satu baris (M2 nol) yang digabung per kombinasi dimensi.
+def build_cube(hour_df):
+    keys = [hour_df[dim] for dim in CUBE_DIMENSIONS[:-1]]
+    keys.append(temp_bin_codes(hour_df['temp_celsius']))
+
+    values = {'n': np.ones(len(hour_df), dtype='int64')}
+    for measure in CUBE_MEASURES:
+        values[f'{measure}_sum'] = hour_df[measure].to_numpy(dtype='int64')
+        values[f'{measure}_m2'] = np.zeros(len(hour_df))
+    values = pd.DataFrame(values, index=hour_df.index)
+
+    return combine_cells(values, keys).reset_index()
+
+
+# Cube untuk sebuah frame per jam, di-cache bersama data yang sedang dimuat
+def get_cube(hour_df):
+    return data_loader.derived(hour_df, 'cube', build_cube, append_cube)
+
+
+# Menggabungkan cube parsial; sel dengan kombinasi dimensi yang sama digabung sehingga
+# hasilnya sama dengan cube dari data gabungan
+def merge_cubes(cubes):
+    merged = pd.concat(cubes, ignore_index=True)
+    return combine_cells(merged, CUBE_DIMENSIONS).reset_index()
+
+
+# Hook append cube: baris baru dibangun menjadi cube parsial lalu digabung
+def append_cube(hour_cube, hour_df, new_rows):
+    partial = build_cube(new_rows)
+    return merge_cubes([hour_cube, partial]), partial
+
+
+# Mask filter di atas sel cube; filters berupa {dimensi: daftar nilai yang diizinkan}
+def cube_mask(cube, filters=None):
+    mask = np.ones(len(cube), dtype=bool)
+    for dim, allowed in (filters or {}).items():
+        if allowed is None:
+            continue
+        mask &= np.isin(cube[dim].to_numpy(), list(allowed))
+    return mask
+
+
+# Roll-up cube ke dimensi `by` dan menghitung mean/sum/std/count untuk satu ukuran
+def rollup(cube, by, measure, filters=None):
+    mask = cube_mask(cube, filters)
+    columns = ['n', f'{measure}_sum', f'{measure}_m2']
+    by_columns = by if isinstance(by, list) else [by]
+    cells = pd.DataFrame({column: cube[column].to_numpy()[mask] for column in by_columns + columns})
+    totals = combine_cells(cells, by, [measure])
+
+    n = totals['n']
+    total = totals[f'{measure}_sum']
+    # Varians sampel (ddof=1) dari M2 gabungan
+    result = pd.DataFrame({
+        'mean': total / n,
+        'sum': total,
+        'std': np.sqrt(totals[f'{measure}_m2'] / (n - 1)).where(n > 1),
+        'count': n,
+    })
+    return result
@@ -1,46 +1,155 @@
 import streamlit as st
+import json
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
 from datetime import datetime
 
+import client_charts
+import comparison
+import cube
+import data_loader
+import disk_cache
+import figures
+import parallel
+import precompute
+import profiling
+import queries
+import regression
+import render_cache
+import selection
+import sketch
+import sql_backend
+import store
+import streaming
+import time_index
+import weather_stats
+
 # Fungsi untuk memuat data dari file
-def load_data():
+# Data di-cache di tingkat proses (lihat data_loader) sehingga semua sesi dan
+# rerun memakai hasil parsing yang sama sampai file CSV berubah.
+# Pada mode streaming, data per jam tidak dimuat ke memori: hour_df berisi ringkasan
+# yang dilipat per chunk (cube, statistik per kondisi cuaca, kubus pengguna, dan jumlah
+# per tanggal), bukan frame (lihat streaming).
+# Pada penyimpanan terpartisi, scope berisi (kota, tanggal awal, tanggal akhir, musim).
+def load_data(scope=None):
     try:
-        # Mencoba berbagai lokasi file
-        try:
-            day_df = pd.read_csv('day.csv')
-            hour_df = pd.read_csv('hour.csv')
-        except:
-            day_df = pd.read_csv('./data/day.csv')
-            hour_df = pd.read_csv('./data/hour.csv')
-            
-        # Preprocessing data
-        # Konversi tanggal
-        day_df['dteday'] = pd.to_datetime(day_df['dteday'])
-        hour_df['dteday'] = pd.to_datetime(hour_df['dteday'])
-        
-        # Menambahkan nama hari
-        day_names = {0: 'Sunday', 1: 'Monday', 2: 'Tuesday', 3: 'Wednesday', 4: 'Thursday', 5: 'Friday', 6: 'Saturday'}
-        day_df['weekday_name'] = day_df['weekday'].map(day_names)
-        
-        # Konversi suhu, kelembaban, dan kecepatan angin ke nilai sebenarnya
-        day_df['temp_celsius'] = day_df['temp'] * 41
-        day_df['hum_percent'] = day_df['hum'] * 100
-        day_df['windspeed_kph'] = day_df['windspeed'] * 67
-        
-        hour_df['temp_celsius'] = hour_df['temp'] * 41
-        hour_df['hum_percent'] = hour_df['hum'] * 100
-        hour_df['windspeed_kph'] = hour_df['windspeed'] * 67
-        
-        return day_df, hour_df
+        return queries.load(*(scope or ()))
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
-        st.error("Pastikan file 'day.csv' dan 'hour.csv' tersedia di path yang benar.")
-        return None, None
+        if store.STORE_DIR:
+            st.error("Pastikan DASHBOARD_STORE berisi partisi <kota>/<tahun>/<bulan>/day.csv dan hour.csv.")
+        else:
+            st.error("Pastikan file 'day.csv' dan 'hour.csv' tersedia di path yang benar.")
+        return None, None, None
+
+# Fungsi untuk memilih cakupan data pada penyimpanan terpartisi (DASHBOARD_STORE): kota,
+# periode, dan musim. Partisi di luar cakupan dipangkas lewat katalog dan tidak dibaca.
+# None jika data berasal dari satu pasang file day.csv/hour.csv.
+def select_scope():
+    if not store.STORE_DIR:
+        return None
+    try:
+        catalog = store.get_catalog()
+    except Exception as e:
+        st.sidebar.error(f"Katalog data tidak bisa dibaca: {str(e)}")
+        return None
+    city_options = store.cities(catalog)
+    if not city_options:
+        return None
+    
+    city = st.sidebar.selectbox("Pilih Kota:", city_options)
+    min_date, max_date = store.city_bounds(catalog, city)
+    period = st.sidebar.date_input(
+        "Periode Data:",
+        value=(min_date, max_date),
+        min_value=min_date,
+        max_value=max_date,
+        key=f"store_period_{city}"
+    )
+    all_seasons = list(data_loader.SEASON_LABELS)
+    seasons = st.sidebar.multiselect(
+        "Musim Data:",
+        all_seasons,
+        default=all_seasons,
+        format_func=data_loader.SEASON_LABELS.get
+    )
+    # Semua musim (atau tidak ada pilihan) berarti tanpa filter musim
+    if set(seasons) == set(all_seasons):
+        seasons = []
+    return (city, *selected_dates(period), seasons)
+
+# Fungsi untuk menyusun kunci render cache.
+# Kunci cache terdiri dari nama view, parameter widget, dan versi data, sehingga
+# kombinasi parameter yang sama tidak perlu digambar ulang oleh matplotlib.
+# Untuk grafik dengan rentang tanggal, versi data hanya berubah jika ada baris baru
+# di dalam rentang tersebut.
+def figure_key(view, params, df, date_range=None):
+    if date_range is not None:
+        version = data_loader.range_version(df, *date_range)
+    else:
+        version = data_loader.frame_version(df)
+    return (view, params, version) if version is not None else None
+
+# Fungsi untuk menampilkan figure melalui render cache. Argumennya sama dengan
+# spesifikasi grafik yang dikembalikan fungsi *_figure di bawah:
+# (view, parameter, frame sumber, fungsi gambar modul figures, fungsi agregasi yang
+# mengembalikan argumen fungsi gambar, rentang tanggal). Agregasi hanya dijalankan jika
+# grafik belum ada di cache, dan selesai sebelum giliran render diambil.
+def show_figure(view, params, df, draw_fn, aggregate_fn, date_range=None):
+    png = render_cache.get_png(figure_key(view, params, df, date_range), draw_fn, aggregate_fn)
+    with profiling.phase('send'):
+        st.image(png, width='stretch')
+
+# Mode render grafik: matplotlib di server atau Vega-Lite di browser
+RENDER_SERVER = "Server (Matplotlib)"
+RENDER_BROWSER = "Browser (Vega-Lite)"
+
+# Fungsi untuk menampilkan grafik yang dirender di browser
+def show_client_chart(chart):
+    data, spec = chart
+    with profiling.phase('send'):
+        st.vega_lite_chart(data, spec, width='stretch')
+
+# Fungsi untuk memeriksa ketersediaan baris data per jam mentah (tidak ada pada mode
+# streaming, yang hanya menyimpan ringkasan)
+def has_hour_rows(hour_df):
+    return hour_df is not None and not streaming.is_streamed(hour_df)
+
+# Fungsi untuk menampilkan pemberitahuan jika grafik membutuhkan baris data per jam mentah
+def require_hour_rows(hour_df):
+    if not has_hour_rows(hour_df):
+        st.info("Grafik ini membutuhkan data per jam lengkap dan tidak tersedia pada mode "
+                "streaming (DASHBOARD_INGEST=stream).")
+        return False
+    return True
+
+# Fungsi untuk pilihan mode eksak grafik distribusi. Secara default box/violin plot
+# digambar dari ringkasan sketch per kategori; data mentah hanya bisa dipaksa jika
+# jumlah barisnya tidak melebihi sketch.EXACT_LIMIT.
+def exact_distribution_toggle(rows, key):
+    allowed = rows <= sketch.EXACT_LIMIT
+    exact = st.checkbox(
+        "Mode Eksak (Data Mentah)",
+        key=key,
+        disabled=not allowed,
+        help=f"Tanpa opsi ini, grafik digambar dari ringkasan kuantil (sketch) dan histogram per "
+             f"kategori dengan galat terbatas. Mode eksak hanya tersedia untuk data hingga "
+             f"{sketch.EXACT_LIMIT:,} baris."
+    )
+    return exact and allowed
+
+# Spesifikasi grafik tren harian; box plot digambar dari ringkasan sketch per hari
+# kecuali mode eksak dipilih
+def daily_trends_figure(day_df, daily_data, plot_type, agg_method, y_var, exact=False):
+    def aggregate():
+        summary = None
+        if plot_type == "Box Plot" and not exact:
+            summary = sketch.plot_stats(sketch.get_distributions(day_df, 'weekday_name'), y_var, data_loader.DAY_ORDER)
+        return daily_data, day_df, plot_type, agg_method, y_var, summary
+    
+    return ('daily_trends', (plot_type, agg_method, y_var, exact), day_df, figures.daily_trends, aggregate)
 
 # Fungsi interaktif untuk analisis tren harian
+@profiling.instrument('view')
 def interactive_daily_trends(day_df):
     st.subheader("Analisis Tren Harian")
     
@@ -56,7 +165,7 @@ def interactive_daily_trends(day_df):
         # Pilihan agregasi
         agg_method = st.selectbox(
             "Pilih Metode Agregasi:",
-            ["Mean", "Median", "Sum", "Min", "Max"]
+            list(queries.AGG_METHODS)
         )
         
         # Pilihan variabel untuk visualisasi
@@ -65,61 +174,44 @@ def interactive_daily_trends(day_df):
             ["cnt", "casual", "registered"]
         )
         
-    with col2:
-        # Menciptakan visualisasi berdasarkan pilihan pengguna
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        # Mendapatkan tata urutan hari
-        day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        
-        # Menentukan fungsi agregasi
-        agg_func = {
-            "Mean": np.mean,
-            "Median": np.median,
-            "Sum": np.sum,
-            "Min": np.min,
-            "Max": np.max
-        }[agg_method]
-        
-        # Agregasi data
-        if 'weekday_name' in day_df.columns:
-            daily_data = day_df.groupby('weekday_name')[y_var].agg(agg_func)
-            daily_data = daily_data.reindex(day_order)
-        else:
-            day_df['weekday_name'] = day_df['weekday'].map({0: 'Sunday', 1: 'Monday', 2: 'Tuesday', 3: 'Wednesday', 4: 'Thursday', 5: 'Friday', 6: 'Saturday'})
-            daily_data = day_df.groupby('weekday_name')[y_var].agg(agg_func)
-            daily_data = daily_data.reindex(day_order)
+        exact = False
+        if plot_type == "Box Plot":
+            exact = exact_distribution_toggle(len(day_df), key="daily_exact")
         
-        # Membuat visualisasi
-        if plot_type == "Bar Chart":
-            sns.barplot(x=daily_data.index, y=daily_data.values, ax=ax)
-        elif plot_type == "Line Chart":
-            sns.lineplot(x=daily_data.index, y=daily_data.values, ax=ax, marker='o')
-        else:  # Box Plot
-            sns.boxplot(x='weekday_name', y=y_var, data=day_df, order=day_order, ax=ax)
-        
-        var_labels = {
-            "cnt": "Total Peminjaman",
-            "casual": "Peminjaman Pengguna Casual",
-            "registered": "Peminjaman Pengguna Terdaftar"
-        }
-        
-        ax.set_title(f'{agg_method} {var_labels.get(y_var, y_var)} Berdasarkan Hari', fontsize=15)
-        ax.set_xlabel('Hari', fontsize=12)
-        ax.set_ylabel(f'{var_labels.get(y_var, y_var)}', fontsize=12)
-        ax.tick_params(axis='x', rotation=45)
+    with col2:
+        # Agregasi data dengan tata urutan hari Senin-Minggu
+        with profiling.phase('aggregate'):
+            daily_data = queries.weekday_aggregate(day_df, agg_method, y_var)
         
-        st.pyplot(fig)
+        # Menciptakan visualisasi berdasarkan pilihan pengguna
+        show_figure(*daily_trends_figure(day_df, daily_data, plot_type, agg_method, y_var, exact))
         
         # Tabel data
         st.write("Data Agregasi:")
         st.dataframe(daily_data.reset_index().rename(columns={
             'weekday_name': 'Hari', 
-            y_var: var_labels.get(y_var, y_var)
+            y_var: figures.VAR_LABELS.get(y_var, y_var)
         }))
 
+# Filter hari pada Distribusi Jam: label widget -> nilai workingday (None = semua hari)
+WORKDAY_FILTERS = {"Semua Hari": None, "Hari Kerja": 1, "Akhir Pekan": 0}
+
+# Spesifikasi grafik garis per jam dan heatmap jam x hari. Filter diterapkan pada cube
+# agregasi, bukan pada setiap baris data per jam; roll-up cube hanya dihitung jika
+# figure belum ada di cache.
+def hourly_figures(hour_cube, y_var, workday_filter, selected_seasons):
+    workingday = WORKDAY_FILTERS[workday_filter]
+    params = (y_var, workday_filter, tuple(sorted(selected_seasons)))
+    return [
+        ('hourly_line', params, hour_cube, figures.hourly_line,
+         lambda: (queries.hourly_profile(hour_cube, y_var, workingday, selected_seasons), y_var)),
+        ('hourly_heatmap', params, hour_cube, figures.hourly_heatmap,
+         lambda: (queries.hourly_heatmap(hour_cube, y_var, workingday, selected_seasons), y_var)),
+    ]
+
 # Fungsi interaktif untuk analisis distribusi jam
-def interactive_hourly_distribution(hour_df):
+@profiling.instrument('view')
+def interactive_hourly_distribution(hour_cube):
     st.subheader("Analisis Distribusi Berdasarkan Jam")
     
     col1, col2 = st.columns([1, 2])
@@ -135,7 +227,7 @@ def interactive_hourly_distribution(hour_df):
         # Filter berdasarkan hari kerja vs akhir pekan
         workday_filter = st.radio(
             "Filter Berdasarkan Hari:",
-            ["Semua Hari", "Hari Kerja", "Akhir Pekan"]
+            list(WORKDAY_FILTERS)
         )
         
         # Filter musim
@@ -148,84 +240,36 @@ def interactive_hourly_distribution(hour_df):
         )
         
     with col2:
-        # Filter data berdasarkan pilihan pengguna
-        filtered_df = hour_df.copy()
-        
-        if workday_filter != "Semua Hari":
-            if workday_filter == "Hari Kerja":
-                filtered_df = filtered_df[filtered_df['workingday'] == 1]
-            else:  # Akhir Pekan
-                filtered_df = filtered_df[filtered_df['workingday'] == 0]
-        
-        if selected_seasons:
-            filtered_df = filtered_df[filtered_df['season'].isin(selected_seasons)]
+        line_figure, heatmap_figure = hourly_figures(hour_cube, y_var, workday_filter, selected_seasons)
         
         # Membuat visualisasi
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        hourly_data = filtered_df.groupby('hr')[y_var].mean()
-        
-        sns.lineplot(x=hourly_data.index, y=hourly_data.values, ax=ax, marker='o')
-        
-        var_labels = {
-            "cnt": "Total Peminjaman",
-            "casual": "Peminjaman Pengguna Casual",
-            "registered": "Peminjaman Pengguna Terdaftar"
-        }
-        
-        ax.set_title(f'Rata-rata {var_labels.get(y_var, y_var)} Berdasarkan Jam', fontsize=15)
-        ax.set_xlabel('Jam', fontsize=12)
-        ax.set_ylabel(f'Rata-rata {var_labels.get(y_var, y_var)}', fontsize=12)
-        ax.set_xticks(range(0, 24))
-        
-        # Menambahkan anotasi pola
-        if y_var == "cnt":
-            morning_peak = hourly_data.iloc[7:10].idxmax()
-            evening_peak = hourly_data.iloc[16:20].idxmax()
-            
-            # Pastikan nilai peak ada sebelum menambahkan anotasi
-            if not pd.isna(hourly_data[morning_peak]):
-                ax.annotate(f'Puncak Pagi: {morning_peak}:00', 
-                           xy=(morning_peak, hourly_data[morning_peak]), 
-                           xytext=(morning_peak-1, hourly_data[morning_peak]+100),
-                           arrowprops=dict(facecolor='black', shrink=0.05))
-            
-            if not pd.isna(hourly_data[evening_peak]):
-                ax.annotate(f'Puncak Sore: {evening_peak}:00', 
-                           xy=(evening_peak, hourly_data[evening_peak]), 
-                           xytext=(evening_peak-1, hourly_data[evening_peak]+100),
-                           arrowprops=dict(facecolor='black', shrink=0.05))
-        
-        st.pyplot(fig)
+        show_figure(*line_figure)
         
         # Heatmap per jam dan hari
         st.write("Heatmap Berdasarkan Jam dan Hari:")
         
-        # Menambahkan kolom hari jika belum ada
-        if 'weekday' in filtered_df.columns:
-            if 'weekday_name' not in filtered_df.columns:
-                day_names = {0: 'Sunday', 1: 'Monday', 2: 'Tuesday', 3: 'Wednesday', 4: 'Thursday', 5: 'Friday', 6: 'Saturday'}
-                filtered_df['weekday_name'] = filtered_df['weekday'].map(day_names)
-            
-            # Membuat heatmap
-            pivot_df = filtered_df.pivot_table(
-                index='hr', 
-                columns='weekday_name', 
-                values=y_var, 
-                aggfunc='mean'
-            )
-            
-            # Mengurutkan kolom hari
-            day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            pivot_df = pivot_df.reindex(columns=day_order)
-            
-            fig, ax = plt.subplots(figsize=(10, 8))
-            sns.heatmap(pivot_df, cmap='YlGnBu', ax=ax, annot=False, fmt=".0f")
-            ax.set_title(f'Rata-rata {var_labels.get(y_var, y_var)} Berdasarkan Jam dan Hari', fontsize=15)
-            st.pyplot(fig)
+        show_figure(*heatmap_figure)
+
+# Fungsi untuk memfilter data berdasarkan kondisi cuaca yang dipilih. Hasilnya berupa
+# posisi baris (None berarti semua baris), bukan salinan frame; kolom yang dibutuhkan
+# baru diambil pada baris tersebut saat grafik digambar (lihat selection).
+def filter_weather(df, selected_weather):
+    return selection.rows(df, {'weathersit': selected_weather})
+
+# Spesifikasi scatter plot faktor cuaca dengan garis regresi. Garis regresi, interval
+# kepercayaan, dan korelasi dihitung dari statistik cukup per kondisi cuaca (lihat
+# regression); bootstrap=True memakai interval bootstrap dari sampel baris terbatas.
+def weather_scatter_figure(df, rows, x_var, y_var, selected_weather, bootstrap=False):
+    return (
+        'weather_scatter', (x_var, y_var, tuple(sorted(selected_weather)), bootstrap), df,
+        figures.weather_scatter,
+        lambda: (selection.take(df, rows, [x_var, y_var, 'weathersit']), x_var, y_var,
+                 queries.weather_regression(df, x_var, y_var, selected_weather, bootstrap))
+    )
 
 # Fungsi interaktif untuk analisis korelasi dengan faktor cuaca
-def interactive_weather_analysis(df):
+@profiling.instrument('view')
+def interactive_weather_analysis(df, render_mode=RENDER_SERVER):
     st.subheader("Analisis Korelasi dengan Faktor Cuaca")
     
     col1, col2 = st.columns([1, 2])
@@ -268,86 +312,74 @@ def interactive_weather_analysis(df):
             format_func=lambda x: weather_options[x]
         )
         
-    with col2:
-        # Filter data berdasarkan pilihan pengguna
-        filtered_df = df.copy()
-        
-        if selected_weather:
-            filtered_df = filtered_df[filtered_df['weathersit'].isin(selected_weather)]
-        
-        # Membuat scatter plot dengan garis regresi
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        # Scatter plot dengan faktor cuaca
-        scatter = sns.scatterplot(
-            x=x_var, 
-            y=y_var, 
-            data=filtered_df, 
-            hue='weathersit',
-            palette='viridis',
-            alpha=0.6,
-            ax=ax
-        )
-        
-        # Garis regresi
-        sns.regplot(
-            x=x_var, 
-            y=y_var, 
-            data=filtered_df, 
-            scatter=False, 
-            color='red',
-            ax=ax
-        )
-        
-        x_labels = {
-            "temp_celsius": "Suhu (°C)",
-            "hum_percent": "Kelembaban (%)",
-            "windspeed_kph": "Kecepatan Angin (km/h)"
-        }
-        
-        y_labels = {
-            "cnt": "Total Peminjaman",
-            "casual": "Peminjaman Pengguna Casual",
-            "registered": "Peminjaman Pengguna Terdaftar"
-        }
-        
-        # Mempercantik legend
-        handles, labels = ax.get_legend_handles_labels()
-        weather_labels = [weather_options.get(int(float(label)), label) if label.replace('.', '', 1).isdigit() else label for label in labels]
-        ax.legend(handles, weather_labels, title='Kondisi Cuaca')
-        
-        ax.set_title(f'Korelasi antara {x_labels.get(x_var, x_var)} dan {y_labels.get(y_var, y_var)}', fontsize=15)
-        ax.set_xlabel(x_labels.get(x_var, x_var), fontsize=12)
-        ax.set_ylabel(y_labels.get(y_var, y_var), fontsize=12)
-        
-        # Menghitung dan menampilkan korelasi
-        correlation = filtered_df[[x_var, y_var]].corr().iloc[0, 1]
-        ax.annotate(f'Korelasi: {correlation:.2f}', 
-                   xy=(0.05, 0.95), 
-                   xycoords='axes fraction',
-                   bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="gray", alpha=0.8))
+        # Interval kepercayaan bootstrap (lebih lambat) sebagai pengganti interval analitik;
+        # resampling membutuhkan baris data mentah
+        bootstrap = False
+        if has_hour_rows(df):
+            bootstrap = st.checkbox(
+                "Interval Kepercayaan Bootstrap",
+                help=f"Interval dihitung dengan {regression.BOOTSTRAP_ITERATIONS} kali resampling dari "
+                     f"maksimal {regression.BOOTSTRAP_ROWS:,} baris sampel. Tanpa opsi ini interval "
+                     f"dihitung secara analitik dari seluruh data."
+            )
         
-        st.pyplot(fig)
+    with col2:
+        # Filter data berdasarkan pilihan pengguna (tidak ada baris mentah pada mode streaming)
+        with profiling.phase('filter'):
+            rows = filter_weather(df, selected_weather) if has_hour_rows(df) else None
+        
+        # Membuat scatter plot dengan garis regresi. Pada mode streaming titik data tidak
+        # tersedia, tetapi korelasi tetap dihitung dari statistik cukup per kondisi cuaca.
+        if not require_hour_rows(df):
+            with profiling.phase('stats'):
+                line = queries.weather_regression(df, x_var, y_var, selected_weather)
+            if line is not None:
+                st.write(f"Korelasi: {line['r']:.2f}")
+        elif render_mode == RENDER_BROWSER:
+            with profiling.phase('stats'):
+                line = queries.weather_regression(df, x_var, y_var, selected_weather, bootstrap)
+            points = selection.take(df, rows, [x_var, y_var, 'weather_name'])
+            show_client_chart(client_charts.weather_scatter(points, x_var, y_var, line=line))
+            if line is not None:
+                st.write(f"Korelasi: {line['r']:.2f}")
+        else:
+            show_figure(*weather_scatter_figure(df, rows, x_var, y_var, selected_weather, bootstrap))
         
         # Menampilkan pola berdasarkan statistik deskriptif
         st.write("Statistik Deskriptif Berdasarkan Kondisi Cuaca:")
         
         if selected_weather:
-            stats_df = filtered_df.groupby('weathersit')[y_var].agg(['mean', 'median', 'std', 'count']).reset_index()
+            # Mean, std, dan count dari cube; median dari kuantil per kondisi cuaca yang sudah di-cache
+            with profiling.phase('aggregate'):
+                stats_df = queries.weather_summary(df, y_var, selected_weather).reset_index()
             stats_df['weathersit'] = stats_df['weathersit'].map(weather_options)
             stats_df.columns = ['Kondisi Cuaca', 'Rata-rata', 'Median', 'Std Dev', 'Jumlah Data']
             st.dataframe(stats_df)
 
+# Tanggal awal dan akhir dari widget date_input; (None, None) berarti seluruh data
+# (baru satu tanggal yang dipilih)
+def selected_dates(date_range):
+    return tuple(date_range) if len(date_range) == 2 else (None, None)
+
+# Spesifikasi grafik tren waktu. date_range adalah nilai widget (bagian dari kunci),
+# sedangkan start_date/end_date adalah rentang yang benar-benar dipakai.
+def time_series_figure(source_df, agg_df, date_range, start_date, end_date, freq, y_vars, window):
+    return (
+        'time_series', (tuple(date_range), freq, tuple(y_vars), window), source_df,
+        figures.time_series, lambda: (agg_df, y_vars, freq, window),
+        (start_date, end_date)
+    )
+
 # Fungsi untuk analisis tren waktu interaktif
-def interactive_time_series(day_df):
+@profiling.instrument('view')
+def interactive_time_series(day_df, hour_df=None):
     st.subheader("Analisis Tren Waktu")
     
     col1, col2 = st.columns([1, 2])
     
     with col1:
-        # Pilihan periode waktu
-        min_date = day_df['dteday'].min().date()
-        max_date = day_df['dteday'].max().date()
+        # Pilihan periode waktu; batas tanggal dibaca dari indeks waktu yang sudah terurut
+        min_date, max_date = queries.date_bounds(day_df)
         
         date_range = st.date_input(
             "Pilih Rentang Waktu:",
@@ -356,10 +388,13 @@ def interactive_time_series(day_df):
             max_value=max_date
         )
         
-        # Pilihan frekuensi agregasi
+        # Pilihan frekuensi agregasi; resolusi per jam memakai data per jam
+        freq_options = ["Harian", "Mingguan", "Bulanan"]
+        if has_hour_rows(hour_df):
+            freq_options.append("Per Jam")
         freq = st.selectbox(
             "Pilih Frekuensi Agregasi:",
-            ["Harian", "Mingguan", "Bulanan"]
+            freq_options
         )
         
         # Pilihan variabel untuk visualisasi
@@ -381,86 +416,61 @@ def interactive_time_series(day_df):
             window_size = st.slider("Window Size Rolling Average:", 1, 30, 7)
     
     with col2:
-        # Filter berdasarkan rentang tanggal
-        if len(date_range) == 2:
-            start_date, end_date = date_range
-            filtered_df = day_df[(day_df['dteday'].dt.date >= start_date) & 
-                                (day_df['dteday'].dt.date <= end_date)]
-        else:
-            filtered_df = day_df
+        # Rentang tanggal dicari dengan binary search pada indeks waktu, lalu jumlah per
+        # periode diambil dari prefix sum (periode di tepi rentang hanya berisi baris di dalam rentang)
+        with profiling.phase('filter'):
+            start_date, end_date = queries.date_range(day_df, *selected_dates(date_range))
+            source_df = hour_df if freq == "Per Jam" else day_df
         
-        # Mengatur frekuensi agregasi
-        if freq == "Harian":
-            filtered_df['period'] = filtered_df['dteday']
-        elif freq == "Mingguan":
-            filtered_df['period'] = filtered_df['dteday'].dt.to_period('W').dt.start_time
-        else:  # Bulanan
-            filtered_df['period'] = filtered_df['dteday'].dt.to_period('M').dt.start_time
-        
-        # Agregasi data
-        agg_df = filtered_df.groupby('period')[y_vars].sum().reset_index()
+        with profiling.phase('aggregate'):
+            agg_df = queries.period_rollup(source_df, freq, y_vars, start_date, end_date)
         
         # Membuat visualisasi
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        for y_var in y_vars:
-            sns.lineplot(
-                x='period', 
-                y=y_var, 
-                data=agg_df, 
-                label={
-                    "cnt": "Total Peminjaman",
-                    "casual": "Pengguna Casual",
-                    "registered": "Pengguna Terdaftar"
-                }.get(y_var, y_var),
-                ax=ax
-            )
-            
-            # Menambahkan rolling average jika diminta
-            if use_rolling and len(agg_df) > window_size:
-                rolling_data = agg_df[y_var].rolling(window=window_size).mean()
-                sns.lineplot(
-                    x=agg_df['period'],
-                    y=rolling_data,
-                    ax=ax,
-                    linestyle='--',
-                    alpha=0.7,
-                    label=f"{y_var} (Rolling Avg {window_size})"
-                )
-        
-        ax.set_title(f'Tren Peminjaman Sepeda ({freq})', fontsize=15)
-        ax.set_xlabel('Periode', fontsize=12)
-        ax.set_ylabel('Jumlah Peminjaman', fontsize=12)
-        
-        # Format sumbu x berdasarkan frekuensi
-        if freq == "Harian":
-            plt.xticks(rotation=45)
-        else:
-            # Untuk mingguan dan bulanan, format label tanggal
-            date_fmt = '%b %d' if freq == "Mingguan" else '%b %Y'
-            new_labels = [d.strftime(date_fmt) for d in agg_df['period']]
-            
-            # Jika terlalu banyak label, pilih subset
-            if len(new_labels) > 12:
-                step = len(new_labels) // 12
-                plt.xticks(range(0, len(new_labels), step), [new_labels[i] for i in range(0, len(new_labels), step)], rotation=45)
-            else:
-                plt.xticks(range(len(new_labels)), new_labels, rotation=45)
-        
-        plt.tight_layout()
-        st.pyplot(fig)
+        window = window_size if use_rolling else None
+        show_figure(*time_series_figure(source_df, agg_df, date_range, start_date, end_date, freq, y_vars, window))
         
         # Download data
         csv = agg_df.to_csv(index=False).encode('utf-8')
         st.download_button(
             "Download Data",
             csv,
-            f"bike_rental_{freq.lower()}.csv",
+            f"bike_rental_{freq.lower().replace(' ', '_')}.csv",
             "text/csv",
             key='download-csv'
         )
 
+# Tabel proporsi pengguna per tipe perbandingan: (tabel di static_tables, kolom
+# kategori, label kategori, judul grafik jumlah, judul grafik proporsi)
+USER_PROPORTIONS = {
+    "Proporsi Harian": ('weekday', 'weekday', 'Hari',
+                        'Jumlah Pengguna Berdasarkan Hari',
+                        'Proporsi Pengguna Berdasarkan Hari (%)'),
+    "Berdasarkan Cuaca": ('weather', 'weather_name', 'Kondisi Cuaca',
+                          'Jumlah Pengguna Berdasarkan Kondisi Cuaca',
+                          'Proporsi Pengguna Berdasarkan Kondisi Cuaca (%)'),
+    "Berdasarkan Suhu": ('temperature', 'temp_range', 'Rentang Suhu',
+                         'Jumlah Pengguna Berdasarkan Rentang Suhu',
+                         'Proporsi Pengguna Berdasarkan Rentang Suhu (%)'),
+}
+
+# Spesifikasi grafik proporsi pengguna untuk satu tipe perbandingan
+def user_proportion_figure(df, dataset, comparison_type, table):
+    _, column, label, count_title, pct_title = USER_PROPORTIONS[comparison_type]
+    return (
+        'user_comparison', (dataset, comparison_type), df,
+        figures.user_proportion, lambda: (table, column, label, count_title, pct_title)
+    )
+
+# Spesifikasi grafik tren pengguna per periode
+def user_trend_figure(df, trend_df, dataset, date_range, start_date, end_date, freq):
+    return (
+        'user_comparison', (dataset, "Tren Waktu", tuple(date_range), freq), df,
+        figures.user_trend, lambda: (trend_df, freq),
+        (start_date, end_date)
+    )
+
 # Fungsi untuk perbandingan interaktif (casual vs registered)
+@profiling.instrument('view')
 def interactive_user_comparison(day_df, hour_df):
     st.subheader("Perbandingan Pengguna Casual vs Terdaftar")
     
@@ -478,54 +488,14 @@ def interactive_user_comparison(day_df, hour_df):
         ["Proporsi Harian", "Tren Waktu", "Berdasarkan Cuaca", "Berdasarkan Suhu"]
     )
     
+    # Tabel hari, cuaca, dan suhu dihitung sekaligus dan di-cache per versi data;
+    # frame sumber tidak diubah
     if comparison_type == "Proporsi Harian":
-        # Agregasi data untuk proporsi harian
-        if 'weekday_name' not in df.columns:
-            day_names = {0: 'Sunday', 1: 'Monday', 2: 'Tuesday', 3: 'Wednesday', 4: 'Thursday', 5: 'Friday', 6: 'Saturday'}
-            df['weekday_name'] = df['weekday'].map(day_names)
-        
-        daily_casual = df.groupby('weekday_name')['casual'].sum()
-        daily_registered = df.groupby('weekday_name')['registered'].sum()
-        
-        # Menyusun dataframe untuk visualisasi
-        day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        comp_df = pd.DataFrame({
-            'weekday': day_order,
-            'casual': [daily_casual.get(day, 0) for day in day_order],
-            'registered': [daily_registered.get(day, 0) for day in day_order]
-        })
-        
-        # Menghitung total dan persentase
-        comp_df['total'] = comp_df['casual'] + comp_df['registered']
-        comp_df['casual_pct'] = (comp_df['casual'] / comp_df['total'] * 100).round(1)
-        comp_df['registered_pct'] = (comp_df['registered'] / comp_df['total'] * 100).round(1)
+        with profiling.phase('aggregate'):
+            comp_df = queries.user_table(df, 'weekday')
         
         # Membuat visualisasi
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-        
-        # Plot 1: Jumlah absolut
-        comp_df_melted = pd.melt(comp_df, id_vars=['weekday'], value_vars=['casual', 'registered'],
-                                var_name='user_type', value_name='count')
-        
-        sns.barplot(x='weekday', y='count', hue='user_type', data=comp_df_melted, ax=ax1)
-        ax1.set_title('Jumlah Pengguna Berdasarkan Hari', fontsize=15)
-        ax1.set_xlabel('Hari', fontsize=12)
-        ax1.set_ylabel('Jumlah Peminjaman', fontsize=12)
-        ax1.tick_params(axis='x', rotation=45)
-        
-        # Plot 2: Persentase
-        percentages = np.array([comp_df['casual_pct'], comp_df['registered_pct']])
-        ax2.bar(comp_df['weekday'], comp_df['registered_pct'], label='Terdaftar')
-        ax2.bar(comp_df['weekday'], comp_df['casual_pct'], bottom=comp_df['registered_pct'], label='Casual')
-        
-        ax2.set_title('Proporsi Pengguna Berdasarkan Hari (%)', fontsize=15)
-        ax2.set_xlabel('Hari', fontsize=12)
-        ax2.set_ylabel('Persentase (%)', fontsize=12)
-        ax2.tick_params(axis='x', rotation=45)
-        ax2.legend()
-        
-        plt.tight_layout()
-        st.pyplot(fig)
+        show_figure(*user_proportion_figure(df, dataset, comparison_type, comp_df))
         
         # Tabel data
         st.write("Data Proporsi Pengguna:")
@@ -539,8 +509,7 @@ def interactive_user_comparison(day_df, hour_df):
         
         with col1:
             # Pilihan periode waktu
-            min_date = df['dteday'].min().date()
-            max_date = df['dteday'].max().date()
+            min_date, max_date = queries.date_bounds(df)
             
             date_range = st.date_input(
                 "Pilih Rentang Waktu:",
@@ -551,132 +520,33 @@ def interactive_user_comparison(day_df, hour_df):
             )
         
         with col2:
-            # Pilihan frekuensi agregasi
+            # Pilihan frekuensi agregasi; resolusi per jam hanya untuk baris data per jam
+            freq_options = ["Harian", "Mingguan", "Bulanan"]
+            if dataset == "Data Per Jam" and has_hour_rows(df):
+                freq_options.append("Per Jam")
             freq = st.selectbox(
                 "Pilih Frekuensi Agregasi:",
-                ["Harian", "Mingguan", "Bulanan"],
+                freq_options,
                 key="comp_freq"
             )
         
-        # Filter berdasarkan rentang tanggal
-        if len(date_range) == 2:
-            start_date, end_date = date_range
-            filtered_df = df[(df['dteday'].dt.date >= start_date) & 
-                            (df['dteday'].dt.date <= end_date)]
-        else:
-            filtered_df = df
-        
-        # Mengatur frekuensi agregasi
-        if freq == "Harian":
-            filtered_df['period'] = filtered_df['dteday']
-        elif freq == "Mingguan":
-            filtered_df['period'] = filtered_df['dteday'].dt.to_period('W').dt.start_time
-        else:  # Bulanan
-            filtered_df['period'] = filtered_df['dteday'].dt.to_period('M').dt.start_time
-        
-        # Agregasi data
-        agg_casual = filtered_df.groupby('period')['casual'].sum()
-        agg_registered = filtered_df.groupby('period')['registered'].sum()
-        
-        # Membuat dataframe untuk visualisasi
-        trend_df = pd.DataFrame({
-            'period': agg_casual.index,
-            'casual': agg_casual.values,
-            'registered': agg_registered.values
-        })
-        
-        trend_df['total'] = trend_df['casual'] + trend_df['registered']
-        trend_df['casual_pct'] = (trend_df['casual'] / trend_df['total'] * 100).round(1)
-        trend_df['registered_pct'] = (trend_df['registered'] / trend_df['total'] * 100).round(1)
-        
-        # Membuat visualisasi
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10), sharex=True)
-        
-        # Plot 1: Jumlah absolut
-        sns.lineplot(x='period', y='casual', data=trend_df, marker='o', label='Casual', ax=ax1)
-        sns.lineplot(x='period', y='registered', data=trend_df, marker='o', label='Terdaftar', ax=ax1)
-        
-        ax1.set_title(f'Tren Jumlah Pengguna ({freq})', fontsize=15)
-        ax1.set_ylabel('Jumlah Peminjaman', fontsize=12)
-        ax1.legend()
+        # Rentang tanggal dan agregasi per periode lewat indeks waktu, tanpa memfilter frame
+        with profiling.phase('filter'):
+            start_date, end_date = queries.date_range(df, *selected_dates(date_range))
         
-        # Plot 2: Persentase
-        sns.lineplot(x='period', y='casual_pct', data=trend_df, marker='o', label='% Casual', ax=ax2)
-        sns.lineplot(x='period', y='registered_pct', data=trend_df, marker='o', label='% Terdaftar', ax=ax2)
+        with profiling.phase('aggregate'):
+            trend_df = queries.user_periods(df, freq, start_date, end_date)
         
-        ax2.set_title(f'Tren Proporsi Pengguna ({freq})', fontsize=15)
-        ax2.set_xlabel('Periode', fontsize=12)
-        ax2.set_ylabel('Persentase (%)', fontsize=12)
-        ax2.legend()
-        
-        # Format sumbu x berdasarkan frekuensi
-        if freq == "Harian":
-            plt.xticks(rotation=45)
-        else:
-            # Untuk mingguan dan bulanan, format label tanggal
-            date_fmt = '%b %d' if freq == "Mingguan" else '%b %Y'
-            new_labels = [d.strftime(date_fmt) for d in trend_df['period']]
-            
-            # Jika terlalu banyak label, pilih subset
-            if len(new_labels) > 12:
-                step = len(new_labels) // 12
-                plt.xticks(range(0, len(new_labels), step), [new_labels[i] for i in range(0, len(new_labels), step)], rotation=45)
-            else:
-                plt.xticks(range(len(new_labels)), new_labels, rotation=45)
-        
-        plt.tight_layout()
-        st.pyplot(fig)
+        # Membuat visualisasi
+        show_figure(*user_trend_figure(df, trend_df, dataset, date_range, start_date, end_date, freq))
         
     elif comparison_type == "Berdasarkan Cuaca":
-        # Analisis berdasarkan cuaca
-        weather_options = {
-            1: 'Cerah',
-            2: 'Berawan',
-            3: 'Hujan Ringan/Salju Ringan',
-            4: 'Hujan Lebat/Salju Lebat'
-        }
-        
         # Agregasi data berdasarkan kondisi cuaca
-        weather_casual = df.groupby('weathersit')['casual'].sum()
-        weather_registered = df.groupby('weathersit')['registered'].sum()
-        
-        # Menyusun dataframe untuk visualisasi
-        weather_df = pd.DataFrame({
-            'weathersit': list(weather_options.keys()),
-            'weather_name': list(weather_options.values()),
-            'casual': [weather_casual.get(w, 0) for w in weather_options.keys()],
-            'registered': [weather_registered.get(w, 0) for w in weather_options.keys()]
-        })
-        
-        weather_df['total'] = weather_df['casual'] + weather_df['registered']
-        weather_df['casual_pct'] = (weather_df['casual'] / weather_df['total'] * 100).round(1)
-        weather_df['registered_pct'] = (weather_df['registered'] / weather_df['total'] * 100).round(1)
+        with profiling.phase('aggregate'):
+            weather_df = queries.user_table(df, 'weather')
         
         # Membuat visualisasi
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-        
-        # Plot 1: Jumlah absolut
-        weather_df_melted = pd.melt(weather_df, id_vars=['weather_name'], value_vars=['casual', 'registered'],
-                                   var_name='user_type', value_name='count')
-        
-        sns.barplot(x='weather_name', y='count', hue='user_type', data=weather_df_melted, ax=ax1)
-        ax1.set_title('Jumlah Pengguna Berdasarkan Kondisi Cuaca', fontsize=15)
-        ax1.set_xlabel('Kondisi Cuaca', fontsize=12)
-        ax1.set_ylabel('Jumlah Peminjaman', fontsize=12)
-        ax1.tick_params(axis='x', rotation=45)
-        
-        # Plot 2: Persentase
-        ax2.bar(weather_df['weather_name'], weather_df['registered_pct'], label='Terdaftar')
-        ax2.bar(weather_df['weather_name'], weather_df['casual_pct'], bottom=weather_df['registered_pct'], label='Casual')
-        
-        ax2.set_title('Proporsi Pengguna Berdasarkan Kondisi Cuaca (%)', fontsize=15)
-        ax2.set_xlabel('Kondisi Cuaca', fontsize=12)
-        ax2.set_ylabel('Persentase (%)', fontsize=12)
-        ax2.tick_params(axis='x', rotation=45)
-        ax2.legend()
-        
-        plt.tight_layout()
-        st.pyplot(fig)
+        show_figure(*user_proportion_figure(df, dataset, comparison_type, weather_df))
         
         # Tabel data
         st.write("Data Proporsi Pengguna Berdasarkan Cuaca:")
@@ -685,51 +555,12 @@ def interactive_user_comparison(day_df, hour_df):
         st.dataframe(display_df)
         
     else:  # Berdasarkan Suhu
-        # Membuat bins untuk suhu
-        df['temp_bins'] = pd.cut(df['temp_celsius'], 
-                                bins=[0, 10, 15, 20, 25, 30, 35, 45],
-                                labels=['0-10°C', '10-15°C', '15-20°C', '20-25°C', '25-30°C', '30-35°C', '35-45°C'])
-        
         # Agregasi data berdasarkan rentang suhu
-        temp_casual = df.groupby('temp_bins')['casual'].sum()
-        temp_registered = df.groupby('temp_bins')['registered'].sum()
-        
-        # Menyusun dataframe untuk visualisasi
-        temp_df = pd.DataFrame({
-            'temp_range': temp_casual.index,
-            'casual': temp_casual.values,
-            'registered': temp_registered.values
-        })
-        
-        temp_df['total'] = temp_df['casual'] + temp_df['registered']
-        temp_df['casual_pct'] = (temp_df['casual'] / temp_df['total'] * 100).round(1)
-        temp_df['registered_pct'] = (temp_df['registered'] / temp_df['total'] * 100).round(1)
+        with profiling.phase('aggregate'):
+            temp_df = queries.user_table(df, 'temperature')
         
         # Membuat visualisasi
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-        
-        # Plot 1: Jumlah absolut
-        temp_df_melted = pd.melt(temp_df, id_vars=['temp_range'], value_vars=['casual', 'registered'],
-                                var_name='user_type', value_name='count')
-        
-        sns.barplot(x='temp_range', y='count', hue='user_type', data=temp_df_melted, ax=ax1)
-        ax1.set_title('Jumlah Pengguna Berdasarkan Rentang Suhu', fontsize=15)
-        ax1.set_xlabel('Rentang Suhu', fontsize=12)
-        ax1.set_ylabel('Jumlah Peminjaman', fontsize=12)
-        ax1.tick_params(axis='x', rotation=45)
-        
-        # Plot 2: Persentase
-        ax2.bar(temp_df['temp_range'], temp_df['registered_pct'], label='Terdaftar')
-        ax2.bar(temp_df['temp_range'], temp_df['casual_pct'], bottom=temp_df['registered_pct'], label='Casual')
-        
-        ax2.set_title('Proporsi Pengguna Berdasarkan Rentang Suhu (%)', fontsize=15)
-        ax2.set_xlabel('Rentang Suhu', fontsize=12)
-        ax2.set_ylabel('Persentase (%)', fontsize=12)
-        ax2.tick_params(axis='x', rotation=45)
-        ax2.legend()
-        
-        plt.tight_layout()
-        st.pyplot(fig)
+        show_figure(*user_proportion_figure(df, dataset, comparison_type, temp_df))
         
         # Tabel data
         st.write("Data Proporsi Pengguna Berdasarkan Suhu:")
@@ -737,8 +568,28 @@ def interactive_user_comparison(day_df, hour_df):
         display_df.columns = ['Rentang Suhu', 'Casual', 'Terdaftar', 'Total', '% Casual', '% Terdaftar']
         st.dataframe(display_df)
 
+# Urutan kondisi cuaca pada grafik: hanya kondisi terpilih yang ada datanya
+def weather_order(df, selected_weather):
+    present = queries.weather_groups(df)
+    return [data_loader.WEATHER_LABELS[w] for w in sorted(selected_weather) if w in present]
+
+# Spesifikasi grafik distribusi per kondisi cuaca; box dan violin plot digambar dari
+# ringkasan sketch per kondisi cuaca kecuali mode eksak dipilih. Baris data mentah
+# (posisi rows) hanya diambil untuk strip plot dan mode eksak.
+def weather_conditions_figure(df, rows, selected_weather, y_var, viz_type, order, exact=False):
+    def aggregate():
+        if viz_type != "Strip Plot" and not exact:
+            summary = sketch.plot_stats(queries.weather_distributions(df), y_var,
+                                        sorted(selected_weather), data_loader.WEATHER_LABELS)
+            return None, y_var, viz_type, order, summary
+        return selection.take(df, rows, ['weather_name', y_var]), y_var, viz_type, order
+    
+    return ('weather_conditions', (tuple(sorted(selected_weather)), y_var, viz_type, exact), df,
+            figures.weather_distribution, aggregate)
+
 # Fungsi untuk analisis kondisi cuaca interaktif
-def interactive_weather_conditions(df):
+@profiling.instrument('view')
+def interactive_weather_conditions(df, render_mode=RENDER_SERVER):
     st.subheader("Eksplorasi Pengaruh Kondisi Cuaca")
     
     # Filter berdasarkan kondisi cuaca
@@ -771,64 +622,52 @@ def interactive_weather_conditions(df):
             }.get(x, x)
         )
         
-        # Pilihan tipe visualisasi
+        # Pilihan tipe visualisasi; strip plot dan mode eksak membutuhkan baris data mentah,
+        # sedangkan box dan violin plot pada mode streaming digambar dari ringkasan sketch
+        viz_options = ["Box Plot", "Violin Plot"]
+        if has_hour_rows(df):
+            viz_options.append("Strip Plot")
         viz_type = st.radio(
             "Pilih Tipe Visualisasi:",
-            ["Box Plot", "Violin Plot", "Strip Plot"]
+            viz_options
         )
+        
+        exact = False
+        if viz_type != "Strip Plot" and has_hour_rows(df):
+            exact = exact_distribution_toggle(len(df), key="weather_exact")
     
     with col2:
         if selected_weather:
-            # Filter data berdasarkan kondisi cuaca
-            filtered_df = df[df['weathersit'].isin(selected_weather)]
-            
-            # Membuat visualisasi
-            fig, ax = plt.subplots(figsize=(10, 6))
+            # Filter data berdasarkan kondisi cuaca (posisi baris, tanpa salinan frame)
+            with profiling.phase('filter'):
+                rows = filter_weather(df, selected_weather) if has_hour_rows(df) else None
             
-            # Mapping kondisi cuaca untuk display
-            filtered_df['weather_name'] = filtered_df['weathersit'].map(weather_options)
+            # Kolom weather_name sudah kategorikal sejak load_data; hanya kondisi yang ada datanya ditampilkan
+            order = weather_order(df, selected_weather)
             
-            # Memilih tipe visualisasi
-            if viz_type == "Box Plot":
-                sns.boxplot(x='weather_name', y=y_var, data=filtered_df, ax=ax)
-            elif viz_type == "Violin Plot":
-                sns.violinplot(x='weather_name', y=y_var, data=filtered_df, ax=ax)
-            else:  # Strip Plot
-                sns.stripplot(x='weather_name', y=y_var, data=filtered_df, jitter=True, alpha=0.5, ax=ax)
-                
-            var_label = {
-                "cnt": "Total Peminjaman",
-                "casual": "Peminjaman Pengguna Casual",
-                "registered": "Peminjaman Pengguna Terdaftar"
-            }.get(y_var, y_var)
-            
-            ax.set_title(f'Distribusi {var_label} Berdasarkan Kondisi Cuaca', fontsize=15)
-            ax.set_xlabel('Kondisi Cuaca', fontsize=12)
-            ax.set_ylabel(var_label, fontsize=12)
-            
-            st.pyplot(fig)
+            # Membuat visualisasi; strip plot bisa dirender di browser
+            if render_mode == RENDER_BROWSER and viz_type == "Strip Plot":
+                points = selection.take(df, rows, ['weather_name', y_var])
+                show_client_chart(client_charts.weather_strip(points, y_var, order))
+            else:
+                show_figure(*weather_conditions_figure(df, rows, selected_weather, y_var, viz_type, order, exact))
             
-            # Statistik deskriptif
+            # Statistik deskriptif dari momen dan kuantil per kondisi cuaca yang sudah di-cache
             st.write("Statistik Deskriptif:")
-            stats = filtered_df.groupby('weather_name')[y_var].describe().reset_index()
+            with profiling.phase('aggregate'):
+                stats = queries.weather_describe(df, y_var, selected_weather)
             st.dataframe(stats)
             
             # Analisis ANOVA
             if len(selected_weather) > 1:
                 st.write("Perbandingan Rata-rata Antar Kondisi Cuaca:")
                 
-                from scipy import stats as scipy_stats
+                # ANOVA dari momen per kondisi cuaca (tanpa memisahkan data mentah per kelompok)
+                with profiling.phase('stats'):
+                    result = queries.weather_anova(df, y_var, selected_weather)
                 
-                # Menyiapkan data untuk ANOVA
-                weather_groups = []
-                for weather in selected_weather:
-                    group_data = filtered_df[filtered_df['weathersit'] == weather][y_var].values
-                    if len(group_data) > 0:
-                        weather_groups.append(group_data)
-                
-                if len(weather_groups) > 1:
-                    # Melakukan ANOVA
-                    f_stat, p_value = scipy_stats.f_oneway(*weather_groups)
+                if result is not None:
+                    f_stat, p_value = result
                     
                     st.write(f"F-statistic: {f_stat:.2f}")
                     st.write(f"p-value: {p_value:.4f}")
@@ -838,8 +677,238 @@ def interactive_weather_conditions(df):
                     else:
                         st.write("Kesimpulan: Tidak ada perbedaan signifikan dalam peminjaman sepeda antar kondisi cuaca yang dipilih.")
 
-# Fungsi utama aplikasi
+# Spesifikasi empat grafik ringkasan di Dashboard Utama: tren bulanan (dari indeks
+# waktu harian), distribusi jam, korelasi suhu, dan proporsi pengguna. Setiap grafik berupa
+# (view, frame sumber, fungsi gambar modul figures, fungsi agregasi yang mengembalikan
+# argumen fungsi gambar) agar agregasi dan render bisa dipisah ke thread dan proses lain.
+def overview_figures(day_df, hour_cube):
+    return [
+        ('overview_monthly', day_df, figures.monthly_trend,
+         lambda: (queries.period_rollup(day_df, "Bulanan", ['cnt']).rename(columns={'period': 'dteday'}),)),
+        ('overview_hourly', hour_cube, figures.hourly_overview,
+         lambda: (queries.hourly_profile(hour_cube, 'cnt'),)),
+        ('overview_temperature', day_df, figures.temp_regression,
+         lambda: (day_df[['temp_celsius', 'cnt']], queries.weather_regression(day_df, 'temp_celsius', 'cnt'))),
+        ('overview_users', day_df, figures.user_pie,
+         lambda: (day_df['casual'].sum(), day_df['registered'].sum())),
+    ]
+
+# Fungsi untuk mengambil PNG grafik ringkasan sesuai urutan layout. Pada mode paralel
+# (DASHBOARD_PARALLEL_WORKERS), grafik yang belum ada di render cache langsung mulai
+# dihitung dan dirender bersamaan; setiap elemen hasil menunggu PNG-nya saat dipanggil.
+def overview_pngs(day_df, hour_cube):
+    return render_cache.get_pngs([
+        (figure_key(view, (), df), draw_fn, aggregate_fn)
+        for view, df, draw_fn, aggregate_fn in overview_figures(day_df, hour_cube)
+    ])
+
+# Fungsi untuk menampilkan PNG yang sudah dirender
+def show_png(png_fn):
+    png = png_fn()
+    with profiling.phase('send'):
+        st.image(png, width='stretch')
+
+# Fungsi untuk halaman ringkasan (Dashboard Utama)
+@profiling.instrument('view')
+def show_overview(day_df, hour_cube):
+    # Judul Utama
+    st.title('Dashboard Analisis Data Bike Sharing')
+    st.write("""
+    Dashboard ini menyajikan analisis data peminjaman sepeda dengan fitur interaktif yang memungkinkan pengguna
+    untuk mengeksplorasi dan memanipulasi data secara langsung.
+    """)
+    
+    # Grafik ringkasan mulai dihitung lebih dulu (bersamaan pada mode paralel) lalu
+    # ditampilkan sesuai urutan layout setelah KPI
+    overview = overview_pngs(day_df, hour_cube)
+    
+    # KPI metrics
+    st.subheader("Metrik Utama")
+    col1, col2, col3, col4 = st.columns(4)
+    
+    metrics = queries.kpis(day_df)
+    month_names = {1: 'Januari', 2: 'Februari', 3: 'Maret', 4: 'April', 5: 'Mei', 6: 'Juni',
+                  7: 'Juli', 8: 'Agustus', 9: 'September', 10: 'Oktober', 11: 'November', 12: 'Desember'}
+    
+    col1.metric("Total Peminjaman", f"{metrics['total_rentals']:,}")
+    col2.metric("Rata-rata Harian", f"{metrics['avg_daily']:,}")
+    col3.metric("Peminjaman Maksimum", f"{metrics['max_daily']:,}")
+    col4.metric("Bulan Terpadat", month_names.get(metrics['peak_month'], metrics['peak_month']))
+    profiling.mark('kpi')
+    
+    # Visualisasi ringkasan
+    st.subheader("Ringkasan Visualisasi")
+    
+    monthly_png, hourly_png, temperature_png, users_png = overview
+    
+    # Baris 1: Tren waktu dan distribusi jam
+    row1_col1, row1_col2 = st.columns(2)
+    
+    with row1_col1:
+        # Tren waktu bulanan
+        show_png(monthly_png)
+    
+    with row1_col2:
+        # Distribusi jam
+        show_png(hourly_png)
+    
+    # Baris 2: Pengaruh cuaca dan proporsi pengguna
+    row2_col1, row2_col2 = st.columns(2)
+    
+    with row2_col1:
+        # Korelasi suhu dan peminjaman
+        show_png(temperature_png)
+    
+    with row2_col2:
+        # Proporsi pengguna casual vs registered
+        show_png(users_png)
+    
+    # Tabel Temuan Utama
+    st.subheader("Temuan Utama")
+    
+    st.write("""
+    **Temuan Utama Analisis Bike Sharing:**
+    
+    1. **Pola Harian:** 
+      - Peminjaman sepeda tertinggi pada hari kerja
+      - Puncak peminjaman di hari Selasa dan Rabu
+    
+    2. **Distribusi Jam:**
+      - Dua puncak peminjaman pada pagi (07-09) dan sore (17-19)
+      - Pola terkait aktivitas komuter
+    
+    3. **Pengaruh Suhu:**
+      - Korelasi positif antara suhu dan jumlah peminjaman
+      - Cuaca hangat mendorong peningkatan penggunaan sepeda
+    
+    4. **Kondisi Cuaca:**
+      - Variasi peminjaman signifikan antar kondisi cuaca
+      - Cuaca cerah cenderung meningkatkan jumlah peminjaman
+    
+    5. **Profil Pengguna:**
+      - Pengguna terdaftar mendominasi peminjaman sepeda
+      - Pengguna casual lebih terpengaruh oleh kondisi cuaca
+    """)
+
+# Fungsi untuk menampilkan panel profiling di sidebar: rincian rerun terakhir dan
+# ringkasan latensi per view
+def show_profiling_panel():
+    if not st.sidebar.checkbox("Tampilkan Profiling"):
+        return
+    records = profiling.history()
+    if not records:
+        return
+    last = records[0]
+    with st.sidebar.expander("Profiling", expanded=True):
+        st.write(f"Rerun terakhir ({last['view']}): {last['total_ms']:.1f} ms")
+        phases = pd.DataFrame([
+            dict(fase=name, **stats) for name, stats in last['phases'].items()
+        ])
+        if len(phases):
+            st.dataframe(phases.round(2), hide_index=True)
+        st.write("Latensi per view (ms):")
+        st.dataframe(pd.DataFrame(profiling.summary()).round(1), hide_index=True)
+        st.download_button(
+            "Download Log (JSON Lines)",
+            "".join(json.dumps(record) + "\n" for record in reversed(records)),
+            "profiling.jsonl",
+            "application/json",
+            key='download-profiling'
+        )
+
+# Fungsi untuk mengisi render cache dari daftar spesifikasi grafik tanpa menampilkannya
+def warm_figures(specs):
+    for view, params, df, draw_fn, aggregate_fn, *date_range in specs:
+        key = figure_key(view, params, df, *date_range)
+        if key is not None and not render_cache.contains(key):
+            render_cache.get_png(key, draw_fn, aggregate_fn)
+
+# Daftar task precompute: grafik untuk state default setiap view sesuai urutan menu
+# (dimulai dari Dashboard Utama yang dibuka pertama kali), lalu artefak turunan data
+# per jam yang dipakai state lain. Nilai di sini harus sama dengan nilai awal widget.
+def precompute_tasks(day_df, hour_df, hour_cube):
+    def warm(specs_fn):
+        return lambda: warm_figures(specs_fn())
+    
+    def time_series_default():
+        start_date, end_date = queries.date_bounds(day_df)
+        agg_df = queries.period_rollup(day_df, "Harian", ["cnt"], start_date, end_date)
+        return [time_series_figure(day_df, agg_df, (start_date, end_date), start_date, end_date,
+                                   "Harian", ["cnt"], None)]
+    
+    def weather_conditions_default():
+        rows = filter_weather(hour_df, [1, 2]) if has_hour_rows(hour_df) else None
+        return [weather_conditions_figure(hour_df, rows, [1, 2], "cnt", "Box Plot", weather_order(hour_df, [1, 2]))]
+    
+    all_weather = list(data_loader.WEATHER_LABELS)
+    tasks = [
+        ("Dashboard Utama", lambda: [png() for png in overview_pngs(day_df, hour_cube)]),
+        ("Tren Harian", warm(lambda: [daily_trends_figure(
+            day_df, queries.weekday_aggregate(day_df, "Mean", "cnt"), "Bar Chart", "Mean", "cnt")])),
+        ("Distribusi Jam", warm(lambda: hourly_figures(hour_cube, "cnt", "Semua Hari", list(data_loader.SEASON_LABELS)))),
+    ]
+    if has_hour_rows(hour_df):
+        tasks.append(("Korelasi Cuaca", warm(lambda: [weather_scatter_figure(
+            hour_df, filter_weather(hour_df, all_weather), "temp_celsius", "cnt", all_weather)])))
+    tasks += [
+        ("Tren Waktu", warm(time_series_default)),
+        ("Pengguna Casual vs Terdaftar", warm(lambda: [user_proportion_figure(
+            day_df, "Data Harian", "Proporsi Harian", queries.user_table(day_df, 'weekday'))])),
+        ("Kondisi Cuaca", warm(weather_conditions_default)),
+    ]
+    # Pada mode streaming ringkasan sudah dilipat saat memuat data, jadi yang disiapkan hanya
+    # tabel statistik dan indeks waktu turunannya. Pada backend SQL agregasi dijalankan di
+    # engine, jadi yang disiapkan hanya database-nya (sudah didaftarkan saat memuat data)
+    # dan sketsa distribusi.
+    if streaming.is_streamed(hour_df):
+        tasks.append(("Data Per Jam", lambda: (streaming.get_summary(hour_df),
+                                               time_index.get_index(streaming.get_daily(hour_df)))))
+    elif sql_backend.ENABLED:
+        tasks.append(("Data Per Jam", lambda: (sql_backend.get_database(hour_df),
+                                               sketch.get_distributions(hour_df, 'weathersit'),
+                                               selection.get_positions(hour_df, 'weathersit'))))
+    else:
+        tasks.append(("Data Per Jam", lambda: (time_index.get_index(hour_df), comparison.static_tables(hour_df),
+                                               cube.get_cube(hour_df), weather_stats.get_summary(hour_df),
+                                               sketch.get_distributions(hour_df, 'weathersit'),
+                                               selection.get_positions(hour_df, 'weathersit'))))
+    return tasks
+
+# Fungsi untuk menampilkan progres precompute di sidebar. Selama precompute berjalan,
+# fragment ini diperbarui setiap detik; setelah selesai, halaman dirender ulang sekali
+# agar pembaruan berkala berhenti.
+def show_precompute_status():
+    initial = precompute.status()
+    if not initial['active']:
+        return
+    
+    @st.fragment(run_every=1.0 if initial['running'] else None)
+    def progress():
+        status = precompute.status()
+        if status['running']:
+            st.progress(status['done'] / max(status['total'], 1),
+                        text=f"Menyiapkan tampilan default: {status['done']}/{status['total']}")
+        elif initial['running']:
+            st.rerun()
+        else:
+            failed = f", {status['failed']} gagal" if status['failed'] else ""
+            st.caption(f"Tampilan default siap ({status['done']}/{status['total']}{failed}, "
+                       f"{status['elapsed']:.1f} detik)")
+            for name, error in status['errors']:
+                st.warning(f"Precompute '{name}' gagal: {error}")
+    
+    with st.sidebar:
+        progress()
+
+# Fungsi utama aplikasi: setiap rerun dicatat oleh profiling, lalu panel profiling
+# ditampilkan setelah rerun selesai agar rinciannya lengkap
 def main():
+    with profiling.run('Dashboard'):
+        render_dashboard()
+    show_profiling_panel()
+
+# Fungsi untuk menampilkan seluruh halaman dashboard
+def render_dashboard():
     st.set_page_config(
         page_title='Dashboard Analisis Bike Sharing Interaktif',
         layout='wide',
@@ -849,16 +918,74 @@ def main():
     # Sidebar untuk navigasi
     st.sidebar.title('Navigasi Dashboard')
     
+    # Cakupan data (hanya pada penyimpanan terpartisi)
+    scope = select_scope()
+    
     # Muat data
-    with st.spinner('Memuat dan memproses data...'):
-        day_df, hour_df = load_data()
+    with st.spinner('Memuat dan memproses data...'), profiling.phase('load_data'):
+        day_df, hour_df, hour_cube = load_data(scope)
     
-    if day_df is not None and hour_df is not None:
+    if day_df is not None and hour_cube is not None:
+        # Precompute state default setiap view di latar belakang (sekali per versi data)
+        precompute.start(
+            (data_loader.frame_version(day_df), data_loader.frame_version(hour_cube)),
+            lambda: precompute_tasks(day_df, hour_df, hour_cube)
+        )
+        show_precompute_status()
+        
+        # Proses render paralel dijalankan sekali per server, sebelum grafik pertama diminta
+        if parallel.ENABLED:
+            parallel.start()
+        
         # Tampilkan info dataset
-        with st.sidebar.expander("Informasi Dataset"):
+        with st.sidebar.expander("Informasi Dataset"), profiling.phase('sidebar'):
             st.write(f"Jumlah Data Harian: {len(day_df)}")
-            st.write(f"Jumlah Data Per Jam: {len(hour_df)}")
+            st.write(f"Jumlah Data Per Jam: {int(hour_cube['n'].sum())}")
             st.write(f"Periode: {day_df['dteday'].min().date()} hingga {day_df['dteday'].max().date()}")
+
+            # Statistik cache data
+            cache_info = data_loader.cache_info()
+            st.write(f"Cache Data: {cache_info['hits']} hit / {cache_info['misses']} miss / "
+                     f"{cache_info['appends']} append")
+            render_info = render_cache.cache_info()
+            st.write(f"Cache Gambar: {render_info['hits']} hit / {render_info['misses']} miss "
+                     f"({render_info['entries']} gambar)")
+            if disk_cache.ENABLED:
+                disk_info = disk_cache.cache_info()
+                rates = ", ".join(
+                    f"{label} {disk_info[kind]['hits']}/{disk_info[kind]['hits'] + disk_info[kind]['misses']} hit"
+                    + (f" ({disk_info[kind]['hit_rate']:.0%})" if disk_info[kind]['hit_rate'] is not None else "")
+                    for kind, label in (('png', 'gambar'), ('table', 'tabel')))
+                usage = f", {disk_info['bytes'] / 1024 ** 2:.1f} MB" if disk_info['bytes'] is not None else ""
+                st.write(f"Cache Disk: {rates}{usage}")
+            if has_hour_rows(hour_df):
+                memory = data_loader.memory_report({'Harian': day_df, 'Per Jam': hour_df})
+            else:
+                memory = data_loader.memory_report({'Harian': day_df, 'Cube Per Jam': hour_cube})
+            st.write("Memori: " + ", ".join(f"{name} {size / 1024 ** 2:.2f} MB" for name, size in memory.items()))
+            if data_loader.SHARED_DIR:
+                st.caption("Data dibagi antar worker lewat shared memory (read-only)")
+            if data_loader.DAY_SOURCE == 'hour':
+                report = None
+                if scope is None and has_hour_rows(hour_df) and not data_loader.SHARED_DIR:
+                    report = data_loader.daily_consistency(hour_df)
+                if report is None:
+                    st.caption("Data harian diturunkan dari data per jam")
+                elif report['consistent']:
+                    st.caption("Data harian diturunkan dari data per jam (konsisten dengan day.csv)")
+                else:
+                    mismatches = sum(report['mismatches'].values())
+                    st.warning(f"Data harian turunan berbeda dengan day.csv: {report['missing']} hari hilang, "
+                               f"{report['extra']} hari tambahan, {mismatches} nilai berbeda")
+            if scope is not None:
+                catalog = store.get_catalog()
+                partitions = store.prune(catalog, *scope)
+                st.write(f"Partisi Dibaca: {len(partitions)} dari {len(catalog['partitions'])} "
+                         f"({store.partition_bytes(partitions) / 1024 ** 2:.2f} MB)")
+            if st.button("Muat Ulang Data"):
+                data_loader.invalidate_cache()
+                render_cache.clear()
+                st.rerun()
         
         # Menu analisis
         analysis_option = st.sidebar.radio(
@@ -867,151 +994,36 @@ def main():
              "Tren Waktu", "Pengguna Casual vs Terdaftar", "Kondisi Cuaca"]
         )
         
+        # Mode render untuk scatter/strip plot dengan banyak titik
+        render_mode = st.sidebar.radio(
+            "Mode Render Grafik:",
+            [RENDER_SERVER, RENDER_BROWSER],
+            help=f"Mode browser mengirim data ringkas ke Vega-Lite; di atas "
+                 f"{client_charts.POINT_THRESHOLD:,} titik data ditampilkan sebagai heatmap kepadatan."
+        )
+        
+        profiling.set_view(analysis_option)
+        
         if analysis_option == "Dashboard Utama":
-            # Judul Utama
-            st.title('Dashboard Analisis Data Bike Sharing')
-            st.write("""
-            Dashboard ini menyajikan analisis data peminjaman sepeda dengan fitur interaktif yang memungkinkan pengguna
-            untuk mengeksplorasi dan memanipulasi data secara langsung.
-            """)
-            
-            # KPI metrics
-            st.subheader("Metrik Utama")
-            col1, col2, col3, col4 = st.columns(4)
-            
-            total_rentals = int(day_df['cnt'].sum())
-            avg_daily = int(day_df['cnt'].mean())
-            max_daily = int(day_df['cnt'].max())
-            peak_month = day_df.groupby(day_df['dteday'].dt.month)['cnt'].mean().idxmax()
-            month_names = {1: 'Januari', 2: 'Februari', 3: 'Maret', 4: 'April', 5: 'Mei', 6: 'Juni',
-                          7: 'Juli', 8: 'Agustus', 9: 'September', 10: 'Oktober', 11: 'November', 12: 'Desember'}
-            
-            col1.metric("Total Peminjaman", f"{total_rentals:,}")
-            col2.metric("Rata-rata Harian", f"{avg_daily:,}")
-            col3.metric("Peminjaman Maksimum", f"{max_daily:,}")
-            col4.metric("Bulan Terpadat", month_names.get(peak_month, peak_month))
-            
-            # Visualisasi ringkasan
-            st.subheader("Ringkasan Visualisasi")
-            
-            # Baris 1: Tren waktu dan distribusi jam
-            row1_col1, row1_col2 = st.columns(2)
-            
-            with row1_col1:
-                # Tren waktu bulanan
-                monthly_data = day_df.groupby(day_df['dteday'].dt.to_period('M').dt.start_time)['cnt'].sum().reset_index()
-                
-                fig, ax = plt.subplots(figsize=(10, 6))
-                sns.lineplot(x='dteday', y='cnt', data=monthly_data, marker='o', ax=ax)
-                
-                ax.set_title('Tren Peminjaman Sepeda Bulanan', fontsize=15)
-                ax.set_xlabel('Bulan', fontsize=12)
-                ax.set_ylabel('Total Peminjaman', fontsize=12)
-                
-                # Format sumbu x untuk menampilkan bulan
-                date_labels = [d.strftime('%b %Y') for d in monthly_data['dteday']]
-                if len(date_labels) > 12:
-                    step = len(date_labels) // 12
-                    plt.xticks(range(0, len(date_labels), step), [date_labels[i] for i in range(0, len(date_labels), step)], rotation=45)
-                else:
-                    plt.xticks(range(len(date_labels)), date_labels, rotation=45)
-                
-                plt.tight_layout()
-                st.pyplot(fig)
-            
-            with row1_col2:
-                # Distribusi jam
-                hourly_data = hour_df.groupby('hr')['cnt'].mean()
-                
-                fig, ax = plt.subplots(figsize=(10, 6))
-                sns.lineplot(x=hourly_data.index, y=hourly_data.values, marker='o', ax=ax)
-                
-                ax.set_title('Rata-rata Peminjaman Sepeda Berdasarkan Jam', fontsize=15)
-                ax.set_xlabel('Jam', fontsize=12)
-                ax.set_ylabel('Rata-rata Peminjaman', fontsize=12)
-                ax.set_xticks(range(0, 24, 2))
-                
-                plt.tight_layout()
-                st.pyplot(fig)
-            
-            # Baris 2: Pengaruh cuaca dan proporsi pengguna
-            row2_col1, row2_col2 = st.columns(2)
-            
-            with row2_col1:
-                # Korelasi suhu dan peminjaman
-                fig, ax = plt.subplots(figsize=(10, 6))
-                
-                sns.scatterplot(x='temp_celsius', y='cnt', data=day_df, alpha=0.7, ax=ax)
-                sns.regplot(x='temp_celsius', y='cnt', data=day_df, scatter=False, ax=ax)
-                
-                ax.set_title('Korelasi antara Suhu dan Jumlah Peminjaman', fontsize=15)
-                ax.set_xlabel('Suhu (°C)', fontsize=12)
-                ax.set_ylabel('Jumlah Peminjaman', fontsize=12)
-                
-                plt.tight_layout()
-                st.pyplot(fig)
-            
-            with row2_col2:
-                # Proporsi pengguna casual vs registered
-                casual_total = day_df['casual'].sum()
-                registered_total = day_df['registered'].sum()
-                
-                proportions = [casual_total, registered_total]
-                labels = ['Casual', 'Registered']
-                
-                fig, ax = plt.subplots(figsize=(10, 6))
-                ax.pie(proportions, labels=labels, autopct='%1.1f%%', startangle=90,
-                      wedgeprops={'edgecolor': 'white', 'linewidth': 1})
-                
-                ax.set_title('Proporsi Pengguna Casual vs Terdaftar', fontsize=15)
-                
-                plt.tight_layout()
-                st.pyplot(fig)
-            
-            # Tabel Temuan Utama
-            st.subheader("Temuan Utama")
-            
-            st.write("""
-            **Temuan Utama Analisis Bike Sharing:**
-            
-            1. **Pola Harian:** 
-              - Peminjaman sepeda tertinggi pada hari kerja
-              - Puncak peminjaman di hari Selasa dan Rabu
-            
-            2. **Distribusi Jam:**
-              - Dua puncak peminjaman pada pagi (07-09) dan sore (17-19)
-              - Pola terkait aktivitas komuter
-            
-            3. **Pengaruh Suhu:**
-              - Korelasi positif antara suhu dan jumlah peminjaman
-              - Cuaca hangat mendorong peningkatan penggunaan sepeda
-            
-            4. **Kondisi Cuaca:**
-              - Variasi peminjaman signifikan antar kondisi cuaca
-              - Cuaca cerah cenderung meningkatkan jumlah peminjaman
-            
-            5. **Profil Pengguna:**
-              - Pengguna terdaftar mendominasi peminjaman sepeda
-              - Pengguna casual lebih terpengaruh oleh kondisi cuaca
-            """)
+            show_overview(day_df, hour_cube)
         
         elif analysis_option == "Tren Harian":
             interactive_daily_trends(day_df)
         
         elif analysis_option == "Distribusi Jam":
-            interactive_hourly_distribution(hour_df)
+            interactive_hourly_distribution(hour_cube)
         
         elif analysis_option == "Korelasi Cuaca":
-            interactive_weather_analysis(hour_df)
+            interactive_weather_analysis(hour_df, render_mode)
         
         elif analysis_option == "Tren Waktu":
-            interactive_time_series(day_df)
+            interactive_time_series(day_df, hour_df)
             
         elif analysis_option == "Pengguna Casual vs Terdaftar":
             interactive_user_comparison(day_df, hour_df)
             
         elif analysis_option == "Kondisi Cuaca":
-            interactive_weather_conditions(hour_df)
+            interactive_weather_conditions(hour_df, render_mode)
 
 if __name__ == '__main__':
     main()
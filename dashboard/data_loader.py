@@ -0,0 +1,746 @@
+import io
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# pyarrow bersifat opsional; tanpa pyarrow data selalu dibaca dari CSV
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+    feather = None
+
+# Lokasi file data yang dicoba secara berurutan
+DATA_DIRS = ['.', './data']
+
+# Nama hari berdasarkan kolom weekday
+DAY_NAMES = {0: 'Sunday', 1: 'Monday', 2: 'Tuesday', 3: 'Wednesday', 4: 'Thursday', 5: 'Friday', 6: 'Saturday'}
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Label musim dan kondisi cuaca
+SEASON_LABELS = {1: 'Musim Semi', 2: 'Musim Panas', 3: 'Musim Gugur', 4: 'Musim Dingin'}
+WEATHER_LABELS = {
+    1: 'Cerah',
+    2: 'Berawan',
+    3: 'Hujan Ringan/Salju Ringan',
+    4: 'Hujan Lebat/Salju Lebat'
+}
+
+# Skema tipe data yang diterapkan saat parsing CSV.
+# Kolom kode kecil cukup uint8; kolom jumlah tetap int64 agar agregasi sum tidak overflow,
+# dan kolom cuaca tetap float64 agar nilai turunan (temp_celsius, dst.) tidak berubah.
+COLUMN_SCHEMA = {
+    'instant': 'int32',
+    'season': 'uint8',
+    'yr': 'uint8',
+    'mnth': 'uint8',
+    'hr': 'uint8',
+    'holiday': 'uint8',
+    'weekday': 'uint8',
+    'workingday': 'uint8',
+    'weathersit': 'uint8',
+    'temp': 'float64',
+    'atemp': 'float64',
+    'hum': 'float64',
+    'windspeed': 'float64',
+    'casual': 'int64',
+    'registered': 'int64',
+    'cnt': 'int64'
+}
+DATE_COLUMNS = ['dteday']
+
+# Kolom label kategorikal
+WEEKDAY_DTYPE = pd.CategoricalDtype(DAY_ORDER)
+SEASON_DTYPE = pd.CategoricalDtype(list(SEASON_LABELS.values()))
+WEATHER_DTYPE = pd.CategoricalDtype(list(WEATHER_LABELS.values()))
+
+# Snapshot kolumnar (Feather tanpa kompresi) disimpan di folder ini, di samping file CSV.
+# Set DASHBOARD_SNAPSHOT=0 untuk mematikan snapshot.
+SNAPSHOT_DIR = '.snapshot'
+USE_SNAPSHOT = os.environ.get('DASHBOARD_SNAPSHOT', '1') != '0'
+SNAPSHOT_SOURCE_KEY = b'dashboard.source_signature'
+# Naikkan nilai ini setiap kali skema atau preprocessing berubah agar snapshot lama dibuat ulang
+SNAPSHOT_FORMAT = 3
+
+# Mode ingest data per jam. 'memory' memuat seluruh hour.csv ke memori; 'stream' membaca
+# file per chunk dan hanya menyimpan ringkasannya (lihat streaming).
+INGEST_MODE = os.environ.get('DASHBOARD_INGEST', 'memory')
+STREAM_CHUNKSIZE = int(os.environ.get('DASHBOARD_CHUNKSIZE', '100000'))
+
+# Ingest inkremental: jika file CSV hanya bertambah baris di akhir, hanya bagian baru yang
+# dibaca dan digabung ke cache. Set DASHBOARD_INCREMENTAL=0 untuk selalu memuat ulang penuh.
+INCREMENTAL = os.environ.get('DASHBOARD_INCREMENTAL', '1') != '0'
+TAIL_WINDOW = 64 * 1024
+TAIL_CHECK = 256
+
+# Sumber data harian. 'csv' membaca day.csv; 'hour' menurunkan data harian dari data per
+# jam dengan satu reduksi per tanggal (lihat derive_daily), sehingga hanya hour.csv yang
+# di-parse dan kedua tabel tidak mungkin berbeda.
+DAY_SOURCES = ['csv', 'hour']
+DAY_SOURCE = os.environ.get('DASHBOARD_DAY_SOURCE', 'csv')
+if DAY_SOURCE not in DAY_SOURCES:
+    raise ValueError(f"DASHBOARD_DAY_SOURCE harus salah satu dari {', '.join(DAY_SOURCES)}")
+
+# Kolom day.csv: kolom kalender sama untuk setiap jam dalam sehari, kolom hitungan
+# dijumlahkan, dan kolom cuaca dirata-rata. Kolom cuaca di day.csv dibulatkan 6 desimal,
+# jadi selisih sebesar itu masih dianggap konsisten.
+DAY_CALENDAR_COLUMNS = ['season', 'yr', 'mnth', 'holiday', 'weekday', 'workingday']
+DAY_WEATHER_COLUMNS = ['temp', 'atemp', 'hum', 'windspeed']
+DAY_COUNT_COLUMNS = ['casual', 'registered', 'cnt']
+DAY_COLUMNS = (['instant', 'dteday'] + DAY_CALENDAR_COLUMNS + ['weathersit'] + DAY_WEATHER_COLUMNS
+               + DAY_COUNT_COLUMNS)
+DAY_WEATHER_TOLERANCE = 1e-6
+
+# Mode serving multi-proses: jika DASHBOARD_SHARED_DIR diisi, frame tidak dibaca dari CSV
+# tetapi di-attach dari file Arrow yang dipublikasikan satu proses loader (lihat serve.py).
+# File di-memory-map read-only, sehingga kolom numerik dipakai bersama oleh semua worker
+# tanpa salinan. Folder sebaiknya berada di /dev/shm (shared memory POSIX).
+SHARED_DIR = os.environ.get('DASHBOARD_SHARED_DIR')
+SHARED_NAMES = ('day', 'hour')
+
+# Cache data tingkat proses, dipakai bersama oleh semua sesi Streamlit.
+# Modul ini diimpor sekali per proses sehingga isinya bertahan antar rerun.
+_cache_lock = threading.Lock()
+_cache = {}
+_cache_stats = {'hits': 0, 'misses': 0, 'appends': 0, 'invalidations': 0}
+
+# Fungsi yang dipanggil setiap kali cache di-invalidate (misalnya untuk membatalkan precompute)
+_invalidate_hooks = []
+
+
+# Fungsi untuk mencari lokasi file day.csv dan hour.csv. Jika data harian diturunkan dari
+# data per jam, cukup hour.csv yang harus ada (day.csv hanya dipakai untuk pemeriksaan).
+def resolve_data_paths():
+    for data_dir in DATA_DIRS:
+        day_path = os.path.join(data_dir, 'day.csv')
+        hour_path = os.path.join(data_dir, 'hour.csv')
+        if os.path.exists(hour_path) and (DAY_SOURCE == 'hour' or os.path.exists(day_path)):
+            return day_path, hour_path
+    if DAY_SOURCE == 'hour':
+        raise FileNotFoundError("File 'hour.csv' tidak ditemukan")
+    raise FileNotFoundError("File 'day.csv' dan 'hour.csv' tidak ditemukan")
+
+
+# Tanda tangan file: path absolut, waktu modifikasi, dan ukuran
+def file_signature(path):
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+# Membaca CSV dengan skema tipe data; kolom yang tidak ada di file diabaikan
+def read_csv(path, **kwargs):
+    return pd.read_csv(path, dtype=COLUMN_SCHEMA, parse_dates=DATE_COLUMNS, **kwargs)
+
+
+# Ukuran memori (byte) tiap frame, termasuk isi kolom string
+def memory_report(frames):
+    return {name: int(df.memory_usage(deep=True).sum()) for name, df in frames.items()}
+
+
+# Fungsi preprocessing yang sama untuk data harian dan per jam
+def preprocess(df):
+    # Konversi tanggal
+    df['dteday'] = pd.to_datetime(df['dteday'])
+
+    # Menambahkan label kategorikal untuk hari, musim, dan kondisi cuaca
+    df['weekday_name'] = df['weekday'].map(DAY_NAMES).astype(WEEKDAY_DTYPE)
+    df['season_name'] = df['season'].map(SEASON_LABELS).astype(SEASON_DTYPE)
+    df['weather_name'] = df['weathersit'].map(WEATHER_LABELS).astype(WEATHER_DTYPE)
+
+    # Konversi suhu, kelembaban, dan kecepatan angin ke nilai sebenarnya
+    df['temp_celsius'] = df['temp'] * 41
+    df['hum_percent'] = df['hum'] * 100
+    df['windspeed_kph'] = df['windspeed'] * 67
+    return df
+
+
+# Lokasi snapshot untuk sebuah file CSV
+def snapshot_path(csv_path):
+    csv_path = os.path.abspath(csv_path)
+    name = os.path.splitext(os.path.basename(csv_path))[0] + '.feather'
+    return os.path.join(os.path.dirname(csv_path), SNAPSHOT_DIR, name)
+
+
+# Penanda file sumber yang disimpan di metadata snapshot
+def _source_marker(csv_path):
+    stat = os.stat(csv_path)
+    return f'{SNAPSHOT_FORMAT}:{stat.st_mtime_ns}:{stat.st_size}'.encode()
+
+
+# Membaca file Arrow dengan memory-map beserta penanda sumbernya. Kolom numerik tanpa
+# nilai kosong menunjuk langsung ke halaman file (read-only), bukan salinan.
+def read_arrow(path):
+    table = feather.read_table(path, memory_map=True)
+    metadata = table.schema.metadata or {}
+    return table.to_pandas(split_blocks=True), metadata.get(SNAPSHOT_SOURCE_KEY)
+
+
+# Menulis frame ke file Arrow tanpa kompresi secara atomik (file sementara lalu rename),
+# dengan penanda sumber di metadata skema. Setiap kolom ditulis sebagai satu chunk:
+# kolom yang terpecah harus disambung (disalin) saat dikonversi ke pandas.
+def write_arrow(df, path, source_marker):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[SNAPSHOT_SOURCE_KEY] = source_marker
+    table = table.replace_schema_metadata(metadata)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    feather.write_feather(table, tmp_path, compression='uncompressed', chunksize=max(1, len(df)))
+    os.replace(tmp_path, path)
+
+
+# Membaca snapshot dengan memory-map; None jika snapshot tidak ada atau sudah usang
+def read_snapshot(csv_path):
+    path = snapshot_path(csv_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        df, marker = read_arrow(path)
+    except Exception:
+        return None
+    if marker != _source_marker(csv_path):
+        return None
+    return df
+
+
+# Menulis snapshot di samping file CSV
+def write_snapshot(df, csv_path, source_marker):
+    path = snapshot_path(csv_path)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_arrow(df, path, source_marker)
+    except OSError:
+        # Folder data read-only: tetap jalan tanpa snapshot
+        pass
+
+
+# Membaca satu file: dari snapshot jika masih valid, jika tidak dari CSV
+def read_frame(csv_path, use_snapshot=None):
+    if use_snapshot is None:
+        use_snapshot = USE_SNAPSHOT
+    use_snapshot = use_snapshot and feather is not None
+
+    if use_snapshot:
+        df = read_snapshot(csv_path)
+        if df is not None:
+            return df
+
+    # Penanda diambil sebelum parsing agar perubahan file selama parsing tetap terdeteksi
+    source_marker = _source_marker(csv_path)
+    df = preprocess(read_csv(csv_path))
+    if use_snapshot:
+        write_snapshot(df, csv_path, source_marker)
+    return df
+
+
+# Membaca dan memproses kedua file tanpa cache; data harian diturunkan dari data per jam
+# jika DAY_SOURCE = 'hour'
+def read_frames(day_path, hour_path, use_snapshot=None):
+    hour_df = read_frame(hour_path, use_snapshot)
+    if DAY_SOURCE == 'hour':
+        return derive_daily(hour_df), hour_df
+    day_df = read_frame(day_path, use_snapshot)
+    return day_df, hour_df
+
+
+# Menurunkan data harian (kolom dan tipe sama seperti day.csv yang sudah diproses) dari data
+# per jam dalam satu reduksi berkelompok: setiap baris dipetakan ke kode tanggalnya sekali,
+# lalu kolom hitungan dan cuaca dijumlahkan per kode dengan np.bincount dan kolom kalender
+# diambil dari jam pertama setiap tanggal. weathersit harian adalah rata-rata weathersit per
+# jam yang dibulatkan ke atas pada .5, sama dengan day.csv.
+def derive_daily(hour_df):
+    codes, dates = pd.factorize(hour_df['dteday'], sort=True)
+    size = len(dates)
+    hours = np.bincount(codes, minlength=size)
+    # Penugasan terbalik: posisi yang ditulis terakhir adalah jam pertama setiap tanggal
+    first = np.empty(size, dtype='int64')
+    first[codes[::-1]] = np.arange(len(codes) - 1, -1, -1)
+
+    def mean(column):
+        return np.bincount(codes, weights=hour_df[column].to_numpy(dtype='float64'), minlength=size) / hours
+
+    table = {'instant': np.arange(1, size + 1), 'dteday': dates}
+    for column in DAY_CALENDAR_COLUMNS:
+        table[column] = hour_df[column].to_numpy()[first]
+    table['weathersit'] = np.floor(mean('weathersit') + 0.5)
+    for column in DAY_WEATHER_COLUMNS:
+        table[column] = mean(column)
+    for column in DAY_COUNT_COLUMNS:
+        table[column] = np.bincount(codes, weights=hour_df[column].to_numpy(dtype='float64'), minlength=size)
+    day_df = pd.DataFrame(table).astype({column: COLUMN_SCHEMA[column] for column in DAY_COLUMNS if column != 'dteday'})
+    return preprocess(day_df)
+
+
+# Hook append data harian turunan: hari yang tersentuh baris baru dihitung ulang dari baris
+# per jam hari-hari tersebut. Jika baris baru hanya membuka hari baru, hari baru cukup
+# disambung (delta = hari baru); jika baris baru melengkapi hari yang sudah ada, frame
+# harian diganti tanpa delta sehingga artefak turunannya dibangun ulang.
+def append_daily(day_df, hour_df, new_rows):
+    first = new_rows['dteday'].min()
+    kept = day_df[day_df['dteday'] < first]
+    new_days = derive_daily(hour_df[hour_df['dteday'] >= first])
+    new_days['instant'] = np.arange(len(kept) + 1, len(kept) + len(new_days) + 1, dtype=COLUMN_SCHEMA['instant'])
+    daily = pd.concat([kept, new_days], ignore_index=True)
+    return daily, (new_days if len(kept) == len(day_df) else None)
+
+
+# Data harian turunan untuk sebuah frame per jam, di-cache bersama data yang sedang dimuat
+def daily_frame(hour_df):
+    return derived(hour_df, 'daily', derive_daily, append_daily)
+
+
+# Membandingkan data harian turunan dengan day.csv: tanggal, kolom kalender, weathersit, dan
+# kolom hitungan harus sama persis; kolom cuaca boleh berbeda sebatas pembulatan day.csv.
+# Mengembalikan ringkasan perbedaan beserta status konsisten.
+def check_daily(day_df, day_path):
+    expected = read_csv(day_path, usecols=DAY_COLUMNS[1:]).set_index('dteday')
+    actual = day_df.set_index('dteday')
+    common = expected.index.intersection(actual.index)
+    report = {
+        'days': len(actual),
+        'missing': len(expected.index.difference(common)),
+        'extra': len(actual.index.difference(common)),
+    }
+    expected, actual = expected.loc[common], actual.loc[common]
+
+    exact_columns = DAY_CALENDAR_COLUMNS + ['weathersit'] + DAY_COUNT_COLUMNS
+    report['mismatches'] = {column: int((expected[column].to_numpy() != actual[column].to_numpy()).sum())
+                            for column in exact_columns}
+    report['weather_diff'] = {column: float(np.abs(expected[column].to_numpy() - actual[column].to_numpy()).max(initial=0))
+                              for column in DAY_WEATHER_COLUMNS}
+    report['consistent'] = (not report['missing'] and not report['extra'] and not any(report['mismatches'].values())
+                            and all(diff <= DAY_WEATHER_TOLERANCE for diff in report['weather_diff'].values()))
+    return report
+
+
+# Hasil pemeriksaan data harian turunan terhadap day.csv, di-cache bersama frame per jam;
+# None jika day.csv tidak ada
+def daily_consistency(hour_df, day_path=None):
+    if day_path is None:
+        day_path = resolve_data_paths()[0]
+    if not os.path.exists(day_path):
+        return None
+    return derived(hour_df, 'daily_consistency', lambda df: check_daily(daily_frame(df), day_path))
+
+
+# Posisi baca untuk ingest inkremental: offset setelah baris lengkap terakhir, potongan
+# byte sebelum offset (untuk memastikan isi lama tidak berubah), kolom header, dan
+# instant baris terakhir. None jika file tidak bisa dilacak secara inkremental.
+def tail_state(path, size):
+    with open(path, 'rb') as f:
+        header = f.readline()
+        start = max(0, size - TAIL_WINDOW)
+        f.seek(start)
+        window = f.read(size - start)
+
+    columns = header.decode().strip().split(',')
+    newline = window.rfind(b'\n')
+    if 'instant' not in columns or newline < 0:
+        return None
+    # Baris terakhir harus utuh di dalam jendela baca
+    if start > 0 and b'\n' not in window[:newline]:
+        return None
+    offset = start + newline + 1
+    if offset <= len(header):
+        return None
+
+    last_line = window[:newline].rsplit(b'\n', 1)[-1].decode()
+    try:
+        last_instant = int(last_line.split(',')[columns.index('instant')])
+    except (ValueError, IndexError):
+        return None
+    return {
+        'columns': columns,
+        'offset': offset,
+        'check': window[max(0, newline + 1 - TAIL_CHECK):newline + 1],
+        'last_instant': last_instant,
+    }
+
+
+# Membaca baris yang ditambahkan setelah posisi terakhir. Mengembalikan (baris baru, posisi
+# baru); baris baru None jika belum ada baris lengkap. Mengembalikan None jika perubahan
+# file bukan sekadar penambahan di akhir sehingga data harus dimuat ulang penuh.
+def read_appended(path, state):
+    size = os.stat(path).st_size
+    offset = state['offset']
+    if size < offset:
+        return None
+    with open(path, 'rb') as f:
+        f.seek(offset - len(state['check']))
+        if f.read(len(state['check'])) != state['check']:
+            return None
+        data = f.read(size - offset)
+
+    # Hanya baris lengkap yang dibaca; baris yang masih ditulis menunggu refresh berikutnya
+    data = data[:data.rfind(b'\n') + 1]
+    if not data.strip():
+        return None, state
+
+    tail = read_csv(io.BytesIO(data), header=None, names=state['columns'])
+    if tail['instant'].iloc[0] <= state['last_instant'] or not tail['instant'].is_monotonic_increasing:
+        return None
+    new_state = dict(state)
+    new_state['offset'] = offset + len(data)
+    new_state['check'] = (state['check'] + data)[-TAIL_CHECK:]
+    new_state['last_instant'] = int(tail['instant'].iloc[-1])
+    return tail, new_state
+
+
+# Menerapkan baris baru ke entri cache: objek yang dimuat diperbarui lewat append_fn,
+# lalu setiap artefak turunan yang punya hook append diperbarui dengan delta sumbernya.
+# Artefak tanpa hook dibuang dan akan dibangun ulang saat diminta, begitu pula artefak
+# yang sumbernya diganti tanpa delta (misalnya frame harian turunan yang harinya dihitung ulang).
+def _append_entry(entry, paths, signature, append_fn):
+    if entry['tails'] is None:
+        return False
+    tails = []
+    states = []
+    for path, state, old, new in zip(paths, entry['tails'], entry['signature'], signature):
+        # File yang berubah tanpa bertambah ukuran pasti diedit, bukan ditambah
+        if new != old and new[2] <= old[2]:
+            return False
+        result = read_appended(path, state)
+        if result is None:
+            return False
+        tails.append(result[0])
+        states.append(result[1])
+
+    objects, deltas = append_fn(entry['objects'], tails)
+    updates = {id(old): (new, delta) for old, new, delta in zip(entry['objects'], objects, deltas)}
+
+    derived_store = {}
+    hooks = {}
+    for (name, source_id), value in entry['derived'].items():
+        if source_id not in updates:
+            continue
+        source, delta = updates[source_id]
+        hook = entry['hooks'].get((name, source_id))
+        if delta is None and id(source) == source_id:
+            new_value, new_delta = value, None
+        elif delta is not None and hook is not None:
+            new_value, new_delta = hook(value, source, delta)
+        else:
+            continue
+        derived_store[(name, id(source))] = new_value
+        if hook is not None:
+            hooks[(name, id(source))] = hook
+        updates[id(value)] = (new_value, new_delta)
+
+    # Rentang tanggal yang terdampak, untuk invalidasi per rentang (lihat range_version)
+    for index, tail in enumerate(tails):
+        if tail is not None:
+            entry['append_log'].append((index, tail['dteday'].min(), tail['dteday'].max(), signature[index]))
+
+    entry['objects'] = objects
+    entry['derived'] = derived_store
+    entry['hooks'] = hooks
+    entry['tails'] = states
+    return True
+
+
+# Mengambil objek dari cache tingkat proses; build_fn hanya dipanggil jika entri belum
+# ada atau file sumbernya berubah. Jika file hanya bertambah baris di akhir dan append_fn
+# diberikan, hanya baris baru yang dibaca dan digabung ke objek yang sudah ada.
+def _load_cached(key, paths, build_fn, append_fn=None):
+    with _cache_lock:
+        signature = tuple(file_signature(path) for path in paths)
+        entry = _cache.get(key)
+        if entry is not None and entry['signature'] == signature:
+            _cache_stats['hits'] += 1
+            entry['used'] = time.monotonic()
+            return entry['objects']
+
+        if entry is not None and append_fn is not None and INCREMENTAL:
+            if _append_entry(entry, paths, signature, append_fn):
+                _cache_stats['appends'] += 1
+                entry['signature'] = signature
+                entry['used'] = time.monotonic()
+                return entry['objects']
+
+        _cache_stats['misses'] += 1
+        objects = build_fn()
+        tails = None
+        # Posisi baca hanya dicatat jika file tidak berubah selama parsing
+        if append_fn is not None and tuple(file_signature(path) for path in paths) == signature:
+            tails = [tail_state(path, size) for path, (_, _, size) in zip(paths, signature)]
+            if any(state is None for state in tails):
+                tails = None
+        _cache[key] = {
+            'key': key,
+            'used': time.monotonic(),
+            'signature': signature,
+            'base_signature': signature,
+            'objects': objects,
+            'derived': {},
+            'hooks': {},
+            'tails': tails,
+            'append_log': [],
+        }
+        return objects
+
+
+# Menggabungkan baris baru ke frame yang sudah dimuat; delta tiap frame adalah
+# baris baru yang sudah diproses (None jika file tersebut tidak berubah)
+def append_frames(frames, tails):
+    new_frames = []
+    deltas = []
+    for df, tail in zip(frames, tails):
+        if tail is None:
+            new_frames.append(df)
+            deltas.append(None)
+            continue
+        delta = preprocess(tail)
+        new_frames.append(pd.concat([df, delta], ignore_index=True))
+        deltas.append(delta)
+    return tuple(new_frames), deltas
+
+
+# Memuat data melalui cache; file hanya dibaca ulang jika mtime/ukurannya berubah
+def load_frames(day_path=None, hour_path=None):
+    if SHARED_DIR:
+        return load_shared(SHARED_DIR)
+    if day_path is None or hour_path is None:
+        day_path, hour_path = resolve_data_paths()
+
+    if DAY_SOURCE == 'hour':
+        hour_df = load_frame(hour_path)
+        return daily_frame(hour_df), hour_df
+
+    key = (os.path.abspath(day_path), os.path.abspath(hour_path))
+    return _load_cached(key, [day_path, hour_path], lambda: read_frames(day_path, hour_path), append_frames)
+
+
+# Lokasi file Arrow yang dipublikasikan di folder shared
+def shared_paths(shared_dir):
+    return [os.path.join(shared_dir, f'{name}.arrow') for name in SHARED_NAMES]
+
+
+# Mempublikasikan frame yang sudah diproses ke folder shared. Dipanggil oleh proses loader;
+# file lama diganti secara atomik sehingga worker yang masih memakainya tidak terganggu.
+# derived_builders (opsional) berisi artefak turunan berbentuk frame yang ikut dipublikasikan,
+# {nama: (indeks frame sumber, build_fn)}, misalnya cube per jam.
+def publish_frames(shared_dir, day_path=None, hour_path=None, derived_builders=None):
+    if feather is None:
+        raise ImportError("Mode shared memory membutuhkan pyarrow")
+    if day_path is None or hour_path is None:
+        day_path, hour_path = resolve_data_paths()
+    os.makedirs(shared_dir, exist_ok=True)
+
+    # Penanda diambil sebelum parsing agar perubahan file selama parsing tetap terdeteksi;
+    # data harian turunan mengikuti penanda file per jam
+    markers = [_source_marker(hour_path if DAY_SOURCE == 'hour' else day_path), _source_marker(hour_path)]
+    frames = read_frames(day_path, hour_path)
+    # Artefak ditulis sebelum frame: worker baru meng-attach ulang setelah frame berubah
+    for name, (index, build_fn) in (derived_builders or {}).items():
+        path = os.path.join(shared_dir, f'{SHARED_NAMES[index]}.{name}.arrow')
+        write_arrow(build_fn(frames[index]), path, markers[index])
+    for df, path, marker in zip(frames, shared_paths(shared_dir), markers):
+        write_arrow(df, path, marker)
+
+
+# Meng-attach frame yang dipublikasikan proses loader (zero-copy, read-only). Entri cache
+# mengikuti tanda tangan file Arrow, jadi publikasi ulang otomatis di-attach ulang.
+# Artefak turunan yang ikut dipublikasikan langsung dimasukkan ke cache derived,
+# sehingga worker tidak membangunnya sendiri. Artefak hanya dipakai jika penanda
+# sumbernya sama dengan penanda frame yang di-attach: saat publikasi ulang berjalan,
+# artefak baru bisa sudah ditulis sementara frame masih versi lama. Artefak yang tidak
+# cocok dilewati dan dibangun ulang oleh worker saat dibutuhkan.
+def load_shared(shared_dir):
+    if feather is None:
+        raise ImportError("Mode shared memory membutuhkan pyarrow")
+    paths = shared_paths(shared_dir)
+    key = ('shared', os.path.abspath(shared_dir))
+    attached = {}
+
+    def build():
+        frames = []
+        for source, path in zip(SHARED_NAMES, paths):
+            df, marker = read_arrow(path)
+            frames.append(df)
+            prefix = f'{source}.'
+            for file_name in os.listdir(shared_dir):
+                if not file_name.startswith(prefix) or file_name.count('.') != 2 or not file_name.endswith('.arrow'):
+                    continue
+                value, derived_marker = read_arrow(os.path.join(shared_dir, file_name))
+                if derived_marker == marker:
+                    attached[(file_name[len(prefix):-len('.arrow')], id(df))] = value
+        return tuple(frames)
+
+    frames = _load_cached(key, paths, build)
+    # Hanya pemanggil yang membangun entri yang mengisi artefak turunannya
+    if attached:
+        with _cache_lock:
+            entry = _cache.get(key)
+            if entry is not None and entry['objects'] is frames:
+                for name_key, value in attached.items():
+                    entry['derived'].setdefault(name_key, value)
+    return frames
+
+
+# Memuat data dari beberapa file partisi melalui cache (lihat store.py): setiap file dibaca
+# (dari snapshot jika masih valid) lalu disambung per jenis data. row_filter (opsional)
+# memfilter baris frame gabungan. Tidak ada append inkremental; jika salah satu file
+# berubah, cakupan ini dimuat ulang. Jika DAY_SOURCE = 'hour', file harian tidak dibaca
+# dan data harian diturunkan dari frame per jam gabungan.
+def load_partitions(key, day_paths, hour_paths, row_filter=None):
+    def read(paths):
+        df = pd.concat([read_frame(path) for path in paths], ignore_index=True)
+        return row_filter(df) if row_filter is not None else df
+
+    if DAY_SOURCE == 'hour':
+        def build():
+            hour_df = read(hour_paths)
+            return derive_daily(hour_df), hour_df
+        return _load_cached(key, list(hour_paths), build)
+    return _load_cached(key, list(day_paths) + list(hour_paths), lambda: (read(day_paths), read(hour_paths)))
+
+
+# Membuang entri cache berjenis `kind` (elemen pertama kunci) yang paling lama tidak
+# dipakai sehingga tersisa paling banyak `keep` entri
+def evict(kind, keep):
+    with _cache_lock:
+        keys = sorted((key for key in _cache if key[0] == kind), key=lambda key: _cache[key]['used'])
+        for key in keys[:max(0, len(keys) - keep)]:
+            del _cache[key]
+
+
+# Memuat satu file melalui cache (misalnya hanya data harian pada mode streaming)
+def load_frame(path):
+    key = ('frame', os.path.abspath(path))
+    return _load_cached(key, [path], lambda: (read_frame(path),), append_frames)[0]
+
+
+# Memuat hasil agregasi streaming sebuah file melalui cache. build_fn menerima path
+# dan mengembalikan objek ringkas (misalnya cube), bukan frame mentah. append_fn
+# (opsional) menerima (objek lama, baris baru mentah) dan mengembalikan (objek baru, delta).
+def load_streamed(path, name, build_fn, append_fn=None):
+    key = ('stream', name, os.path.abspath(path))
+    def append_objects(objects, tails):
+        value, delta = append_fn(objects[0], tails[0])
+        return (value,), [delta]
+    return _load_cached(key, [path], lambda: (build_fn(path),),
+                        append_objects if append_fn is not None else None)[0]
+
+
+# Entri cache yang memuat objek ini, baik objek yang dimuat maupun artefak turunannya
+def _find_entry(obj):
+    for entry in _cache.values():
+        if any(item is obj for item in entry['objects']):
+            return entry
+        if any(value is obj for value in entry['derived'].values()):
+            return entry
+    return None
+
+
+# Artefak turunan (cube, indeks, statistik) di-cache bersama frame asalnya,
+# sehingga ikut terbuang saat data dimuat ulang atau cache di-invalidate.
+# Frame yang tidak berasal dari cache dihitung langsung tanpa disimpan.
+# append_fn(nilai lama, sumber baru, delta sumber) -> (nilai baru, delta) dipakai untuk
+# memperbarui artefak saat ada baris baru; tanpa hook, artefak dibangun ulang.
+def derived(df, name, build_fn, append_fn=None):
+    with _cache_lock:
+        entry = _find_entry(df)
+        key = (name, id(df))
+        if entry is not None and key in entry['derived']:
+            return entry['derived'][key]
+
+    value = build_fn(df)
+    if entry is not None:
+        with _cache_lock:
+            # Entri bisa saja sudah diganti (reload atau append) selama artefak dibangun
+            if _find_entry(df) is entry:
+                value = entry['derived'].setdefault(key, value)
+                if append_fn is not None:
+                    entry['hooks'][key] = append_fn
+    return value
+
+
+# Versi data yang sedang di-cache, dipakai sebagai bagian dari kunci cache lain
+def data_version(day_path=None, hour_path=None):
+    if day_path is None or hour_path is None:
+        day_path, hour_path = resolve_data_paths()
+    if DAY_SOURCE == 'hour':
+        return (None, file_signature(hour_path))
+    return (file_signature(day_path), file_signature(hour_path))
+
+
+# Versi data (kunci cache dan tanda tangan file) untuk frame atau artefak yang berasal dari
+# cache; None jika bukan. Kunci ikut disertakan karena beberapa cakupan data (lihat store.py)
+# bisa dibangun dari file yang sama.
+def frame_version(df):
+    with _cache_lock:
+        entry = _find_entry(df)
+        if entry is not None:
+            return (entry['key'], entry['signature'])
+    return None
+
+
+# Versi data yang juga membedakan objek di dalam satu entri cache: posisi frame pada entri,
+# atau nama artefak turunan beserta posisi sumbernya. Nilainya sama di setiap proses yang
+# membaca file data yang sama, sehingga bisa menjadi kunci cache di luar proses (lihat
+# disk_cache); None jika objek tidak berasal dari cache.
+def object_version(obj):
+    with _cache_lock:
+        entry = _find_entry(obj)
+        if entry is None:
+            return None
+        return (entry['key'], entry['signature'], _object_path(entry, obj))
+
+
+def _object_path(entry, obj):
+    for index, item in enumerate(entry['objects']):
+        if item is obj:
+            return index
+    sources = {id(item): item for item in entry['objects']}
+    sources.update((id(value), value) for value in entry['derived'].values())
+    for (name, source_id), value in entry['derived'].items():
+        if value is obj and source_id in sources:
+            return (name, _object_path(entry, sources[source_id]))
+    return None
+
+
+# Versi data untuk rentang tanggal tertentu pada frame dari cache. Versi ini hanya
+# berubah jika baris yang ditambahkan secara inkremental jatuh di dalam rentang,
+# sehingga cache lain (misalnya gambar) untuk rentang lain tetap berlaku.
+def range_version(df, start, end):
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    with _cache_lock:
+        entry = _find_entry(df)
+        if entry is None:
+            return None
+        index = next((i for i, item in enumerate(entry['objects']) if item is df), None)
+        if index is None:
+            return (entry['key'], entry['signature'])
+        # Append dicatat dengan tanda tangan file setelah append, bukan nomor urutnya, agar
+        # versi yang sama di proses lain berarti isi data yang sama
+        appends = tuple(
+            appended for log_index, first, last, appended in entry['append_log']
+            if log_index == index and first <= end and last >= start
+        )
+        return (entry['key'], entry['base_signature'], index, appends)
+
+
+# Hook untuk membuang cache secara eksplisit (misalnya setelah data diperbarui)
+def invalidate_cache():
+    with _cache_lock:
+        _cache.clear()
+        _cache_stats['invalidations'] += 1
+    for hook in list(_invalidate_hooks):
+        hook()
+
+
+# Mendaftarkan fungsi yang dipanggil setelah cache di-invalidate
+def on_invalidate(fn):
+    if fn not in _invalidate_hooks:
+        _invalidate_hooks.append(fn)
+
+
+# Statistik hit/miss cache data
+def cache_info():
+    with _cache_lock:
+        info = dict(_cache_stats)
+        info['entries'] = len(_cache)
+    return info
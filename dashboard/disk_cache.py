@@ -0,0 +1,279 @@
+import fcntl
+import functools
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+import data_loader
+import lazy
+import profiling
+
+
+# Cache hasil di disk yang bertahan setelah server di-restart dan bisa dipakai bersama
+# beberapa replika (folder yang sama, misalnya volume bersama). Isinya gambar PNG hasil
+# render dan tabel agregasi lapisan query (Parquet). Setiap entri dialamati hash SHA-256
+# dari kuncinya (view atau query, parameter, dan versi data), sehingga entri untuk data
+# atau parameter lain tidak pernah tertukar dan entri lama cukup dibiarkan tersingkir.
+#
+#   <DASHBOARD_DISK_CACHE>/<jenis>/<2 karakter hash>/<hash>.<ekstensi>
+#
+# Entri ditulis ke file sementara lalu di-rename (atomik), jadi pembaca di proses lain
+# tidak pernah melihat file setengah jadi. Waktu modifikasi file diperbarui setiap kali
+# entri dibaca dan dipakai sebagai urutan LRU: jika ukuran total melebihi batas, entri yang
+# paling lama tidak dipakai dihapus oleh satu proses saja (flock pada file .lock).
+# Versi data berasal dari tanda tangan file (path, mtime, ukuran), jadi replika harus
+# membaca file data yang sama.
+DIR = os.environ.get('DASHBOARD_DISK_CACHE')
+ENABLED = bool(DIR)
+MAX_BYTES = int(os.environ.get('DASHBOARD_DISK_CACHE_MB', '512')) * 1024 ** 2
+
+# Naikkan nilai ini setiap kali isi entri berubah (misalnya gaya grafik) agar entri lama tidak dipakai
+CACHE_FORMAT = 2
+EXTENSIONS = {'png': '.png', 'table': '.parquet'}
+LOCK_NAME = '.lock'
+
+# Setelah penghapusan, ukuran total diturunkan sampai fraksi batas ini agar penghapusan
+# tidak terjadi pada setiap penulisan berikutnya
+LOW_WATER = 0.9
+# File sementara milik proses yang mati di tengah penulisan dihapus setelah selang ini (detik)
+STALE_TMP_SECONDS = 3600
+
+# Statistik per proses dan per jenis entri
+_lock = threading.Lock()
+_stats = {kind: {'hits': 0, 'misses': 0, 'writes': 0, 'errors': 0, 'bytes_read': 0, 'bytes_written': 0}
+          for kind in EXTENSIONS}
+# Perkiraan ukuran total folder cache (dari pemindaian terakhir ditambah penulisan sejak itu)
+_usage = {'bytes': None, 'entries': None, 'written': 0, 'evictions': 0}
+
+
+def _count(kind, name, amount=1):
+    with _lock:
+        _stats[kind][name] += amount
+
+
+# Hash SHA-256 dari kunci entri. Kunci berisi tuple nilai sederhana (string, angka,
+# tanggal, tuple) yang repr-nya sama di setiap proses.
+def digest(kind, key):
+    return hashlib.sha256(repr((CACHE_FORMAT, kind, key)).encode()).hexdigest()
+
+
+# Lokasi file untuk sebuah entri
+def entry_path(kind, key, root=None):
+    name = digest(kind, key)
+    return os.path.join(root or DIR, kind, name[:2], name + EXTENSIONS[kind])
+
+
+# Membaca byte sebuah entri; None jika belum ada (atau baru saja dihapus proses lain)
+def read(kind, key):
+    if not ENABLED or key is None:
+        return None
+    path = entry_path(kind, key)
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        _count(kind, 'misses')
+        return None
+    try:
+        # Menandai entri sebagai baru dipakai (urutan LRU)
+        os.utime(path)
+    except OSError:
+        pass
+    _count(kind, 'hits')
+    _count(kind, 'bytes_read', len(data))
+    return data
+
+
+# Menulis entri secara atomik (file sementara lalu rename). Penulisan yang gagal (misalnya
+# disk penuh atau folder read-only) hanya dicatat; hasil tetap dipakai dari memori.
+def write(kind, key, data):
+    if not ENABLED or key is None:
+        return
+    path = entry_path(kind, key)
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        _count(kind, 'errors')
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return
+    _count(kind, 'writes')
+    _count(kind, 'bytes_written', len(data))
+    with _lock:
+        _usage['written'] += len(data)
+        due = _usage['bytes'] is None or _usage['bytes'] + _usage['written'] > MAX_BYTES
+    if due:
+        evict()
+
+
+# Semua file di folder cache: (path, ukuran, waktu modifikasi)
+def _scan(root):
+    files = []
+    for kind in EXTENSIONS:
+        for dirpath, _, names in os.walk(os.path.join(root, kind)):
+            for name in names:
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((path, stat.st_size, stat.st_mtime))
+    return files
+
+
+# Menghapus entri yang paling lama tidak dipakai sampai ukuran total di bawah batas. Hanya
+# satu proses yang menghapus pada satu waktu; proses lain yang mendapati lock sedang
+# dipegang melewatkan giliran ini. Mengembalikan jumlah entri yang dihapus.
+def evict(max_bytes=None):
+    max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+    os.makedirs(DIR, exist_ok=True)
+    with open(os.path.join(DIR, LOCK_NAME), 'a') as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return 0
+        try:
+            now = time.time()
+            files = []
+            removed = 0
+            for path, size, mtime in _scan(DIR):
+                if path.endswith('.tmp'):
+                    if now - mtime > STALE_TMP_SECONDS:
+                        _remove(path)
+                    continue
+                files.append((mtime, size, path))
+            total = sum(size for _, size, _ in files)
+            if total > max_bytes:
+                files.sort()
+                for mtime, size, path in files:
+                    if total <= max_bytes * LOW_WATER:
+                        break
+                    if _remove(path):
+                        total -= size
+                        removed += 1
+            with _lock:
+                _usage.update(bytes=total, entries=len(files) - removed, written=0)
+                _usage['evictions'] += removed
+            return removed
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
+
+
+# Menghapus semua entri (dipakai benchmark)
+def clear():
+    for path, _, _ in _scan(DIR):
+        _remove(path)
+    with _lock:
+        _usage.update(bytes=0, entries=0, written=0)
+
+
+# DataFrame/Series ke byte Parquet. Series disimpan sebagai frame satu kolom dan namanya
+# dicatat di metadata skema.
+def table_to_bytes(value):
+    is_series = isinstance(value, pd.Series)
+    frame = value.to_frame(name='__series__') if is_series else value
+    table = lazy.module('pyarrow').Table.from_pandas(frame)
+    if is_series:
+        table = table.replace_schema_metadata({
+            **table.schema.metadata, b'dashboard_series': json.dumps(value.name).encode()})
+    buffer = io.BytesIO()
+    lazy.module('pyarrow.parquet').write_table(table, buffer)
+    return buffer.getvalue()
+
+
+def table_from_bytes(data):
+    table = lazy.module('pyarrow.parquet').read_table(io.BytesIO(data))
+    frame = table.to_pandas()
+    series_name = (table.schema.metadata or {}).get(b'dashboard_series')
+    if series_name is None:
+        return frame
+    return frame.iloc[:, 0].rename(json.loads(series_name))
+
+
+# Apakah pyarrow (untuk Parquet) tersedia; tanpa pyarrow tabel agregasi tidak disimpan ke disk
+@functools.cache
+def has_parquet():
+    try:
+        lazy.module('pyarrow.parquet')
+    except ImportError:
+        return False
+    return True
+
+
+# Mengambil tabel dari cache disk, atau menghitungnya lewat build_fn lalu menyimpannya.
+# Hasil selain DataFrame/Series dikembalikan apa adanya tanpa disimpan.
+def get_table(key, build_fn):
+    if not ENABLED or key is None or not has_parquet():
+        return build_fn()
+    data = read('table', key)
+    if data is not None:
+        with profiling.phase('disk_cache'):
+            return table_from_bytes(data)
+    value = build_fn()
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        with profiling.phase('disk_cache'):
+            write('table', key, table_to_bytes(value))
+    return value
+
+
+# Bagian kunci untuk satu argumen query: frame dan cube diwakili versi datanya (lihat
+# data_loader.object_version), daftar diubah menjadi tuple
+def _key_part(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return ('frame', data_loader.object_version(value))
+    if isinstance(value, (list, tuple)):
+        return tuple(_key_part(item) for item in value)
+    return value
+
+
+# Dekorator untuk fungsi lapisan query yang mengembalikan tabel: hasilnya di-cache di disk
+# per (nama fungsi, backend, argumen, versi data frame argumen). Pemanggilan dengan frame
+# yang tidak berasal dari cache data (versinya tidak diketahui) dihitung langsung.
+def cached_table(backend_fn):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            parts = tuple(_key_part(arg) for arg in args) + tuple(
+                (name, _key_part(value)) for name, value in sorted(kwargs.items()))
+            frames = [arg for arg in (*args, *kwargs.values()) if isinstance(arg, (pd.DataFrame, pd.Series))]
+            if not frames or any(data_loader.object_version(frame) is None for frame in frames):
+                return fn(*args, **kwargs)
+            return get_table((fn.__name__, backend_fn(), parts), lambda: fn(*args, **kwargs))
+        return wrapper
+    return decorator
+
+
+# Statistik cache disk proses ini per jenis entri (termasuk hit rate) dan ukuran folder
+# dari pemindaian terakhir
+def cache_info():
+    with _lock:
+        info = {kind: dict(stats) for kind, stats in _stats.items()}
+        usage = dict(_usage)
+    for stats in info.values():
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else None
+    info['evictions'] = usage['evictions']
+    info['bytes'] = None if usage['bytes'] is None else usage['bytes'] + usage['written']
+    info['entries'] = usage['entries']
+    return info
@@ -0,0 +1,367 @@
+import pandas as pd
+
+import data_loader
+import lazy
+
+# Fungsi-fungsi di modul ini hanya menggambar: menerima data yang sudah diagregasi
+# beserta parameter tampilan, lalu mengembalikan figure matplotlib. Tidak ada
+# pemanggilan Streamlit di sini, sehingga figure bisa dirender di luar sesi.
+
+VAR_LABELS = {
+    "cnt": "Total Peminjaman",
+    "casual": "Peminjaman Pengguna Casual",
+    "registered": "Peminjaman Pengguna Terdaftar"
+}
+
+X_LABELS = {
+    "temp_celsius": "Suhu (°C)",
+    "hum_percent": "Kelembaban (%)",
+    "windspeed_kph": "Kecepatan Angin (km/h)"
+}
+
+
+# matplotlib.pyplot dan seaborn (yang ikut memuat scipy) baru dimuat saat grafik pertama
+# digambar, sehingga proses yang belum menggambar apa pun tidak membayar biaya importnya
+def _plotting():
+    return lazy.module('matplotlib.pyplot'), lazy.module('seaborn')
+
+
+# Label sumbu x untuk periode mingguan/bulanan (maksimal sekitar 12 label)
+def _set_period_ticks(periods, freq):
+    plt = lazy.module('matplotlib.pyplot')
+    if freq in ("Harian", "Per Jam"):
+        plt.xticks(rotation=45)
+    else:
+        # Untuk mingguan dan bulanan, format label tanggal
+        date_fmt = '%b %d' if freq == "Mingguan" else '%b %Y'
+        new_labels = [d.strftime(date_fmt) for d in periods]
+
+        # Jika terlalu banyak label, pilih subset
+        if len(new_labels) > 12:
+            step = len(new_labels) // 12
+            plt.xticks(range(0, len(new_labels), step), [new_labels[i] for i in range(0, len(new_labels), step)], rotation=45)
+        else:
+            plt.xticks(range(len(new_labels)), new_labels, rotation=45)
+
+
+# Box plot dari statistik ringkasan (lihat sketch.plot_stats) dengan gaya seperti sns.boxplot
+def _summary_boxplot(ax, boxes):
+    line = {'color': '0.25'}
+    ax.bxp(boxes, positions=range(len(boxes)), widths=0.8, patch_artist=True,
+           boxprops={'facecolor': 'C0', 'edgecolor': '0.25'}, medianprops=line, whiskerprops=line, capprops=line,
+           flierprops={'marker': 'd', 'markerfacecolor': '0.25', 'markeredgecolor': '0.25', 'markersize': 4})
+    ax.set_xticks(range(len(boxes)), [box['label'] for box in boxes])
+    ax.set_xlim(-0.5, len(boxes) - 0.5)
+
+
+# Violin plot dari statistik ringkasan, dengan box kecil di dalamnya seperti sns.violinplot
+def _summary_violinplot(ax, boxes, violins):
+    positions = range(len(violins))
+    parts = ax.violin(violins, positions=positions, widths=0.8, showextrema=False)
+    for body in parts['bodies']:
+        body.set_facecolor('C0')
+        body.set_edgecolor('0.25')
+        body.set_alpha(1)
+    for position, box in zip(positions, boxes):
+        ax.vlines(position, box['whislo'], box['whishi'], color='0.25', linewidth=1.5)
+        ax.vlines(position, box['q1'], box['q3'], color='0.25', linewidth=5)
+        ax.scatter([position], [box['med']], color='white', s=20, zorder=3)
+    ax.set_xticks(positions, [box['label'] for box in boxes])
+    ax.set_xlim(-0.5, len(violins) - 0.5)
+
+
+# Tren harian: bar/line dari data agregasi atau box plot dari data harian.
+# Jika summary (box, violin) diberikan, box plot digambar dari ringkasan sketch.
+def daily_trends(daily_data, day_df, plot_type, agg_method, y_var, summary=None):
+    plt, sns = _plotting()
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    if plot_type == "Bar Chart":
+        sns.barplot(x=daily_data.index, y=daily_data.values, ax=ax)
+    elif plot_type == "Line Chart":
+        sns.lineplot(x=daily_data.index, y=daily_data.values, ax=ax, marker='o')
+    elif summary is not None:  # Box Plot dari ringkasan
+        _summary_boxplot(ax, summary[0])
+    else:  # Box Plot
+        sns.boxplot(x='weekday_name', y=y_var, data=day_df, order=data_loader.DAY_ORDER, ax=ax)
+
+    ax.set_title(f'{agg_method} {VAR_LABELS.get(y_var, y_var)} Berdasarkan Hari', fontsize=15)
+    ax.set_xlabel('Hari', fontsize=12)
+    ax.set_ylabel(f'{VAR_LABELS.get(y_var, y_var)}', fontsize=12)
+    ax.tick_params(axis='x', rotation=45)
+    return fig
+
+
+# Rata-rata per jam dengan anotasi puncak pagi dan sore
+def hourly_line(hourly_data, y_var):
+    plt, sns = _plotting()
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    sns.lineplot(x=hourly_data.index, y=hourly_data.values, ax=ax, marker='o')
+
+    ax.set_title(f'Rata-rata {VAR_LABELS.get(y_var, y_var)} Berdasarkan Jam', fontsize=15)
+    ax.set_xlabel('Jam', fontsize=12)
+    ax.set_ylabel(f'Rata-rata {VAR_LABELS.get(y_var, y_var)}', fontsize=12)
+    ax.set_xticks(range(0, 24))
+
+    # Menambahkan anotasi pola
+    if y_var == "cnt":
+        morning_peak = hourly_data.iloc[7:10].idxmax()
+        evening_peak = hourly_data.iloc[16:20].idxmax()
+
+        # Pastikan nilai peak ada sebelum menambahkan anotasi
+        if not pd.isna(hourly_data[morning_peak]):
+            ax.annotate(f'Puncak Pagi: {morning_peak}:00',
+                        xy=(morning_peak, hourly_data[morning_peak]),
+                        xytext=(morning_peak-1, hourly_data[morning_peak]+100),
+                        arrowprops=dict(facecolor='black', shrink=0.05))
+
+        if not pd.isna(hourly_data[evening_peak]):
+            ax.annotate(f'Puncak Sore: {evening_peak}:00',
+                        xy=(evening_peak, hourly_data[evening_peak]),
+                        xytext=(evening_peak-1, hourly_data[evening_peak]+100),
+                        arrowprops=dict(facecolor='black', shrink=0.05))
+    return fig
+
+
+# Heatmap rata-rata per jam dan hari
+def hourly_heatmap(pivot_df, y_var):
+    plt, sns = _plotting()
+    fig, ax = plt.subplots(figsize=(10, 8))
+    sns.heatmap(pivot_df, cmap='YlGnBu', ax=ax, annot=False, fmt=".0f")
+    ax.set_title(f'Rata-rata {VAR_LABELS.get(y_var, y_var)} Berdasarkan Jam dan Hari', fontsize=15)
+    return fig
+
+
+# Garis regresi dengan pita interval kepercayaan, dari hasil regression.regression_line
+def _regression_band(ax, line, color):
+    if line is None:
+        return
+    ax.fill_between(line['x'], line['lo'], line['hi'], color=color, alpha=0.15, linewidth=0)
+    ax.plot(line['x'], line['y'], color=color)
+
+
+# Scatter plot faktor cuaca vs peminjaman dengan garis regresi dan nilai korelasi.
+# Garis regresi dan korelasi (line) sudah dihitung dari statistik cukup per kondisi cuaca.
+def weather_scatter(filtered_df, x_var, y_var, line):
+    plt, sns = _plotting()
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    # Scatter plot dengan faktor cuaca
+    sns.scatterplot(
+        x=x_var,
+        y=y_var,
+        data=filtered_df,
+        hue='weathersit',
+        palette='viridis',
+        alpha=0.6,
+        ax=ax
+    )
+
+    # Garis regresi
+    _regression_band(ax, line, 'red')
+
+    # Mempercantik legend
+    weather_options = data_loader.WEATHER_LABELS
+    handles, labels = ax.get_legend_handles_labels()
+    weather_labels = [weather_options.get(int(float(label)), label) if label.replace('.', '', 1).isdigit() else label for label in labels]
+    ax.legend(handles, weather_labels, title='Kondisi Cuaca')
+
+    ax.set_title(f'Korelasi antara {X_LABELS.get(x_var, x_var)} dan {VAR_LABELS.get(y_var, y_var)}', fontsize=15)
+    ax.set_xlabel(X_LABELS.get(x_var, x_var), fontsize=12)
+    ax.set_ylabel(VAR_LABELS.get(y_var, y_var), fontsize=12)
+
+    # Menampilkan korelasi
+    correlation = line['r'] if line is not None else float('nan')
+    ax.annotate(f'Korelasi: {correlation:.2f}',
+                xy=(0.05, 0.95),
+                xycoords='axes fraction',
+                bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="gray", alpha=0.8))
+    return fig
+
+
+# Tren waktu per periode, opsional dengan rolling average
+def time_series(agg_df, y_vars, freq, window_size=None):
+    plt, sns = _plotting()
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    for y_var in y_vars:
+        sns.lineplot(
+            x='period',
+            y=y_var,
+            data=agg_df,
+            label={
+                "cnt": "Total Peminjaman",
+                "casual": "Pengguna Casual",
+                "registered": "Pengguna Terdaftar"
+            }.get(y_var, y_var),
+            ax=ax
+        )
+
+        # Menambahkan rolling average jika diminta
+        if window_size is not None and len(agg_df) > window_size:
+            rolling_data = agg_df[y_var].rolling(window=window_size).mean()
+            sns.lineplot(
+                x=agg_df['period'],
+                y=rolling_data,
+                ax=ax,
+                linestyle='--',
+                alpha=0.7,
+                label=f"{y_var} (Rolling Avg {window_size})"
+            )
+
+    ax.set_title(f'Tren Peminjaman Sepeda ({freq})', fontsize=15)
+    ax.set_xlabel('Periode', fontsize=12)
+    ax.set_ylabel('Jumlah Peminjaman', fontsize=12)
+
+    # Format sumbu x berdasarkan frekuensi
+    _set_period_ticks(agg_df['period'], freq)
+
+    plt.tight_layout()
+    return fig
+
+
+# Jumlah absolut dan proporsi casual vs terdaftar per kategori
+def user_proportion(comp_df, category, xlabel, title_count, title_pct):
+    plt, sns = _plotting()
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+
+    # Plot 1: Jumlah absolut
+    comp_df_melted = pd.melt(comp_df, id_vars=[category], value_vars=['casual', 'registered'],
+                             var_name='user_type', value_name='count')
+
+    sns.barplot(x=category, y='count', hue='user_type', data=comp_df_melted, ax=ax1)
+    ax1.set_title(title_count, fontsize=15)
+    ax1.set_xlabel(xlabel, fontsize=12)
+    ax1.set_ylabel('Jumlah Peminjaman', fontsize=12)
+    ax1.tick_params(axis='x', rotation=45)
+
+    # Plot 2: Persentase
+    ax2.bar(comp_df[category], comp_df['registered_pct'], label='Terdaftar')
+    ax2.bar(comp_df[category], comp_df['casual_pct'], bottom=comp_df['registered_pct'], label='Casual')
+
+    ax2.set_title(title_pct, fontsize=15)
+    ax2.set_xlabel(xlabel, fontsize=12)
+    ax2.set_ylabel('Persentase (%)', fontsize=12)
+    ax2.tick_params(axis='x', rotation=45)
+    ax2.legend()
+
+    plt.tight_layout()
+    return fig
+
+
+# Tren jumlah dan proporsi casual vs terdaftar per periode
+def user_trend(trend_df, freq):
+    plt, sns = _plotting()
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10), sharex=True)
+
+    # Plot 1: Jumlah absolut
+    sns.lineplot(x='period', y='casual', data=trend_df, marker='o', label='Casual', ax=ax1)
+    sns.lineplot(x='period', y='registered', data=trend_df, marker='o', label='Terdaftar', ax=ax1)
+
+    ax1.set_title(f'Tren Jumlah Pengguna ({freq})', fontsize=15)
+    ax1.set_ylabel('Jumlah Peminjaman', fontsize=12)
+    ax1.legend()
+
+    # Plot 2: Persentase
+    sns.lineplot(x='period', y='casual_pct', data=trend_df, marker='o', label='% Casual', ax=ax2)
+    sns.lineplot(x='period', y='registered_pct', data=trend_df, marker='o', label='% Terdaftar', ax=ax2)
+
+    ax2.set_title(f'Tren Proporsi Pengguna ({freq})', fontsize=15)
+    ax2.set_xlabel('Periode', fontsize=12)
+    ax2.set_ylabel('Persentase (%)', fontsize=12)
+    ax2.legend()
+
+    # Format sumbu x berdasarkan frekuensi
+    _set_period_ticks(trend_df['period'], freq)
+
+    plt.tight_layout()
+    return fig
+
+
+# Distribusi peminjaman per kondisi cuaca (box, violin, atau strip plot)
+def weather_distribution(filtered_df, y_var, viz_type, weather_order, summary=None):
+    plt, sns = _plotting()
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    # Memilih tipe visualisasi; box dan violin bisa digambar dari ringkasan sketch
+    if summary is not None and viz_type == "Box Plot":
+        _summary_boxplot(ax, summary[0])
+    elif summary is not None and viz_type == "Violin Plot":
+        _summary_violinplot(ax, *summary)
+    elif viz_type == "Box Plot":
+        sns.boxplot(x='weather_name', y=y_var, data=filtered_df, order=weather_order, ax=ax)
+    elif viz_type == "Violin Plot":
+        sns.violinplot(x='weather_name', y=y_var, data=filtered_df, order=weather_order, ax=ax)
+    else:  # Strip Plot
+        sns.stripplot(x='weather_name', y=y_var, data=filtered_df, order=weather_order, jitter=True, alpha=0.5, ax=ax)
+
+    var_label = VAR_LABELS.get(y_var, y_var)
+    ax.set_title(f'Distribusi {var_label} Berdasarkan Kondisi Cuaca', fontsize=15)
+    ax.set_xlabel('Kondisi Cuaca', fontsize=12)
+    ax.set_ylabel(var_label, fontsize=12)
+    return fig
+
+
+# Dashboard Utama: tren peminjaman bulanan
+def monthly_trend(monthly_data):
+    plt, sns = _plotting()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.lineplot(x='dteday', y='cnt', data=monthly_data, marker='o', ax=ax)
+
+    ax.set_title('Tren Peminjaman Sepeda Bulanan', fontsize=15)
+    ax.set_xlabel('Bulan', fontsize=12)
+    ax.set_ylabel('Total Peminjaman', fontsize=12)
+
+    # Format sumbu x untuk menampilkan bulan
+    _set_period_ticks(monthly_data['dteday'], "Bulanan")
+
+    plt.tight_layout()
+    return fig
+
+
+# Dashboard Utama: rata-rata peminjaman per jam
+def hourly_overview(hourly_data):
+    plt, sns = _plotting()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.lineplot(x=hourly_data.index, y=hourly_data.values, marker='o', ax=ax)
+
+    ax.set_title('Rata-rata Peminjaman Sepeda Berdasarkan Jam', fontsize=15)
+    ax.set_xlabel('Jam', fontsize=12)
+    ax.set_ylabel('Rata-rata Peminjaman', fontsize=12)
+    ax.set_xticks(range(0, 24, 2))
+
+    plt.tight_layout()
+    return fig
+
+
+# Dashboard Utama: korelasi suhu dan jumlah peminjaman harian
+def temp_regression(day_df, line):
+    plt, sns = _plotting()
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    sns.scatterplot(x='temp_celsius', y='cnt', data=day_df, alpha=0.7, ax=ax)
+    _regression_band(ax, line, 'C0')
+
+    ax.set_title('Korelasi antara Suhu dan Jumlah Peminjaman', fontsize=15)
+    ax.set_xlabel('Suhu (°C)', fontsize=12)
+    ax.set_ylabel('Jumlah Peminjaman', fontsize=12)
+
+    plt.tight_layout()
+    return fig
+
+
+# Dashboard Utama: proporsi pengguna casual vs terdaftar
+def user_pie(casual_total, registered_total):
+    plt = lazy.module('matplotlib.pyplot')
+    proportions = [casual_total, registered_total]
+    labels = ['Casual', 'Registered']
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.pie(proportions, labels=labels, autopct='%1.1f%%', startangle=90,
+           wedgeprops={'edgecolor': 'white', 'linewidth': 1})
+
+    ax.set_title('Proporsi Pengguna Casual vs Terdaftar', fontsize=15)
+
+    plt.tight_layout()
+    return fig
@@ -0,0 +1,15 @@
+import functools
+import importlib
+
+import profiling
+
+# Modul berat (matplotlib, seaborn, scipy) tidak diimpor saat proses dimulai, tetapi saat
+# pertama kali dibutuhkan oleh view yang memakainya. Waktu import pertama tercatat sebagai
+# fase 'import:<nama>' pada rerun yang memicunya.
+
+
+# Mengimpor modul sekali lalu menyimpan hasilnya; pemanggilan berikutnya hanya lookup cache
+@functools.cache
+def module(name):
+    with profiling.phase(f'import:{name}'):
+        return importlib.import_module(name)
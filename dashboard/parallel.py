@@ -0,0 +1,108 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Eksekusi paralel untuk halaman yang menampilkan beberapa grafik sekaligus (Dashboard
+# Utama). Agregasi dijalankan di thread pool karena memakai cache data dan artefak turunan
+# milik proses ini; gambar dirender di process pool karena pyplot tidak thread-safe.
+# DASHBOARD_PARALLEL_WORKERS=N menyalakan mode paralel dengan N proses render; 0 (default)
+# berarti agregasi dan render berjalan satu per satu seperti biasa.
+WORKERS = int(os.environ.get('DASHBOARD_PARALLEL_WORKERS', '0'))
+ENABLED = WORKERS > 0
+
+# Pool dibuat sekali per proses saat pertama kali dipakai. Proses render memakai start
+# method spawn: fork dari server Streamlit yang berthread tidak aman.
+_lock = threading.Lock()
+_pools = {'threads': None, 'processes': None}
+# Process pool yang proses render-nya sudah dijalankan lewat start
+_started = None
+
+
+# Dijalankan sekali di setiap proses render: backend non-interaktif dan import pustaka
+# plotting di muka, sehingga render pertama tidak membayar biaya import
+def _init_worker():
+    import matplotlib
+    matplotlib.use('Agg')
+    import lazy
+    lazy.module('matplotlib.pyplot')
+    lazy.module('seaborn')
+
+
+# Dijalankan di proses render: menggambar figure lalu mengembalikan byte PNG
+def _render(draw_fn, args):
+    import render_cache
+    return render_cache.figure_to_png(draw_fn(*args))
+
+
+def _ready():
+    return os.getpid()
+
+
+# Thread pool untuk agregasi dan process pool untuk render (dibuat jika belum ada)
+def pools():
+    with _lock:
+        if _pools['threads'] is None:
+            _pools['threads'] = ThreadPoolExecutor(max_workers=max(WORKERS, 4), thread_name_prefix='dashboard-parallel')
+        if _pools['processes'] is None:
+            _pools['processes'] = ProcessPoolExecutor(max_workers=WORKERS, initializer=_init_worker,
+                                                      mp_context=multiprocessing.get_context('spawn'))
+        return _pools['threads'], _pools['processes']
+
+
+# Menjalankan semua proses render lebih dulu tanpa menunggu (dipanggil setiap rerun,
+# hanya berpengaruh pada pemanggilan pertama) agar render pertama tidak menunggu proses baru
+def start():
+    global _started
+    _, processes = pools()
+    with _lock:
+        if _started is processes:
+            return []
+        _started = processes
+    return [processes.submit(_ready) for _ in range(WORKERS)]
+
+
+# Seperti start, tetapi menunggu semua proses render siap; mengembalikan PID-nya
+def warm():
+    _, processes = pools()
+    return sorted({future.result() for future in [processes.submit(_ready) for _ in range(WORKERS)]})
+
+
+# Membuang process pool yang rusak (misalnya proses render mati); pool baru dibuat saat dipakai lagi
+def _reset(processes):
+    with _lock:
+        if _pools['processes'] is processes:
+            _pools['processes'] = None
+    processes.shutdown(wait=False, cancel_futures=True)
+
+
+# Menghitung agregasi lalu merender satu grafik. Dijalankan di thread pool: thread menunggu
+# hasil render dari process pool, jadi agregasi grafik lain tetap berjalan selama render.
+def _aggregate_and_render(processes, draw_fn, aggregate_fn):
+    args = aggregate_fn()
+    try:
+        return processes.submit(_render, draw_fn, args).result()
+    except BrokenProcessPool:
+        _reset(processes)
+        raise
+
+
+# Mulai merender beberapa grafik secara bersamaan. Setiap tugas berisi (draw_fn,
+# aggregate_fn): aggregate_fn() dijalankan di thread pool proses ini dan mengembalikan
+# argumen draw_fn, sedangkan draw_fn (fungsi modul figures, harus bisa di-pickle)
+# dijalankan di proses render. Mengembalikan Future byte PNG sesuai urutan tugas.
+def render_all(tasks):
+    threads, processes = pools()
+    return [threads.submit(_aggregate_and_render, processes, draw_fn, aggregate_fn)
+            for draw_fn, aggregate_fn in tasks]
+
+
+# Menghentikan pool (dipakai benchmark)
+def shutdown():
+    with _lock:
+        threads, processes = _pools['threads'], _pools['processes']
+        _pools.update(threads=None, processes=None)
+    for pool in (threads, processes):
+        if pool is not None:
+            pool.shutdown(wait=True)
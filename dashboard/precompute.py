@@ -0,0 +1,115 @@
+import logging
+import os
+import threading
+import time
+
+import data_loader
+
+# Precompute di latar belakang: setelah data dimuat, hasil agregasi dan gambar untuk
+# state default setiap view dihitung lebih dulu di satu thread daemon, sehingga pengguna
+# pertama setiap view langsung mendapat hasil dari cache data dan render cache.
+# Set DASHBOARD_PRECOMPUTE=0 untuk mematikan.
+ENABLED = os.environ.get('DASHBOARD_PRECOMPUTE', '1') != '0'
+
+# Kegagalan task dicatat lewat logging (beserta traceback) dan disimpan di status
+# sehingga bisa ditampilkan di sidebar
+logger = logging.getLogger(__name__)
+
+# State precompute tingkat proses. Satu putaran precompute berlaku untuk satu versi data;
+# putaran lama dibatalkan lewat Event cancel saat versi berubah atau cache di-invalidate.
+_lock = threading.Lock()
+_state = {
+    'version': None, 'cancel': None, 'thread': None,
+    'total': 0, 'done': 0, 'failed': 0, 'errors': [], 'started': None, 'finished': None, 'cancelled': 0,
+}
+
+
+# Memulai precompute untuk versi data tertentu. tasks_fn() dijalankan di thread
+# latar belakang dan mengembalikan daftar (nama, fungsi); setiap fungsi mengisi cache.
+# Versi yang sama tidak dihitung dua kali, versi baru membatalkan putaran sebelumnya.
+def start(version, tasks_fn):
+    if not ENABLED or version is None:
+        return
+    with _lock:
+        if _state['version'] == version:
+            return
+        if _state['cancel'] is not None and not _state['cancel'].is_set():
+            _state['cancel'].set()
+            _state['cancelled'] += 1
+        cancel = threading.Event()
+        thread = threading.Thread(target=_run, args=(cancel, tasks_fn), name='dashboard-precompute', daemon=True)
+        _state.update(version=version, cancel=cancel, thread=thread, total=0, done=0, failed=0, errors=[],
+                      started=time.perf_counter(), finished=None)
+    thread.start()
+
+
+# Memperbarui state hanya jika putaran ini belum digantikan putaran lain
+def _update(cancel, **changes):
+    with _lock:
+        if _state['cancel'] is cancel:
+            _state.update(changes)
+
+
+def _run(cancel, tasks_fn):
+    done = failed = 0
+    errors = []
+    try:
+        tasks = tasks_fn()
+    except Exception as e:
+        logger.exception("Precompute gagal menyusun task")
+        tasks = []
+        failed = 1
+        errors.append(('Menyusun task', f'{type(e).__name__}: {e}'))
+    _update(cancel, total=len(tasks), failed=failed, errors=list(errors))
+
+    # Pembatalan dicek di antara task; task yang sedang berjalan dibiarkan selesai
+    for name, task in tasks:
+        if cancel.is_set():
+            return
+        try:
+            task()
+        except Exception as e:
+            failed += 1
+            logger.exception("Precompute '%s' gagal", name)
+            errors.append((name, f'{type(e).__name__}: {e}'))
+        done += 1
+        _update(cancel, done=done, failed=failed, errors=list(errors))
+    _update(cancel, finished=time.perf_counter())
+
+
+# Membatalkan putaran yang sedang berjalan; putaran berikutnya dimulai lagi saat start
+# dipanggil, termasuk untuk versi data yang sama (misalnya setelah cache dikosongkan)
+def cancel():
+    with _lock:
+        if _state['cancel'] is not None and not _state['cancel'].is_set():
+            _state['cancel'].set()
+            _state['cancelled'] += 1
+        _state.update(version=None, cancel=None, thread=None, total=0, done=0, failed=0, errors=[],
+                      started=None, finished=None)
+
+
+# Precompute dibatalkan setiap kali cache data di-invalidate
+data_loader.on_invalidate(cancel)
+
+
+# Progres putaran terakhir: jumlah task, selesai, gagal (beserta daftar (nama task, pesan
+# error)), dan lama berjalan (detik)
+def status():
+    with _lock:
+        info = {key: _state[key] for key in ('total', 'done', 'failed', 'cancelled')}
+        info['errors'] = list(_state['errors'])
+        started, finished = _state['started'], _state['finished']
+        info['active'] = started is not None
+        info['running'] = started is not None and finished is None
+        if started is not None:
+            info['elapsed'] = (finished or time.perf_counter()) - started
+    return info
+
+
+# Menunggu putaran yang sedang berjalan selesai (dipakai benchmark)
+def wait(timeout=None):
+    with _lock:
+        thread = _state['thread']
+    if thread is not None:
+        thread.join(timeout)
+    return not status()['running']
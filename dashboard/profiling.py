@@ -0,0 +1,175 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+# Instrumentasi latensi per rerun. Setiap rerun dicatat sebagai satu record berisi
+# waktu total dan rincian per fase (misalnya load_data, filter, aggregate, plot, encode).
+# Set DASHBOARD_PROFILE=0 untuk mematikan pencatatan.
+ENABLED = os.environ.get('DASHBOARD_PROFILE', '1') != '0'
+
+# Peak memori per fase diukur dengan tracemalloc (alokasi Python dan numpy). Karena
+# tracemalloc memperlambat alokasi, pengukuran memori hanya aktif jika diminta.
+TRACE_MEMORY = os.environ.get('DASHBOARD_PROFILE_MEMORY', '0') == '1'
+
+# Jika diisi, setiap record ditulis sebagai satu baris JSON ke file ini
+LOG_PATH = os.environ.get('DASHBOARD_PROFILE_LOG')
+
+# Jumlah record terakhir yang disimpan untuk panel sidebar
+HISTORY_SIZE = 500
+
+_lock = threading.Lock()
+_history = deque(maxlen=HISTORY_SIZE)
+# Streamlit menjalankan setiap sesi di thread sendiri, jadi rerun aktif disimpan per thread
+_local = threading.local()
+
+if ENABLED and TRACE_MEMORY and not tracemalloc.is_tracing():
+    tracemalloc.start()
+
+
+# Stack fase rerun yang sedang dicatat di thread ini; None jika tidak ada.
+# Setiap elemen: [nama fase, waktu mulai, peak memori dari fase anak].
+def _stack():
+    return getattr(_local, 'stack', None)
+
+
+# Mencatat satu rerun. Fase yang dijalankan di dalamnya ditambahkan ke record yang
+# di-yield; nilai record['view'] boleh diganti selama rerun berjalan.
+@contextmanager
+def run(name):
+    if not ENABLED or _stack() is not None:
+        yield None
+        return
+
+    record = {'ts': time.time(), 'view': name, 'phases': {}}
+    stack = [[name, time.perf_counter(), 0]]
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    _local.stack = stack
+    _local.record = record
+    try:
+        yield record
+    except BaseException as e:
+        # Termasuk exception kontrol Streamlit (rerun/stop)
+        record['exit'] = type(e).__name__
+        raise
+    finally:
+        _local.stack = None
+        _local.record = None
+        _, start, child_peak = stack.pop()
+        record['total_ms'] = (time.perf_counter() - start) * 1000
+        if tracemalloc.is_tracing():
+            record['peak_mb'] = max(child_peak, tracemalloc.get_traced_memory()[1]) / 1024 ** 2
+        _store(record)
+
+
+# Mencatat satu fase di dalam rerun aktif. Fase bersarang dicatat dengan nama
+# bertingkat ('view/plot'); fase dengan nama sama dalam satu rerun dijumlahkan.
+@contextmanager
+def phase(name):
+    stack = _stack()
+    if stack is None:
+        yield
+        return
+
+    parent = stack[-1]
+    if tracemalloc.is_tracing():
+        # Peak sejauh ini milik fase induk; dicatat sebelum peak di-reset untuk fase ini
+        parent[2] = max(parent[2], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+    path = name if len(stack) == 1 else f'{parent[0]}/{name}'
+    entry = [path, time.perf_counter(), 0]
+    stack.append(entry)
+    try:
+        yield
+    finally:
+        stack.pop()
+        stats = _local.record['phases'].setdefault(path, {'ms': 0.0, 'calls': 0})
+        stats['ms'] += (time.perf_counter() - entry[1]) * 1000
+        stats['calls'] += 1
+        if tracemalloc.is_tracing():
+            peak = max(entry[2], tracemalloc.get_traced_memory()[1])
+            stats['peak_mb'] = max(stats.get('peak_mb', 0.0), peak / 1024 ** 2)
+            parent[2] = max(parent[2], peak)
+
+
+# Mengganti nama view rerun aktif (misalnya setelah pilihan menu di sidebar diketahui)
+def set_view(name):
+    record = getattr(_local, 'record', None)
+    if record is not None:
+        record['view'] = name
+
+
+# Mencatat titik waktu (ms sejak awal rerun) saat sebuah tahap tercapai, misalnya KPI
+# pertama tampil. Hanya kemunculan pertama tiap nama dalam satu rerun yang dicatat.
+def mark(name):
+    stack = _stack()
+    if stack is None:
+        return
+    marks = _local.record.setdefault('marks', {})
+    marks.setdefault(name, (time.perf_counter() - stack[0][1]) * 1000)
+
+
+# Dekorator yang mencatat seluruh pemanggilan fungsi sebagai satu fase
+def instrument(name):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Menyimpan record ke riwayat dan (jika diatur) ke log JSON lines
+def _store(record):
+    with _lock:
+        _history.append(record)
+        if LOG_PATH:
+            try:
+                with open(LOG_PATH, 'a') as f:
+                    f.write(json.dumps(record) + '\n')
+            except OSError:
+                pass
+
+
+# Record rerun terakhir, terbaru lebih dulu
+def history(limit=None):
+    with _lock:
+        records = list(_history)
+    records.reverse()
+    return records[:limit] if limit else records
+
+
+# Ringkasan latensi per view dari riwayat: jumlah rerun, p50, p95, dan maksimum (ms)
+def summary():
+    by_view = {}
+    for record in history():
+        by_view.setdefault(record['view'], []).append(record['total_ms'])
+    rows = []
+    for view, totals in sorted(by_view.items()):
+        totals.sort()
+        rows.append({
+            'view': view,
+            'reruns': len(totals),
+            'p50_ms': _percentile(totals, 50),
+            'p95_ms': _percentile(totals, 95),
+            'max_ms': totals[-1],
+        })
+    return rows
+
+
+# Persentil dengan metode nearest-rank pada data yang sudah terurut
+def _percentile(sorted_values, q):
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+
+# Mengosongkan riwayat
+def clear():
+    with _lock:
+        _history.clear()
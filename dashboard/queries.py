@@ -0,0 +1,262 @@
+import numpy as np
+import pandas as pd
+
+import comparison
+import cube
+import data_loader
+import disk_cache
+import regression
+import selection
+import sketch
+import sql_backend
+import store
+import streaming
+import time_index
+import weather_stats
+
+# Lapisan query yang tidak bergantung pada UI: setiap fungsi menerima frame (atau cube)
+# yang sudah dimuat beserta parameter analisis, lalu mengembalikan DataFrame/Series atau
+# dict biasa. Dashboard memanggil fungsi-fungsi ini secara in-process, dan api.py
+# menyajikannya lewat HTTP/JSON, sehingga keduanya memakai cache data dan artefak
+# turunan yang sama (lihat data_loader.derived).
+#
+# Dengan DASHBOARD_BACKEND=sqlite/duckdb, fungsi yang mengagregasi data dijalankan sebagai
+# SQL pada engine tertanam (lihat sql_backend.py) dengan hasil yang sama; tampilan yang
+# memerlukan baris mentah (scatter, strip, box plot eksak) tetap memakai frame pandas.
+# Pada mode streaming, data per jam berupa ringkasan yang dilipat per chunk (lihat
+# streaming.py) dan fungsi data per jam menghitung hasilnya dari ringkasan tersebut.
+MEASURES = cube.CUBE_MEASURES
+
+# Metode agregasi tren harian
+AGG_METHODS = {
+    "Mean": np.mean,
+    "Median": np.median,
+    "Sum": np.sum,
+    "Min": np.min,
+    "Max": np.max
+}
+
+# Tabel hasil query di-cache di disk (DASHBOARD_DISK_CACHE) per backend, parameter, dan
+# versi data, sehingga tetap berlaku setelah restart dan di replika lain
+cached_table = disk_cache.cached_table(lambda: sql_backend.BACKEND)
+
+# Frekuensi agregasi waktu (label yang sama dengan widget)
+FREQUENCIES = list(time_index.RESOLUTIONS)
+
+# Tabel perbandingan pengguna yang tidak bergantung pada rentang waktu
+USER_TABLES = ['weekday', 'weather', 'temperature']
+USER_TABLE_BUILDERS = {
+    'weekday': comparison.weekday_table,
+    'weather': comparison.weather_table,
+    'temperature': comparison.temperature_table,
+}
+
+
+# Memuat data: (frame harian, frame per jam, cube per jam). Pada mode streaming frame per
+# jam diganti ringkasan streaming (lihat streaming.is_streamed). Dengan DASHBOARD_STORE, data
+# dimuat dari penyimpanan terpartisi untuk kota, rentang tanggal, dan musim terpilih
+# (default: kota pertama, seluruh data).
+def load(city=None, start=None, end=None, seasons=None):
+    if store.STORE_DIR:
+        if data_loader.INGEST_MODE == 'stream':
+            raise ValueError("DASHBOARD_INGEST=stream belum didukung bersama DASHBOARD_STORE")
+        day_df, hour_df = store.load(city, start, end, seasons)
+        frames = day_df, hour_df, cube.get_cube(hour_df)
+    elif data_loader.INGEST_MODE == 'stream':
+        day_path, hour_path = data_loader.resolve_data_paths()
+        summaries = streaming.load(hour_path)
+        frames = data_loader.load_frame(day_path), summaries, streaming.get_cube(summaries)
+    else:
+        day_df, hour_df = data_loader.load_frames()
+        frames = day_df, hour_df, cube.get_cube(hour_df)
+    if sql_backend.ENABLED:
+        register(*frames)
+    return frames
+
+
+# Mendaftarkan frame dan cube per jam ke engine SQL (sekali per versi data); ringkasan
+# streaming tidak didaftarkan
+def register(day_df, hour_df, hour_cube):
+    for frame in (day_df, hour_df, hour_cube):
+        if not streaming.is_streamed(frame):
+            sql_backend.get_database(frame)
+
+
+# Metrik utama Dashboard Utama
+def kpis(day_df):
+    if sql_backend.ENABLED:
+        return sql_backend.kpis(day_df)
+    return {
+        'total_rentals': int(day_df['cnt'].sum()),
+        'avg_daily': int(day_df['cnt'].mean()),
+        'max_daily': int(day_df['cnt'].max()),
+        'peak_month': int(day_df.groupby(day_df['dteday'].dt.month)['cnt'].mean().idxmax()),
+        'casual': int(day_df['casual'].sum()),
+        'registered': int(day_df['registered'].sum()),
+    }
+
+
+# Agregasi per hari dengan urutan hari Senin-Minggu
+@cached_table
+def weekday_aggregate(day_df, agg_method, y_var):
+    if sql_backend.ENABLED:
+        return sql_backend.weekday_aggregate(day_df, agg_method, y_var)
+    daily_data = day_df.groupby('weekday_name', observed=True)[y_var].agg(AGG_METHODS[agg_method])
+    return daily_data.reindex(data_loader.DAY_ORDER)
+
+
+# Filter cube per jam: workingday 1 (hari kerja), 0 (akhir pekan), atau None (semua hari);
+# daftar musim kosong berarti semua musim
+def hourly_filters(workingday=None, seasons=None):
+    filters = {}
+    if workingday is not None:
+        filters['workingday'] = [workingday]
+    if seasons:
+        filters['season'] = list(seasons)
+    return filters
+
+
+# Rata-rata per jam dari roll-up cube
+@cached_table
+def hourly_profile(hour_cube, y_var, workingday=None, seasons=None):
+    if sql_backend.ENABLED:
+        return sql_backend.hourly_profile(hour_cube, y_var, workingday, seasons)
+    return cube.rollup(hour_cube, 'hr', y_var, hourly_filters(workingday, seasons))['mean']
+
+
+# Pivot rata-rata per jam (baris) dan hari (kolom) dari roll-up cube
+@cached_table
+def hourly_heatmap(hour_cube, y_var, workingday=None, seasons=None):
+    if sql_backend.ENABLED:
+        return sql_backend.hourly_heatmap(hour_cube, y_var, workingday, seasons)
+    filters = hourly_filters(workingday, seasons)
+    pivot_df = cube.rollup(hour_cube, ['hr', 'weekday'], y_var, filters)['mean'].unstack('weekday')
+    pivot_df = pivot_df.rename(columns=data_loader.DAY_NAMES)
+    pivot_df.columns.name = 'weekday_name'
+
+    # Mengurutkan kolom hari
+    return pivot_df.reindex(columns=data_loader.DAY_ORDER)
+
+
+# Garis regresi, interval kepercayaan, dan korelasi untuk kondisi cuaca terpilih
+# (kosong berarti semua kondisi); None jika data tidak cukup
+def weather_regression(hour_df, x_var, y_var, groups=None, bootstrap=False):
+    group_moments = None
+    if streaming.is_streamed(hour_df):
+        if bootstrap:
+            raise ValueError("Interval bootstrap membutuhkan data per jam mentah")
+        group_moments = hour_df['moments'][(x_var, y_var)]
+    elif sql_backend.ENABLED:
+        group_moments = sql_backend.regression_moments(hour_df, x_var, y_var, groups)
+    return regression.regression_line(hour_df, x_var, y_var, groups, bootstrap, group_moments)
+
+
+# Mean, std, dan count per kondisi cuaca dari cube, ditambah median dari kuantil yang
+# sudah di-cache (indeks weathersit)
+@cached_table
+def weather_summary(hour_df, y_var, groups):
+    if streaming.is_streamed(hour_df) or sql_backend.ENABLED:
+        return summary_table(_summary(hour_df, y_var, groups), y_var, groups)
+    summary = cube.rollup(cube.get_cube(hour_df), 'weathersit', y_var, {'weathersit': list(groups)})
+    summary['median'] = weather_stats.variable_quantiles(hour_df, y_var)['50%']
+    return summary[['mean', 'median', 'std', 'count']]
+
+
+# Tabel mean, median, std, dan count dari ringkasan per kondisi cuaca (struktur
+# weather_stats.build_summary), dengan bentuk yang sama seperti weather_summary; groups
+# (opsional) membatasi kondisi cuaca yang ditampilkan
+def summary_table(summary, y_var, groups=None):
+    rows = {}
+    for (group, measure), stats in sorted(summary.items()):
+        if measure != y_var or (groups is not None and group not in groups):
+            continue
+        n, total = stats['count'], stats['sum']
+        mean = total / n
+        std = np.sqrt(stats['m2'] / (n - 1)) if n > 1 else np.nan
+        rows[group] = [mean, stats['quantiles'][2], std, n]
+    table = pd.DataFrame.from_dict(rows, orient='index', columns=['mean', 'median', 'std', 'count'])
+    table.index.name = 'weathersit'
+    return table
+
+
+# Ringkasan per kondisi cuaca dari ringkasan streaming atau dari engine SQL (hanya kondisi
+# terpilih), atau None untuk ringkasan pandas yang di-cache
+def _summary(hour_df, y_var, groups):
+    if streaming.is_streamed(hour_df):
+        return streaming.get_summary(hour_df)
+    return sql_backend.weather_summary(hour_df, y_var, groups) if sql_backend.ENABLED else None
+
+
+# Tabel statistik deskriptif per kondisi cuaca
+@cached_table
+def weather_describe(hour_df, y_var, groups):
+    return weather_stats.describe_table(hour_df, y_var, groups, _summary(hour_df, y_var, groups))
+
+
+# ANOVA satu arah antar kondisi cuaca: (F, p-value), atau None jika kurang dari dua kelompok
+def weather_anova(hour_df, y_var, groups):
+    return weather_stats.anova(hour_df, y_var, groups, _summary(hour_df, y_var, groups))
+
+
+# Ringkasan distribusi per kondisi cuaca untuk box/violin plot (lihat sketch)
+def weather_distributions(hour_df):
+    if streaming.is_streamed(hour_df):
+        return streaming.get_distributions(hour_df)
+    return sketch.get_distributions(hour_df, 'weathersit')
+
+
+# Kondisi cuaca yang ada datanya
+def weather_groups(hour_df):
+    if streaming.is_streamed(hour_df):
+        return {group for group, _ in streaming.get_summary(hour_df)}
+    return selection.present(hour_df, 'weathersit')
+
+
+# Tanggal pertama dan terakhir sebuah frame
+def date_bounds(df):
+    if streaming.is_streamed(df):
+        return time_index.date_bounds(time_index.get_index(streaming.get_daily(df)))
+    if sql_backend.ENABLED:
+        return sql_backend.date_bounds(df)
+    return time_index.date_bounds(time_index.get_index(df))
+
+
+# Rentang tanggal yang dipakai: [start, end] jika keduanya diberikan, selain itu seluruh data
+def date_range(df, start=None, end=None):
+    if start is None or end is None:
+        return date_bounds(df)
+    return start, end
+
+
+# Jumlah setiap variabel per periode untuk rentang tanggal [start, end]
+@cached_table
+def period_rollup(df, freq, y_vars, start=None, end=None):
+    start, end = date_range(df, start, end)
+    if streaming.is_streamed(df):
+        df = streaming.get_daily(df)
+    elif sql_backend.ENABLED:
+        return sql_backend.period_rollup(df, freq, list(y_vars), start, end)
+    return time_index.rollup(time_index.get_index(df), start, end, freq, list(y_vars))
+
+
+# Perbandingan pengguna casual vs terdaftar per hari, kondisi cuaca, atau rentang suhu
+@cached_table
+def user_table(df, by):
+    if streaming.is_streamed(df):
+        return USER_TABLE_BUILDERS[by](df['user_counts'])
+    if sql_backend.ENABLED:
+        counts = sql_backend.user_counts(df, comparison.WEEKDAY_SLOTS, comparison.WEATHER_SLOTS, comparison.TEMP_SLOTS)
+        return USER_TABLE_BUILDERS[by](counts)
+    return comparison.static_tables(df)[by]
+
+
+# Perbandingan pengguna casual vs terdaftar per periode waktu
+@cached_table
+def user_periods(df, freq, start=None, end=None):
+    start, end = date_range(df, start, end)
+    if streaming.is_streamed(df):
+        df = streaming.get_daily(df)
+    elif sql_backend.ENABLED:
+        sums = sql_backend.period_rollup(df, freq, comparison.USER_COLUMNS, start, end)
+        return comparison.user_table('period', sums['period'].to_numpy(), sums['casual'], sums['registered'])
+    return comparison.period_table(df, freq, start, end)
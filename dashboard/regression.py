@@ -0,0 +1,186 @@
+import os
+
+import numpy as np
+
+import data_loader
+import lazy
+import selection
+
+# Statistik regresi linear dan korelasi per kondisi cuaca. Untuk setiap pasangan
+# (faktor cuaca, jenis peminjaman) dan setiap weathersit disimpan statistik cukup yang
+# bisa digabung: n, rata-rata x dan y, jumlah kuadrat simpangan x dan y, serta jumlah
+# perkalian simpangan x*y (setara dengan n, Σx, Σy, Σx², Σy², Σxy, tetapi dalam bentuk
+# terpusat agar tidak kehilangan presisi pada data besar). Gabungan beberapa kondisi
+# cuaca dihitung dengan rumus Chan dkk. dalam waktu konstan, tanpa menyentuh baris data.
+X_VARS = ['temp_celsius', 'hum_percent', 'windspeed_kph']
+Y_VARS = ['cnt', 'casual', 'registered']
+GROUP = 'weathersit'
+
+# Interval kepercayaan bootstrap (opsional): jumlah resampling dan batas jumlah baris
+# sampel; di atas batas ini baris diambil acak tanpa pengembalian sebelum resampling
+BOOTSTRAP_ROWS = int(os.environ.get('DASHBOARD_BOOTSTRAP_ROWS', '10000'))
+BOOTSTRAP_ITERATIONS = 1000
+
+# Jumlah titik pada garis regresi dan pita interval kepercayaan
+LINE_POINTS = 100
+
+
+# Statistik cukup per kode grup untuk satu pasangan kolom x dan y
+def _group_moments(codes, x, y, size):
+    n = np.bincount(codes, minlength=size)
+    present = n > 0
+    safe_n = np.where(present, n, 1)
+    mean_x = np.bincount(codes, x, size) / safe_n
+    mean_y = np.bincount(codes, y, size) / safe_n
+    dx = x - mean_x[codes]
+    dy = y - mean_y[codes]
+    min_x = np.full(size, np.inf)
+    max_x = np.full(size, -np.inf)
+    np.minimum.at(min_x, codes, x)
+    np.maximum.at(max_x, codes, x)
+    moments = {
+        'n': n, 'mean_x': mean_x, 'mean_y': mean_y,
+        'm2_x': np.bincount(codes, dx * dx, size),
+        'm2_y': np.bincount(codes, dy * dy, size),
+        'c_xy': np.bincount(codes, dx * dy, size),
+        'min_x': min_x, 'max_x': max_x,
+    }
+    return {stat: values[present] for stat, values in moments.items()}, np.flatnonzero(present)
+
+
+# Membangun statistik cukup untuk semua pasangan kolom:
+# {(x_var, y_var): {weathersit: {n, mean_x, mean_y, m2_x, m2_y, c_xy, min_x, max_x}}}
+def build_moments(df):
+    codes = df[GROUP].to_numpy(dtype='int64')
+    size = int(codes.max()) + 1 if len(codes) else 0
+    table = {}
+    for x_var in X_VARS:
+        x = df[x_var].to_numpy(dtype='float64')
+        for y_var in Y_VARS:
+            y = df[y_var].to_numpy(dtype='float64')
+            moments, groups = _group_moments(codes, x, y, size)
+            table[(x_var, y_var)] = {
+                int(group): {stat: values[i].item() for stat, values in moments.items()}
+                for i, group in enumerate(groups)
+            }
+    return table
+
+
+# Menggabungkan statistik dua kelompok data (rumus paralel Chan dkk.)
+def merge(a, b):
+    n = a['n'] + b['n']
+    delta_x = b['mean_x'] - a['mean_x']
+    delta_y = b['mean_y'] - a['mean_y']
+    weight = a['n'] * b['n'] / n
+    return {
+        'n': n,
+        'mean_x': a['mean_x'] + delta_x * b['n'] / n,
+        'mean_y': a['mean_y'] + delta_y * b['n'] / n,
+        'm2_x': a['m2_x'] + b['m2_x'] + delta_x * delta_x * weight,
+        'm2_y': a['m2_y'] + b['m2_y'] + delta_y * delta_y * weight,
+        'c_xy': a['c_xy'] + b['c_xy'] + delta_x * delta_y * weight,
+        'min_x': min(a['min_x'], b['min_x']),
+        'max_x': max(a['max_x'], b['max_x']),
+    }
+
+
+# Statistik gabungan untuk beberapa kondisi cuaca (semua jika groups kosong); None jika tidak ada data
+def combine(group_moments, groups=None):
+    selected = [group_moments[g] for g in sorted(group_moments) if not groups or g in groups]
+    if not selected:
+        return None
+    total = selected[0]
+    for moments in selected[1:]:
+        total = merge(total, moments)
+    return total
+
+
+# Menggabungkan statistik cukup parsial (struktur build_moments) per kondisi cuaca
+def merge_moments(table, partial):
+    merged = {}
+    for pair, group_moments in table.items():
+        merged[pair] = dict(group_moments)
+        for group, moments in partial[pair].items():
+            merged[pair][group] = merge(merged[pair][group], moments) if group in merged[pair] else moments
+    return merged
+
+
+# Hook append: statistik baris baru digabung per kondisi cuaca
+def append_moments(table, df, new_rows):
+    return merge_moments(table, build_moments(new_rows)), None
+
+
+# Statistik cukup untuk sebuah frame, di-cache bersama data yang sedang dimuat
+def get_moments(df):
+    return data_loader.derived(df, 'regression_moments', build_moments, append_moments)
+
+
+# Koefisien regresi dan korelasi dari statistik cukup
+def fit(moments):
+    if moments is None or moments['n'] < 2 or moments['m2_x'] <= 0:
+        return None
+    slope = moments['c_xy'] / moments['m2_x']
+    r = moments['c_xy'] / np.sqrt(moments['m2_x'] * moments['m2_y']) if moments['m2_y'] > 0 else np.nan
+    return {
+        'n': moments['n'],
+        'slope': slope,
+        'intercept': moments['mean_y'] - slope * moments['mean_x'],
+        'r': r,
+        # Jumlah kuadrat residual
+        'sse': max(moments['m2_y'] - slope * moments['c_xy'], 0.0),
+    }
+
+
+# Garis regresi dan pita interval kepercayaan analitik untuk rata-rata prediksi:
+# y ± t(n-2) * s * sqrt(1/n + (x - x̄)² / Σ(x - x̄)²)
+def analytic_band(moments, level=0.95, points=LINE_POINTS):
+    coefficients = fit(moments)
+    if coefficients is None:
+        return None
+    n = coefficients['n']
+    x = np.linspace(moments['min_x'], moments['max_x'], points)
+    y = coefficients['intercept'] + coefficients['slope'] * x
+    if n > 2:
+        t = lazy.module('scipy.stats').t.ppf((1 + level) / 2, n - 2)
+        s2 = coefficients['sse'] / (n - 2)
+        half = t * np.sqrt(s2 * (1 / n + (x - moments['mean_x']) ** 2 / moments['m2_x']))
+    else:
+        half = np.zeros_like(x)
+    return {'x': x, 'y': y, 'lo': y - half, 'hi': y + half, 'r': coefficients['r'], 'n': n}
+
+
+# Pita interval kepercayaan bootstrap (persentil) seperti sns.regplot, dari maksimal
+# max_rows baris sampel
+def bootstrap_band(x, y, grid, level=0.95, max_rows=None, iterations=BOOTSTRAP_ITERATIONS, seed=0):
+    if max_rows is None:
+        max_rows = BOOTSTRAP_ROWS
+    rng = np.random.default_rng(seed)
+    if len(x) > max_rows:
+        sample = rng.choice(len(x), max_rows, replace=False)
+        x, y = x[sample], y[sample]
+    predictions = np.empty((iterations, len(grid)))
+    for i in range(iterations):
+        rows = rng.integers(0, len(x), len(x))
+        xs, ys = x[rows], y[rows]
+        dx = xs - xs.mean()
+        m2 = dx @ dx
+        slope = dx @ (ys - ys.mean()) / m2 if m2 > 0 else 0.0
+        predictions[i] = ys.mean() + slope * (grid - xs.mean())
+    tail = (1 - level) / 2 * 100
+    return np.percentile(predictions, [tail, 100 - tail], axis=0)
+
+
+# Garis regresi, pita interval kepercayaan, dan korelasi x_var vs y_var untuk kondisi
+# cuaca terpilih (semua jika kosong). Secara default dihitung dari statistik cukup;
+# bootstrap=True menghitung ulang pita dengan bootstrap dari sampel baris terbatas.
+# group_moments boleh diberikan dari luar (misalnya hasil query backend SQL).
+def regression_line(df, x_var, y_var, groups=None, bootstrap=False, group_moments=None):
+    if group_moments is None:
+        group_moments = get_moments(df)[(x_var, y_var)]
+    moments = combine(group_moments, groups)
+    line = analytic_band(moments)
+    if line is not None and bootstrap:
+        rows = selection.rows(df, {GROUP: list(groups or [])})
+        line['lo'], line['hi'] = bootstrap_band(
+            selection.values(df, rows, x_var, 'float64'), selection.values(df, rows, y_var, 'float64'), line['x'])
+    return line
@@ -0,0 +1,195 @@
+import functools
+import io
+import os
+import threading
+from collections import OrderedDict
+
+import disk_cache
+import lazy
+import parallel
+import profiling
+
+# Opsi savefig yang sama dengan default st.pyplot
+SAVEFIG_OPTIONS = {'format': 'png', 'bbox_inches': 'tight', 'dpi': 200}
+
+# Jumlah maksimum gambar PNG yang disimpan (LRU)
+MAX_ENTRIES = int(os.environ.get('DASHBOARD_RENDER_CACHE_SIZE', '128'))
+
+# Cache render tingkat proses: (view, parameter, versi data) -> byte PNG
+_cache_lock = threading.Lock()
+_cache = OrderedDict()
+_cache_stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+
+# pyplot memakai state global yang tidak thread-safe, jadi render dilakukan satu per satu
+_render_lock = threading.Lock()
+
+
+# Menyimpan figure sebagai PNG lalu menutupnya agar memori tidak terus bertambah
+def figure_to_png(fig):
+    try:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, **SAVEFIG_OPTIONS)
+        return buffer.getvalue()
+    finally:
+        lazy.module('matplotlib.pyplot').close(fig)
+
+
+# Tanpa agregasi: draw_fn dipanggil tanpa argumen
+def _no_args():
+    return ()
+
+
+# Menghitung argumen fungsi gambar. Dijalankan sebelum _render_lock diambil, sehingga
+# agregasi (cache data, artefak turunan, query) tidak menahan render grafik lain.
+def _aggregate(aggregate_fn):
+    with profiling.phase('aggregate'):
+        return aggregate_fn()
+
+
+# Menggambar figure dari argumen yang sudah diagregasi lalu mengubahnya menjadi PNG;
+# dipanggil saat _render_lock dipegang
+def _draw(draw_fn, args):
+    with profiling.phase('plot'):
+        fig = draw_fn(*args)
+    with profiling.phase('encode'):
+        return figure_to_png(fig)
+
+
+# Merender figure draw_fn(*aggregate_fn()) tanpa melewati cache
+def render_png(draw_fn, aggregate_fn=_no_args):
+    args = _aggregate(aggregate_fn)
+    with profiling.phase('render_wait'):
+        _render_lock.acquire()
+    try:
+        return _draw(draw_fn, args)
+    finally:
+        _render_lock.release()
+
+
+# Mengambil PNG dari cache tanpa merender; None jika belum ada. Jika tidak ada di memori,
+# PNG dicari di cache disk (DASHBOARD_DISK_CACHE) lalu disimpan ke memori.
+def _lookup(key, disk=True):
+    with _cache_lock:
+        png = _cache.get(key)
+        if png is not None:
+            _cache.move_to_end(key)
+            _cache_stats['hits'] += 1
+            return png
+    if not disk:
+        return None
+    with profiling.phase('disk_cache'):
+        png = disk_cache.read('png', key)
+    if png is not None:
+        with _cache_lock:
+            _cache_stats['disk_hits'] += 1
+        store_png(key, png)
+    return png
+
+
+# Menyimpan PNG hasil render ke cache memori dan cache disk
+def _remember(key, png):
+    store_png(key, png)
+    with profiling.phase('disk_cache'):
+        disk_cache.write('png', key, png)
+
+
+# Mengambil PNG dari cache, atau merender draw_fn(*aggregate_fn()) jika belum ada.
+# key=None berarti hasil tidak boleh di-cache (misalnya versi data tidak diketahui).
+# Agregasi dihitung sebelum menunggu giliran render; setelah itu cache dicek ulang:
+# gambar yang sama mungkin baru selesai dirender thread lain (sesi lain atau
+# precompute), jadi tidak digambar dua kali.
+def get_png(key, draw_fn, aggregate_fn=_no_args):
+    if key is None:
+        return render_png(draw_fn, aggregate_fn)
+
+    png = _lookup(key)
+    if png is not None:
+        return png
+
+    args = _aggregate(aggregate_fn)
+    with profiling.phase('render_wait'):
+        _render_lock.acquire()
+    try:
+        png = _lookup(key, disk=False)
+        if png is None:
+            with _cache_lock:
+                _cache_stats['misses'] += 1
+            png = _draw(draw_fn, args)
+            _remember(key, png)
+    finally:
+        _render_lock.release()
+    return png
+
+
+# Mengambil PNG beberapa grafik sekaligus. Setiap permintaan berisi (key, draw_fn,
+# aggregate_fn) dan digambar dengan draw_fn(*aggregate_fn()). Hasilnya, sesuai urutan
+# permintaan, berupa fungsi tanpa argumen yang mengembalikan byte PNG. Pada mode paralel
+# (lihat modul parallel) grafik yang belum ada di cache langsung mulai diagregasi dan
+# dirender bersamaan, dan fungsi tersebut menunggu hasilnya; tanpa mode paralel, grafik
+# dirender lewat get_png saat fungsinya dipanggil.
+def get_pngs(requests):
+    if not parallel.ENABLED:
+        return [functools.partial(get_png, key, draw_fn, aggregate_fn)
+                for key, draw_fn, aggregate_fn in requests]
+
+    results = []
+    for key, draw_fn, aggregate_fn in requests:
+        png = _lookup(key) if key is not None else None
+        if png is not None:
+            results.append(functools.partial(_identity, png))
+            continue
+        if key is not None:
+            with _cache_lock:
+                _cache_stats['misses'] += 1
+        future = parallel.render_all([(draw_fn, aggregate_fn)])[0]
+        if key is not None:
+            future.add_done_callback(functools.partial(_store_future, key))
+        results.append(functools.partial(_wait, future))
+    return results
+
+
+def _identity(value):
+    return value
+
+
+# Menyimpan hasil render paralel ke cache setelah selesai (render yang gagal tidak disimpan)
+def _store_future(key, future):
+    if not future.cancelled() and future.exception() is None:
+        _remember(key, future.result())
+
+
+# Menunggu hasil render paralel
+def _wait(future):
+    with profiling.phase('render_wait'):
+        return future.result()
+
+
+# Apakah PNG untuk kunci ini sudah ada di cache (tanpa mengubah statistik atau urutan LRU)
+def contains(key):
+    with _cache_lock:
+        return key in _cache
+
+
+# Menyimpan PNG ke cache dan membuang entri yang paling lama tidak dipakai
+def store_png(key, png):
+    with _cache_lock:
+        _cache[key] = png
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+            _cache_stats['evictions'] += 1
+
+
+# Mengosongkan cache render
+def clear():
+    with _cache_lock:
+        _cache.clear()
+
+
+# Statistik cache render
+def cache_info():
+    with _cache_lock:
+        info = dict(_cache_stats)
+        info['entries'] = len(_cache)
+        info['bytes'] = sum(len(png) for png in _cache.values())
+    return info
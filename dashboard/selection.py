@@ -0,0 +1,81 @@
+import numpy as np
+
+import data_loader
+
+# Filter baris tanpa menyalin frame. Untuk setiap kolom kategori yang difilter (misalnya
+# weathersit), posisi baris per nilai dihitung sekali dan di-cache bersama frame (lihat
+# data_loader.derived). Filter {kolom: [nilai, ...]} lalu menjadi satu array posisi baris
+# (urutan baris asli) tanpa mask boolean atau frame antara. Frame dari cache tidak pernah
+# diubah; yang dibentuk hanya kolom yang dibutuhkan pada baris terpilih, dan hanya saat
+# benar-benar dipakai (misalnya saat grafik tidak ada di render cache).
+
+
+# Posisi baris per nilai kolom: {nilai: array posisi terurut}
+def build_positions(values, offset=0):
+    dtype = np.int32 if offset + len(values) < 2 ** 31 else np.int64
+    order = np.argsort(values, kind='stable').astype(dtype)
+    sorted_values = values[order]
+    starts = np.flatnonzero(np.diff(sorted_values)) + 1
+    keys = sorted_values[np.r_[0, starts]] if len(values) else []
+    return {key.item(): part + offset for key, part in zip(keys, np.split(order, starts))}
+
+
+# Baris baru (append inkremental) ditambahkan di akhir posisi setiap nilai
+def _append_positions(column):
+    def append(positions, new_df, delta):
+        added = build_positions(delta[column].to_numpy(), len(new_df) - len(delta))
+        merged = dict(positions)
+        for key, part in added.items():
+            merged[key] = np.concatenate([merged[key], part]) if key in merged else part
+        return merged, None
+    return append
+
+
+def get_positions(df, column):
+    return data_loader.derived(df, f'positions:{column}', lambda df: build_positions(df[column].to_numpy()),
+                               _append_positions(column))
+
+
+# Nilai kolom yang ada datanya
+def present(df, column):
+    return set(get_positions(df, column))
+
+
+# Posisi baris yang lolos filter {kolom: nilai terpilih}, sesuai urutan baris asli. None
+# berarti semua baris (tanpa filter, atau semua nilai yang ada dipilih), sehingga
+# pemanggil bisa memakai frame apa adanya. Daftar nilai kosong berarti kolom tidak difilter.
+def rows(df, filters):
+    selected = None
+    for column, values in filters.items():
+        if not values:
+            continue
+        positions = get_positions(df, column)
+        if set(positions) <= set(values):
+            continue
+        parts = [positions[value] for value in values if value in positions]
+        column_rows = np.concatenate(parts) if parts else np.empty(0, dtype=np.int32)
+        if len(parts) > 1:
+            column_rows.sort()
+        selected = column_rows if selected is None else np.intersect1d(selected, column_rows, assume_unique=True)
+    return selected
+
+
+# Frame berisi kolom yang dibutuhkan pada baris terpilih. Pemilihan kolom tidak menyalin
+# data (copy-on-write); hanya baris terpilih dari kolom tersebut yang disalin.
+def take(df, selected, columns):
+    frame = df[list(columns)]
+    return frame if selected is None else frame.iloc[selected]
+
+
+# Array nilai satu kolom pada baris terpilih; konversi tipe data dilakukan setelah baris
+# dipilih agar kolom penuh tidak disalin
+def values(df, selected, column, dtype=None):
+    array = df[column].to_numpy()
+    if selected is not None:
+        array = array[selected]
+    return array if dtype is None else array.astype(dtype, copy=False)
+
+
+# Jumlah baris terpilih
+def count(df, selected):
+    return len(df) if selected is None else len(selected)
@@ -0,0 +1,264 @@
+import argparse
+import asyncio
+import os
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+
+import cube
+import data_loader
+
+# Launcher serving multi-proses: satu proses loader mempublikasikan data yang sudah
+# diproses ke shared memory, lalu N worker Streamlit meng-attach data tersebut
+# (lihat data_loader.load_shared) dan dilayani di belakang satu load balancer TCP.
+#
+#   python dashboard/serve.py --workers 4 --port 8501
+#
+# Argumen yang tidak dikenal diteruskan ke `streamlit run` setiap worker.
+
+DASHBOARD_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dashboard.py')
+
+# Sesi Streamlit (websocket dan file media seperti gambar st.image) hanya ada di worker
+# yang membuatnya, jadi browser harus selalu diarahkan ke worker yang sama. Worker dipilih
+# bergiliran saat websocket dibuka, lalu dicatat di cookie. Setiap request HTTP biasa
+# dirutekan sendiri: koneksinya ditutup setelah satu respons (Connection: close), sehingga
+# browser tidak memakai ulang koneksi keep-alive yang sudah terikat ke worker lain.
+STICKY_COOKIE = 'dashboard_worker'
+STREAM_PATH = b'/_stcore/stream'
+HOP_HEADERS = re.compile(rb'\r\n(?:connection|keep-alive):[^\r]*', re.IGNORECASE)
+
+# Artefak turunan yang ikut dipublikasikan: cube per jam dibangun sekali oleh loader,
+# bukan sekali per worker
+SHARED_DERIVED = {'cube': (1, cube.build_cube)}
+HEAD_LIMIT = 64 * 1024
+BUFFER_SIZE = 64 * 1024
+
+
+# Folder shared default: /dev/shm (tmpfs) jika tersedia, jika tidak folder temp biasa
+def default_shared_dir():
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(base, f'bike-dashboard-{os.getpid()}')
+
+
+# Mempublikasikan data dan artefak turunan ke folder shared
+def publish(shared_dir):
+    data_loader.publish_frames(shared_dir, derived_builders=SHARED_DERIVED)
+
+
+# Menjalankan satu worker Streamlit yang meng-attach data dari folder shared
+def start_worker(port, shared_dir, streamlit_args):
+    env = dict(os.environ, DASHBOARD_SHARED_DIR=shared_dir, DASHBOARD_INGEST='memory')
+    command = [
+        sys.executable, '-m', 'streamlit', 'run', DASHBOARD_SCRIPT,
+        '--server.port', str(port),
+        '--server.address', '127.0.0.1',
+        '--server.headless', 'true',
+    ] + streamlit_args
+    return subprocess.Popen(command, env=env)
+
+
+# Memori proses dari /proc/<pid>/smaps_rollup (kB). Pss membagi halaman bersama secara
+# proporsional antar proses, sehingga jumlah Pss semua worker adalah memori sebenarnya.
+def process_memory(pid):
+    memory = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == 'kB':
+                    memory[parts[0].rstrip(':')] = int(parts[1])
+    except OSError:
+        return None
+    return memory
+
+
+# Tabel memori per worker: RSS, PSS, memori privat, dan bagian PSS dari shared memory
+def memory_table(workers):
+    lines = [f"{'worker':<8}{'pid':>8}{'rss (MB)':>11}{'pss (MB)':>11}{'privat (MB)':>13}{'shmem (MB)':>12}"]
+    total_pss = 0
+    for port, process in workers:
+        memory = process_memory(process.pid)
+        if memory is None:
+            continue
+        private = memory.get('Private_Clean', 0) + memory.get('Private_Dirty', 0)
+        total_pss += memory.get('Pss', 0)
+        lines.append(f"{port:<8}{process.pid:>8}{memory.get('Rss', 0) / 1024:>11.1f}"
+                     f"{memory.get('Pss', 0) / 1024:>11.1f}{private / 1024:>13.1f}"
+                     f"{memory.get('Pss_Shmem', 0) / 1024:>12.1f}")
+    lines.append(f"total PSS worker: {total_pss / 1024:.1f} MB")
+    return '\n'.join(lines)
+
+
+# Menyalin data dari satu sisi koneksi ke sisi lain sampai koneksi ditutup
+async def pipe(reader, writer, prefix=b''):
+    try:
+        if prefix:
+            writer.write(prefix)
+        while True:
+            data = await reader.read(BUFFER_SIZE)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+# Memilih worker untuk satu request dari header-nya: cookie sticky jika ada, worker
+# bergiliran untuk websocket baru (cookie lalu dipasang di respons). Request lain tanpa
+# cookie (halaman awal, file statis) tidak memajukan giliran dan dilayani worker giliran
+# berikutnya. Mengembalikan (port, pasang cookie, websocket).
+def choose_worker(head, ports, rotation):
+    request_line = head.split(b'\r\n', 1)[0].split()
+    is_stream = len(request_line) > 1 and request_line[1].startswith(STREAM_PATH)
+    match = re.search(rb'(?:^|[;\s])' + STICKY_COOKIE.encode() + rb'=(\d+)', head)
+    if match and int(match.group(1)) in ports:
+        return int(match.group(1)), False, is_stream
+    port = ports[rotation['next'] % len(ports)]
+    if is_stream:
+        rotation['next'] += 1
+    return port, is_stream, is_stream
+
+
+# Header request HTTP biasa dengan Connection: close, agar worker menutup koneksi setelah
+# respons dan request berikutnya dari browser dirutekan ulang
+def close_after_response(head):
+    return HOP_HEADERS.sub(b'', head[:-4]) + b'\r\nConnection: close\r\n\r\n'
+
+
+# Meneruskan satu koneksi klien ke worker yang dipilih; worker yang tidak bisa
+# dihubungi dilewati. Websocket diteruskan apa adanya selama koneksi terbuka; request
+# lain hanya satu per koneksi.
+async def handle_client(client_reader, client_writer, ports, rotation):
+    try:
+        head = await client_reader.readuntil(b'\r\n\r\n')
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+        client_writer.close()
+        return
+
+    port, set_cookie, is_stream = choose_worker(head, ports, rotation)
+    candidates = [port] + [p for p in ports if p != port]
+    for port in candidates:
+        try:
+            worker_reader, worker_writer = await asyncio.open_connection('127.0.0.1', port)
+            break
+        except OSError:
+            set_cookie = is_stream
+    else:
+        client_writer.close()
+        return
+
+    extra_headers = b''
+    if set_cookie:
+        extra_headers += f'Set-Cookie: {STICKY_COOKIE}={port}; Path=/; SameSite=Lax\r\n'.encode()
+    if not is_stream:
+        head = close_after_response(head)
+        extra_headers += b'Connection: close\r\n'
+
+    worker_writer.write(head)
+    response_prefix = b''
+    if extra_headers:
+        # Header tambahan disisipkan setelah baris status respons pertama
+        try:
+            await worker_writer.drain()
+            status = await worker_reader.readuntil(b'\r\n')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            client_writer.close()
+            worker_writer.close()
+            return
+        response_prefix = status + extra_headers
+
+    await asyncio.gather(
+        pipe(client_reader, worker_writer),
+        pipe(worker_reader, client_writer, response_prefix),
+    )
+
+
+# Mempublikasikan ulang data jika file CSV berubah. Worker meng-attach file baru pada
+# rerun berikutnya; file lama tetap valid sampai tidak dipakai lagi.
+async def watch_data(shared_dir, interval, version):
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            current = data_loader.data_version()
+            if current != version:
+                await loop.run_in_executor(None, publish, shared_dir)
+                version = current
+                print("Data berubah, dipublikasikan ulang ke", shared_dir, flush=True)
+        except Exception as e:
+            print(f"Gagal mempublikasikan ulang data: {e}", flush=True)
+
+
+# Mencetak tabel memori per worker secara berkala
+async def report_memory(workers, interval):
+    while True:
+        await asyncio.sleep(interval)
+        print(memory_table(workers), flush=True)
+
+
+async def serve(args, workers, shared_dir, version):
+    ports = [port for port, _ in workers]
+    rotation = {'next': 0}
+    server = await asyncio.start_server(
+        lambda r, w: handle_client(r, w, ports, rotation),
+        args.host, args.port, limit=HEAD_LIMIT
+    )
+    print(f"Load balancer di http://{args.host}:{args.port} -> worker {ports}", flush=True)
+
+    tasks = [asyncio.create_task(watch_data(shared_dir, args.watch_interval, version))]
+    if args.report_interval > 0:
+        tasks.append(asyncio.create_task(report_memory(workers, args.report_interval)))
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    async with server:
+        await stop.wait()
+    for task in tasks:
+        task.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serving dashboard multi-proses dengan data di shared memory')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8501)
+    parser.add_argument('--worker-port', type=int, default=8601, help='port worker pertama')
+    parser.add_argument('--shared-dir', help='folder file Arrow bersama (default di /dev/shm)')
+    parser.add_argument('--watch-interval', type=float, default=5.0,
+                        help='interval (detik) pengecekan perubahan file CSV')
+    parser.add_argument('--report-interval', type=float, default=0,
+                        help='jika > 0, cetak memori per worker setiap N detik')
+    args, streamlit_args = parser.parse_known_args()
+
+    shared_dir = args.shared_dir or default_shared_dir()
+    owns_dir = not os.path.exists(shared_dir)
+    version = data_loader.data_version()
+    publish(shared_dir)
+    print("Data dipublikasikan ke", shared_dir, flush=True)
+
+    workers = [(args.worker_port + i, start_worker(args.worker_port + i, shared_dir, streamlit_args))
+               for i in range(args.workers)]
+    try:
+        asyncio.run(serve(args, workers, shared_dir, version))
+    finally:
+        for _, process in workers:
+            process.terminate()
+        for _, process in workers:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if owns_dir:
+            shutil.rmtree(shared_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+
+# Ringkasan distribusi per kategori untuk box plot dan violin plot pada data besar.
+# Setiap (kategori, variabel) menyimpan sketch kuantil KLL, histogram dengan batas bin
+# yang sama untuk semua kategori (dasar KDE), serta n, jumlah, M2 (jumlah kuadrat simpangan
+# dari rata-rata, digabung dengan rumus varians paralel seperti cube), min, dan max.
+# Semuanya bisa digabung, sehingga baris baru cukup diringkas lalu digabung, dan
+# ukuran ringkasan tidak bergantung pada jumlah baris.
+MEASURES = ['cnt', 'casual', 'registered']
+
+# Parameter k sketch KLL: galat rank kira-kira O(1/k) dengan sekitar 3k nilai tersimpan
+SKETCH_K = int(os.environ.get('DASHBOARD_SKETCH_K', '200'))
+HIST_BINS = 512
+
+# Di atas jumlah baris ini grafik distribusi selalu memakai ringkasan; di bawahnya
+# pengguna bisa memaksa mode eksak dari data mentah
+EXACT_LIMIT = int(os.environ.get('DASHBOARD_EXACT_LIMIT', '1000000'))
+
+# Violin: bandwidth Scott, kurva diperpanjang `cut` x bandwidth di luar min/max seperti seaborn
+VIOLIN_POINTS = 100
+VIOLIN_CUT = 2
+
+
+# Kapasitas level sketch KLL: level teratas menampung k nilai, setiap level di bawahnya 2/3 kali lipat
+def _capacity(k, level, height):
+    return max(2, int(np.ceil(k * (2 / 3) ** (height - level - 1))))
+
+
+# Sketch KLL kosong. Nilai di level h mewakili 2^h nilai asli.
+def kll_sketch(k=None, seed=0):
+    return {'k': k or SKETCH_K, 'n': 0, 'levels': [np.empty(0)], 'seed': seed, 'rng': np.random.default_rng(seed)}
+
+
+# Memadatkan level yang melebihi kapasitas: nilai diurutkan, lalu setiap nilai kedua
+# (posisi awal acak) naik ke level berikutnya dengan bobot dua kali lipat
+def _compress(sketch):
+    levels = sketch['levels']
+    changed = True
+    while changed:
+        changed = False
+        for h in range(len(levels)):
+            if len(levels[h]) <= _capacity(sketch['k'], h, len(levels)):
+                continue
+            if h + 1 == len(levels):
+                levels.append(np.empty(0))
+            items = np.sort(levels[h])
+            odd = len(items) % 2
+            offset = int(sketch['rng'].integers(2))
+            levels[h + 1] = np.concatenate([levels[h + 1], items[odd + offset::2]])
+            levels[h] = items[:odd]
+            changed = True
+
+
+# Menambahkan sekumpulan nilai ke sketch (sekaligus, bukan satu per satu)
+def kll_update(sketch, values):
+    values = np.asarray(values, dtype='float64')
+    sketch['levels'][0] = np.concatenate([sketch['levels'][0], values])
+    sketch['n'] += len(values)
+    _compress(sketch)
+    return sketch
+
+
+# Menggabungkan dua sketch menjadi sketch baru tanpa mengubah keduanya. Sketch gabungan
+# punya generator acak sendiri dengan seed yang diturunkan dari seed kedua sketch, jadi
+# generator sketch asal tidak ikut maju dan hasil penggabungan tetap deterministik.
+def kll_merge(a, b):
+    height = max(len(a['levels']), len(b['levels']))
+    levels = [
+        np.concatenate([side['levels'][h] for side in (a, b) if h < len(side['levels'])])
+        for h in range(height)
+    ]
+    seed = int(np.random.SeedSequence([a['seed'], b['seed']]).generate_state(1)[0])
+    merged = {'k': a['k'], 'n': a['n'] + b['n'], 'levels': levels, 'seed': seed, 'rng': np.random.default_rng(seed)}
+    _compress(merged)
+    return merged
+
+
+# Nilai tersimpan beserta bobotnya, terurut menurut nilai
+def kll_items(sketch):
+    values = np.concatenate(sketch['levels'])
+    weights = np.concatenate([np.full(len(level), 2 ** h) for h, level in enumerate(sketch['levels'])])
+    order = np.argsort(values, kind='stable')
+    return values[order], weights[order]
+
+
+# Perkiraan kuantil q (0..1) dari sketch
+def kll_quantiles(sketch, qs):
+    values, weights = kll_items(sketch)
+    cumulative = np.cumsum(weights)
+    ranks = np.asarray(qs, dtype='float64') * cumulative[-1]
+    return values[np.clip(np.searchsorted(cumulative, ranks, 'left'), 0, len(values) - 1)]
+
+
+# Ringkasan satu kategori untuk satu variabel
+def _summarize(values, edges, seed):
+    values = np.asarray(values, dtype='float64')
+    deviation = values - values.mean()
+    return {
+        'n': len(values),
+        'sum': float(values.sum()),
+        'm2': float(deviation @ deviation),
+        'min': float(values.min()),
+        'max': float(values.max()),
+        'hist': np.histogram(values, bins=edges)[0],
+        'sketch': kll_update(kll_sketch(seed=seed), values),
+    }
+
+
+# Menggabungkan dua ringkasan kategori yang memakai batas bin yang sama. M2 digabung
+# dengan rumus varians paralel: M2 = M2_a + M2_b + (mean_b - mean_a)^2 * n_a * n_b / n.
+def _merge_summary(a, b):
+    n = a['n'] + b['n']
+    delta = b['sum'] / b['n'] - a['sum'] / a['n']
+    return {
+        'n': n,
+        'sum': a['sum'] + b['sum'],
+        'm2': a['m2'] + b['m2'] + delta * delta * a['n'] * b['n'] / n,
+        'min': min(a['min'], b['min']),
+        'max': max(a['max'], b['max']),
+        'hist': a['hist'] + b['hist'],
+        'sketch': kll_merge(a['sketch'], b['sketch']),
+    }
+
+
+# Kode kategori dan labelnya untuk kolom pengelompokan (kategorikal atau bilangan)
+def _category_codes(keys):
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        return keys.cat.codes.to_numpy(), list(keys.cat.categories)
+    labels, codes = np.unique(keys.to_numpy(), return_inverse=True)
+    return codes, labels.tolist()
+
+
+# Batas bin histogram untuk sebuah variabel, sama untuk semua kategori
+def _edges(values):
+    low, high = float(values.min()), float(values.max())
+    return np.linspace(low, high if high > low else low + 1, HIST_BINS + 1)
+
+
+# Membangun ringkasan distribusi per kategori `by` untuk setiap variabel:
+# {'by', 'edges': {variabel: batas bin}, 'groups': {(kategori, variabel): ringkasan}}
+def build_distributions(df, by, edges=None):
+    codes, labels = _category_codes(df[by])
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    present = np.unique(sorted_codes[sorted_codes >= 0])
+    starts = np.searchsorted(sorted_codes, present, 'left')
+    ends = np.searchsorted(sorted_codes, present, 'right')
+
+    if edges is None:
+        edges = {measure: _edges(df[measure].to_numpy()) for measure in MEASURES} if len(df) else {}
+    groups = {}
+    for measure in MEASURES:
+        values = df[measure].to_numpy()[order]
+        for seed, (code, start, end) in enumerate(zip(present, starts, ends)):
+            groups[(labels[code], measure)] = _summarize(values[start:end], edges[measure], seed)
+    return {'by': by, 'edges': edges, 'groups': groups}
+
+
+# Membangun ringkasan distribusi dari jumlah kemunculan setiap nilai per (kategori,
+# variabel) (lihat weather_stats.count_values) dan sketch KLL per (kategori, variabel)
+# yang dilipat terpisah, misalnya per chunk pada mode streaming. n, jumlah, M2, min, max,
+# dan histogram sama dengan build_distributions pada data mentah; batas bin diambil dari
+# nilai terkecil dan terbesar semua kategori.
+def counts_distributions(by, value_counts, sketches):
+    edges = {}
+    for measure in MEASURES:
+        values = [counts[0] for (_, name), counts in value_counts.items() if name == measure]
+        if values:
+            edges[measure] = _edges(np.concatenate(values))
+    groups = {}
+    for (category, measure), (values, occurrences) in value_counts.items():
+        values = values.astype('float64')
+        n = int(occurrences.sum())
+        total = float(values @ occurrences)
+        deviation = values - total / n
+        groups[(category, measure)] = {
+            'n': n,
+            'sum': total,
+            'm2': float(occurrences @ (deviation * deviation)),
+            'min': float(values[0]),
+            'max': float(values[-1]),
+            'hist': np.histogram(values, bins=edges[measure], weights=occurrences)[0].astype('int64'),
+            'sketch': sketches[(category, measure)],
+        }
+    return {'by': by, 'edges': edges, 'groups': groups}
+
+
+# Hook append: baris baru diringkas dengan batas bin yang sama lalu digabung per kategori.
+# Jika ada nilai baru di luar batas bin, ringkasan dibangun ulang dari frame lengkap.
+def append_distributions(distributions, df, new_rows):
+    edges = distributions['edges']
+    for measure in MEASURES:
+        values = new_rows[measure].to_numpy()
+        if len(values) and (values.min() < edges[measure][0] or values.max() > edges[measure][-1]):
+            return build_distributions(df, distributions['by']), None
+
+    partial = build_distributions(new_rows, distributions['by'], edges)
+    groups = dict(distributions['groups'])
+    for key, summary in partial['groups'].items():
+        groups[key] = _merge_summary(groups[key], summary) if key in groups else summary
+    return {'by': distributions['by'], 'edges': edges, 'groups': groups}, None
+
+
+# Ringkasan distribusi per kategori untuk sebuah frame, di-cache bersama data yang sedang dimuat
+def get_distributions(df, by):
+    return data_loader.derived(
+        df, f'distributions:{by}',
+        lambda frame: build_distributions(frame, by),
+        append_distributions
+    )
+
+
+# Statistik box plot (format Axes.bxp) dari ringkasan: kuartil dari sketch, whisker
+# pada nilai terjauh dalam 1,5 x IQR, dan outlier dari nilai tersimpan di sketch
+# (perwakilan berbobot, bukan seluruh outlier)
+def box_stats(summary, label):
+    q1, median, q3 = kll_quantiles(summary['sketch'], [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    low, high = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    values, _ = kll_items(summary['sketch'])
+    values = np.unique(np.r_[values, summary['min'], summary['max']])
+    inside = values[(values >= low) & (values <= high)]
+    return {
+        'label': label,
+        'med': median,
+        'q1': q1,
+        'q3': q3,
+        'whislo': inside.min() if len(inside) else q1,
+        'whishi': inside.max() if len(inside) else q3,
+        'fliers': values[(values < low) | (values > high)],
+        'mean': summary['sum'] / summary['n'],
+    }
+
+
+# Statistik violin plot (format Axes.violin): KDE Gaussian dengan bandwidth Scott yang
+# dihitung dari histogram, bukan dari setiap baris
+def violin_stats(summary, edges):
+    n = summary['n']
+    mean = summary['sum'] / n
+    std = np.sqrt(summary['m2'] / max(n - 1, 1))
+    width = edges[1] - edges[0]
+    bandwidth = max(std * n ** (-1 / 5), width)
+    coords = np.linspace(summary['min'] - VIOLIN_CUT * bandwidth, summary['max'] + VIOLIN_CUT * bandwidth, VIOLIN_POINTS)
+    centers = (edges[:-1] + edges[1:]) / 2
+    counts = summary['hist']
+    used = counts > 0
+    z = (coords[:, None] - centers[None, used]) / bandwidth
+    density = (counts[used] * np.exp(-0.5 * z * z)).sum(axis=1) / (n * bandwidth * np.sqrt(2 * np.pi))
+    q1, median, q3 = kll_quantiles(summary['sketch'], [0.25, 0.5, 0.75])
+    return {
+        'coords': coords,
+        'vals': density,
+        'mean': mean,
+        'median': median,
+        'min': summary['min'],
+        'max': summary['max'],
+        'quartiles': (q1, q3),
+    }
+
+
+# Statistik box dan violin untuk kategori yang dipilih (urut sesuai `order`, kategori
+# tanpa data dilewati); labels memetakan kategori ke label sumbu x
+def plot_stats(distributions, y_var, order, labels=None):
+    boxes, violins = [], []
+    for category in order:
+        summary = distributions['groups'].get((category, y_var))
+        if summary is None or summary['n'] == 0:
+            continue
+        label = labels.get(category, category) if labels else category
+        boxes.append(box_stats(summary, label))
+        violins.append(violin_stats(summary, distributions['edges'][y_var]))
+    return boxes, violins
@@ -0,0 +1,321 @@
+import math
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+import cube
+import data_loader
+import lazy
+
+# Backend SQL tertanam untuk lapisan query (lihat queries.py). Dengan DASHBOARD_BACKEND=sqlite
+# atau duckdb, setiap frame yang dimuat didaftarkan sebagai tabel `data` di engine tersebut,
+# lalu filter dan agregasi view dijalankan sebagai SQL di dalam engine, bukan sebagai mask
+# boolean + groupby pandas. Default `pandas` memakai artefak turunan pandas seperti biasa.
+#
+# sqlite - database in-memory dengan indeks pada (dteday, hr), weathersit, dan season
+# duckdb - tabel kolumnar DuckDB (butuh paket duckdb), diurutkan menurut waktu sehingga
+#          filter rentang tanggal melewati blok lewat zone map
+BACKENDS = ['pandas', 'sqlite', 'duckdb']
+BACKEND = os.environ.get('DASHBOARD_BACKEND', 'pandas')
+if BACKEND not in BACKENDS:
+    raise ValueError(f"DASHBOARD_BACKEND harus salah satu dari {', '.join(BACKENDS)}")
+ENABLED = BACKEND != 'pandas'
+
+INDEXES = {'idx_time': ['dteday', 'hr'], 'idx_weather': ['weathersit'], 'idx_season': ['season']}
+
+# Ekspresi yang berbeda antar engine: awal periode untuk setiap frekuensi dan bulan
+DIALECTS = {
+    'sqlite': {
+        'period': {
+            'Per Jam': "dteday || printf(' %02d:00:00', hr)",
+            'Harian': "dteday",
+            'Mingguan': "date(dteday, '-' || ((CAST(strftime('%w', dteday) AS INTEGER) + 6) % 7) || ' days')",
+            'Bulanan': "strftime('%Y-%m-01', dteday)",
+        },
+        'month': "CAST(strftime('%m', dteday) AS INTEGER)",
+    },
+    'duckdb': {
+        'period': {
+            'Per Jam': "dteday + to_hours(CAST(hr AS BIGINT))",
+            'Harian': "dteday",
+            'Mingguan': "date_trunc('week', dteday)",
+            'Bulanan': "date_trunc('month', dteday)",
+        },
+        'month': "month(dteday)",
+    },
+}
+
+
+# Kolom frame yang didaftarkan: semua kolom numerik (label kategorikal tidak perlu karena
+# kodenya sudah ada), temp_bin dari temp_celsius, dan tanggal sebagai string ISO (SQLite)
+# atau DATE (DuckDB)
+def _table_frame(df):
+    table = pd.DataFrame({
+        column: df[column] for column in df.columns
+        if column == 'dteday' or (pd.api.types.is_numeric_dtype(df[column]) and not isinstance(df[column].dtype, pd.CategoricalDtype))
+    })
+    if 'temp_celsius' in table.columns and 'temp_bin' not in table.columns:
+        table['temp_bin'] = cube.temp_bin_codes(df['temp_celsius']).to_numpy()
+    if 'dteday' in table.columns:
+        table['dteday'] = table['dteday'].dt.strftime('%Y-%m-%d') if BACKEND == 'sqlite' else table['dteday'].dt.date
+    return table
+
+
+# Database untuk sebuah frame: koneksi engine berisi tabel `data`, beserta lock karena
+# koneksi dipakai bersama oleh semua sesi (thread) Streamlit
+def build_database(df):
+    table = _table_frame(df)
+    if BACKEND == 'sqlite':
+        conn = sqlite3.connect(':memory:', check_same_thread=False)
+        table.to_sql('data', conn, index=False, chunksize=100000)
+        for name, columns in INDEXES.items():
+            if all(column in table.columns for column in columns):
+                conn.execute(f"CREATE INDEX {name} ON data ({', '.join(columns)})")
+        conn.execute('ANALYZE')
+    else:
+        conn = lazy.module('duckdb').connect()
+        conn.register('frame', table)
+        order = [column for column in INDEXES['idx_time'] if column in table.columns]
+        conn.execute(f"CREATE TABLE data AS SELECT * FROM frame ORDER BY {', '.join(order) or '1'}")
+        conn.unregister('frame')
+    return {'conn': conn, 'lock': threading.Lock(), 'columns': list(table.columns)}
+
+
+# Hook append: baris baru dimasukkan ke tabel yang sudah ada (indeks SQLite ikut
+# diperbarui), bukan membangun ulang database. Koneksi dipakai bersama sehingga tabel
+# diubah di tempat: query yang sedang berjalan selesai dulu (lock database), query
+# berikutnya sudah melihat baris baru. Append hanya menambah tanggal yang lebih baru,
+# jadi tabel DuckDB tetap terurut menurut waktu. Untuk cube, sel parsial baris baru
+# ditambahkan sebagai baris terpisah; query cube selalu menjumlahkan sel per kelompok.
+def append_database(db, df, new_rows):
+    table = _table_frame(new_rows)[db['columns']]
+    with db['lock']:
+        if BACKEND == 'sqlite':
+            table.to_sql('data', db['conn'], index=False, if_exists='append', chunksize=100000)
+        else:
+            db['conn'].register('frame', table)
+            db['conn'].execute(f"INSERT INTO data ({', '.join(db['columns'])}) SELECT * FROM frame")
+            db['conn'].unregister('frame')
+    return db, None
+
+
+# Database untuk sebuah frame, di-cache bersama data yang sedang dimuat dan diperbarui
+# lewat append_database jika ada baris baru
+def get_database(df):
+    return data_loader.derived(df, f'sql:{BACKEND}', build_database, append_database)
+
+
+# Menjalankan query pada database frame dan mengembalikan hasilnya sebagai DataFrame
+def fetch(df, sql, params=()):
+    db = get_database(df)
+    with db['lock']:
+        cursor = db['conn'].execute(sql, list(params))
+        rows = cursor.fetchall()
+        columns = [column[0] for column in cursor.description]
+    return pd.DataFrame.from_records(rows, columns=columns)
+
+
+# Klausa WHERE dari daftar kondisi (kolom, nilai); daftar nilai menjadi IN (?, ...)
+def where(conditions):
+    clauses, params = [], []
+    for column, value in conditions:
+        if isinstance(value, (list, tuple)):
+            clauses.append(f"{column} IN ({', '.join('?' * len(value))})" if value else '0 = 1')
+            params.extend(int(v) for v in value)
+        else:
+            clauses.append(f'{column} = ?')
+            params.append(value)
+    return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+
+# Parameter tanggal sesuai tipe kolom dteday di engine
+def date_param(value):
+    value = pd.Timestamp(value).date()
+    return value.isoformat() if BACKEND == 'sqlite' else value
+
+
+# Kuantil (interpolasi linear seperti numpy) per kelompok, dihitung di engine:
+# DuckDB lewat quantile_cont, SQLite lewat nomor urut baris per kelompok (window function)
+# sehingga hanya baris di sekitar posisi kuantil yang dikirim balik. {kelompok: array}
+def group_quantiles(df, column, group, qs, conditions=()):
+    clause, params = where(conditions)
+    if BACKEND == 'duckdb':
+        rows = fetch(df, f"SELECT {group} AS g, quantile_cont({column}, {list(qs)}) AS q "
+                         f"FROM data{clause} GROUP BY {group}", params)
+        return {g: np.asarray(q, dtype='float64') for g, q in zip(rows['g'], rows['q'])}
+
+    positions = ' OR '.join(f'i = CAST({q!r} * (c - 1) AS INTEGER) OR i = CAST({q!r} * (c - 1) AS INTEGER) + 1'
+                            for q in qs)
+    rows = fetch(df, f"""
+        WITH ranked AS (
+            SELECT {group} AS g, {column} AS v,
+                   ROW_NUMBER() OVER (PARTITION BY {group} ORDER BY {column}) - 1 AS i,
+                   COUNT(*) OVER (PARTITION BY {group}) AS c
+            FROM data{clause}
+        )
+        SELECT g, i, c, v FROM ranked WHERE {positions}""", params)
+    result = {}
+    for g, part in rows.groupby('g', sort=True):
+        values = dict(zip(part['i'], part['v'].astype('float64')))
+        c = int(part['c'].iloc[0])
+        quantiles = []
+        for q in qs:
+            position = q * (c - 1)
+            lo = math.floor(position)
+            fraction = position - lo
+            quantiles.append(values[lo] if fraction == 0 else values[lo] + (values[lo + 1] - values[lo]) * fraction)
+        result[g] = np.array(quantiles)
+    return result
+
+
+# Metrik utama dari data harian
+def kpis(day_df):
+    totals = fetch(day_df, "SELECT SUM(cnt) AS total, AVG(cnt) AS mean, MAX(cnt) AS peak, "
+                           "SUM(casual) AS casual, SUM(registered) AS registered FROM data").iloc[0]
+    month = DIALECTS[BACKEND]['month']
+    peak_month = fetch(day_df, f"SELECT {month} AS month, AVG(cnt) AS mean FROM data "
+                               f"GROUP BY month ORDER BY mean DESC, month LIMIT 1").iloc[0]['month']
+    return {
+        'total_rentals': int(totals['total']),
+        'avg_daily': int(totals['mean']),
+        'max_daily': int(totals['peak']),
+        'peak_month': int(peak_month),
+        'casual': int(totals['casual']),
+        'registered': int(totals['registered']),
+    }
+
+
+# Agregasi per hari (Mean, Median, Sum, Min, Max) dengan urutan hari Senin-Minggu
+def weekday_aggregate(day_df, agg_method, y_var):
+    if agg_method == 'Median':
+        values = {g: q[0] for g, q in group_quantiles(day_df, y_var, 'weekday', [0.5]).items()}
+    else:
+        function = {'Mean': 'AVG', 'Sum': 'SUM', 'Min': 'MIN', 'Max': 'MAX'}[agg_method]
+        rows = fetch(day_df, f"SELECT weekday, {function}({y_var}) AS value FROM data GROUP BY weekday")
+        values = dict(zip(rows['weekday'], rows['value']))
+    data = pd.Series({data_loader.DAY_NAMES[g]: v for g, v in values.items() if g in data_loader.DAY_NAMES}, name=y_var)
+    data = data.reindex(data_loader.DAY_ORDER)
+    data.index.name = 'weekday_name'
+    return data
+
+
+# Filter cube per jam sebagai kondisi SQL
+def _hourly_conditions(workingday, seasons):
+    conditions = []
+    if workingday is not None:
+        conditions.append(('workingday', int(workingday)))
+    if seasons:
+        conditions.append(('season', list(seasons)))
+    return conditions
+
+
+# Rata-rata per jam dari sel cube (jumlah / banyak baris) yang lolos filter
+def hourly_profile(profile, y_var, workingday=None, seasons=None):
+    clause, params = where(_hourly_conditions(workingday, seasons))
+    rows = fetch(profile, f"SELECT hr, SUM({y_var}_sum) * 1.0 / SUM(n) AS mean FROM data{clause} "
+                          f"GROUP BY hr ORDER BY hr", params)
+    return rows.set_index('hr')['mean']
+
+
+# Pivot rata-rata per jam (baris) dan hari (kolom)
+def hourly_heatmap(profile, y_var, workingday=None, seasons=None):
+    clause, params = where(_hourly_conditions(workingday, seasons))
+    rows = fetch(profile, f"SELECT hr, weekday, SUM({y_var}_sum) * 1.0 / SUM(n) AS mean FROM data{clause} "
+                          f"GROUP BY hr, weekday ORDER BY hr, weekday", params)
+    pivot_df = rows.pivot(index='hr', columns='weekday', values='mean').rename(columns=data_loader.DAY_NAMES)
+    pivot_df.columns.name = 'weekday_name'
+    return pivot_df.reindex(columns=data_loader.DAY_ORDER)
+
+
+# Ringkasan per kondisi cuaca untuk satu variabel dengan struktur yang sama seperti
+# weather_stats.build_summary: {(weathersit, variabel): {count, sum, m2, kuantil}}. M2
+# dijumlahkan dari simpangan terhadap rata-rata kelompok (window function), bukan dari
+# selisih jumlah kuadrat, agar tidak kehilangan presisi.
+def weather_summary(hour_df, y_var, groups):
+    conditions = [('weathersit', list(groups))]
+    clause, params = where(conditions)
+    rows = fetch(hour_df, f"""
+        WITH filtered AS (
+            SELECT weathersit, {y_var} AS y, {y_var} - AVG({y_var}) OVER (PARTITION BY weathersit) AS deviation
+            FROM data{clause}
+        )
+        SELECT weathersit, COUNT(*) AS n, SUM(y) AS total, SUM(deviation * deviation) AS m2
+        FROM filtered GROUP BY weathersit""", params)
+    quantiles = group_quantiles(hour_df, y_var, 'weathersit', [0.0, 0.25, 0.5, 0.75, 1.0], conditions)
+    return {
+        (int(group), y_var): {'count': int(n), 'sum': int(total), 'm2': float(m2), 'quantiles': quantiles[group]}
+        for group, n, total, m2 in zip(rows['weathersit'], rows['n'], rows['total'], rows['m2'])
+    }
+
+
+# Statistik cukup regresi per kondisi cuaca, dengan struktur yang sama seperti
+# regression.build_moments untuk satu pasangan (x, y). M2 dan kovarians dijumlahkan dari
+# simpangan terhadap rata-rata kelompok (window function), bukan dari selisih jumlah
+# kuadrat, agar tidak kehilangan presisi.
+def regression_moments(df, x_var, y_var, groups=None):
+    clause, params = where([('weathersit', list(groups))] if groups else [])
+    rows = fetch(df, f"""
+        WITH filtered AS (
+            SELECT weathersit, {x_var} AS x, {y_var} AS y,
+                   {x_var} - AVG({x_var}) OVER (PARTITION BY weathersit) AS dx,
+                   {y_var} - AVG({y_var}) OVER (PARTITION BY weathersit) AS dy
+            FROM data{clause}
+        )
+        SELECT weathersit, COUNT(*) AS n, SUM(x) AS sx, SUM(y) AS sy,
+               SUM(dx * dx) AS m2_x, SUM(dy * dy) AS m2_y, SUM(dx * dy) AS c_xy,
+               MIN(x) AS min_x, MAX(x) AS max_x
+        FROM filtered GROUP BY weathersit""", params)
+    moments = {}
+    for row in rows.itertuples(index=False):
+        n = int(row.n)
+        moments[int(row.weathersit)] = {
+            'n': n,
+            'mean_x': float(row.sx) / n,
+            'mean_y': float(row.sy) / n,
+            'm2_x': float(row.m2_x),
+            'm2_y': float(row.m2_y),
+            'c_xy': float(row.c_xy),
+            'min_x': float(row.min_x),
+            'max_x': float(row.max_x),
+        }
+    return moments
+
+
+# Tanggal pertama dan terakhir
+def date_bounds(df):
+    row = fetch(df, "SELECT MIN(dteday) AS first, MAX(dteday) AS last FROM data").iloc[0]
+    return pd.Timestamp(row['first']).date(), pd.Timestamp(row['last']).date()
+
+
+# Jumlah setiap kolom per periode untuk rentang tanggal [start, end] (inklusif)
+def period_rollup(df, freq, columns, start, end):
+    period = DIALECTS[BACKEND]['period'][freq]
+    sums = ', '.join(f'SUM({column}) AS {column}' for column in columns)
+    rows = fetch(df, f"SELECT {period} AS period, {sums} FROM data WHERE dteday BETWEEN ? AND ? "
+                     f"GROUP BY 1 ORDER BY 1", [date_param(start), date_param(end)])
+    table = {'period': pd.to_datetime(rows['period']).to_numpy(dtype=df['dteday'].dtype)}
+    for column in columns:
+        table[column] = rows[column].to_numpy(dtype='int64')
+    return pd.DataFrame(table)
+
+
+# Jumlah baris, casual, dan registered per (hari, kondisi cuaca, rentang suhu) dengan
+# bentuk yang sama seperti comparison.user_counts; slot di luar label dihitung di engine
+def user_counts(df, weekday_slots, weather_slots, temp_slots):
+    rows = fetch(df, f"""
+        SELECT CASE WHEN weekday BETWEEN 0 AND 6 THEN (weekday + 6) % 7 ELSE {weekday_slots - 1} END AS d,
+               CASE WHEN weathersit BETWEEN 1 AND {weather_slots - 1} THEN weathersit - 1 ELSE {weather_slots - 1} END AS w,
+               temp_bin + 1 AS t,
+               COUNT(*) AS n, SUM(casual) AS casual, SUM(registered) AS registered
+        FROM data GROUP BY 1, 2, 3""")
+    shape = (weekday_slots, weather_slots, temp_slots)
+    cells = (rows['d'].to_numpy(dtype='int64'), rows['w'].to_numpy(dtype='int64'), rows['t'].to_numpy(dtype='int64'))
+    counts = {'rows': np.zeros(shape, dtype='int64')}
+    counts['rows'][cells] = rows['n'].to_numpy(dtype='int64')
+    for column in ['casual', 'registered']:
+        counts[column] = np.zeros(shape)
+        counts[column][cells] = rows[column].to_numpy(dtype='float64')
+    return counts
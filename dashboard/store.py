@@ -0,0 +1,275 @@
+import argparse
+import json
+import os
+import threading
+
+import pandas as pd
+
+import data_loader
+
+# Penyimpanan data terpartisi untuk banyak kota dan tahun. Setiap partisi berisi data satu
+# kota untuk satu bulan, dengan skema yang sama seperti day.csv/hour.csv:
+#
+#   <DASHBOARD_STORE>/<kota>/<tahun>/<bulan>/day.csv
+#   <DASHBOARD_STORE>/<kota>/<tahun>/<bulan>/hour.csv
+#
+# Katalog (catalog.json di folder akar) mencatat tanggal pertama/terakhir, jumlah baris,
+# musim, dan tanda tangan file setiap partisi. Pilihan kota, rentang tanggal, dan musim
+# memangkas partisi lewat katalog sebelum file data dibaca, sehingga memuat satu bulan
+# satu kota hanya membaca file partisi bulan tersebut. Dengan DASHBOARD_DAY_SOURCE=hour,
+# day.csv partisi boleh tidak ada dan tidak dibaca: data harian diturunkan dari data per jam.
+STORE_DIR = os.environ.get('DASHBOARD_STORE')
+CATALOG_NAME = 'catalog.json'
+# Naikkan nilai ini setiap kali isi katalog berubah agar katalog lama dipindai ulang
+CATALOG_FORMAT = 1
+PARTITION_FILES = ('day', 'hour')
+
+# Banyaknya cakupan data (kota, rentang tanggal, musim) yang frame-nya disimpan di cache
+# data; cakupan yang paling lama tidak dipakai dibuang lebih dulu
+MAX_SCOPES = int(os.environ.get('DASHBOARD_STORE_SCOPES', '8'))
+
+# Katalog yang sudah dipindai per folder akar, dipakai bersama oleh semua sesi
+_catalog_lock = threading.Lock()
+_catalogs = {}
+
+
+# Lokasi file partisi
+def partition_path(root, partition, name):
+    return os.path.join(root, partition['path'], f'{name}.csv')
+
+
+# File partisi yang dibaca saat memuat data
+def loaded_files():
+    return ('hour',) if data_loader.DAY_SOURCE == 'hour' else PARTITION_FILES
+
+
+# Folder partisi (relatif terhadap akar) yang berisi hour.csv, urut menurut kota dan waktu
+def find_partitions(root):
+    found = []
+    for city in sorted(os.listdir(root)):
+        city_dir = os.path.join(root, city)
+        if not os.path.isdir(city_dir):
+            continue
+        for year in sorted(os.listdir(city_dir)):
+            if not year.isdigit():
+                continue
+            for month in sorted(os.listdir(os.path.join(city_dir, year))):
+                relative = os.path.join(city, year, month)
+                if month.isdigit() and os.path.exists(os.path.join(root, relative, 'hour.csv')):
+                    found.append(relative)
+    return found
+
+
+# Statistik satu file partisi: tanda tangan, jumlah baris, tanggal pertama/terakhir, dan
+# musim. Hanya kolom tanggal dan musim yang dibaca.
+def scan_file(path):
+    stat = os.stat(path)
+    df = data_loader.read_csv(path, usecols=['dteday', 'season'])
+    return {
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'rows': len(df),
+        'min_date': df['dteday'].min().date().isoformat() if len(df) else None,
+        'max_date': df['dteday'].max().date().isoformat() if len(df) else None,
+        'seasons': sorted(int(season) for season in df['season'].unique()),
+    }
+
+
+# Entri katalog untuk satu partisi; file yang tanda tangannya sama dengan entri lama tidak dipindai ulang
+def scan_partition(root, relative, previous=None):
+    city, year, month = relative.split(os.sep)
+    files = {}
+    for name in PARTITION_FILES:
+        path = os.path.join(root, relative, f'{name}.csv')
+        if not os.path.exists(path):
+            continue
+        stat = os.stat(path)
+        old = (previous or {}).get('files', {}).get(name)
+        if old is not None and old['mtime_ns'] == stat.st_mtime_ns and old['size'] == stat.st_size:
+            files[name] = old
+        else:
+            files[name] = scan_file(path)
+    dates = [stats[bound] for stats in files.values() for bound in ('min_date', 'max_date') if stats[bound]]
+    return {
+        'city': city,
+        'year': int(year),
+        'month': int(month),
+        'path': relative,
+        'files': files,
+        'min_date': min(dates) if dates else None,
+        'max_date': max(dates) if dates else None,
+        'seasons': sorted({season for stats in files.values() for season in stats['seasons']}),
+    }
+
+
+# Membaca catalog.json; None jika tidak ada, rusak, atau formatnya lama
+def read_catalog(root):
+    try:
+        with open(os.path.join(root, CATALOG_NAME)) as f:
+            catalog = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if catalog.get('format') != CATALOG_FORMAT:
+        return None
+    return catalog
+
+
+# Menulis catalog.json secara atomik (file sementara lalu rename)
+def write_catalog(root, catalog):
+    path = os.path.join(root, CATALOG_NAME)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(catalog, f, indent=1)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Folder data read-only: katalog tetap dipakai dari memori
+        pass
+
+
+# Memindai folder akar dan memperbarui katalog: partisi baru atau berubah dipindai,
+# partisi lain diambil dari catalog.json. Katalog ditulis ulang hanya jika ada perubahan.
+def refresh_catalog(root):
+    previous = read_catalog(root)
+    old = {partition['path']: partition for partition in previous['partitions']} if previous else {}
+    partitions = [scan_partition(root, relative, old.get(relative)) for relative in find_partitions(root)]
+    catalog = {'format': CATALOG_FORMAT, 'partitions': partitions}
+    if catalog != previous:
+        write_catalog(root, catalog)
+    return catalog
+
+
+# Katalog untuk sebuah folder akar, dipindai sekali per proses (atau setelah cache di-invalidate)
+def get_catalog(root=None):
+    root = os.path.abspath(root or STORE_DIR)
+    with _catalog_lock:
+        if root not in _catalogs:
+            _catalogs[root] = refresh_catalog(root)
+        return _catalogs[root]
+
+
+# Membuang katalog yang sudah dipindai (dipanggil saat cache data di-invalidate)
+def clear_catalogs():
+    with _catalog_lock:
+        _catalogs.clear()
+
+
+data_loader.on_invalidate(clear_catalogs)
+
+
+# Daftar kota pada katalog
+def cities(catalog):
+    return sorted({partition['city'] for partition in catalog['partitions']})
+
+
+# Tanggal pertama dan terakhir data sebuah kota
+def city_bounds(catalog, city):
+    partitions = [p for p in catalog['partitions'] if p['city'] == city and p['min_date']]
+    return (pd.Timestamp(min(p['min_date'] for p in partitions)).date(),
+            pd.Timestamp(max(p['max_date'] for p in partitions)).date())
+
+
+# Tanggal (date) atau None
+def _as_date(value):
+    return None if value is None else pd.Timestamp(value).date()
+
+
+# Partisi sebuah kota yang rentang tanggalnya beririsan dengan [start, end] dan berisi
+# salah satu musim terpilih (None atau kosong berarti tanpa batas)
+def prune(catalog, city, start=None, end=None, seasons=None):
+    start, end = _as_date(start), _as_date(end)
+    selected = []
+    for partition in catalog['partitions']:
+        if partition['city'] != city or partition['min_date'] is None:
+            continue
+        if not all(name in partition['files'] for name in loaded_files()):
+            continue
+        if start is not None and partition['max_date'] < start.isoformat():
+            continue
+        if end is not None and partition['min_date'] > end.isoformat():
+            continue
+        if seasons and not set(partition['seasons']) & set(seasons):
+            continue
+        selected.append(partition)
+    return selected
+
+
+# Ukuran total (byte) file partisi yang akan dibaca
+def partition_bytes(partitions):
+    return sum(partition['files'][name]['size'] for partition in partitions for name in loaded_files()
+               if name in partition['files'])
+
+
+# Filter baris frame gabungan: partisi di tepi rentang atau yang berisi beberapa musim
+# bisa memuat baris di luar cakupan
+def scope_filter(start=None, end=None, seasons=None):
+    def apply(df):
+        mask = pd.Series(True, index=df.index)
+        if start is not None:
+            mask &= df['dteday'] >= pd.Timestamp(start)
+        if end is not None:
+            mask &= df['dteday'] <= pd.Timestamp(end)
+        if seasons:
+            mask &= df['season'].isin(list(seasons))
+        if mask.all():
+            return df
+        return df[mask].reset_index(drop=True)
+    return apply
+
+
+# Memuat data harian dan per jam sebuah kota untuk rentang tanggal dan musim terpilih.
+# Hanya partisi yang lolos pemangkasan katalog yang dibaca; hasilnya di-cache per cakupan
+# dan dimuat ulang jika salah satu file partisinya berubah.
+def load(city=None, start=None, end=None, seasons=None, root=None):
+    root = os.path.abspath(root or STORE_DIR)
+    catalog = get_catalog(root)
+    if city is None:
+        city = cities(catalog)[0]
+    start, end = _as_date(start), _as_date(end)
+    seasons = tuple(sorted(set(seasons))) if seasons else None
+    partitions = prune(catalog, city, start, end, seasons)
+    if not partitions:
+        raise FileNotFoundError(f"Tidak ada partisi data untuk kota '{city}' pada rentang dan musim terpilih")
+
+    paths = {name: [partition_path(root, partition, name) for partition in partitions] for name in loaded_files()}
+    key = ('store', root, city, start, end, seasons)
+    frames = data_loader.load_partitions(key, paths.get('day', []), paths['hour'], scope_filter(start, end, seasons))
+    data_loader.evict('store', MAX_SCOPES)
+    return frames
+
+
+# Memecah sepasang day.csv/hour.csv menjadi partisi bulanan sebuah kota lalu memperbarui katalog
+def split(day_path, hour_path, root, city):
+    for name, path in zip(PARTITION_FILES, (day_path, hour_path)):
+        df = pd.read_csv(path, dtype=str)
+        months = pd.to_datetime(df['dteday']).dt.strftime(os.path.join('%Y', '%m'))
+        for month, part in df.groupby(months, sort=True):
+            out_dir = os.path.join(root, city, month)
+            os.makedirs(out_dir, exist_ok=True)
+            part.to_csv(os.path.join(out_dir, f'{name}.csv'), index=False)
+    return refresh_catalog(os.path.abspath(root))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Penyimpanan data terpartisi per kota/tahun/bulan')
+    commands = parser.add_subparsers(dest='command', required=True)
+    split_parser = commands.add_parser('split', help='memecah day.csv dan hour.csv menjadi partisi bulanan sebuah kota')
+    split_parser.add_argument('day_csv')
+    split_parser.add_argument('hour_csv')
+    split_parser.add_argument('root')
+    split_parser.add_argument('--city', required=True)
+    catalog_parser = commands.add_parser('catalog', help='memindai ulang partisi dan menulis catalog.json')
+    catalog_parser.add_argument('root')
+    args = parser.parse_args()
+
+    if args.command == 'split':
+        catalog = split(args.day_csv, args.hour_csv, args.root, args.city)
+    else:
+        catalog = refresh_catalog(os.path.abspath(args.root))
+    partitions = catalog['partitions']
+    print(f"{len(partitions)} partisi, {len(cities(catalog))} kota, "
+          f"{partition_bytes(partitions) / 1024 ** 2:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
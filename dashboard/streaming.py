@@ -0,0 +1,155 @@
+import pandas as pd
+
+import comparison
+import cube
+import data_loader
+import regression
+import selection
+import sketch
+import weather_stats
+
+# Mode streaming data per jam (DASHBOARD_INGEST=stream): hour.csv dibaca per chunk dan
+# setiap chunk langsung dilipat ke ringkasan yang bisa digabung, tanpa menyimpan baris
+# mentahnya:
+#   cube         - cube agregasi (lihat cube), untuk Dashboard Utama dan Distribusi Jam
+#   value_counts - jumlah kemunculan nilai per (kondisi cuaca, variabel) (lihat weather_stats)
+#   sketches     - sketch KLL per (kondisi cuaca, variabel) untuk box/violin plot (lihat sketch)
+#   moments      - statistik cukup regresi per kondisi cuaca (lihat regression)
+#   user_counts  - kubus pengguna per (hari, kondisi cuaca, rentang suhu) (lihat comparison)
+#   daily        - jumlah casual/registered/cnt per tanggal, untuk tren per periode
+# Memori puncak sebanding dengan ukuran chunk dan ukuran ringkasan, bukan ukuran file.
+# Tampilan yang membutuhkan baris mentah (scatter, strip plot, box plot eksak, interval
+# bootstrap, dan resolusi per jam) tidak tersedia pada mode ini.
+
+# Kolom CSV yang dibaca (dimensi, ukuran, dan input preprocessing)
+STREAM_COLUMNS = ['dteday', 'season', 'hr', 'weekday', 'workingday', 'weathersit',
+                  'temp', 'hum', 'windspeed', 'casual', 'registered', 'cnt']
+DAILY_COLUMNS = ['casual', 'registered', 'cnt']
+
+
+# Apakah objek data per jam berupa ringkasan streaming, bukan frame
+def is_streamed(hour_df):
+    return isinstance(hour_df, dict)
+
+
+# Ringkasan untuk baris per jam yang sudah diproses. seed membedakan sketch KLL antar chunk.
+def summarize(hour_df, seed=0):
+    positions = selection.build_positions(hour_df['weathersit'].to_numpy())
+    sketches = {}
+    for measure in sketch.MEASURES:
+        values = hour_df[measure].to_numpy()
+        for group, rows in positions.items():
+            sketches[(group, measure)] = sketch.kll_update(sketch.kll_sketch(seed=seed), values[rows])
+    return {
+        'cube': cube.build_cube(hour_df),
+        'value_counts': weather_stats.count_values(hour_df, positions),
+        'sketches': sketches,
+        'moments': regression.build_moments(hour_df),
+        'user_counts': comparison.user_counts(hour_df),
+        'daily': hour_df.groupby('dteday', as_index=False)[DAILY_COLUMNS].sum(),
+    }
+
+
+# Menggabungkan beberapa ringkasan; hasilnya sama dengan ringkasan dari data gabungan
+# (kecuali sketch KLL, yang galatnya tetap terbatas)
+def merge(parts):
+    first = parts[0]
+    value_counts = first['value_counts']
+    sketches = dict(first['sketches'])
+    moments = first['moments']
+    user_counts = first['user_counts']
+    for part in parts[1:]:
+        value_counts = weather_stats.merge_value_counts(value_counts, part['value_counts'])
+        for key, part_sketch in part['sketches'].items():
+            sketches[key] = sketch.kll_merge(sketches[key], part_sketch) if key in sketches else part_sketch
+        moments = regression.merge_moments(moments, part['moments'])
+        user_counts = {name: counts + part['user_counts'][name] for name, counts in user_counts.items()}
+    daily = pd.concat([part['daily'] for part in parts], ignore_index=True)
+    return {
+        'cube': cube.merge_cubes([part['cube'] for part in parts]),
+        'value_counts': value_counts,
+        'sketches': sketches,
+        'moments': moments,
+        'user_counts': user_counts,
+        'daily': daily.groupby('dteday', as_index=False)[DAILY_COLUMNS].sum(),
+    }
+
+
+# Membangun ringkasan dengan membaca CSV per chunk. Setiap chunk diproses dengan
+# preprocessing yang sama lalu diringkas; ringkasan parsial digabung setelah cube-nya
+# menyamai ukuran cube berjalan, agar biaya penggabungan tidak tumbuh kuadratik terhadap
+# jumlah chunk.
+def stream_summaries(hour_path, chunksize=None):
+    if chunksize is None:
+        chunksize = data_loader.STREAM_CHUNKSIZE
+
+    summaries = None
+    pending = []
+    pending_rows = 0
+    rows = 0
+    for chunk in data_loader.read_csv(hour_path, usecols=STREAM_COLUMNS, chunksize=chunksize):
+        partial = summarize(data_loader.preprocess(chunk), seed=rows)
+        rows += len(chunk)
+        pending.append(partial)
+        pending_rows += len(partial['cube'])
+        if summaries is None or pending_rows >= len(summaries['cube']):
+            summaries = merge(([summaries] if summaries is not None else []) + pending)
+            pending = []
+            pending_rows = 0
+
+    if pending:
+        summaries = merge([summaries] + pending)
+    if summaries is None:
+        summaries = summarize(data_loader.preprocess(
+            data_loader.read_csv(hour_path, usecols=STREAM_COLUMNS, nrows=0)))
+    return summaries
+
+
+# Ringkasan streaming, di-cache sampai file per jam berubah
+def load(hour_path):
+    return data_loader.load_streamed(hour_path, 'hour', stream_summaries, append_summaries)
+
+
+# Hook append: baris baru mentah diringkas lalu digabung. Ringkasan parsialnya menjadi
+# delta, sehingga artefak turunan (misalnya database SQL cube) cukup menerima bagian baru.
+def append_summaries(summaries, new_rows):
+    partial = summarize(data_loader.preprocess(new_rows), seed=int(summaries['cube']['n'].sum()))
+    return merge([summaries, partial]), partial
+
+
+# Hook append untuk bagian ringkasan yang punya delta sendiri (misalnya cube)
+def _append_part(name):
+    def append(value, summaries, partial):
+        return summaries[name], partial[name]
+    return append
+
+
+# Cube agregasi dari ringkasan streaming. Diambil lewat data_loader.derived agar punya
+# versi data sendiri (render cache, database SQL) seperti cube pada mode in-memory.
+def get_cube(summaries):
+    return data_loader.derived(summaries, 'cube', lambda s: s['cube'], _append_part('cube'))
+
+
+# Jumlah per tanggal sebagai frame (dteday, casual, registered, cnt) untuk indeks waktu
+# (lihat time_index). Tanpa hook append: hari terakhir bisa berubah saat ada baris baru,
+# jadi indeks waktunya dibangun ulang.
+def get_daily(summaries):
+    return data_loader.derived(summaries, 'daily', lambda s: s['daily'])
+
+
+# Ringkasan per kondisi cuaca untuk tabel statistik deskriptif dan ANOVA (struktur
+# weather_stats.build_summary)
+def get_summary(summaries):
+    return data_loader.derived(
+        summaries, 'weather_summary',
+        lambda s: weather_stats.combine_summary(s['cube'], s['value_counts'])
+    )
+
+
+# Ringkasan distribusi per kondisi cuaca untuk box/violin plot (struktur
+# sketch.build_distributions)
+def get_distributions(summaries):
+    return data_loader.derived(
+        summaries, 'distributions:weathersit',
+        lambda s: sketch.counts_distributions('weathersit', s['value_counts'], s['sketches'])
+    )
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+
+import data_loader
+
+# Resolusi agregasi waktu: label widget -> satuan pemotongan waktu
+RESOLUTIONS = {'Per Jam': 'h', 'Harian': 'D', 'Mingguan': 'W', 'Bulanan': 'M'}
+MEASURES = ['cnt', 'casual', 'registered']
+
+
+# Waktu setiap baris: tanggal, ditambah jam untuk data per jam
+def row_timestamps(df):
+    stamps = df['dteday'].to_numpy()
+    if 'hr' in df.columns:
+        stamps = stamps + df['hr'].to_numpy().astype('timedelta64[h]')
+    return stamps
+
+
+# Awal periode (jam, hari, minggu mulai Senin, atau bulan) untuk setiap waktu
+def truncate(stamps, unit):
+    if unit == 'h':
+        start = stamps.astype('datetime64[h]')
+    else:
+        days = stamps.astype('datetime64[D]')
+        if unit == 'D':
+            start = days
+        elif unit == 'M':
+            start = days.astype('datetime64[M]')
+        else:
+            # 1970-01-01 jatuh pada hari Kamis (weekday 3 jika Senin = 0)
+            start = days - (days.view('int64') + 3) % 7
+    return start.astype(stamps.dtype)
+
+
+# Posisi baris awal setiap periode dan kunci periodenya, untuk waktu yang sudah terurut
+def _period_starts(stamps, unit):
+    keys = truncate(stamps, unit)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.array([], dtype='int64')
+    return starts, keys[starts]
+
+
+# Membangun indeks waktu: waktu baris yang terurut, prefix sum tiap ukuran, dan posisi
+# awal periode untuk setiap resolusi. Jumlah untuk rentang baris [lo, hi) cukup dihitung
+# dari selisih dua prefix sum, sehingga rollup tidak perlu menyentuh setiap baris.
+def build_time_index(df):
+    stamps = row_timestamps(df)
+    order = None
+    if len(stamps) and not (stamps[1:] >= stamps[:-1]).all():
+        order = np.argsort(stamps, kind='stable')
+        stamps = stamps[order]
+
+    prefix = {}
+    for measure in MEASURES:
+        values = df[measure].to_numpy(dtype='int64')
+        if order is not None:
+            values = values[order]
+        prefix[measure] = np.concatenate([[0], np.cumsum(values)])
+
+    hourly = 'hr' in df.columns
+    resolutions = {}
+    for label, unit in RESOLUTIONS.items():
+        if unit == 'h' and not hourly:
+            continue
+        resolutions[label] = _period_starts(stamps, unit)
+    return {'stamps': stamps, 'prefix': prefix, 'resolutions': resolutions}
+
+
+# Hook append: baris baru yang waktunya tidak mendahului baris terakhir cukup disambung
+# (prefix sum dilanjutkan dan awal periode baru ditambahkan); selain itu indeks dibangun ulang
+def append_time_index(index, df, new_rows):
+    stamps = row_timestamps(new_rows)
+    old_stamps = index['stamps']
+    sorted_tail = len(stamps) == 0 or (stamps[1:] >= stamps[:-1]).all()
+    if not len(old_stamps) or not sorted_tail or stamps[0] < old_stamps[-1]:
+        return build_time_index(df), None
+
+    offset = len(old_stamps)
+    prefix = {}
+    for measure, old_prefix in index['prefix'].items():
+        values = new_rows[measure].to_numpy(dtype='int64')
+        prefix[measure] = np.concatenate([old_prefix, old_prefix[-1] + np.cumsum(values)])
+
+    resolutions = {}
+    for label, (starts, keys) in index['resolutions'].items():
+        new_starts, new_keys = _period_starts(stamps, RESOLUTIONS[label])
+        # Baris baru yang masih berada di periode terakhir tidak membuka periode baru
+        if len(new_keys) and new_keys[0] == keys[-1]:
+            new_starts, new_keys = new_starts[1:], new_keys[1:]
+        resolutions[label] = (np.concatenate([starts, new_starts + offset]), np.concatenate([keys, new_keys]))
+    return {'stamps': np.concatenate([old_stamps, stamps]), 'prefix': prefix, 'resolutions': resolutions}, None
+
+
+# Indeks waktu untuk sebuah frame, di-cache bersama data yang sedang dimuat
+def get_index(df):
+    return data_loader.derived(df, 'time_index', build_time_index, append_time_index)
+
+
+# Tanggal pertama dan terakhir pada indeks
+def date_bounds(index):
+    stamps = index['stamps']
+    return pd.Timestamp(stamps[0]).date(), pd.Timestamp(stamps[-1]).date()
+
+
+# Jumlah setiap kolom per periode untuk rentang tanggal [start, end] (inklusif).
+# Rentang baris dicari dengan binary search, dan periode yang terpotong oleh rentang
+# hanya berisi baris di dalam rentang. Biaya O(log n + k) untuk k periode.
+def rollup(index, start, end, freq, columns):
+    stamps = index['stamps']
+    start = np.datetime64(start, 'D').astype(stamps.dtype)
+    end = (np.datetime64(end, 'D') + np.timedelta64(1, 'D')).astype(stamps.dtype)
+    lo = np.searchsorted(stamps, start, 'left')
+    hi = np.searchsorted(stamps, end, 'left')
+
+    starts, keys = index['resolutions'][freq]
+    if lo >= hi:
+        bounds = np.array([lo])
+        periods = keys[:0]
+    else:
+        first = np.searchsorted(starts, lo, 'right') - 1
+        last = np.searchsorted(starts, hi, 'left')
+        bounds = np.concatenate([[lo], starts[first + 1:last], [hi]])
+        periods = keys[first:last]
+
+    table = {'period': periods}
+    for column in columns:
+        table[column] = np.diff(index['prefix'][column][bounds])
+    return pd.DataFrame(table)
@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+
+import cube
+import data_loader
+import lazy
+import selection
+
+# Ringkasan per kondisi cuaca untuk tabel statistik deskriptif dan ANOVA. Count, jumlah,
+# dan M2 (jumlah kuadrat simpangan dari mean) per (kondisi cuaca, variabel) diambil dari
+# roll-up cube per jam (lihat cube.combine_cells). Kuantil min/kuartil/median/max dihitung
+# eksak dari jumlah kemunculan setiap nilai per kondisi cuaca: ukurannya berupa bilangan
+# bulat sehingga banyak nilai uniknya kecil, dan ringkasan ini bisa digabung, jadi baris
+# baru (append) cukup diringkas lalu digabung tanpa mengurutkan ulang seluruh data.
+# Sketch KLL (lihat sketch) tetap dipakai untuk box/violin plot; tabel describe dan median
+# memakai kuantil eksak agar sama dengan pandas dan backend SQL.
+QUANTILES = [0.0, 0.25, 0.5, 0.75, 1.0]
+QUANTILE_COLUMNS = ['min', '25%', '50%', '75%', 'max']
+
+
+# Nilai unik terurut dan jumlah kemunculannya
+def _value_counts(values):
+    codes, uniques = pd.factorize(values, sort=True)
+    return uniques, np.bincount(codes, minlength=len(uniques))
+
+
+# Menggabungkan dua ringkasan (nilai unik, jumlah kemunculan)
+def _merge_counts(a, b):
+    codes, uniques = pd.factorize(np.concatenate([a[0], b[0]]), sort=True)
+    return uniques, np.bincount(codes, weights=np.concatenate([a[1], b[1]]), minlength=len(uniques)).astype('int64')
+
+
+# Kuantil dari ringkasan (nilai unik, jumlah kemunculan) dengan interpolasi linear antara
+# dua nilai berurutan, seperti np.quantile dan Series.describe pada data mentah
+def counts_quantiles(counts, qs):
+    values, occurrences = counts
+    cumulative = np.cumsum(occurrences)
+    positions = np.asarray(qs, dtype='float64') * (cumulative[-1] - 1)
+    lower = np.floor(positions)
+    last = len(values) - 1
+    below = values[np.minimum(np.searchsorted(cumulative, lower, 'right'), last)].astype('float64')
+    above = values[np.minimum(np.searchsorted(cumulative, lower + 1, 'right'), last)].astype('float64')
+    return below + (positions - lower) * (above - below)
+
+
+# Jumlah kemunculan setiap nilai per (kondisi cuaca, variabel) dari posisi baris per
+# kondisi cuaca {weathersit: array posisi}
+def count_values(df, group_positions):
+    counts = {}
+    for measure in cube.CUBE_MEASURES:
+        values = df[measure].to_numpy(dtype='int64')
+        for group, positions in group_positions.items():
+            counts[(group, measure)] = _value_counts(values[positions])
+    return counts
+
+
+# Jumlah kemunculan nilai memakai posisi baris yang sudah di-cache (lihat selection)
+def build_value_counts(df):
+    return count_values(df, selection.get_positions(df, 'weathersit'))
+
+
+# Jumlah kemunculan nilai untuk baris frame tanpa cache posisi baris (misalnya baris baru
+# atau satu chunk pada mode streaming)
+def frame_value_counts(df):
+    return count_values(df, selection.build_positions(df['weathersit'].to_numpy()))
+
+
+# Menggabungkan ringkasan parsial ke ringkasan jumlah kemunculan nilai yang sudah ada
+def merge_value_counts(counts, partial):
+    merged = dict(counts)
+    for key, part in partial.items():
+        merged[key] = _merge_counts(merged[key], part) if key in merged else part
+    return merged
+
+
+# Hook append: baris baru diringkas lalu digabung ke ringkasan lama. Hook berjalan di dalam
+# lock cache, jadi posisi baris baru dihitung langsung, bukan lewat data_loader.derived.
+def append_value_counts(counts, df, new_rows):
+    partial = frame_value_counts(new_rows)
+    return merge_value_counts(counts, partial), partial
+
+
+# Menyusun ringkasan {(weathersit, variabel): {count, sum, m2, kuantil}} dari cube dan
+# jumlah kemunculan nilai
+def combine_summary(hour_cube, value_counts):
+    totals = cube.combine_cells(hour_cube, 'weathersit')
+    summary = {}
+    for group, row in totals.iterrows():
+        for measure in cube.CUBE_MEASURES:
+            summary[(int(group), measure)] = {
+                'count': int(row['n']),
+                'sum': int(row[f'{measure}_sum']),
+                'm2': float(row[f'{measure}_m2']),
+                'quantiles': counts_quantiles(value_counts[(int(group), measure)], QUANTILES),
+            }
+    return summary
+
+
+# Membangun ringkasan dari cube dan jumlah kemunculan nilai yang di-cache bersama frame
+def build_summary(df):
+    value_counts = data_loader.derived(df, 'weather_value_counts', build_value_counts, append_value_counts)
+    return combine_summary(cube.get_cube(df), value_counts)
+
+
+# Ringkasan untuk sebuah frame, di-cache bersama data yang sedang dimuat. Saat ada baris
+# baru, ringkasan ini disusun ulang dari cube dan jumlah kemunculan nilai yang sudah
+# diperbarui lewat hook append masing-masing (O(sel cube + nilai unik), bukan O(baris)).
+def get_summary(df):
+    return data_loader.derived(df, 'weather_summary', build_summary)
+
+
+# Count, mean, dan M2 (jumlah kuadrat simpangan dari mean) per kondisi cuaca terpilih
+# yang berisi data, urut menurut kode kondisi cuaca.
+# summary boleh diberikan dari luar (misalnya hasil query backend SQL) dengan struktur yang sama.
+def group_moments(df, y_var, groups, summary=None):
+    if summary is None:
+        summary = get_summary(df)
+    moments = []
+    for group in sorted(set(groups)):
+        stats = summary.get((group, y_var))
+        if stats is None or stats['count'] == 0:
+            continue
+        moments.append((group, stats['count'], stats['sum'] / stats['count'], stats['m2']))
+    return moments
+
+
+# Kuantil satu variabel per kondisi cuaca (indeks weathersit, kolom min..max)
+def variable_quantiles(df, y_var, summary=None):
+    if summary is None:
+        summary = get_summary(df)
+    rows = {group: stats['quantiles'] for (group, measure), stats in summary.items() if measure == y_var}
+    return pd.DataFrame.from_dict(rows, orient='index', columns=QUANTILE_COLUMNS)
+
+
+# Tabel statistik deskriptif per kondisi cuaca, sama dengan
+# df[df['weathersit'].isin(groups)].groupby('weather_name', observed=True)[y_var].describe().reset_index()
+def describe_table(df, y_var, groups, summary=None):
+    if summary is None:
+        summary = get_summary(df)
+    moments = group_moments(df, y_var, groups, summary)
+    rows = []
+    for group, n, mean, m2 in moments:
+        std = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+        rows.append([float(n), mean, std, *summary[(group, y_var)]['quantiles']])
+    table = pd.DataFrame(rows, columns=['count', 'mean', 'std'] + QUANTILE_COLUMNS, dtype='float64')
+    labels = [data_loader.WEATHER_LABELS[group] for group, *_ in moments]
+    table.insert(0, 'weather_name', pd.Categorical(labels, dtype=data_loader.WEATHER_DTYPE))
+    return table
+
+
+# ANOVA satu arah dari momen per kelompok, sama dengan scipy.stats.f_oneway pada data
+# mentah: F = (SSB / (k - 1)) / (SSW / (N - k)) dengan SSW = Σ M2 dan
+# SSB = Σ n (mean - grand mean)². Mengembalikan (F, p-value), atau None jika kurang
+# dari dua kelompok yang berisi data.
+def anova(df, y_var, groups, summary=None):
+    moments = group_moments(df, y_var, groups, summary)
+    k = len(moments)
+    if k < 2:
+        return None
+    _, n, means, m2 = (np.array(column, dtype='float64') for column in zip(*moments))
+    total = n.sum()
+    grand_mean = (n * means).sum() / total
+    ss_between = (n * (means - grand_mean) ** 2).sum()
+    ss_within = m2.sum()
+    df_between, df_within = k - 1, total - k
+    if df_within <= 0:
+        return np.nan, np.nan
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        f_stat = (ss_between / df_between) / (ss_within / df_within)
+    p_value = lazy.module('scipy.stats').f.sf(f_stat, df_between, df_within)
+    return float(f_stat), float(p_value)
@@ -0,0 +1,11 @@
+import os
+import sys
+
+# Folder data asli dan modul dashboard relatif terhadap folder tests
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(REPO_DIR, 'data')
+DASHBOARD_DIR = os.path.join(REPO_DIR, 'dashboard')
+
+# Supaya modul dashboard (data_loader, dst.) bisa diimpor dari test
+if DASHBOARD_DIR not in sys.path:
+    sys.path.insert(0, DASHBOARD_DIR)
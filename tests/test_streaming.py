@@ -0,0 +1,113 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import DATA_DIR
+
+import comparison
+import cube
+import data_loader
+import regression
+import sketch
+import streaming
+import weather_stats
+
+HOUR_PATH = os.path.join(DATA_DIR, 'hour.csv')
+
+# Ukuran chunk: lebih kecil dari satu hari data, tidak habis membagi jumlah baris,
+# dan lebih besar dari seluruh file
+CHUNKSIZES = [1000, 7777, 100000]
+
+
+@pytest.fixture(scope='module')
+def hour_df():
+    return data_loader.read_frame(HOUR_PATH, use_snapshot=False)
+
+
+@pytest.fixture(scope='module')
+def expected_cube(hour_df):
+    return cube.build_cube(hour_df)
+
+
+@pytest.fixture(scope='module', params=CHUNKSIZES)
+def streamed(request):
+    return streaming.stream_summaries(HOUR_PATH, chunksize=request.param)
+
+
+# Cube hasil streaming identik dengan cube dari frame in-memory
+def test_stream_cube_matches_memory(expected_cube, streamed):
+    pd.testing.assert_frame_equal(streamed['cube'], expected_cube)
+    pd.testing.assert_frame_equal(cube.merge_cubes([streamed['cube']]), expected_cube)
+
+
+# Agregat yang dipakai tampilan: rata-rata per jam, jumlah per hari, statistik per
+# kondisi cuaca, dan rentang suhu
+@pytest.mark.parametrize('by, measure', [('hr', 'cnt'), ('weekday', 'casual'), ('weathersit', 'registered'),
+                                         ('temp_bin', 'cnt')])
+def test_stream_rollups_match_memory(expected_cube, streamed, by, measure):
+    pd.testing.assert_frame_equal(cube.rollup(streamed['cube'], by, measure), cube.rollup(expected_cube, by, measure))
+
+
+# Rata-rata per jam dari cube streaming sama dengan groupby pandas pada data mentah
+def test_stream_hourly_mean_matches_groupby(hour_df, streamed):
+    hourly_mean = cube.rollup(streamed['cube'], 'hr', 'cnt')['mean']
+    pd.testing.assert_series_equal(hourly_mean, hour_df.groupby('hr')['cnt'].mean(),
+                                   check_names=False, check_index_type=False)
+
+
+# Ringkasan per kondisi cuaca (tabel describe dan ANOVA): count, jumlah, M2, dan kuantil
+# sama dengan ringkasan dari frame in-memory
+def test_stream_weather_summary_matches_memory(hour_df, streamed):
+    expected = weather_stats.build_summary(hour_df)
+    summary = weather_stats.combine_summary(streamed['cube'], streamed['value_counts'])
+    assert summary.keys() == expected.keys()
+    for key, stats in expected.items():
+        assert summary[key]['count'] == stats['count']
+        assert summary[key]['sum'] == stats['sum']
+        assert summary[key]['m2'] == pytest.approx(stats['m2'], rel=1e-9)
+        np.testing.assert_array_equal(summary[key]['quantiles'], stats['quantiles'])
+
+
+# Ringkasan distribusi box/violin: n, jumlah, M2, min, max, dan histogram sama dengan
+# build_distributions; kuartil sketch berada dalam galat rank sketch KLL
+def test_stream_distributions_match_memory(hour_df, streamed):
+    expected = sketch.build_distributions(hour_df, 'weathersit')
+    distributions = sketch.counts_distributions('weathersit', streamed['value_counts'], streamed['sketches'])
+    for measure in sketch.MEASURES:
+        np.testing.assert_array_equal(distributions['edges'][measure], expected['edges'][measure])
+    assert distributions['groups'].keys() == expected['groups'].keys()
+    for (group, measure), stats in expected['groups'].items():
+        summary = distributions['groups'][(group, measure)]
+        for field in ('n', 'sum', 'min', 'max'):
+            assert summary[field] == stats[field]
+        assert summary['m2'] == pytest.approx(stats['m2'], rel=1e-9)
+        np.testing.assert_array_equal(summary['hist'], stats['hist'])
+        assert summary['sketch']['n'] == stats['n']
+
+        values = np.sort(hour_df.loc[hour_df['weathersit'] == group, measure].to_numpy())
+        if len(values) >= 100:
+            estimates = sketch.kll_quantiles(summary['sketch'], [0.25, 0.5, 0.75])
+            ranks = np.searchsorted(values, estimates, 'right') / len(values)
+            assert np.abs(ranks - [0.25, 0.5, 0.75]).max() < 0.05
+
+
+# Statistik cukup regresi per kondisi cuaca sama dengan build_moments
+def test_stream_moments_match_memory(hour_df, streamed):
+    expected = regression.build_moments(hour_df)
+    assert streamed['moments'].keys() == expected.keys()
+    for pair, group_moments in expected.items():
+        assert streamed['moments'][pair].keys() == group_moments.keys()
+        for group, moments in group_moments.items():
+            for stat, value in moments.items():
+                assert streamed['moments'][pair][group][stat] == pytest.approx(value, rel=1e-9, abs=1e-6)
+
+
+# Kubus pengguna dan jumlah per tanggal sama dengan perhitungan pada data mentah
+def test_stream_user_counts_and_daily_match_memory(hour_df, streamed):
+    expected = comparison.user_counts(hour_df)
+    for name, counts in expected.items():
+        np.testing.assert_array_equal(streamed['user_counts'][name], counts)
+    daily = hour_df.groupby('dteday', as_index=False)[streaming.DAILY_COLUMNS].sum()
+    pd.testing.assert_frame_equal(streamed['daily'], daily)